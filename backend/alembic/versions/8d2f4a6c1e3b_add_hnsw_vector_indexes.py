@@ -0,0 +1,53 @@
+"""add_hnsw_vector_indexes
+
+Revision ID: 8d2f4a6c1e3b
+Revises: 55f5fd09e256
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.config.ai_config import ai_config
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2f4a6c1e3b"
+down_revision: Union[str, Sequence[str], None] = "55f5fd09e256"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VECTOR_TABLES = ("messages", "atoms", "topics")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Create HNSW indexes (cosine distance) on messages, atoms and topics embeddings
+    so similarity queries ordered by `embedding <=> query` use an ANN index scan
+    instead of a sequential scan. Build parameters come from
+    AI_VECTOR_SEARCH_HNSW_M / AI_VECTOR_SEARCH_HNSW_EF_CONSTRUCTION.
+
+    Indexes are built CONCURRENTLY to avoid locking writes on large tables.
+    """
+    m = ai_config.vector_search.hnsw_m
+    ef_construction = ai_config.vector_search.hnsw_ef_construction
+
+    with op.get_context().autocommit_block():
+        for table in VECTOR_TABLES:
+            op.execute(
+                f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_embedding_hnsw
+                ON {table} USING hnsw (embedding vector_cosine_ops)
+                WITH (m = {m}, ef_construction = {ef_construction})
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in VECTOR_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_embedding_hnsw")
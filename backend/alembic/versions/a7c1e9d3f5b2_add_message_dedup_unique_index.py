@@ -0,0 +1,68 @@
+"""add_message_dedup_unique_index
+
+Revision ID: a7c1e9d3f5b2
+Revises: e5c3a7d9f1b4
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c1e9d3f5b2"
+down_revision: Union[str, Sequence[str], None] = "e5c3a7d9f1b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Partial unique (source_id, source_channel_id, external_message_id) key so
+    bulk ingestion can deduplicate with INSERT ... ON CONFLICT DO NOTHING.
+    Telegram message ids are only unique per chat, and messages stored before
+    the channel was recorded have a NULL source_channel_id, so those rows are
+    neither deduplicated nor covered by the index. Existing duplicates with a
+    channel are merged into the oldest row first; history and feedback rows
+    are repointed to it.
+    """
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE message_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id
+        FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY source_id, source_channel_id, external_message_id
+                ORDER BY created_at, id
+            ) AS keep_id
+            FROM messages
+            WHERE source_channel_id IS NOT NULL
+        ) ranked
+        WHERE id <> keep_id
+        """
+    )
+    op.execute(
+        "UPDATE message_history h SET message_id = d.keep_id FROM message_duplicates d WHERE h.message_id = d.id"
+    )
+    op.execute(
+        "UPDATE classification_feedback f SET message_id = d.keep_id "
+        "FROM message_duplicates d WHERE f.message_id = d.id"
+    )
+    op.execute("DELETE FROM messages m USING message_duplicates d WHERE m.id = d.id")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_messages_source_channel_external
+            ON messages (source_id, source_channel_id, external_message_id)
+            WHERE source_channel_id IS NOT NULL
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_messages_source_channel_external")
@@ -0,0 +1,39 @@
+"""add_telegram_avatar_cache_table
+
+Revision ID: b3d5f7a9c1e4
+Revises: a7c1e9d3f5b2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d5f7a9c1e4"
+down_revision: Union[str, Sequence[str], None] = "a7c1e9d3f5b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Create telegram_avatar_cache table: resolved Bot API avatar URLs per
+    Telegram user (NULL = no photo), refreshed by the avatar resolver after TTL.
+    """
+    op.create_table(
+        "telegram_avatar_cache",
+        sa.Column("telegram_user_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("avatar_url", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("telegram_user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("telegram_avatar_cache")
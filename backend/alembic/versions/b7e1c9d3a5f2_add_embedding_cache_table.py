@@ -0,0 +1,43 @@
+"""add_embedding_cache_table
+
+Revision ID: b7e1c9d3a5f2
+Revises: 8d2f4a6c1e3b
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import pgvector.sqlalchemy.vector
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e1c9d3a5f2"
+down_revision: Union[str, Sequence[str], None] = "8d2f4a6c1e3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Create embedding_cache table: embeddings keyed by sha256(text) plus
+    provider type, model and dimensions, shared by API and worker processes.
+    """
+    op.create_table(
+        "embedding_cache",
+        sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("provider_type", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column("model", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("embedding", pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash", "provider_type", "model", "dimensions"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("embedding_cache")
@@ -0,0 +1,38 @@
+"""add_messages_thread_sent_at_index
+
+Revision ID: c4a8e2f6b9d1
+Revises: b7e1c9d3a5f2
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e2f6b9d1"
+down_revision: Union[str, Sequence[str], None] = "b7e1c9d3a5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Composite index for thread context lookups (N messages before/after a target
+    within the same source_thread_id, ordered by sent_at).
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_thread_sent_at
+            ON messages (source_thread_id, sent_at)
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_thread_sent_at")
@@ -0,0 +1,120 @@
+"""add_unprocessed_message_counter
+
+Revision ID: c8e2a4f6b1d3
+Revises: b3d5f7a9c1e4
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e2a4f6b1d3"
+down_revision: Union[str, Sequence[str], None] = "b3d5f7a9c1e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app/models/unprocessed_message_bucket.py
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION track_unprocessed_messages() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        SELECT date_trunc('hour', sent_at), count(*) FROM new_rows
+        WHERE topic_id IS NULL GROUP BY 1 ORDER BY 1
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + EXCLUDED.message_count;
+    ELSE
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        SELECT date_trunc('hour', sent_at), -count(*) FROM old_rows
+        WHERE topic_id IS NULL GROUP BY 1 ORDER BY 1
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + EXCLUDED.message_count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+UPDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION track_unprocessed_message_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF OLD.topic_id IS NULL THEN
+        UPDATE unprocessed_message_buckets SET message_count = message_count - 1
+        WHERE bucket_start = date_trunc('hour', OLD.sent_at);
+    END IF;
+    IF NEW.topic_id IS NULL THEN
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        VALUES (date_trunc('hour', NEW.sent_at), 1)
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = (
+    "CREATE TRIGGER messages_unprocessed_insert AFTER INSERT ON messages "
+    "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION track_unprocessed_messages()",
+    "CREATE TRIGGER messages_unprocessed_update AFTER UPDATE OF topic_id, sent_at ON messages FOR EACH ROW "
+    "WHEN ((OLD.topic_id IS NULL OR NEW.topic_id IS NULL) "
+    "AND (OLD.topic_id IS DISTINCT FROM NEW.topic_id OR OLD.sent_at IS DISTINCT FROM NEW.sent_at)) "
+    "EXECUTE FUNCTION track_unprocessed_message_update()",
+    "CREATE TRIGGER messages_unprocessed_delete AFTER DELETE ON messages "
+    "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION track_unprocessed_messages()",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Hourly counters of messages without topic, maintained by triggers on
+    messages (the update trigger only fires for topic_id/sent_at changes) and
+    backfilled in the same transaction, so the knowledge extraction threshold
+    check no longer runs COUNT(*) over the lookback window. Partial index for
+    loading extraction candidates.
+    """
+    op.create_table(
+        "unprocessed_message_buckets",
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_start"),
+    )
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(UPDATE_TRIGGER_FUNCTION)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute(
+        """
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        SELECT date_trunc('hour', sent_at), count(*) FROM messages
+        WHERE topic_id IS NULL GROUP BY 1
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_unprocessed_conversation
+            ON messages (source_channel_id, source_thread_id, sent_at)
+            WHERE topic_id IS NULL
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_unprocessed_conversation")
+
+    for trigger in ("messages_unprocessed_insert", "messages_unprocessed_update", "messages_unprocessed_delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON messages")
+    op.execute("DROP FUNCTION IF EXISTS track_unprocessed_message_update()")
+    op.execute("DROP FUNCTION IF EXISTS track_unprocessed_messages()")
+    op.drop_table("unprocessed_message_buckets")
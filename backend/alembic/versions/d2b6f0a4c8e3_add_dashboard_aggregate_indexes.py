@@ -0,0 +1,41 @@
+"""add_dashboard_aggregate_indexes
+
+Revision ID: d2b6f0a4c8e3
+Revises: c4a8e2f6b9d1
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b6f0a4c8e3"
+down_revision: Union[str, Sequence[str], None] = "c4a8e2f6b9d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Time-range indexes for dashboard aggregates. The messages index covers
+    topic_id and noise_classification so period counts and per-topic trends
+    can be answered with index-only scans.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_sent_at
+            ON messages (sent_at) INCLUDE (topic_id, noise_classification)
+            """
+        )
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_atoms_created_at ON atoms (created_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_atoms_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_sent_at")
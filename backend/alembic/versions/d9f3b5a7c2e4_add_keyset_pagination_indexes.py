@@ -0,0 +1,53 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: d9f3b5a7c2e4
+Revises: c8e2a4f6b1d3
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f3b5a7c2e4"
+down_revision: Union[str, Sequence[str], None] = "c8e2a4f6b1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Composite (timestamp, id) indexes matching the keyset cursors of the
+    message, atom and topic lists. They lead with the same column as the
+    single-column dashboard indexes (the messages one keeps its INCLUDE
+    columns for index-only period counts), which are dropped as redundant.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_sent_at_id
+            ON messages (sent_at, id) INCLUDE (topic_id, noise_classification)
+            """
+        )
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_atoms_created_at_id ON atoms (created_at, id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_topics_created_at_id ON topics (created_at, id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_sent_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_atoms_created_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_sent_at
+            ON messages (sent_at) INCLUDE (topic_id, noise_classification)
+            """
+        )
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_atoms_created_at ON atoms (created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_topics_created_at_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_atoms_created_at_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_sent_at_id")
@@ -0,0 +1,75 @@
+"""add_search_vectors_and_trigram_indexes
+
+Revision ID: e4a6c8b0d2f5
+Revises: d9f3b5a7c2e4
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a6c8b0d2f5"
+down_revision: Union[str, Sequence[str], None] = "d9f3b5a7c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) served by pg_trgm for the ILIKE '%q%' fallback of /search
+TRIGRAM_INDEXES = (
+    ("ix_messages_content_trgm", "messages", "content"),
+    ("ix_topics_name_trgm", "topics", "name"),
+    ("ix_topics_description_trgm", "topics", "description"),
+    ("ix_atoms_title_trgm", "atoms", "title"),
+    ("ix_atoms_content_trgm", "atoms", "content"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Stored tsvector columns for /search on messages and topics, matching the
+    'simple' configuration of the atoms expression index (idx_atoms_fts), so
+    ranking no longer re-parses every matching row. Adding a stored generated
+    column rewrites the table: run during a maintenance window on large
+    installations. The columns are not mapped on the models; only the raw
+    search SQL reads them.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE topics ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', name || ' ' || COALESCE(description, ''))) STORED
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_search_vector ON messages USING GIN (search_vector)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_topics_search_vector ON topics USING GIN (search_vector)"
+        )
+        for index_name, table, column in TRIGRAM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} USING GIN ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_topics_search_vector")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_search_vector")
+
+    op.execute("ALTER TABLE topics DROP COLUMN IF EXISTS search_vector")
+    op.execute("ALTER TABLE messages DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,74 @@
+"""add_daily_rollup_tables
+
+Revision ID: e5c3a7d9f1b4
+Revises: d2b6f0a4c8e3
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c3a7d9f1b4"
+down_revision: Union[str, Sequence[str], None] = "d2b6f0a4c8e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Create daily rollup tables for dashboard metrics plus their refresh
+    watermark table. updated_at indexes let the refresh job find changed days.
+    Rollups are populated by the first refresh_daily_rollups_task run.
+    """
+    op.create_table(
+        "message_daily_stats",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source_id", sa.Integer(), nullable=False),
+        sa.Column("topic_id", sa.Uuid(), nullable=True),
+        sa.Column("noise_classification", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=True),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_message_daily_stats_day"), "message_daily_stats", ["day"], unique=False)
+    op.create_table(
+        "atom_daily_stats",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("type", sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column("user_approved", sa.Boolean(), nullable=False),
+        sa.Column("archived", sa.Boolean(), nullable=False),
+        sa.Column("atom_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_atom_daily_stats_day"), "atom_daily_stats", ["day"], unique=False)
+    op.create_table(
+        "daily_rollup_state",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("covered_until", sa.Date(), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_messages_updated_at ON messages (updated_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_atoms_updated_at ON atoms (updated_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_atoms_updated_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_messages_updated_at")
+
+    op.drop_table("daily_rollup_state")
+    op.drop_index(op.f("ix_atom_daily_stats_day"), table_name="atom_daily_stats")
+    op.drop_table("atom_daily_stats")
+    op.drop_index(op.f("ix_message_daily_stats_day"), table_name="message_daily_stats")
+    op.drop_table("message_daily_stats")
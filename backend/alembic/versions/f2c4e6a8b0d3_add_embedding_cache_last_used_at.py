@@ -0,0 +1,42 @@
+"""add_embedding_cache_last_used_at
+
+Revision ID: f2c4e6a8b0d3
+Revises: e4a6c8b0d2f5
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c4e6a8b0d3"
+down_revision: Union[str, Sequence[str], None] = "e4a6c8b0d2f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Track when each embedding_cache entry was last used so entries that are no
+    longer needed can be pruned. Existing entries start their lifetime now.
+    """
+    op.add_column(
+        "embedding_cache",
+        sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_embedding_cache_last_used_at"),
+        "embedding_cache",
+        ["last_used_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_embedding_cache_last_used_at"), table_name="embedding_cache")
+    op.drop_column("embedding_cache", "last_used_at")
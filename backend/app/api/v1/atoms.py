@@ -28,6 +28,7 @@ from app.models.atom import (
 )
 from app.models.topic import Topic
 from app.services import AtomCRUD
+from app.services.pagination import CountMode
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/atoms", tags=["atoms"])
@@ -42,6 +43,8 @@ router = APIRouter(prefix="/atoms", tags=["atoms"])
 async def list_atoms(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page (skip is ignored)"),
+    count: CountMode = Query(CountMode.exact, description="Total: exact, estimated (planner statistics) or none"),
     session: AsyncSession = Depends(get_session),
 ) -> AtomListResponse:
     """List all atoms with pagination.
@@ -52,19 +55,29 @@ async def list_atoms(
     Args:
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
+        cursor: Keyset cursor over (created_at, id) from the previous page
+        count: How to compute the total
         session: Database session
 
     Returns:
         List of atoms with pagination metadata
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
     """
     crud = AtomCRUD(session)
-    atoms, total = await crud.list_atoms(skip=skip, limit=limit)
+    try:
+        result = await crud.list_atoms(skip=skip, limit=limit, cursor=cursor, count=count)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     page = (skip // limit) + 1 if limit else 1
     return AtomListResponse(
-        items=atoms,
-        total=total,
+        items=result.items,
+        total=result.total,
         page=page,
         page_size=limit,
+        total_is_estimate=result.total_is_estimate,
+        next_cursor=result.next_cursor,
     )
 
 
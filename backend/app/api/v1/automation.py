@@ -24,6 +24,7 @@ from app.models.automation_rule import (
     AutomationRuleUpdate,
 )
 from app.models.topic_version import TopicVersion
+from app.services.rule_compiler import rule_set_cache
 from app.services.rule_engine_service import rule_engine_service
 from app.services.rule_templates import RULE_TEMPLATES
 from app.services.versioning import VersioningService
@@ -313,6 +314,7 @@ async def create_rule(
     rule = AutomationRule(**rule_data.model_dump())
     session.add(rule)
     await session.commit()
+    rule_set_cache.invalidate()
     await session.refresh(rule)
 
     return AutomationRulePublic.model_validate(rule)
@@ -379,6 +381,7 @@ async def update_rule(
         setattr(rule, field, value)
 
     await session.commit()
+    rule_set_cache.invalidate()
     await session.refresh(rule)
 
     return AutomationRulePublic.model_validate(rule)
@@ -419,6 +422,7 @@ async def delete_rule(
 
     await session.delete(rule)
     await session.commit()
+    rule_set_cache.invalidate()
 
 
 @rules_router.post(
@@ -459,6 +463,7 @@ async def toggle_rule(
 
     rule.enabled = not rule.enabled
     await session.commit()
+    rule_set_cache.invalidate()
     await session.refresh(rule)
 
     return AutomationRulePublic.model_validate(rule)
@@ -10,6 +10,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.database import get_session
 from app.models.atom import Atom
@@ -178,7 +179,7 @@ async def generate_message_embedding(
         {"provider_id": "550e8400-e29b-41d4-a716-446655440000"}
         ```
     """
-    message = await session.get(Message, message_id)
+    message = await session.get(Message, message_id, options=[undefer(Message.embedding)])  # type: ignore[arg-type]
     if not message:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Message {message_id} not found")
 
@@ -240,7 +241,7 @@ async def generate_atom_embedding(
         {"provider_id": "550e8400-e29b-41d4-a716-446655440000"}
         ```
     """
-    atom = await session.get(Atom, atom_id)
+    atom = await session.get(Atom, atom_id, options=[undefer(Atom.embedding)])  # type: ignore[arg-type]
     if not atom:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Atom {atom_id} not found")
 
@@ -302,7 +303,7 @@ async def generate_topic_embedding(
         {"provider_id": "550e8400-e29b-41d4-a716-446655440000"}
         ```
     """
-    topic = await session.get(Topic, topic_id)
+    topic = await session.get(Topic, topic_id, options=[undefer(Topic.embedding)])  # type: ignore[arg-type]
     if not topic:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Topic {topic_id} not found")
 
@@ -5,7 +5,12 @@ from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.v1.response_models import ConfigResponse, DetailedHealthResponse, HealthResponse
+from app.api.v1.response_models import (
+    ConfigResponse,
+    DetailedHealthResponse,
+    HealthResponse,
+    WebSocketStatsResponse,
+)
 from app.database import get_session
 from app.tasks import score_message_task
 
@@ -82,6 +87,24 @@ async def detailed_health_check(
     )
 
 
+@router.get(
+    "/health/websocket",
+    response_model=WebSocketStatsResponse,
+    summary="WebSocket delivery metrics",
+    response_description="Send queue depth and delivered/dropped frame counters",
+)
+async def websocket_stats() -> WebSocketStatsResponse:
+    """
+    Get WebSocket fan-out metrics for this API process.
+
+    Queue depth is summed over per-connection send queues; dropped frames count
+    frames discarded because a client could not keep up.
+    """
+    from app.services.websocket_manager import websocket_manager
+
+    return WebSocketStatsResponse(**websocket_manager.get_delivery_stats())
+
+
 @router.get(
     "/config",
     response_model=ConfigResponse,
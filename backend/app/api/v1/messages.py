@@ -5,6 +5,7 @@ from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import and_, func, select
 
 from app.api.v1.response_models import PaginatedMessagesResponse
@@ -19,6 +20,7 @@ from app.services.message_inspect_service import (
     MessageInspectResponse,
     MessageInspectService,
 )
+from app.services.pagination import CountMode, count_rows, encode_cursor, keyset_filter
 from app.services.websocket_manager import websocket_manager
 
 logger = logging.getLogger(__name__)
@@ -74,7 +76,14 @@ async def create_message(message: MessageCreateRequest, db: DatabaseDep) -> dict
     )
 
     db.add(db_message)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"Message {message.external_message_id} already exists for source {message.source_id}",
+        )
     await db.refresh(db_message)
 
     # Fetch topic if assigned
@@ -139,6 +148,10 @@ async def get_messages(
     ),
     sort_by: str | None = Query(None, description="Column to sort by (author_name, source_name, analyzed, sent_at)"),
     sort_order: str | None = Query("desc", description="Sort order (asc or desc)"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page: keyset pagination by sent_at (page is ignored)"
+    ),
+    count: CountMode = Query(CountMode.exact, description="Total: exact, estimated (planner statistics) or none"),
 ) -> PaginatedMessagesResponse:
     """
     Retrieve messages with pagination and optional filtering.
@@ -146,6 +159,9 @@ async def get_messages(
     Supports filtering by author, source, topic, date range, and noise classification.
     Importance score filtering allows finding high-signal messages (>0.7) or noise (<0.3).
     Returns most recent messages first with pagination support.
+
+    When sorted by sent_at, responses carry next_cursor; passing it back pages
+    over (sent_at, id) without OFFSET, so deep pages cost the same as the first.
     """
     # Build base query with joins
     from sqlalchemy import column, or_
@@ -183,15 +199,14 @@ async def get_messages(
         statement = statement.where(and_(*filters))
 
     # Count total items
-    count_statement = select(func.count()).select_from(Message).join(User).join(Source)
+    count_statement = select(Message.id).join(User).join(Source)
     if filters:
         count_statement = count_statement.where(and_(*filters))
 
-    count_result = await db.execute(count_statement)
-    total = count_result.scalar() or 0
+    total, total_is_estimate = await count_rows(db, count_statement, count, table=None if filters else "messages")
 
     # Calculate pagination
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+    total_pages = None if total is None else ((total + page_size - 1) // page_size if total > 0 else 1)
     offset = (page - 1) * page_size
 
     # Apply sorting
@@ -199,6 +214,10 @@ async def get_messages(
 
     from sqlalchemy import ColumnElement, asc, desc
 
+    keyset = sort_by in (None, "sent_at")
+    if cursor and not keyset:
+        raise HTTPException(status_code=400, detail="cursor pagination is only supported when sorting by sent_at")
+
     sort_column: ColumnElement[Any]
     if sort_by == "author_name":
         sort_column = column("first_name")
@@ -206,20 +225,25 @@ async def get_messages(
         sort_column = column("name")
     elif sort_by == "analyzed":
         sort_column = column("analyzed")
-    elif sort_by == "sent_at":
-        sort_column = column("sent_at")
     else:
-        # Default: sort by sent_at (when message was actually sent)
-        sort_column = column("sent_at")
+        # Default: sort by sent_at (when message was actually sent), id breaks ties for cursors
+        sort_column = Message.sent_at  # type: ignore[assignment]
 
     # Apply sort order
-    if sort_order == "asc":
-        statement = statement.order_by(asc(sort_column))
-    else:
-        statement = statement.order_by(desc(sort_column))
+    direction = asc if sort_order == "asc" else desc
+    statement = statement.order_by(direction(sort_column))
+    if keyset:
+        statement = statement.order_by(direction(Message.id))  # type: ignore[arg-type]
 
     # Fetch paginated data
-    statement = statement.offset(offset).limit(page_size)
+    if cursor:
+        try:
+            after_cursor = keyset_filter(Message.sent_at, Message.id, cursor, descending=sort_order != "asc")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        statement = statement.where(after_cursor).limit(page_size)
+    else:
+        statement = statement.offset(offset).limit(page_size)
 
     result = await db.execute(statement)
     messages_data = result.all()
@@ -255,12 +279,19 @@ async def get_messages(
             )
         )
 
+    next_cursor = None
+    if keyset and len(messages_data) == page_size:
+        last = messages_data[-1][0]
+        next_cursor = encode_cursor(last.sent_at, last.id)
+
     return PaginatedMessagesResponse.model_validate({
         "items": [item.model_dump() for item in items],
         "total": total,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
+        "total_is_estimate": total_is_estimate,
+        "next_cursor": next_cursor,
     })
 
 
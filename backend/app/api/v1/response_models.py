@@ -31,6 +31,17 @@ class DetailedHealthResponse(BaseModel):
         }
 
 
+class WebSocketStatsResponse(BaseModel):
+    """WebSocket delivery metrics for the current API process."""
+
+    connections: int
+    queue_depth_total: int
+    queue_depth_max: int
+    frames_sent: int
+    frames_dropped: int
+    slow_consumer_disconnects: int
+
+
 class ConfigResponse(BaseModel):
     wsUrl: str
     apiBaseUrl: str
@@ -135,10 +146,12 @@ class MessageFiltersResponse(BaseModel):
 
 class PaginatedMessagesResponse(BaseModel):
     items: list[MessageResponse]
-    total: int
+    total: int | None  # None with count=none
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
+    total_is_estimate: bool = False
+    next_cursor: str | None = None  # Only when ordered by sent_at and more rows may follow
 
 
 # ------------------
@@ -1,12 +1,14 @@
 """Search API endpoint for topics, messages, and atoms using PostgreSQL Full-Text Search."""
 
+import asyncio
 import uuid
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import Row, TextClause, text
 
 from app.dependencies import DatabaseDep
 
@@ -15,6 +17,96 @@ router = APIRouter(prefix="/search", tags=["search"])
 # Atom type literal for type safety
 AtomType = Literal["problem", "solution", "decision", "question", "insight", "pattern", "requirement"]
 
+# Matches are ranked on the stored search_vector columns (GIN indexed) and the
+# ILIKE fallback is served by pg_trgm GIN indexes; ts_headline, which re-parses
+# the text, only runs for the top rows of each group.
+TOPIC_SEARCH_QUERY = text(
+    """
+    WITH matches AS (
+        SELECT id, name, description, ts_rank(search_vector, to_tsquery('simple', :tsquery)) AS rank
+        FROM topics
+        WHERE
+            search_vector @@ to_tsquery('simple', :tsquery)
+            OR name ILIKE :like_query
+            OR description ILIKE :like_query
+        ORDER BY rank DESC
+        LIMIT :limit
+    )
+    SELECT
+        id,
+        name,
+        description,
+        rank,
+        ts_headline('simple', name || ' ' || COALESCE(description, ''),
+                   to_tsquery('simple', :tsquery),
+                   'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
+    FROM matches
+    ORDER BY rank DESC
+    """
+)
+
+MESSAGE_SEARCH_QUERY = text(
+    """
+    WITH matches AS (
+        SELECT id, content, sent_at, topic_id, author_id,
+               ts_rank(search_vector, to_tsquery('simple', :tsquery)) AS rank
+        FROM messages
+        WHERE
+            search_vector @@ to_tsquery('simple', :tsquery)
+            OR content ILIKE :like_query
+        ORDER BY rank DESC
+        LIMIT :limit
+    )
+    SELECT
+        m.id,
+        m.content,
+        m.sent_at,
+        m.topic_id,
+        u.first_name,
+        u.last_name,
+        t.id as topic_id_join,
+        t.name as topic_name,
+        m.rank,
+        ts_headline('simple', m.content, to_tsquery('simple', :tsquery),
+            'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
+    FROM matches m
+    JOIN users u ON m.author_id = u.id
+    LEFT JOIN topics t ON m.topic_id = t.id
+    ORDER BY m.rank DESC
+    """
+)
+
+ATOM_SEARCH_QUERY = text(
+    """
+    WITH matches AS (
+        SELECT id, type, title, content, user_approved,
+               ts_rank(to_tsvector('simple', title || ' ' || content), to_tsquery('simple', :tsquery)) AS rank
+        FROM atoms
+        WHERE
+            archived = false
+            AND (
+                to_tsvector('simple', title || ' ' || content) @@ to_tsquery('simple', :tsquery)
+                OR title ILIKE :like_query
+                OR content ILIKE :like_query
+            )
+        ORDER BY rank DESC
+        LIMIT :limit
+    )
+    SELECT
+        id,
+        type,
+        title,
+        content,
+        user_approved,
+        rank,
+        ts_headline('simple', title || ' ' || content,
+                   to_tsquery('simple', :tsquery),
+                   'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
+    FROM matches
+    ORDER BY rank DESC
+    """
+)
+
 
 class TopicBrief(BaseModel):
     """Brief topic information for message search results."""
@@ -86,6 +178,7 @@ async def search(
 
     Returns top N results per category, ranked by relevance using ts_rank.
     Snippets include highlighted matches using ts_headline with <mark> tags.
+    The three categories are queried concurrently.
 
     Args:
         q: Search query string (1-256 characters)
@@ -106,33 +199,19 @@ async def search(
     # Convert query to tsquery format (handle special characters)
     tsquery = query.replace("'", "''")
     tsquery_formatted = " & ".join(tsquery.split())
+    params = {"tsquery": tsquery_formatted, "like_query": f"%{query}%", "limit": limit}
 
-    # Search topics using raw SQL for FTS
-    topic_query = text(
-        """
-        SELECT
-            id,
-            name,
-            description,
-            ts_rank(to_tsvector('simple', name || ' ' || COALESCE(description, '')),
-                    to_tsquery('simple', :tsquery)) as rank,
-            ts_headline('simple', name || ' ' || COALESCE(description, ''),
-                       to_tsquery('simple', :tsquery),
-                       'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
-        FROM topics
-        WHERE
-            to_tsvector('simple', name || ' ' || COALESCE(description, '')) @@ to_tsquery('simple', :tsquery)
-            OR name ILIKE :like_query
-            OR description ILIKE :like_query
-        ORDER BY rank DESC
-        LIMIT :limit
-        """
-    )
+    # The three groups are independent, so each runs on its own pooled connection
+    engine = db.bind
+
+    async def fetch(statement: TextClause) -> Sequence[Row[Any]]:
+        async with engine.connect() as connection:  # type: ignore[union-attr]
+            result = await connection.execute(statement, params)
+            return result.all()
 
-    topic_result = await db.execute(
-        topic_query, {"tsquery": tsquery_formatted, "like_query": f"%{query}%", "limit": limit}
+    topics_data, messages_data, atoms_data = await asyncio.gather(
+        fetch(TOPIC_SEARCH_QUERY), fetch(MESSAGE_SEARCH_QUERY), fetch(ATOM_SEARCH_QUERY)
     )
-    topics_data = topic_result.all()
 
     topics = [
         TopicSearchResult(
@@ -145,37 +224,6 @@ async def search(
         for row in topics_data
     ]
 
-    # Search messages with author join
-    message_query = text(
-        """
-        SELECT
-            m.id,
-            m.content,
-            m.sent_at,
-            m.topic_id,
-            u.first_name,
-            u.last_name,
-            t.id as topic_id_join,
-            t.name as topic_name,
-            ts_rank(to_tsvector('simple', m.content), to_tsquery('simple', :tsquery)) as rank,
-            ts_headline('simple', m.content, to_tsquery('simple', :tsquery),
-                'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
-        FROM messages m
-        JOIN users u ON m.author_id = u.id
-        LEFT JOIN topics t ON m.topic_id = t.id
-        WHERE
-            to_tsvector('simple', m.content) @@ to_tsquery('simple', :tsquery)
-            OR m.content ILIKE :like_query
-        ORDER BY rank DESC
-        LIMIT :limit
-        """
-    )
-
-    message_result = await db.execute(
-        message_query, {"tsquery": tsquery_formatted, "like_query": f"%{query}%", "limit": limit}
-    )
-    messages_data = message_result.all()
-
     messages = [
         MessageSearchResult(
             id=row.id,
@@ -188,38 +236,6 @@ async def search(
         for row in messages_data
     ]
 
-    # Search atoms by title and content
-    atom_query = text(
-        """
-        SELECT
-            id,
-            type,
-            title,
-            content,
-            user_approved,
-            ts_rank(to_tsvector('simple', title || ' ' || content),
-                    to_tsquery('simple', :tsquery)) as rank,
-            ts_headline('simple', title || ' ' || content,
-                       to_tsquery('simple', :tsquery),
-                       'MaxWords=50, MinWords=20, StartSel=<mark>, StopSel=</mark>') as snippet
-        FROM atoms
-        WHERE
-            archived = false
-            AND (
-                to_tsvector('simple', title || ' ' || content) @@ to_tsquery('simple', :tsquery)
-                OR title ILIKE :like_query
-                OR content ILIKE :like_query
-            )
-        ORDER BY rank DESC
-        LIMIT :limit
-        """
-    )
-
-    atom_result = await db.execute(
-        atom_query, {"tsquery": tsquery_formatted, "like_query": f"%{query}%", "limit": limit}
-    )
-    atoms_data = atom_result.all()
-
     atoms = [
         AtomSearchResult(
             id=row.id,
@@ -28,6 +28,7 @@ from app.models.atom import AtomPublic
 from app.schemas.messages import MessageResponse
 from app.services import AtomCRUD, MessageCRUD, TopicCRUD
 from app.services.metrics_broadcaster import metrics_broadcaster
+from app.services.pagination import CountMode
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/topics", tags=["topics"])
@@ -57,6 +58,10 @@ async def list_topics(
         description="Sort criteria: name_asc, name_desc, created_desc, created_asc, updated_desc",
     ),
     is_active: bool | None = Query(None, description="Filter by active status. None returns all topics."),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (created_desc/created_asc only, skip is ignored)"
+    ),
+    count: CountMode = Query(CountMode.exact, description="Total: exact, estimated (planner statistics) or none"),
     session: AsyncSession = Depends(get_session),
 ) -> TopicListResponse:
     """List all topics with pagination, search, sorting, and active filter.
@@ -70,25 +75,37 @@ async def list_topics(
         search: Optional search query for name or description
         sort_by: Sort order (default: created_desc)
         is_active: Filter by active status. None returns all topics.
+        cursor: Keyset cursor over (created_at, id) from the previous page
+        count: How to compute the total
         session: Database session
 
     Returns:
         List of topics with pagination metadata
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or the sort does not support cursors
     """
     crud = TopicCRUD(session)
-    topics, total = await crud.list(
-        skip=skip,
-        limit=limit,
-        search=search,
-        sort_by=sort_by,
-        is_active=is_active,
-    )
+    try:
+        result = await crud.list(
+            skip=skip,
+            limit=limit,
+            search=search,
+            sort_by=sort_by,
+            is_active=is_active,
+            cursor=cursor,
+            count=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
     page = (skip // limit) + 1 if limit else 1
     return TopicListResponse(
-        items=topics,
-        total=total,
+        items=result.items,
+        total=result.total,
         page=page,
         page_size=limit,
+        total_is_estimate=result.total_is_estimate,
+        next_cursor=result.next_cursor,
     )
 
 
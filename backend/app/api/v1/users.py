@@ -14,6 +14,7 @@ from app.schemas.users import (
     UserResponse,
     UserUpdateRequest,
 )
+from app.services.user_service import invalidate_identity
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["users"])
@@ -96,6 +97,8 @@ async def update_current_user(
 
     await db.commit()
     await db.refresh(user)
+    assert user.id is not None
+    await invalidate_identity(user_id=user.id)
 
     logger.info(f"Updated user {user.id} with fields: {list(update_data.keys())}")
 
@@ -263,6 +266,7 @@ async def link_telegram_profile(
     tg_profile.user_id = user_id
     await db.commit()
     await db.refresh(tg_profile)
+    await invalidate_identity(telegram_user_id=request.telegram_user_id)
 
     logger.info(f"Manually linked Telegram user {request.telegram_user_id} to user {user_id}")
 
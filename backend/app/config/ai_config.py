@@ -7,7 +7,7 @@ hardcoded as magic numbers across the codebase. Each setting includes:
 - Environment variable override support (via pydantic-settings)
 """
 
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -158,6 +158,14 @@ class AnalysisSettings(BaseSettings):
         description="Group messages by channel before extraction (separates different chat sources)",
     )
 
+    sql_grouping: bool = Field(
+        default=True,
+        description=(
+            "Compute conversation keys for extraction batches in the database (window functions). "
+            "False = load candidate messages and group them in Python"
+        ),
+    )
+
 
 class VectorSearchSettings(BaseSettings):
     """Vector search thresholds for different use cases."""
@@ -183,6 +191,59 @@ class VectorSearchSettings(BaseSettings):
         description="Low threshold for exploratory search",
     )
 
+    hnsw_m: int = Field(
+        default=16,
+        ge=4,
+        le=64,
+        description=(
+            "HNSW graph connectivity (max links per node) used when building vector indexes. "
+            "Higher = better recall, larger index and slower builds. Applied at migration time"
+        ),
+    )
+
+    hnsw_ef_construction: int = Field(
+        default=64,
+        ge=16,
+        le=512,
+        description="HNSW build-time candidate list size. Must be >= 2 * hnsw_m. Applied at migration time",
+    )
+
+    hnsw_ef_search: int = Field(
+        default=40,
+        ge=1,
+        le=1000,
+        description=(
+            "HNSW query-time candidate list size (recall/latency knob). "
+            "pgvector default is 40; 100-200 gives ~99% recall at a few ms extra latency. "
+            "Raised automatically to the query LIMIT so top-k results are never truncated"
+        ),
+    )
+
+    hnsw_iterative_scan: Literal["off", "strict_order", "relaxed_order"] = Field(
+        default="relaxed_order",
+        description=(
+            "pgvector >= 0.8 iterative index scans for filtered queries. "
+            "relaxed_order is safe because similarity queries re-sort candidates; ignored on older pgvector"
+        ),
+    )
+
+    candidate_overfetch_factor: int = Field(
+        default=2,
+        ge=1,
+        le=20,
+        description="Initial index candidates fetched per requested result before the similarity threshold is applied",
+    )
+
+    max_candidates: int = Field(
+        default=400,
+        ge=10,
+        le=1000,
+        description=(
+            "Upper bound for adaptive over-fetching when filters drop candidates "
+            "(also caps ef_search, pgvector max is 1000)"
+        ),
+    )
+
 
 class AIConfig(BaseSettings):
     """Unified AI system configuration with environment variable override support.
@@ -8,8 +8,10 @@ Components:
 - FrameworkRegistry: Global registry for framework selection
 - ProviderResolver: Resolves providers from DB with fallback to settings
 - LLMService: Main service for agent creation and execution
+- LLMAgentRegistry: Process-wide cache of created agents
 """
 
+from app.llm.application.agent_registry import LLMAgentRegistry, agent_registry
 from app.llm.application.framework_registry import FrameworkRegistry
 from app.llm.application.llm_service import LLMService
 from app.llm.application.provider_resolver import ProviderResolver
@@ -18,4 +20,6 @@ __all__ = [
     "FrameworkRegistry",
     "ProviderResolver",
     "LLMService",
+    "LLMAgentRegistry",
+    "agent_registry",
 ]
@@ -0,0 +1,213 @@
+"""Agent Registry - Process-wide cache of ready-to-run LLM agents.
+
+Creating an agent means decrypting the provider API key, building a model (and
+its HTTP client) through a factory and wrapping it in a framework agent. Agents
+are stateless between runs, so they are cached and reused, keyed by everything
+that affects them:
+
+- framework instance
+- provider fingerprint (id, type, base_url, encrypted API key digest)
+- agent configuration (prompts, model, settings, output/deps types)
+
+Provider rows are still resolved from the DB on every call; a changed provider
+yields a new fingerprint, so stale agents are never returned even in processes
+that did not see the update. Explicit invalidation releases them early.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar, cast
+from uuid import UUID
+
+from app.llm.domain.models import AgentConfig
+from app.llm.domain.ports import LLMAgent
+from app.models import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+AgentCacheKey = tuple[Hashable, ...]
+T = TypeVar("T")
+
+
+def provider_fingerprint(provider: LLMProvider) -> tuple[Hashable, ...]:
+    """Identify provider connection settings without keeping the API key around."""
+    api_key = provider.api_key_encrypted
+    key_digest = hashlib.sha256(api_key).hexdigest() if isinstance(api_key, bytes) else None
+    provider_type = getattr(provider.type, "value", provider.type)
+    return (provider.id, provider_type, provider.base_url, key_digest)
+
+
+def agent_config_fingerprint(config: AgentConfig) -> tuple[Hashable, ...]:
+    """Identify an agent configuration (types are compared by identity)."""
+    return (
+        config.model_dump_json(exclude={"output_type", "deps_type"}),
+        config.output_type,
+        config.deps_type,
+    )
+
+
+class LLMAgentRegistry:
+    """LRU cache of LLMAgent instances implementing the AgentRegistry protocol.
+
+    Keyed agents (``get_or_create``) are created once per key even under
+    concurrent requests. Named agents (``register_agent``) are kept until
+    unregistered. Small DB-backed settings (e.g. AgentConfig rows) can be
+    cached for ``config_ttl`` seconds via ``get_config``.
+
+    Example:
+        >>> agent = await registry.get_or_create(key, lambda: framework.create_agent(config, provider_config))
+        >>> registry.invalidate_provider(provider_id)
+    """
+
+    def __init__(self, max_entries: int = 128, config_ttl: float = 60.0):
+        """Initialize registry.
+
+        Args:
+            max_entries: Maximum cached keyed agents (least recently used evicted)
+            config_ttl: Seconds cached configs stay valid
+        """
+        self.max_entries = max_entries
+        self.config_ttl = config_ttl
+        self._agents: OrderedDict[AgentCacheKey, LLMAgent[Any]] = OrderedDict()
+        self._agent_index: dict[AgentCacheKey, tuple[UUID | None, str]] = {}
+        self._named: dict[str, LLMAgent[Any]] = {}
+        self._configs: dict[str, tuple[float, Any]] = {}
+        self._locks: dict[AgentCacheKey, asyncio.Lock] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(framework: object, provider: LLMProvider, config: AgentConfig) -> AgentCacheKey:
+        """Build cache key for an agent created by ``framework`` for ``provider``."""
+        return (id(framework), provider_fingerprint(provider), agent_config_fingerprint(config))
+
+    async def get_or_create(
+        self,
+        key: AgentCacheKey,
+        factory: Callable[[], Awaitable[LLMAgent[Any]]],
+        provider_id: UUID | None = None,
+        agent_name: str = "",
+    ) -> LLMAgent[Any]:
+        """Return cached agent for key or create it with ``factory``.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            factory: Coroutine factory creating the agent on a miss
+            provider_id: Provider the agent uses (for invalidation)
+            agent_name: Agent config name (for invalidation)
+
+        Returns:
+            Cached or newly created agent
+        """
+        agent = self._lookup(key)
+        if agent is not None:
+            return agent
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                agent = self._lookup(key)
+                if agent is not None:
+                    return agent
+
+                self.misses += 1
+                agent = await factory()
+                self._agents[key] = agent
+                self._agent_index[key] = (provider_id, agent_name)
+                while len(self._agents) > self.max_entries:
+                    evicted, _ = self._agents.popitem(last=False)
+                    self._agent_index.pop(evicted, None)
+                    self._locks.pop(evicted, None)
+        finally:
+            # A failed factory leaves nothing cached, so its lock must not stay behind
+            if key not in self._agents:
+                self._locks.pop(key, None)
+        return agent
+
+    def _lookup(self, key: AgentCacheKey) -> LLMAgent[Any] | None:
+        agent = self._agents.get(key)
+        if agent is not None:
+            self._agents.move_to_end(key)
+            self.hits += 1
+        return agent
+
+    async def get_config(self, name: str, loader: Callable[[], Awaitable[T]]) -> T:
+        """Return cached config value for ``name``, loading it when missing or expired."""
+        cached = self._configs.get(name)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cast(T, cached[1])
+        value = await loader()
+        self._configs[name] = (now + self.config_ttl, value)
+        return value
+
+    def invalidate_provider(self, provider_id: UUID) -> int:
+        """Drop cached agents using a provider.
+
+        Returns:
+            Number of agents dropped
+        """
+        return self._drop(lambda owner: owner[0] == provider_id)
+
+    def invalidate_agent(self, name: str) -> int:
+        """Drop cached agents and config for an agent name.
+
+        Returns:
+            Number of agents dropped
+        """
+        self._configs.pop(name, None)
+        return self._drop(lambda owner: owner[1] == name)
+
+    def _drop(self, predicate: Callable[[tuple[UUID | None, str]], bool]) -> int:
+        keys = [key for key, owner in self._agent_index.items() if predicate(owner)]
+        for key in keys:
+            self._agents.pop(key, None)
+            self._agent_index.pop(key, None)
+            self._locks.pop(key, None)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached agent(s)")
+        return len(keys)
+
+    def get_stats(self) -> dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {"agents": len(self._agents), "configs": len(self._configs), "hits": self.hits, "misses": self.misses}
+
+    async def register_agent(self, name: str, agent: LLMAgent[Any]) -> None:
+        """Register a named agent instance.
+
+        Raises:
+            ValueError: If agent name already exists
+        """
+        if name in self._named:
+            raise ValueError(f"Agent '{name}' already registered")
+        self._named[name] = agent
+
+    async def get_agent(self, name: str) -> LLMAgent[Any] | None:
+        """Get named agent, None if not registered."""
+        return self._named.get(name)
+
+    async def unregister_agent(self, name: str) -> bool:
+        """Unregister named agent, False if not found."""
+        return self._named.pop(name, None) is not None
+
+    async def list_agents(self) -> list[str]:
+        """List named agents."""
+        return list(self._named)
+
+    async def clear(self) -> None:
+        """Clear named agents, cached agents and configs."""
+        self._named.clear()
+        self._agents.clear()
+        self._agent_index.clear()
+        self._configs.clear()
+        self._locks.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+agent_registry = LLMAgentRegistry()
@@ -6,6 +6,7 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.llm.application.agent_registry import LLMAgentRegistry, agent_registry
 from app.llm.application.framework_registry import FrameworkRegistry
 from app.llm.application.provider_resolver import ProviderResolver
 from app.llm.domain.models import AgentConfig, AgentResult, ProviderConfig
@@ -48,6 +49,8 @@ class LLMService:
     - Framework selection (Pydantic AI, future LangChain)
     - Provider resolution (DB → Settings → Defaults)
     - Agent creation and execution
+    - Agent reuse via LLMAgentRegistry (no key decryption / model construction
+      on repeat calls with the same provider and config)
 
     This service is framework-agnostic and uses dependency injection
     for all LLM operations.
@@ -68,14 +71,17 @@ class LLMService:
         self,
         provider_resolver: ProviderResolver,
         framework_name: str | None = None,
+        registry: LLMAgentRegistry | None = None,
     ):
         """Initialize LLM service.
 
         Args:
             provider_resolver: Resolver for provider lookup
             framework_name: Framework to use (None = default from registry)
+            registry: Agent cache (None = process-wide registry)
         """
         self.provider_resolver = provider_resolver
+        self.registry = registry or agent_registry
         self.framework: LLMFramework = FrameworkRegistry.get(framework_name)
         self.framework_name = framework_name or "default"
 
@@ -121,22 +127,30 @@ class LLMService:
             provider_id=provider_id,
         )
 
-        logger.info(
-            f"Creating agent '{config.name}' with provider '{provider.name}' using framework '{self.framework_name}'"
-        )
-
-        provider_config = await provider_to_config(provider, self.provider_resolver.crud)
-
-        try:
-            agent = await self.framework.create_agent(config=config, provider_config=provider_config)
-            logger.info(f"Agent '{config.name}' created successfully")
-            return agent
-        except Exception as e:
-            logger.error(
-                f"Failed to create agent '{config.name}': {e}",
-                exc_info=True,
+        async def build() -> LLMAgent[Any]:
+            logger.info(
+                f"Creating agent '{config.name}' with provider '{provider.name}' using framework '{self.framework_name}'"
             )
-            raise
+
+            provider_config = await provider_to_config(provider, self.provider_resolver.crud)
+
+            try:
+                agent = await self.framework.create_agent(config=config, provider_config=provider_config)
+                logger.info(f"Agent '{config.name}' created successfully")
+                return agent
+            except Exception as e:
+                logger.error(
+                    f"Failed to create agent '{config.name}': {e}",
+                    exc_info=True,
+                )
+                raise
+
+        return await self.registry.get_or_create(
+            LLMAgentRegistry.make_key(self.framework, provider, config),
+            build,
+            provider_id=provider.id,
+            agent_name=config.name,
+        )
 
     async def execute_prompt(
         self,
@@ -147,7 +147,14 @@ async def startup() -> None:
     from app.database import AsyncSessionLocal
     from app.db.seed_default_agent import seed_default_knowledge_extractor
     from app.services.extraction_scheduler_service import extraction_scheduler_service
+    from app.services.user_service import IDENTITY_CACHE_SUBJECT, handle_identity_invalidation
     from app.services.websocket_manager import websocket_manager
+    from app.tasks.metrics import (
+        DAILY_ROLLUP_REFRESH_CRON,
+        EMBEDDING_CACHE_PRUNE_CRON,
+        prune_embedding_cache_task,
+        refresh_daily_rollups_task,
+    )
 
     initialize_llm_system()
 
@@ -165,6 +172,7 @@ async def startup() -> None:
         logger.warning(f"Failed to seed default agent: {e}")
 
     if not nats_broker.is_worker_process:
+        websocket_manager.add_control_handler(IDENTITY_CACHE_SUBJECT, handle_identity_invalidation)
 
         @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
         async def connect_nats() -> None:
@@ -179,6 +187,16 @@ async def startup() -> None:
             async with AsyncSessionLocal() as session:
                 stats = await extraction_scheduler_service.sync_scheduled_tasks(session)  # type: ignore[arg-type]
                 logger.info(f"Extraction scheduler synced: {stats}")
+            await extraction_scheduler_service.schedule_system_task(
+                schedule_id="daily_rollup_refresh",
+                task_name=refresh_daily_rollups_task.task_name,
+                cron=DAILY_ROLLUP_REFRESH_CRON,
+            )
+            await extraction_scheduler_service.schedule_system_task(
+                schedule_id="embedding_cache_prune",
+                task_name=prune_embedding_cache_task.task_name,
+                cron=EMBEDDING_CACHE_PRUNE_CRON,
+            )
         except Exception as e:
             logger.warning(f"Failed to start extraction scheduler: {e}")
 
@@ -186,9 +204,14 @@ async def startup() -> None:
 @app.on_event("shutdown")
 async def shutdown() -> None:
     """Shutdown TaskIQ broker, WebSocketManager, and Scheduler on application shutdown"""
+    from app.services.avatar_resolver import close_avatar_resolver
+    from app.services.embedding_service import close_embedding_clients
     from app.services.extraction_scheduler_service import extraction_scheduler_service
     from app.services.websocket_manager import websocket_manager
 
+    await close_embedding_clients()
+    await close_avatar_resolver()
+
     if not nats_broker.is_worker_process:
         await extraction_scheduler_service.shutdown()
         await websocket_manager.shutdown()
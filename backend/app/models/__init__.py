@@ -55,6 +55,8 @@ from .confirmation_token import (
     DataWipeResult,
     DataWipeScope,
 )
+from .daily_stats import AtomDailyStats, DailyRollupState, MessageDailyStats
+from .embedding_cache import EmbeddingCacheEntry
 from .enums import (
     AnalysisRunStatus,
     AnalysisStatus,
@@ -121,6 +123,7 @@ from .scheduled_job import (
     ScheduledJobUpdate,
 )
 from .task_config import TaskConfig, TaskConfigCreate, TaskConfigPublic, TaskConfigUpdate
+from .telegram_avatar_cache import TelegramAvatarCacheEntry
 from .telegram_profile import TelegramProfile
 from .topic import (
     ICON_COLORS,
@@ -138,6 +141,7 @@ from .topic import (
     validate_hex_color,
 )
 from .topic_version import TopicVersion, TopicVersionPublic
+from .unprocessed_message_bucket import UnprocessedMessageBucket
 from .user import User
 from .knowledge_extraction_run import (
     ExtractionStatus,
@@ -292,4 +296,14 @@ __all__ = [
     "KnowledgeExtractionRun",
     "KnowledgeExtractionRunCreate",
     "KnowledgeExtractionRunPublic",
+    # Embedding Cache
+    "EmbeddingCacheEntry",
+    # Telegram Avatar Cache
+    "TelegramAvatarCacheEntry",
+    # Daily Rollups
+    "MessageDailyStats",
+    "AtomDailyStats",
+    "DailyRollupState",
+    # Unprocessed Message Counter
+    "UnprocessedMessageBucket",
 ]
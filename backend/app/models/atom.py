@@ -4,12 +4,11 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
-from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
 from pydantic import field_validator
-from sqlalchemy import JSON, Column, Text
+from sqlalchemy import JSON, Text
 from sqlmodel import Field, Relationship, SQLModel
 
-from .base import TimestampMixin
+from .base import TimestampMixin, deferred_embedding, embedding_column
 
 
 class AtomType(str, Enum):
@@ -48,6 +47,9 @@ class LinkType(str, Enum):
     depends_on = "depends_on"
 
 
+_embedding = embedding_column()
+
+
 class Atom(TimestampMixin, SQLModel, table=True):
     """
     Atomic unit of knowledge - self-contained idea.
@@ -58,6 +60,7 @@ class Atom(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "atoms"
+    __mapper_args__ = deferred_embedding(_embedding)
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -104,7 +107,7 @@ class Atom(TimestampMixin, SQLModel, table=True):
 
     embedding: list[float] | None = Field(
         default=None,
-        sa_column=Column(Vector(1536)),
+        sa_column=_embedding,
         description="Vector embedding for semantic search (must match settings.embedding.openai_embedding_dimensions)",
     )
 
@@ -395,9 +398,11 @@ class AtomListResponse(SQLModel):
     """Paginated response schema for atoms."""
 
     items: list[AtomPublic]
-    total: int
+    total: int | None = Field(description="Total atoms (None with count=none)")
     page: int
     page_size: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page (keyset pagination)")
 
 
 class BulkApproveRequest(SQLModel):
@@ -1,11 +1,29 @@
 """Base models and mixins for all entities."""
 
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import BigInteger, DateTime, func
+from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
+from sqlalchemy import BigInteger, Column, DateTime, func
+from sqlalchemy.orm import deferred
 from sqlmodel import Field, SQLModel
 
 
+def embedding_column(dimensions: int = 1536) -> Column[Any]:
+    """Vector column for the ``embedding`` field, see ``deferred_embedding``."""
+    return Column("embedding", Vector(dimensions))
+
+
+def deferred_embedding(column: Column[Any]) -> dict[str, Any]:
+    """Mapper args that defer loading of the ``embedding`` column.
+
+    Plain ``select(Model)`` skips the vector (~12 KB per row); paths that need
+    it opt in with ``options(undefer(Model.embedding))``. Reading an unloaded
+    embedding raises instead of lazy loading, which async sessions cannot do.
+    """
+    return {"properties": {"embedding": deferred(column, raiseload=True)}}
+
+
 class IDMixin(SQLModel):
     """Primary key mixin with BigInteger for scalability."""
 
@@ -0,0 +1,55 @@
+"""Daily rollup tables for dashboard and summary metrics."""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from app.models.base import IDMixin
+
+
+class MessageDailyStats(IDMixin, SQLModel, table=True):
+    """Message counts per UTC day, source, topic and noise classification.
+
+    Maintained by ``DailyRollupService.refresh``; days are rebuilt as a whole,
+    so rows carry no uniqueness constraint.
+    """
+
+    __tablename__ = "message_daily_stats"
+
+    day: date = Field(index=True, description="UTC day of Message.sent_at")
+    source_id: int = Field(description="Message source ID")
+    topic_id: uuid.UUID | None = Field(default=None, description="Assigned topic (None = unassigned)")
+    noise_classification: str | None = Field(default=None, max_length=50, description="Noise classification")
+    message_count: int = Field(default=0, ge=0, description="Number of messages")
+
+
+class AtomDailyStats(IDMixin, SQLModel, table=True):
+    """Atom counts per UTC day of creation, type and review state."""
+
+    __tablename__ = "atom_daily_stats"
+
+    day: date = Field(index=True, description="UTC day of Atom.created_at")
+    type: str = Field(max_length=20, description="Atom type")
+    user_approved: bool = Field(default=False, description="Whether atoms are approved")
+    archived: bool = Field(default=False, description="Whether atoms are archived")
+    atom_count: int = Field(default=0, ge=0, description="Number of atoms")
+
+
+class DailyRollupState(SQLModel, table=True):
+    """Refresh watermark per rollup table.
+
+    Days before ``covered_until`` are served from the rollup table; later rows are
+    aggregated live from the source table.
+    """
+
+    __tablename__ = "daily_rollup_state"
+
+    name: str = Field(primary_key=True, max_length=50, description="Rollup table name")
+    covered_until: date | None = Field(default=None, description="First day not covered by the rollup")
+    refreshed_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True)),
+        description="Source rows updated after this moment may have changed covered days",
+    )
@@ -0,0 +1,53 @@
+"""Persistent embedding cache model."""
+
+from datetime import datetime
+
+from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class EmbeddingCacheEntry(SQLModel, table=True):
+    """Embedding vector cached by content hash.
+
+    Identical text embedded with the same provider, model and dimensions always
+    yields the same vector, so entries never need invalidation. The composite key
+    keeps vectors from different models apart. Entries unused for
+    ``EMBEDDING_CACHE_TTL_DAYS`` are pruned by a scheduled task.
+    """
+
+    __tablename__ = "embedding_cache"
+
+    content_hash: str = Field(
+        primary_key=True,
+        max_length=64,
+        description="SHA-256 hex digest of the embedded text",
+    )
+    provider_type: str = Field(
+        primary_key=True,
+        max_length=20,
+        description="Embedding provider type (openai, ollama)",
+    )
+    model: str = Field(
+        primary_key=True,
+        max_length=100,
+        description="Embedding model name",
+    )
+    dimensions: int = Field(
+        primary_key=True,
+        description="Native model dimensions",
+    )
+    embedding: list[float] = Field(
+        sa_column=Column(Vector(1536), nullable=False),
+        description="Validated embedding vector as stored on entities (1536 dimensions)",
+    )
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+        description="When the entry was cached",
+    )
+    last_used_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), index=True),
+        description="When the entry was last stored or served (refreshed at most daily)",
+    )
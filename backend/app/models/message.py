@@ -3,14 +3,15 @@
 import uuid
 from datetime import datetime
 
-from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
-from sqlalchemy import Column, Text
+from sqlalchemy import Index, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
-from .base import TimestampMixin
+from .base import TimestampMixin, deferred_embedding, embedding_column
 from .enums import AnalysisStatus
 
+_embedding = embedding_column()
+
 
 class Message(TimestampMixin, SQLModel, table=True):
     """Message table - stores incoming messages from various sources.
@@ -21,6 +22,20 @@ class Message(TimestampMixin, SQLModel, table=True):
     """
 
     __tablename__ = "messages"
+    __mapper_args__ = deferred_embedding(_embedding)
+    __table_args__ = (
+        # Dedup key for ingestion (Telegram message ids are only unique per chat)
+        Index(
+            "uq_messages_source_channel_external",
+            "source_id",
+            "source_channel_id",
+            "external_message_id",
+            unique=True,
+            # Rows stored before the chat id was recorded have no channel
+            postgresql_where=text("source_channel_id IS NOT NULL"),
+            sqlite_where=text("source_channel_id IS NOT NULL"),
+        ),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -91,7 +106,7 @@ class Message(TimestampMixin, SQLModel, table=True):
 
     embedding: list[float] | None = Field(
         default=None,
-        sa_column=Column(Vector(1536)),
+        sa_column=_embedding,
         description="Vector embedding for semantic search (must match settings.embedding.openai_embedding_dimensions)",
     )
 
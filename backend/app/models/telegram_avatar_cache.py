@@ -0,0 +1,26 @@
+"""Persistent Telegram avatar URL cache model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+
+class TelegramAvatarCacheEntry(SQLModel, table=True):
+    """Resolved avatar URL per Telegram user, shared by API and worker processes.
+
+    ``avatar_url`` is None for users without a profile photo, so negative results
+    are cached too. Entries older than the resolver TTL are refreshed.
+    """
+
+    __tablename__ = "telegram_avatar_cache"
+
+    telegram_user_id: int = Field(
+        sa_column=Column(BigInteger, primary_key=True, autoincrement=False),
+        description="Telegram user ID",
+    )
+    avatar_url: str | None = Field(default=None, max_length=500, description="Bot API file URL of the avatar")
+    fetched_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="When the avatar was resolved via the Bot API",
+    )
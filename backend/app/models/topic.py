@@ -3,12 +3,11 @@
 import re
 import uuid
 
-from pgvector.sqlalchemy import Vector  # type: ignore[import-untyped]
 from pydantic import field_validator
-from sqlalchemy import Column, Text
+from sqlalchemy import Text
 from sqlmodel import Field, Relationship, SQLModel
 
-from .base import TimestampMixin
+from .base import TimestampMixin, deferred_embedding, embedding_column
 
 TOPIC_ICONS = {
     "shopping": "ShoppingCartIcon",
@@ -193,10 +192,14 @@ def auto_select_color(icon: str) -> str:
     return ICON_COLORS.get(icon, "#64748B")
 
 
+_embedding = embedding_column()
+
+
 class Topic(TimestampMixin, SQLModel, table=True):
     """Topic model for categorizing messages and tasks."""
 
     __tablename__ = "topics"
+    __mapper_args__ = deferred_embedding(_embedding)
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -226,7 +229,7 @@ class Topic(TimestampMixin, SQLModel, table=True):
     )
     embedding: list[float] | None = Field(
         default=None,
-        sa_column=Column(Vector(1536)),
+        sa_column=_embedding,
         description="Vector embedding for semantic search (1536 dimensions)",
     )
     is_active: bool = Field(
@@ -324,9 +327,11 @@ class TopicListResponse(SQLModel):
     """Paginated response schema for topics."""
 
     items: list[TopicPublic]
-    total: int
+    total: int | None = Field(description="Total topics (None with count=none)")
     page: int
     page_size: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = Field(default=None, description="Cursor for the next page (keyset pagination)")
 
 
 class RecentTopicItem(SQLModel):
@@ -0,0 +1,108 @@
+"""Hourly counters of messages not yet assigned to a topic."""
+
+from datetime import datetime
+
+from sqlalchemy import DDL, event
+from sqlmodel import Field, SQLModel
+
+from app.models.message import Message
+
+
+class UnprocessedMessageBucket(SQLModel, table=True):
+    """Number of messages without topic per hour of ``Message.sent_at``.
+
+    Maintained by database triggers on ``messages`` (insert, delete and
+    changes of ``topic_id``/``sent_at``), so every write path keeps it exact.
+    Buckets before the extraction lookback window are pruned periodically.
+    """
+
+    __tablename__ = "unprocessed_message_buckets"
+
+    bucket_start: datetime = Field(primary_key=True, description="Start of the hour (sent_at truncated)")
+    message_count: int = Field(default=0, description="Messages with topic_id IS NULL in this hour")
+
+
+# Insert and delete use statement-level triggers: one upsert per touched hour and
+# statement, rows in bucket order so concurrent writers lock buckets consistently.
+# Updates use a row-level trigger limited to topic_id/sent_at changes (PostgreSQL
+# does not allow column lists on triggers with transition tables), so the many
+# other message updates (status, analysis results, embeddings) never fire it.
+POSTGRES_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION track_unprocessed_messages() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        SELECT date_trunc('hour', sent_at), count(*) FROM new_rows
+        WHERE topic_id IS NULL GROUP BY 1 ORDER BY 1
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + EXCLUDED.message_count;
+    ELSE
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        SELECT date_trunc('hour', sent_at), -count(*) FROM old_rows
+        WHERE topic_id IS NULL GROUP BY 1 ORDER BY 1
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + EXCLUDED.message_count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+POSTGRES_UPDATE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION track_unprocessed_message_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF OLD.topic_id IS NULL THEN
+        UPDATE unprocessed_message_buckets SET message_count = message_count - 1
+        WHERE bucket_start = date_trunc('hour', OLD.sent_at);
+    END IF;
+    IF NEW.topic_id IS NULL THEN
+        INSERT INTO unprocessed_message_buckets (bucket_start, message_count)
+        VALUES (date_trunc('hour', NEW.sent_at), 1)
+        ON CONFLICT (bucket_start) DO UPDATE
+        SET message_count = unprocessed_message_buckets.message_count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+POSTGRES_TRIGGERS = (
+    "CREATE TRIGGER messages_unprocessed_insert AFTER INSERT ON messages "
+    "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION track_unprocessed_messages()",
+    "CREATE TRIGGER messages_unprocessed_update AFTER UPDATE OF topic_id, sent_at ON messages FOR EACH ROW "
+    "WHEN ((OLD.topic_id IS NULL OR NEW.topic_id IS NULL) "
+    "AND (OLD.topic_id IS DISTINCT FROM NEW.topic_id OR OLD.sent_at IS DISTINCT FROM NEW.sent_at)) "
+    "EXECUTE FUNCTION track_unprocessed_message_update()",
+    "CREATE TRIGGER messages_unprocessed_delete AFTER DELETE ON messages "
+    "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION track_unprocessed_messages()",
+)
+
+# SQLite (tests) only has row-level triggers; buckets use SQLAlchemy's datetime text format
+# ("%" is doubled because DDL statements go through %-formatting)
+_SQLITE_BUCKET = "strftime('%%Y-%%m-%%d %%H:00:00.000000', {row}.sent_at)"
+_SQLITE_ADD = (
+    "INSERT INTO unprocessed_message_buckets (bucket_start, message_count) "
+    "SELECT " + _SQLITE_BUCKET.format(row="NEW") + ", 1 WHERE NEW.topic_id IS NULL "
+    "ON CONFLICT (bucket_start) DO UPDATE SET message_count = message_count + 1;"
+)
+_SQLITE_REMOVE = (
+    "UPDATE unprocessed_message_buckets SET message_count = message_count - 1 "
+    "WHERE OLD.topic_id IS NULL AND bucket_start = " + _SQLITE_BUCKET.format(row="OLD") + ";"
+)
+SQLITE_TRIGGERS = (
+    f"CREATE TRIGGER messages_unprocessed_insert AFTER INSERT ON messages BEGIN {_SQLITE_ADD} END",
+    f"CREATE TRIGGER messages_unprocessed_update AFTER UPDATE OF topic_id, sent_at ON messages "
+    f"BEGIN {_SQLITE_REMOVE} {_SQLITE_ADD} END",
+    f"CREATE TRIGGER messages_unprocessed_delete AFTER DELETE ON messages BEGIN {_SQLITE_REMOVE} END",
+)
+
+# Tables created with metadata.create_all (tests, fresh dev databases) get the triggers too
+_messages_table = Message.__table__  # type: ignore[attr-defined]
+for _function in (POSTGRES_TRIGGER_FUNCTION, POSTGRES_UPDATE_TRIGGER_FUNCTION):
+    event.listen(_messages_table, "after_create", DDL(_function).execute_if(dialect="postgresql"))  # type: ignore[no-untyped-call]
+for _trigger in POSTGRES_TRIGGERS:
+    event.listen(_messages_table, "after_create", DDL(_trigger).execute_if(dialect="postgresql"))  # type: ignore[no-untyped-call]
+for _trigger in SQLITE_TRIGGERS:
+    event.listen(_messages_table, "after_create", DDL(_trigger).execute_if(dialect="sqlite"))  # type: ignore[no-untyped-call]
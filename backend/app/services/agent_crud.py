@@ -159,7 +159,9 @@ class AgentCRUD(BaseCRUD[AgentConfig]):
             if not provider:
                 raise ValueError(f"Provider with ID '{update_dict['provider_id']}' not found")
 
+        previous_name = agent.name
         updated_agent = await self.update(agent, update_dict)
+        self._invalidate_cached_agents(previous_name, updated_agent.name)
         return self._to_public(updated_agent)
 
     async def delete_agent(self, agent_id: UUID) -> bool:
@@ -176,4 +178,14 @@ class AgentCRUD(BaseCRUD[AgentConfig]):
             Running agent instances continue until task completion.
             Will cascade delete agent_task_assignments due to FK constraint.
         """
+        agent = await self.get(agent_id)
+        if agent:
+            self._invalidate_cached_agents(agent.name)
         return await self.delete(agent_id)
+
+    def _invalidate_cached_agents(self, *names: str) -> None:
+        """Drop cached LLM agents and settings for these agent names (this process)."""
+        from app.llm.application.agent_registry import agent_registry
+
+        for name in names:
+            agent_registry.invalidate_agent(name)
@@ -4,13 +4,16 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import UTC
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import desc
+from sqlalchemy import desc, inspect
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -27,6 +30,8 @@ from app.models.atom import (
 )
 from app.models.atom_version import AtomVersion
 from app.services.base_crud import BaseCRUD
+from app.services.pagination import CountMode, count_rows, encode_cursor, keyset_filter
+from app.services.semantic_search_service import vector_similarity
 
 if TYPE_CHECKING:
     from app.services.embedding_service import EmbeddingService
@@ -54,6 +59,16 @@ class DeduplicationResult:
     version_id: int | None = None
 
 
+@dataclass
+class AtomListPage:
+    """One page of list_atoms."""
+
+    items: list[AtomPublic]
+    total: int | None
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+
+
 class AtomCRUD(BaseCRUD[Atom]):
     """CRUD service for Atom operations.
 
@@ -69,16 +84,24 @@ class AtomCRUD(BaseCRUD[Atom]):
         """
         super().__init__(Atom, session)
 
-    def _to_public(self, atom: Atom, pending_versions_count: int = 0) -> AtomPublic:
+    async def create(self, obj_in: dict[str, Any]) -> Atom:
+        """Create atom, keeping the (deferred) embedding it was created with loaded."""
+        atom = await super().create(obj_in)
+        set_committed_value(atom, "embedding", obj_in.get("embedding"))
+        return atom
+
+    def _to_public(self, atom: Atom, pending_versions_count: int = 0, has_embedding: bool | None = None) -> AtomPublic:
         """Convert Atom model to AtomPublic schema.
 
         Args:
             atom: Database atom instance
             pending_versions_count: Number of unapproved versions
+            has_embedding: Embedding presence when the vector itself was not loaded (list queries)
 
         Returns:
             Public atom schema
         """
+        embedding = None if "embedding" in inspect(atom).unloaded else atom.embedding  # type: ignore[union-attr]
         return AtomPublic(
             id=str(atom.id),
             type=atom.type,
@@ -89,8 +112,8 @@ class AtomCRUD(BaseCRUD[Atom]):
             archived=atom.archived,
             archived_at=atom.archived_at,
             meta=atom.meta,
-            embedding=atom.embedding,
-            has_embedding=atom.embedding is not None,
+            embedding=embedding,
+            has_embedding=embedding is not None if has_embedding is None else has_embedding,
             pending_versions_count=pending_versions_count,
             detected_language=getattr(atom, "detected_language", None),
             created_at=atom.created_at,
@@ -106,7 +129,7 @@ class AtomCRUD(BaseCRUD[Atom]):
         Returns:
             AtomPublic or None if not found
         """
-        atom = await self.get(atom_id)
+        atom = await self.session.get(Atom, atom_id, options=[undefer(Atom.embedding)])  # type: ignore[arg-type]
         if not atom:
             return None
 
@@ -124,19 +147,25 @@ class AtomCRUD(BaseCRUD[Atom]):
         self,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[AtomPublic], int]:
-        """List atoms with pagination.
+        cursor: str | None = None,
+        count: CountMode = CountMode.exact,
+    ) -> AtomListPage:
+        """List atoms with pagination, newest first.
 
         Args:
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: next_cursor of the previous page for keyset pagination
+            count: How to compute the total
 
         Returns:
-            Tuple of (list of atoms, total count)
+            Page of atoms with total and next cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        count_query = select(func.count()).select_from(Atom)
-        count_result = await self.session.execute(count_query)
-        total = count_result.scalar_one()
+        after_cursor = keyset_filter(Atom.created_at, Atom.id, cursor) if cursor else None
+        total, total_is_estimate = await count_rows(self.session, select(Atom.id), count, table="atoms")
 
         # Subquery for pending versions count per atom
         pending_subq = (
@@ -151,16 +180,30 @@ class AtomCRUD(BaseCRUD[Atom]):
 
         # Main query with LEFT JOIN to get pending counts
         query = (
-            select(Atom, func.coalesce(pending_subq.c.pending_count, 0).label("pending_count"))
+            select(
+                Atom,
+                func.coalesce(pending_subq.c.pending_count, 0).label("pending_count"),
+                Atom.embedding.is_not(None).label("has_embedding"),  # type: ignore[union-attr]
+            )
             .outerjoin(pending_subq, Atom.id == pending_subq.c.atom_id)  # type: ignore[arg-type]
-            .offset(skip)
             .limit(limit)
-            .order_by(desc(Atom.created_at))  # type: ignore[arg-type]
+            .order_by(desc(Atom.created_at), desc(Atom.id))  # type: ignore[arg-type]
         )
+        query = query.where(after_cursor) if after_cursor is not None else query.offset(skip)
         result = await self.session.execute(query)
         rows = result.all()
 
-        return [self._to_public(row[0], pending_versions_count=row[1]) for row in rows], total
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return AtomListPage(
+            items=[self._to_public(row[0], pending_versions_count=row[1], has_embedding=row[2]) for row in rows],
+            total=total,
+            total_is_estimate=total_is_estimate,
+            next_cursor=next_cursor,
+        )
 
     async def create_atom(self, atom_data: AtomCreate) -> AtomPublic:
         """Create a new atom.
@@ -190,6 +233,7 @@ class AtomCRUD(BaseCRUD[Atom]):
 
         update_data = atom_data.model_dump(exclude_unset=True)
         updated_atom = await self.update(atom, update_data)
+        await self.session.refresh(updated_atom, ["embedding"])
         return self._to_public(updated_atom)
 
     async def link_to_topic(
@@ -249,7 +293,11 @@ class AtomCRUD(BaseCRUD[Atom]):
         )
 
         query = (
-            select(Atom, func.coalesce(pending_subq.c.pending_count, 0).label("pending_count"))
+            select(
+                Atom,
+                func.coalesce(pending_subq.c.pending_count, 0).label("pending_count"),
+                Atom.embedding.is_not(None).label("has_embedding"),  # type: ignore[union-attr]
+            )
             .join(TopicAtom, TopicAtom.atom_id == Atom.id)  # type: ignore[arg-type]
             .outerjoin(pending_subq, Atom.id == pending_subq.c.atom_id)  # type: ignore[arg-type]
             .where(TopicAtom.topic_id == topic_id)
@@ -259,7 +307,7 @@ class AtomCRUD(BaseCRUD[Atom]):
         result = await self.session.execute(query)
         rows = result.all()
 
-        return [self._to_public(row[0], pending_versions_count=row[1]) for row in rows]
+        return [self._to_public(row[0], pending_versions_count=row[1], has_embedding=row[2]) for row in rows]
 
     async def bulk_approve_atoms(self, atom_ids: list[str]) -> BulkApproveResponse:
         """Bulk approve multiple atoms in a single transaction.
@@ -613,3 +661,150 @@ class AtomCRUD(BaseCRUD[Atom]):
             action=DeduplicationAction.CREATED_NEW,
             atom=self._to_public(atom),
         )
+
+    async def create_many_with_dedup(
+        self,
+        atoms_data: Sequence[AtomCreate],
+        embedding_service: EmbeddingService,
+        search_service: SemanticSearchService,
+        threshold_high: float = 0.95,
+        threshold_mid: float = 0.85,
+        created_by: str | None = None,
+        embeddings: Sequence[list[float]] | None = None,
+    ) -> list[DeduplicationResult]:
+        """Batch version of create_with_dedup with the same thresholds and decisions.
+
+        All atoms are embedded in one provider call and their nearest existing
+        atoms resolved in one vector query. Atoms created earlier in the same
+        batch are compared in memory, as create_with_dedup called in a loop
+        would have found them in the database. New atoms are committed together;
+        versions are created afterwards in input order.
+
+        Args:
+            atoms_data: Atoms to create, in order
+            embedding_service: Service for generating embeddings
+            search_service: Service for semantic search
+            threshold_high: Similarity threshold for version creation (default: 0.95)
+            threshold_mid: Similarity threshold for similar_to reference (default: 0.85)
+            created_by: User identifier for version attribution
+            embeddings: Title and content vectors per atom, when the caller already has them
+
+        Returns:
+            One DeduplicationResult per input atom, in input order
+
+        Raises:
+            ValueError: If embedding generation fails
+            SQLAlchemyError: If database operation fails
+        """
+        from app.services.versioning_service import VersioningService
+
+        if not atoms_data:
+            return []
+
+        if embeddings is None:
+            texts = [f"{atom_data.title}\n\n{atom_data.content}" for atom_data in atoms_data]
+            try:
+                embeddings = await embedding_service.generate_embeddings(texts)
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings for deduplication: {e}")
+                raise ValueError(f"Embedding generation failed: {e}") from e
+
+        neighbours = await search_service.search_by_vectors(
+            self.session, "atoms a", embeddings, limit=5, threshold=threshold_mid
+        )
+
+        created: list[tuple[Atom, list[float]]] = []
+        # Per input: (action, atom created for it, similar atom id, similarity score)
+        decisions: list[tuple[DeduplicationAction, Atom | None, uuid.UUID | None, float | None]] = []
+        for atom_data, embedding, rows in zip(atoms_data, embeddings, neighbours, strict=True):
+            top_id: uuid.UUID | None = rows[0]["id"] if rows else None
+            top_score = float(rows[0]["similarity"]) if rows else 0.0
+            for atom, atom_embedding in created:
+                score = vector_similarity(embedding, atom_embedding)
+                if score >= threshold_mid and score > top_score:
+                    top_id, top_score = atom.id, score
+
+            if top_id is not None and top_score > threshold_high:
+                logger.info(
+                    f"High similarity ({top_score:.3f}) found with atom {top_id}. Creating version instead of new atom."
+                )
+                decisions.append((DeduplicationAction.CREATED_VERSION, None, top_id, top_score))
+                continue
+
+            atom_dict = atom_data.model_dump()
+            if top_id is not None and top_score > threshold_mid:
+                logger.info(
+                    f"Medium similarity ({top_score:.3f}) found with atom {top_id}. "
+                    f"Creating new atom with similar_to reference."
+                )
+                meta = atom_data.meta.copy() if atom_data.meta else {}
+                meta["similar_to"] = str(top_id)
+                meta["similarity_score"] = round(top_score, 4)
+                atom_dict["meta"] = meta
+                decision: tuple[DeduplicationAction, uuid.UUID | None, float | None] = (
+                    DeduplicationAction.CREATED_SIMILAR,
+                    top_id,
+                    top_score,
+                )
+            else:
+                logger.info("No similar atoms found. Creating new unique atom.")
+                decision = (DeduplicationAction.CREATED_NEW, None, None)
+
+            atom = Atom(**atom_dict, embedding=embedding)
+            created.append((atom, embedding))
+            decisions.append((decision[0], atom, decision[1], decision[2]))
+
+        if created:
+            self.session.add_all([atom for atom, _ in created])
+            await self.session.commit()
+            # Load server-side defaults (timestamps) without dropping the embeddings
+            await self.session.execute(
+                select(Atom)
+                .where(Atom.id.in_([atom.id for atom, _ in created]))  # type: ignore[attr-defined]
+                .execution_options(populate_existing=True)
+            )
+            for atom, embedding in created:
+                set_committed_value(atom, "embedding", embedding)
+
+        versioning_service = VersioningService()
+        results: list[DeduplicationResult] = []
+        for atom_data, (action, created_atom, similar_id, similarity) in zip(atoms_data, decisions, strict=True):
+            if created_atom is not None:
+                results.append(
+                    DeduplicationResult(
+                        action=action,
+                        atom=self._to_public(created_atom),
+                        similar_atom_id=similar_id,
+                        similarity_score=similarity,
+                    )
+                )
+                continue
+
+            assert similar_id is not None
+            version = await versioning_service.create_atom_version(
+                db=self.session,
+                atom_id=similar_id,  # type: ignore[arg-type]
+                data={
+                    "type": atom_data.type,
+                    "title": atom_data.title,
+                    "content": atom_data.content,
+                    "confidence": atom_data.confidence,
+                    "meta": atom_data.meta or {},
+                },
+                created_by=created_by or "deduplication",
+            )
+            atom_public = await self.get_atom(similar_id)
+            if atom_public is None:
+                raise ValueError(f"Atom {similar_id} not found after version creation")
+
+            results.append(
+                DeduplicationResult(
+                    action=action,
+                    atom=atom_public,
+                    similar_atom_id=similar_id,
+                    similarity_score=similarity,
+                    version_id=version.id,
+                )
+            )
+
+        return results
@@ -0,0 +1,290 @@
+"""Shared Telegram avatar resolution.
+
+Resolving an avatar takes two Bot API calls (``getUserProfilePhotos`` then
+``getFile``). Results are cached per Telegram user in two tiers:
+
+- In-process LRU (fast, per API/worker process)
+- Postgres ``telegram_avatar_cache`` table (shared across processes and restarts)
+
+Entries expire after ``settings.telegram.avatar_cache_ttl_seconds``; users
+without a profile photo are cached as None. Concurrent lookups for the same
+user share one Bot API round-trip, and requests go through a pooled HTTP client.
+
+Latency-sensitive callers (the webhook handler) use ``get_cached``, which never
+calls Telegram: it returns whatever is cached, even if stale, and refreshes
+missing or stale entries in the background. Workers use ``resolve``.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from core.config import settings
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.telegram_avatar_cache import TelegramAvatarCacheEntry
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+_PERSISTENT_FAILURE_BACKOFF_SECONDS = 60.0
+# Failed lookups (network/API errors) are retried after this many seconds
+_FAILURE_TTL_SECONDS = 60.0
+
+
+class AvatarResolver:
+    """Two-tier (LRU + Postgres) avatar URL cache with single-flight Bot API lookups.
+
+    Example:
+        >>> avatar_url = await resolver.resolve(telegram_user_id)
+        >>> avatar_url = await resolver.get_cached(telegram_user_id)  # never waits on Telegram
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        session_factory: Callable[[], AsyncSession] | None = None,
+    ):
+        """Initialize resolver.
+
+        Args:
+            bot_token: Telegram bot token
+            ttl_seconds: Seconds a resolved avatar stays fresh
+            max_entries: In-process LRU capacity
+            session_factory: Session factory for the persistent tier (None disables it)
+        """
+        self.bot_token = bot_token
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        # telegram_user_id -> (expires_at epoch seconds, avatar_url)
+        self._memory: OrderedDict[int, tuple[float, str | None]] = OrderedDict()
+        self._inflight: dict[int, asyncio.Task[str | None]] = {}
+        self._background: set[asyncio.Task[Any]] = set()
+        # Clients are bound to the event loop that created them
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._persistent_retry_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    async def resolve(self, telegram_user_id: int) -> str | None:
+        """Return a fresh avatar URL, fetching it from Telegram when needed.
+
+        Args:
+            telegram_user_id: Telegram user ID
+
+        Returns:
+            Avatar URL, or None if the user has no photo or lookup failed
+        """
+        if not telegram_user_id:
+            return None
+
+        found, fresh, avatar_url = await self._lookup(telegram_user_id)
+        if found and fresh:
+            self.hits += 1
+            return avatar_url
+
+        self.misses += 1
+        task = self._inflight.get(telegram_user_id)
+        if task is None:
+            task = asyncio.create_task(self._refresh(telegram_user_id))
+            self._inflight[telegram_user_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(telegram_user_id, None))
+        return await asyncio.shield(task)
+
+    async def get_cached(self, telegram_user_id: int) -> str | None:
+        """Return the cached avatar URL (possibly stale) without calling Telegram.
+
+        Missing or stale entries are refreshed in the background, so the next
+        lookup sees the new value.
+        """
+        if not telegram_user_id:
+            return None
+
+        found, fresh, avatar_url = await self._lookup(telegram_user_id)
+        if found:
+            self.hits += 1
+        if not fresh:
+            self.schedule_refresh(telegram_user_id)
+        return avatar_url
+
+    def schedule_refresh(self, telegram_user_id: int) -> None:
+        """Resolve an avatar in the background (no-op if already in flight)."""
+        if not telegram_user_id or telegram_user_id in self._inflight:
+            return
+        task = asyncio.create_task(self.resolve(telegram_user_id))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def clear(self) -> None:
+        """Drop in-process entries and reset counters (persistent tier untouched)."""
+        self._memory.clear()
+        self._inflight.clear()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """Return cache size and hit/miss/fetch counters."""
+        return {"entries": len(self._memory), "hits": self.hits, "misses": self.misses, "fetches": self.fetches}
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def _lookup(self, telegram_user_id: int) -> tuple[bool, bool, str | None]:
+        """Return (found, fresh, avatar_url), memory tier first, then the persistent tier."""
+        now = time.time()
+        cached = self._memory.get(telegram_user_id)
+        if cached is not None:
+            self._memory.move_to_end(telegram_user_id)
+            return True, cached[0] > now, cached[1]
+
+        entry = await self._load_persistent(telegram_user_id)
+        if entry is None:
+            return False, False, None
+
+        expires_at = _as_utc(entry.fetched_at).timestamp() + self.ttl_seconds
+        self._remember(telegram_user_id, expires_at, entry.avatar_url)
+        return True, expires_at > now, entry.avatar_url
+
+    async def _refresh(self, telegram_user_id: int) -> str | None:
+        try:
+            avatar_url = await self._fetch(telegram_user_id)
+        except Exception as e:
+            logger.warning(f"Failed to fetch avatar for Telegram user {telegram_user_id}: {e}")
+            self._remember(telegram_user_id, time.time() + _FAILURE_TTL_SECONDS, None)
+            return None
+
+        self._remember(telegram_user_id, time.time() + self.ttl_seconds, avatar_url)
+        await self._store_persistent(telegram_user_id, avatar_url)
+        return avatar_url
+
+    async def _fetch(self, telegram_user_id: int) -> str | None:
+        """Resolve avatar URL via Bot API (latest photo, biggest size)."""
+        self.fetches += 1
+        client = self._client()
+        api_base = f"{TELEGRAM_API_BASE}/bot{self.bot_token}"
+
+        photos_response = await client.post(
+            f"{api_base}/getUserProfilePhotos", json={"user_id": telegram_user_id, "limit": 1}
+        )
+        photos_response.raise_for_status()
+        photos_result = photos_response.json()
+        if not photos_result.get("ok"):
+            raise RuntimeError(photos_result.get("description", "unknown error"))
+
+        photos = photos_result.get("result", {}).get("photos", [])
+        if not photos:
+            return None
+
+        file_response = await client.post(f"{api_base}/getFile", json={"file_id": photos[0][-1]["file_id"]})
+        file_response.raise_for_status()
+        file_result = file_response.json()
+        if not file_result.get("ok"):
+            raise RuntimeError(file_result.get("description", "unknown error"))
+
+        file_path = file_result.get("result", {}).get("file_path")
+        if not file_path:
+            return None
+        return f"{TELEGRAM_API_BASE}/file/bot{self.bot_token}/{file_path}"
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+            self._clients[loop] = client
+        return client
+
+    def _remember(self, telegram_user_id: int, expires_at: float, avatar_url: str | None) -> None:
+        self._memory[telegram_user_id] = (expires_at, avatar_url)
+        self._memory.move_to_end(telegram_user_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _persistent_available(self) -> bool:
+        return self.session_factory is not None and time.monotonic() >= self._persistent_retry_at
+
+    def _persistent_failed(self, operation: str, error: Exception) -> None:
+        self._persistent_retry_at = time.monotonic() + _PERSISTENT_FAILURE_BACKOFF_SECONDS
+        logger.warning(
+            f"Avatar cache {operation} failed, skipping persistent tier for "
+            f"{_PERSISTENT_FAILURE_BACKOFF_SECONDS:.0f}s: {error}"
+        )
+
+    async def _load_persistent(self, telegram_user_id: int) -> TelegramAvatarCacheEntry | None:
+        if not self._persistent_available():
+            return None
+        assert self.session_factory is not None
+        try:
+            async with self.session_factory() as session:
+                return await session.get(TelegramAvatarCacheEntry, telegram_user_id)
+        except Exception as e:
+            self._persistent_failed("lookup", e)
+            return None
+
+    async def _store_persistent(self, telegram_user_id: int, avatar_url: str | None) -> None:
+        if not self._persistent_available():
+            return
+        assert self.session_factory is not None
+        values = {"telegram_user_id": telegram_user_id, "avatar_url": avatar_url, "fetched_at": datetime.now(UTC)}
+        try:
+            async with self.session_factory() as session:
+                insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+                stmt = insert(TelegramAvatarCacheEntry).values(values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["telegram_user_id"],
+                    set_={"avatar_url": stmt.excluded.avatar_url, "fetched_at": stmt.excluded.fetched_at},
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            self._persistent_failed("store", e)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+_avatar_resolver: AvatarResolver | None = None
+
+
+def get_avatar_resolver() -> AvatarResolver:
+    """Return the process-wide avatar resolver."""
+    global _avatar_resolver
+    if _avatar_resolver is None:
+        from app.database import AsyncSessionLocal
+
+        _avatar_resolver = AvatarResolver(
+            bot_token=settings.telegram.telegram_bot_token,
+            ttl_seconds=settings.telegram.avatar_cache_ttl_seconds,
+            session_factory=AsyncSessionLocal if settings.telegram.avatar_cache_persistent else None,
+        )
+    return _avatar_resolver
+
+
+async def close_avatar_resolver() -> None:
+    """Close the avatar resolver's HTTP client on API and worker shutdown."""
+    if _avatar_resolver is not None:
+        await _avatar_resolver.aclose()
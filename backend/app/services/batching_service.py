@@ -2,20 +2,46 @@
 
 Groups messages by channel and thread for better LLM extraction quality.
 Uses time-gap fallback when explicit threading is unavailable.
+
+``group_unprocessed_by_conversation`` computes the same conversation keys in
+the database with window functions, so large backlogs are grouped without
+loading messages; the Python functions remain for already loaded messages.
 """
 
 import uuid
 from collections import defaultdict
 from datetime import datetime
-from typing import Sequence
+from typing import Any, Protocol, Sequence
 
 from loguru import logger
+from sqlalchemy import Row, String, and_, case, cast, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.ai_config import ai_config
 from app.models import Message
 
 
-def group_messages_by_conversation(messages: Sequence[Message]) -> dict[str, list[Message]]:
+class BatchMessage(Protocol):
+    """Columns needed to select conversations for a batch."""
+
+    @property
+    def id(self) -> uuid.UUID: ...
+
+    @property
+    def sent_at(self) -> datetime: ...
+
+
+class ConversationMessage(BatchMessage, Protocol):
+    """Columns needed for conversation grouping (Message or a loaded row)."""
+
+    @property
+    def source_channel_id(self) -> str | None: ...
+
+    @property
+    def source_thread_id(self) -> str | None: ...
+
+
+def group_messages_by_conversation[M: ConversationMessage](messages: Sequence[M]) -> dict[str, list[M]]:
     """Group messages by channel+thread with time-gap fallback.
 
     Strategy:
@@ -24,7 +50,7 @@ def group_messages_by_conversation(messages: Sequence[Message]) -> dict[str, lis
     3. Else → put in "ungrouped" bucket
 
     Args:
-        messages: Sequence of Message objects to group
+        messages: Sequence of Message objects (or rows with the same columns) to group
 
     Returns:
         Dictionary mapping conversation keys to message lists.
@@ -33,7 +59,7 @@ def group_messages_by_conversation(messages: Sequence[Message]) -> dict[str, lis
     if not messages:
         return {}
 
-    groups: dict[str, list[Message]] = defaultdict(list)
+    groups: dict[str, list[M]] = defaultdict(list)
 
     # Track last message time per channel for time-gap detection
     channel_last_time: dict[str, datetime] = {}
@@ -81,8 +107,8 @@ def group_messages_by_conversation(messages: Sequence[Message]) -> dict[str, lis
     return dict(groups)
 
 
-def select_conversations_for_batch(
-    grouped: dict[str, list[Message]],
+def select_conversations_for_batch[M: BatchMessage](
+    grouped: dict[str, list[M]],
     max_size: int,
 ) -> list[uuid.UUID]:
     """Select complete conversations for batch processing.
@@ -91,7 +117,7 @@ def select_conversations_for_batch(
     Keeps conversations together (doesn't split threads).
 
     Args:
-        grouped: Dictionary from group_messages_by_conversation()
+        grouped: Dictionary from group_messages_by_conversation() or group_unprocessed_by_conversation()
         max_size: Maximum number of messages in batch
 
     Returns:
@@ -136,6 +162,70 @@ def select_conversations_for_batch(
     return batch_ids
 
 
+def _seconds_between(later: Any, earlier: Any, dialect: str) -> Any:
+    if dialect == "sqlite":
+        return (func.julianday(later) - func.julianday(earlier)) * 86400
+    return func.extract("epoch", later - earlier)
+
+
+async def group_unprocessed_by_conversation(db: AsyncSession, since: datetime) -> dict[str, list[Row]]:
+    """Group unprocessed messages by conversation inside the database.
+
+    Same keys as group_messages_by_conversation(): LAG(sent_at) per channel
+    marks time gaps among messages without thread, a running sum numbers the
+    gaps. Only (id, conversation_key, sent_at) rows are transferred.
+
+    Args:
+        db: Database session
+        since: Only messages without topic sent at or after this time
+
+    Returns:
+        Dictionary mapping conversation keys to rows ordered by sent_at,
+        ready for select_conversations_for_batch()
+    """
+    channel = Message.source_channel_id
+    thread = Message.source_thread_id
+    kind = case(
+        (and_(thread.is_not(None), thread != ""), "thread"),  # type: ignore[union-attr, arg-type]
+        (and_(channel.is_not(None), channel != ""), "timegap"),  # type: ignore[union-attr, arg-type]
+        else_="ungrouped",
+    ).label("kind")
+
+    prev_sent_at = func.lag(Message.sent_at).over(partition_by=(channel, kind), order_by=Message.sent_at)  # type: ignore[arg-type]
+    ordered = (
+        select(Message.id, Message.sent_at, channel, thread, kind, prev_sent_at.label("prev_sent_at"))  # type: ignore[call-overload]
+        .where(Message.topic_id.is_(None), Message.sent_at >= since)  # type: ignore[union-attr]
+        .subquery()
+    )
+    gap_seconds = _seconds_between(ordered.c.sent_at, ordered.c.prev_sent_at, db.bind.dialect.name)
+    new_gap = case((gap_seconds > ai_config.analysis.time_gap_seconds, 1), else_=0)
+    gap_num = func.sum(new_gap).over(
+        partition_by=(ordered.c.source_channel_id, ordered.c.kind), order_by=ordered.c.sent_at
+    )
+    numbered = select(ordered, gap_num.label("gap_num")).subquery()
+
+    thread_channel = func.coalesce(func.nullif(numbered.c.source_channel_id, ""), "default")
+    conversation_key = case(
+        (numbered.c.kind == "thread", thread_channel + literal(":") + numbered.c.source_thread_id),
+        (
+            numbered.c.kind == "timegap",
+            numbered.c.source_channel_id + literal(":timegap_") + cast(numbered.c.gap_num, String),
+        ),
+        else_=literal("ungrouped"),
+    ).label("conversation_key")
+
+    result = await db.execute(
+        select(numbered.c.id, conversation_key, numbered.c.sent_at).order_by(numbered.c.sent_at, numbered.c.id)
+    )
+
+    groups: dict[str, list[Row]] = defaultdict(list)
+    for row in result:
+        groups[row.conversation_key].append(row)
+
+    logger.info(f"Grouped {sum(len(v) for v in groups.values())} messages into {len(groups)} conversations in SQL")
+    return dict(groups)
+
+
 def get_thread_statistics(messages: Sequence[Message]) -> dict[str, int]:
     """Get statistics about threading in a message set.
 
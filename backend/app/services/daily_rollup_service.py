@@ -0,0 +1,330 @@
+"""Incrementally maintained daily rollups for dashboard metrics.
+
+``message_daily_stats`` and ``atom_daily_stats`` hold per-day counts for every
+day before a watermark (``DailyRollupState.covered_until``). Readers combine the
+rollup for whole covered days with a live aggregation of the remaining rows
+(partial boundary days and everything since the watermark), so results stay
+exact while the amount of raw data scanned per request stays bounded.
+
+``refresh`` advances the watermark to today and rebuilds covered days whose
+source rows changed since the previous refresh (detected via ``updated_at``).
+"""
+
+import logging
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, NamedTuple
+
+from sqlalchemy import Date, and_, delete, func, insert, or_, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.selectable import Select, Subquery
+
+from app.models.atom import Atom
+from app.models.daily_stats import AtomDailyStats, DailyRollupState, MessageDailyStats
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_ROLLUP = "message_daily_stats"
+ATOM_ROLLUP = "atom_daily_stats"
+ROLLUPS = (MESSAGE_ROLLUP, ATOM_ROLLUP)
+
+# Rows committed while a refresh runs may carry updated_at slightly before its start
+_DIRTY_OVERLAP = timedelta(minutes=5)
+
+
+class utc_day(FunctionElement[date]):
+    """UTC calendar day of a timestamp column (dialect-aware)."""
+
+    type = Date()
+    name = "utc_day"
+    inherit_cache = True
+
+
+@compiles(utc_day)
+def _compile_utc_day(element: utc_day, compiler: Any, **kw: Any) -> str:
+    return f"date({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(utc_day, "postgresql")
+def _compile_utc_day_postgresql(element: utc_day, compiler: Any, **kw: Any) -> str:
+    column = list(element.clauses)[0]
+    expr = compiler.process(element.clauses, **kw)
+    if getattr(column.type, "timezone", False):
+        return f"CAST(timezone('UTC', {expr}) AS DATE)"
+    return f"CAST({expr} AS DATE)"
+
+
+class RollupSplit(NamedTuple):
+    """A time range split into whole rollup days and raw (live) spans."""
+
+    rollup_start: date | None
+    rollup_end: date | None
+    raw_spans: list[tuple[datetime, datetime | None]]
+
+
+def _midnight(day: date, like: datetime | None = None) -> datetime:
+    """Midnight of ``day``, tz-aware only if ``like`` is."""
+    return datetime.combine(day, time.min, tzinfo=like.tzinfo if like else None)
+
+
+def split_period(start: datetime, end: datetime | None, covered_until: date | None) -> RollupSplit:
+    """Split ``[start, end)`` into rollup-covered whole days and raw spans.
+
+    Args:
+        start: Inclusive range start (UTC, naive or aware)
+        end: Exclusive range end (None = unbounded)
+        covered_until: First day not covered by the rollup (None = no rollup yet)
+
+    Returns:
+        RollupSplit with the rollup day range ``[rollup_start, rollup_end)`` and
+        the raw timestamp spans that must be aggregated live
+
+    Example:
+        >>> split_period(datetime(2025, 1, 1, 12), None, date(2025, 1, 5))
+        RollupSplit(rollup_start=date(2025, 1, 2), rollup_end=date(2025, 1, 5), raw_spans=[...])
+    """
+    first_full_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    rollup_end = covered_until
+    if rollup_end is not None and end is not None:
+        rollup_end = min(rollup_end, end.date())
+
+    if rollup_end is None or first_full_day >= rollup_end:
+        return RollupSplit(None, None, [(start, end)])
+
+    spans: list[tuple[datetime, datetime | None]] = []
+    head_end = _midnight(first_full_day, start)
+    if start < head_end:
+        spans.append((start, head_end))
+    tail_start = _midnight(rollup_end, start)
+    if end is None or tail_start < end:
+        spans.append((tail_start, end))
+    return RollupSplit(first_full_day, rollup_end, spans)
+
+
+def _span_condition(column: Any, spans: list[tuple[datetime, datetime | None]]) -> ColumnElement[bool]:
+    conditions = [and_(column >= start, column < end) if end is not None else column >= start for start, end in spans]
+    return or_(*conditions)
+
+
+def message_stats_source(split: RollupSplit) -> Subquery:
+    """Message counts as (day, source_id, topic_id, noise_classification, message_count) rows.
+
+    Combines rollup rows for covered days with live aggregation of raw spans.
+    """
+    parts: list[Select[Any]] = []
+    if split.rollup_start is not None:
+        parts.append(
+            select(  # type: ignore[call-overload]
+                MessageDailyStats.day,
+                MessageDailyStats.source_id,
+                MessageDailyStats.topic_id,
+                MessageDailyStats.noise_classification,
+                MessageDailyStats.message_count,
+            ).where(
+                MessageDailyStats.day >= split.rollup_start,
+                MessageDailyStats.day < split.rollup_end,  # type: ignore[operator]
+            )
+        )
+    if split.raw_spans:
+        day = utc_day(Message.sent_at)
+        parts.append(
+            select(  # type: ignore[call-overload]
+                day.label("day"),
+                Message.source_id,
+                Message.topic_id,
+                Message.noise_classification,
+                func.count().label("message_count"),
+            )
+            .where(_span_condition(Message.sent_at, split.raw_spans))
+            .group_by(day, Message.source_id, Message.topic_id, Message.noise_classification)
+        )
+    return (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("message_stats")
+
+
+def atom_stats_source(split: RollupSplit) -> Subquery:
+    """Atom counts as (day, type, user_approved, archived, atom_count) rows.
+
+    Combines rollup rows for covered days with live aggregation of raw spans.
+    """
+    parts: list[Select[Any]] = []
+    if split.rollup_start is not None:
+        parts.append(
+            select(  # type: ignore[call-overload]
+                AtomDailyStats.day,
+                AtomDailyStats.type,
+                AtomDailyStats.user_approved,
+                AtomDailyStats.archived,
+                AtomDailyStats.atom_count,
+            ).where(
+                AtomDailyStats.day >= split.rollup_start,
+                AtomDailyStats.day < split.rollup_end,  # type: ignore[operator]
+            )
+        )
+    if split.raw_spans:
+        day = utc_day(Atom.created_at)
+        parts.append(
+            select(  # type: ignore[call-overload]
+                day.label("day"),
+                Atom.type,
+                Atom.user_approved,
+                Atom.archived,
+                func.count().label("atom_count"),
+            )
+            .where(_span_condition(Atom.created_at, split.raw_spans))
+            .group_by(day, Atom.type, Atom.user_approved, Atom.archived)
+        )
+    return (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("atom_stats")
+
+
+def _day_ranges(days: set[date]) -> list[tuple[date, date]]:
+    """Collapse days into sorted half-open ``[start, end)`` ranges of consecutive days."""
+    ranges: list[tuple[date, date]] = []
+    for day in sorted(days):
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], day + timedelta(days=1))
+        else:
+            ranges.append((day, day + timedelta(days=1)))
+    return ranges
+
+
+class DailyRollupService:
+    """Maintains and exposes the daily rollup tables.
+
+    Example:
+        >>> service = DailyRollupService(session)
+        >>> await service.refresh()
+        {'message_daily_stats': 3, 'atom_daily_stats': 3}
+        >>> covered = await service.get_covered_until()
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Initialize rollup service.
+
+        Args:
+            session: Async database session
+        """
+        self.session = session
+
+    async def get_covered_until(self) -> dict[str, date | None]:
+        """Return the rollup watermark per rollup table (None = not built yet)."""
+        result = await self.session.execute(select(DailyRollupState.name, DailyRollupState.covered_until))  # type: ignore[call-overload]
+        covered: dict[str, date | None] = dict.fromkeys(ROLLUPS)
+        for name, covered_until in result.all():
+            covered[name] = covered_until
+        return covered
+
+    async def refresh(self, today: date | None = None) -> dict[str, int]:
+        """Bring rollups up to date and commit.
+
+        First run builds every day before ``today``. Later runs rebuild the days
+        between the previous watermark and ``today`` plus older days whose rows
+        were inserted or updated since the previous refresh.
+
+        Args:
+            today: First day to leave uncovered (default: current UTC day)
+
+        Returns:
+            Number of rebuilt days per rollup table
+        """
+        today = today or datetime.now(UTC).date()
+        started_at = datetime.now(UTC)
+
+        if self.session.bind.dialect.name == "postgresql":
+            # Serialize concurrent refreshes (released on commit)
+            await self.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('daily_rollups'))"))
+
+        rebuilt: dict[str, int] = {}
+        for name in ROLLUPS:
+            state = await self.session.get(DailyRollupState, name)
+            if state is None:
+                state = DailyRollupState(name=name)
+                self.session.add(state)
+
+            if state.covered_until is None or state.refreshed_at is None:
+                await self._rebuild(name, None, today)
+                rebuilt[name] = -1
+            else:
+                days = await self._dirty_days(name, state.refreshed_at, state.covered_until)
+                day = state.covered_until
+                while day < today:
+                    days.add(day)
+                    day += timedelta(days=1)
+                await self._rebuild(name, days, today)
+                rebuilt[name] = len(days)
+
+            state.covered_until = today
+            state.refreshed_at = started_at - _DIRTY_OVERLAP
+
+        await self.session.commit()
+        logger.info(f"Daily rollups refreshed up to {today}: {rebuilt}")
+        return rebuilt
+
+    async def reset(self, name: str) -> None:
+        """Drop a rollup and its watermark so readers fall back to live aggregation.
+
+        Used after bulk deletes that ``updated_at`` tracking cannot see. Does not commit.
+        """
+        table = MessageDailyStats if name == MESSAGE_ROLLUP else AtomDailyStats
+        await self.session.execute(delete(table))
+        await self.session.execute(delete(DailyRollupState).where(DailyRollupState.name == name))  # type: ignore[arg-type]
+
+    async def _dirty_days(self, name: str, since: datetime, covered_until: date) -> set[date]:
+        """Covered days with source rows inserted, updated or deleted after ``since``."""
+        model: Any = Message if name == MESSAGE_ROLLUP else Atom
+        column = model.sent_at if name == MESSAGE_ROLLUP else model.created_at
+        day = utc_day(column)
+        query = select(day).where(model.updated_at >= since, column < _midnight(covered_until)).distinct()
+        days = set((await self.session.execute(query)).scalars())
+
+        if name == ATOM_ROLLUP:
+            # Atoms can be deleted individually; compare per-day totals to catch that.
+            # Messages are only deleted by data wipe, which resets the rollup instead.
+            live = await self.session.execute(
+                select(day, func.count()).where(column < _midnight(covered_until)).group_by(day)
+            )
+            rolled = await self.session.execute(
+                select(AtomDailyStats.day, func.sum(AtomDailyStats.atom_count)).group_by(AtomDailyStats.day)  # type: ignore[call-overload]
+            )
+            live_counts = dict(live.tuples().all())
+            rolled_counts = dict(rolled.tuples().all())
+            days |= {d for d in live_counts.keys() | rolled_counts.keys() if live_counts.get(d) != rolled_counts.get(d)}
+        return days
+
+    async def _rebuild(self, name: str, days: set[date] | None, today: date) -> None:
+        """Replace rollup rows for ``days`` (None = every day before ``today``)."""
+        if days is not None and not days:
+            return
+
+        if name == MESSAGE_ROLLUP:
+            table: Any = MessageDailyStats
+            column: Any = Message.sent_at
+            day = utc_day(column)
+            aggregate = select(  # type: ignore[call-overload]
+                day, Message.source_id, Message.topic_id, Message.noise_classification, func.count()
+            ).group_by(day, Message.source_id, Message.topic_id, Message.noise_classification)
+            columns = ["day", "source_id", "topic_id", "noise_classification", "message_count"]
+        else:
+            table = AtomDailyStats
+            column = Atom.created_at
+            day = utc_day(column)
+            aggregate = select(day, Atom.type, Atom.user_approved, Atom.archived, func.count()).group_by(  # type: ignore[call-overload]
+                day, Atom.type, Atom.user_approved, Atom.archived
+            )
+            columns = ["day", "type", "user_approved", "archived", "atom_count"]
+
+        aggregate = aggregate.where(column < _midnight(today))
+        if days is None:
+            await self.session.execute(delete(table))
+        else:
+            ranges = _day_ranges(days)
+            await self.session.execute(
+                delete(table).where(or_(*[and_(table.day >= start, table.day < end) for start, end in ranges]))
+            )
+            aggregate = aggregate.where(
+                _span_condition(column, [(_midnight(start), _midnight(end)) for start, end in ranges])
+            )
+
+        await self.session.execute(insert(table).from_select(columns, aggregate))
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from datetime import datetime, time, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select
+from sqlalchemy.sql.elements import ColumnElement
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.schemas.dashboard import (
@@ -18,9 +20,19 @@ from app.api.v1.schemas.dashboard import (
     TrendItem,
     TrendsResponse,
 )
-from app.models.atom import Atom
 from app.models.message import Message
 from app.models.topic import Topic
+from app.services.daily_rollup_service import (
+    ATOM_ROLLUP,
+    MESSAGE_ROLLUP,
+    DailyRollupService,
+    RollupSplit,
+    atom_stats_source,
+    message_stats_source,
+    split_period,
+)
+
+NOISE_CLASSIFICATIONS = ("noise", "spam", "low_quality")
 
 
 class DashboardService:
@@ -28,6 +40,11 @@ class DashboardService:
 
     Provides aggregated statistics for messages, atoms, and topics
     with auto-detection of period (today/yesterday) and trend calculation.
+
+    All aggregates are computed in SQL (``SUM(...) FILTER (...)``, ``GROUP BY``);
+    current and previous periods share one query per entity. Whole past days are
+    read from the daily rollup tables, the rest is aggregated live (see
+    ``daily_rollup_service``).
     """
 
     def __init__(self, session: AsyncSession):
@@ -72,16 +89,13 @@ class DashboardService:
             prev_end = yesterday_start
             period_label = "Дані за вчора"
 
-        messages = await self._get_message_stats(period_start, period_end)
-        atoms = await self._get_atom_stats(period_start, period_end)
+        messages, prev_messages_total = await self._get_message_stats(period_start, period_end, prev_start, prev_end)
+        atoms, prev_atoms_total = await self._get_atom_stats(period_start, period_end, prev_start, prev_end)
         topics = await self._get_topic_stats(period_start, period_end)
 
-        prev_messages = await self._get_message_stats(prev_start, prev_end)
-        prev_atoms = await self._get_atom_stats(prev_start, prev_end)
-
         trends = {
-            "messages": self._calculate_trend(messages.total, prev_messages.total),
-            "atoms": self._calculate_trend(atoms.total, prev_atoms.total),
+            "messages": self._calculate_trend(messages.total, prev_messages_total),
+            "atoms": self._calculate_trend(atoms.total, prev_atoms_total),
         }
 
         return DashboardMetricsResponse(
@@ -105,73 +119,95 @@ class DashboardService:
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def _split(self, rollup: str, start: datetime, end: datetime | None) -> RollupSplit:
+        """Split a range into rollup-covered days and live spans for ``rollup``."""
+        covered = await DailyRollupService(self.session).get_covered_until()
+        return split_period(start, end, covered[rollup])
+
+    @staticmethod
+    def _in_days(day: Any, start: datetime, end: datetime | None = None) -> ColumnElement[bool]:
+        """Condition on a rollup ``day`` column for the days overlapping ``[start, end)``."""
+        condition: ColumnElement[bool] = day >= start.date()
+        if end is None:
+            return condition
+        last_day = end.date() if end.time() == time.min else end.date() + timedelta(days=1)
+        return and_(condition, day < last_day)
+
     async def _get_message_stats(
-        self, start: datetime, end: datetime
-    ) -> MessageStats:
-        """Get message statistics for a period."""
-        base_query = select(Message).where(
-            Message.sent_at >= start,  # type: ignore[arg-type]
-            Message.sent_at < end,  # type: ignore[arg-type]
-        )
-        result = await self.session.execute(base_query)
-        messages = result.scalars().all()
+        self, start: datetime, end: datetime, prev_start: datetime, prev_end: datetime
+    ) -> tuple[MessageStats, int]:
+        """Get message statistics for a period plus the previous period total.
 
-        total = len(messages)
-        signal_count = sum(1 for m in messages if m.noise_classification == "signal")
-        noise_count = sum(1 for m in messages if m.noise_classification in ("noise", "spam", "low_quality"))
+        Returns:
+            Tuple of (stats for [start, end), message count for [prev_start, prev_end))
+        """
+        source = message_stats_source(await self._split(MESSAGE_ROLLUP, min(start, prev_start), max(end, prev_end)))
+        in_period = self._in_days(source.c.day, start, end)
+        count = source.c.message_count
+        query = select(
+            func.sum(count).filter(in_period).label("total"),
+            func.sum(count).filter(in_period, source.c.noise_classification == "signal").label("signal"),
+            func.sum(count)
+            .filter(in_period, source.c.noise_classification.in_(NOISE_CLASSIFICATIONS))
+            .label("noise"),
+            func.sum(count).filter(self._in_days(source.c.day, prev_start, prev_end)).label("prev_total"),
+        )
+        row = (await self.session.execute(query)).one()
 
-        return MessageStats(
+        total = row.total or 0
+        signal_count = row.signal or 0
+        stats = MessageStats(
             total=total,
             signal_count=signal_count,
-            noise_count=noise_count,
+            noise_count=row.noise or 0,
             signal_ratio=signal_count / total if total > 0 else 0.0,
         )
+        return stats, row.prev_total or 0
 
-    async def _get_atom_stats(self, start: datetime, end: datetime) -> AtomStats:
-        """Get atom statistics for a period."""
-        base_query = select(Atom).where(
-            Atom.created_at >= start,  # type: ignore[operator,arg-type]
-            Atom.created_at < end,  # type: ignore[operator,arg-type]
-        )
-        result = await self.session.execute(base_query)
-        atoms = result.scalars().all()
-
-        total = len(atoms)
-        approved = sum(1 for a in atoms if a.user_approved)
-        pending_review = sum(1 for a in atoms if not a.user_approved and not a.archived)
+    async def _get_atom_stats(
+        self, start: datetime, end: datetime, prev_start: datetime, prev_end: datetime
+    ) -> tuple[AtomStats, int]:
+        """Get atom statistics for a period plus the previous period total.
 
-        by_type: dict[str, int] = {}
-        for atom in atoms:
-            by_type[atom.type] = by_type.get(atom.type, 0) + 1
-
-        return AtomStats(
-            total=total,
-            pending_review=pending_review,
-            approved=approved,
-            by_type=by_type,
+        Returns:
+            Tuple of (stats for [start, end), atom count for [prev_start, prev_end))
+        """
+        source = atom_stats_source(await self._split(ATOM_ROLLUP, min(start, prev_start), max(end, prev_end)))
+        in_period = self._in_days(source.c.day, start, end)
+        count = source.c.atom_count
+        query = select(
+            source.c.type,
+            func.sum(count).filter(in_period).label("total"),
+            func.sum(count).filter(in_period, source.c.user_approved.is_(True)).label("approved"),
+            func.sum(count)
+            .filter(in_period, source.c.user_approved.is_not(True), source.c.archived.is_not(True))
+            .label("pending_review"),
+            func.sum(count).filter(self._in_days(source.c.day, prev_start, prev_end)).label("prev_total"),
+        ).group_by(source.c.type)
+        rows = (await self.session.execute(query)).all()
+
+        stats = AtomStats(
+            total=sum(row.total or 0 for row in rows),
+            pending_review=sum(row.pending_review or 0 for row in rows),
+            approved=sum(row.approved or 0 for row in rows),
+            by_type={row.type: row.total for row in rows if row.total},
         )
+        return stats, sum(row.prev_total or 0 for row in rows)
 
     async def _get_topic_stats(self, start: datetime, end: datetime) -> TopicStats:
         """Get topic statistics."""
-        total_query = select(func.count()).select_from(Topic)
-        total_result = await self.session.execute(total_query)
-        total = total_result.scalar() or 0
-
+        source = message_stats_source(await self._split(MESSAGE_ROLLUP, start, end))
+        total_query = select(func.count()).select_from(Topic).scalar_subquery()
         active_query = (
-            select(func.count(func.distinct(Message.topic_id)))
-            .select_from(Message)
-            .where(
-                Message.sent_at >= start,  # type: ignore[arg-type]
-                Message.sent_at < end,  # type: ignore[arg-type]
-                Message.topic_id.isnot(None),  # type: ignore[union-attr]
-            )
+            select(func.count(func.distinct(source.c.topic_id)))
+            .where(source.c.topic_id.isnot(None))
+            .scalar_subquery()
         )
-        active_result = await self.session.execute(active_query)
-        active_today = active_result.scalar() or 0
+        row = (await self.session.execute(select(total_query.label("total"), active_query.label("active")))).one()
 
         return TopicStats(
-            total=total,
-            active_today=active_today,
+            total=row.total or 0,
+            active_today=row.active or 0,
         )
 
     def _calculate_trend(self, current: int, previous: int) -> TrendData:
@@ -223,53 +259,30 @@ class DashboardService:
             prev_start = period_start - timedelta(days=30)
             prev_end = period_start
 
-        # Get topics with message counts for current period
-        topics_query = select(Topic).limit(limit * 2)
-        topics_result = await self.session.execute(topics_query)
-        topics = topics_result.scalars().all()
-
-        # Count messages per topic for current period
-        current_counts: dict[str, int] = {}
-        prev_counts: dict[str, int] = {}
-
-        for topic in topics:
-            # Current period count
-            curr_query = (
-                select(func.count())
-                .select_from(Message)
-                .where(
-                    Message.topic_id == topic.id,
-                    Message.sent_at >= period_start,  # type: ignore[arg-type]
-                )
-            )
-            curr_result = await self.session.execute(curr_query)
-            current_counts[topic.name] = curr_result.scalar() or 0
-
-            # Previous period count
-            prev_query = (
-                select(func.count())
-                .select_from(Message)
-                .where(
-                    Message.topic_id == topic.id,
-                    Message.sent_at >= prev_start,  # type: ignore[arg-type]
-                    Message.sent_at < prev_end,  # type: ignore[arg-type]
-                )
+        # Count messages per topic for both periods in one grouped pass, ranked over all topics
+        source = message_stats_source(await self._split(MESSAGE_ROLLUP, min(period_start, prev_start), None))
+        current_count = func.sum(source.c.message_count).filter(self._in_days(source.c.day, period_start))
+        prev_count = func.sum(source.c.message_count).filter(self._in_days(source.c.day, prev_start, prev_end))
+        counts = (
+            select(
+                source.c.topic_id,
+                current_count.label("count"),
+                func.coalesce(prev_count, 0).label("prev_count"),
             )
-            prev_result = await self.session.execute(prev_query)
-            prev_counts[topic.name] = prev_result.scalar() or 0
-
-        # Build trends list sorted by count
-        trends_data = [
-            (name, count, count - prev_counts.get(name, 0))
-            for name, count in current_counts.items()
-            if count > 0
-        ]
-        trends_data.sort(key=lambda x: x[1], reverse=True)
-
-        trends = [
-            TrendItem(keyword=name, count=count, delta=delta)
-            for name, count, delta in trends_data[:limit]
-        ]
+            .where(source.c.topic_id.isnot(None))
+            .group_by(source.c.topic_id)
+            .having(current_count > 0)
+            .subquery("topic_counts")
+        )
+        query = (
+            select(Topic.name, counts.c.count, counts.c.prev_count)  # type: ignore[call-overload]
+            .join(counts, counts.c.topic_id == Topic.id)
+            .order_by(counts.c.count.desc(), Topic.name)
+            .limit(limit)
+        )
+        rows = (await self.session.execute(query)).all()
+
+        trends = [TrendItem(keyword=name, count=count, delta=count - prev_count) for name, count, prev_count in rows]
 
         return TrendsResponse(
             trends=trends,
@@ -289,34 +302,24 @@ class DashboardService:
         today_start = datetime.combine(now.date(), time.min)
         period_start = today_start - timedelta(days=days - 1)
 
-        # Query messages grouped by date and noise_classification
-        day_col = func.date(Message.sent_at).label("day")
-        count_col = func.count().label("cnt")
-        query = (
-            select(day_col, Message.noise_classification, count_col)  # type: ignore[call-overload]
-            .where(Message.sent_at >= period_start)
-            .group_by(day_col, Message.noise_classification)
-        )
+        # Query signal/noise counts grouped by date (one row per day)
+        source = message_stats_source(await self._split(MESSAGE_ROLLUP, period_start, None))
+        query = select(
+            source.c.day,
+            func.sum(source.c.message_count).filter(source.c.noise_classification == "signal").label("signal"),
+            func.sum(source.c.message_count)
+            .filter(source.c.noise_classification.in_(NOISE_CLASSIFICATIONS))
+            .label("noise"),
+        ).group_by(source.c.day)
         result = await self.session.execute(query)
-        rows = result.all()
 
-        # Aggregate by date
         date_counts: dict[str, dict[str, int]] = {}
-        for row in rows:
-            day_str = row.day.isoformat() if row.day else None
-            if day_str is None:
+        for row in result.all():
+            if row.day is None:
                 continue
-
-            if day_str not in date_counts:
-                date_counts[day_str] = {"signal": 0, "noise": 0}
-
-            classification = row.noise_classification
-            count = row.cnt or 0
-
-            if classification == "signal":
-                date_counts[day_str]["signal"] += count
-            elif classification in ("noise", "spam", "low_quality"):
-                date_counts[day_str]["noise"] += count
+            # SQLite returns DATE() as text, PostgreSQL as date
+            day_str = row.day if isinstance(row.day, str) else row.day.isoformat()
+            date_counts[day_str] = {"signal": row.signal or 0, "noise": row.noise or 0}
 
         # Build response with all days (fill gaps with zeros)
         data: list[MessageTrendPoint] = []
@@ -27,6 +27,7 @@ from app.models.message import Message
 from app.models.message_history import MessageHistory
 from app.models.topic import Topic
 from app.models.topic_version import TopicVersion
+from app.services.daily_rollup_service import ATOM_ROLLUP, MESSAGE_ROLLUP, DailyRollupService
 
 logger = logging.getLogger(__name__)
 
@@ -232,6 +233,13 @@ class DataWipeService:
             await session.execute(delete(Topic))
             deleted_counts["topics"] = pre_counts.get("topics", 0)
 
+        # Rollups cannot see bulk deletes; drop them so readers fall back to live data
+        rollups = DailyRollupService(session)
+        if scope in (DataWipeScope.messages, DataWipeScope.topics, DataWipeScope.all):
+            await rollups.reset(MESSAGE_ROLLUP)
+        if scope in (DataWipeScope.atoms, DataWipeScope.all):
+            await rollups.reset(ATOM_ROLLUP)
+
         # Mark token as used
         token.used = True
         token.used_at = datetime.now(UTC)
@@ -0,0 +1,268 @@
+"""Content-addressed embedding cache.
+
+Embeddings are deterministic for a given text, provider, model and dimensions, so
+they are cached by ``sha256(text)`` plus those three values. Two tiers are used:
+
+- In-process LRU (fast, per API/worker process)
+- Postgres ``embedding_cache`` table (shared across processes and restarts)
+
+The persistent tier is best-effort: database errors are logged and the tier is
+skipped for a short backoff period, so embedding generation never fails because
+of the cache. Its size is bounded by ``prune``, which a scheduled task runs to
+drop entries unused for ``EMBEDDING_CACHE_TTL_DAYS``; hits refresh an entry's
+``last_used_at`` at most once per ``_TOUCH_INTERVAL``.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+
+from core.config import settings
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+logger = logging.getLogger(__name__)
+
+_PERSISTENT_FAILURE_BACKOFF_SECONDS = 60.0
+# Hits refresh last_used_at only when older than this, so reads rarely write
+_TOUCH_INTERVAL = timedelta(days=1)
+
+
+class EmbeddingCacheKey(NamedTuple):
+    """Cache key: text hash plus everything that changes the resulting vector."""
+
+    content_hash: str
+    provider_type: str
+    model: str
+    dimensions: int
+
+
+def make_cache_key(text: str, provider_type: str, model: str, dimensions: int) -> EmbeddingCacheKey:
+    """Build cache key for text embedded with the given provider/model/dimensions."""
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return EmbeddingCacheKey(content_hash, provider_type, model, dimensions)
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + Postgres) embedding cache with hit/miss counters.
+
+    Example:
+        >>> key = make_cache_key("Hello", "openai", "text-embedding-3-small", 1536)
+        >>> await cache.put_many({key: vector})
+        >>> (await cache.get_many([key]))[key] == vector
+        True
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        session_factory: Callable[[], AsyncSession] | None = None,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: In-process LRU capacity (0 disables the memory tier)
+            session_factory: Session factory for the persistent tier (None disables it)
+        """
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+        self._memory: OrderedDict[EmbeddingCacheKey, list[float]] = OrderedDict()
+        self._persistent_retry_at = 0.0
+
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Drop in-process entries and reset counters (persistent tier untouched)."""
+        self._memory.clear()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and hit rate."""
+        hits = self.memory_hits + self.persistent_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    async def get_many(self, keys: Sequence[EmbeddingCacheKey]) -> dict[EmbeddingCacheKey, list[float]]:
+        """Look up embeddings, memory tier first, then the persistent tier.
+
+        Persistent hits are promoted into the memory tier. Duplicate keys are counted once.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Mapping of found keys to (copied) embedding vectors
+        """
+        found: dict[EmbeddingCacheKey, list[float]] = {}
+        missing: list[EmbeddingCacheKey] = []
+
+        for key in dict.fromkeys(keys):
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = list(vector)
+                self.memory_hits += 1
+            else:
+                missing.append(key)
+
+        if missing and self._persistent_available():
+            persisted = await self._load_persistent(missing)
+            self.persistent_hits += len(persisted)
+            for key, vector in persisted.items():
+                self._remember(key, vector)
+                found[key] = list(vector)
+            missing = [key for key in missing if key not in persisted]
+
+        self.misses += len(missing)
+        return found
+
+    async def put_many(self, entries: Mapping[EmbeddingCacheKey, list[float]]) -> None:
+        """Store embeddings in both tiers.
+
+        Args:
+            entries: Mapping of cache keys to embedding vectors
+        """
+        if not entries:
+            return
+        for key, vector in entries.items():
+            self._remember(key, list(vector))
+        if self._persistent_available():
+            await self._store_persistent(entries)
+
+    async def prune(self, max_age: timedelta) -> int:
+        """Delete persistent entries not used within ``max_age``.
+
+        Args:
+            max_age: Entries last used before ``now - max_age`` are deleted
+
+        Returns:
+            Number of deleted entries (0 when the persistent tier is disabled)
+        """
+        if self.session_factory is None:
+            return 0
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(EmbeddingCacheEntry).where(
+                    EmbeddingCacheEntry.last_used_at < datetime.now(UTC) - max_age  # type: ignore[operator, arg-type]
+                )
+            )
+            await session.commit()
+        return result.rowcount or 0  # type: ignore[attr-defined]
+
+    def _remember(self, key: EmbeddingCacheKey, vector: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _persistent_available(self) -> bool:
+        return self.session_factory is not None and time.monotonic() >= self._persistent_retry_at
+
+    def _persistent_failed(self, action: str, error: Exception) -> None:
+        self._persistent_retry_at = time.monotonic() + _PERSISTENT_FAILURE_BACKOFF_SECONDS
+        logger.warning(
+            f"Embedding cache {action} failed, persistent tier disabled for "
+            f"{_PERSISTENT_FAILURE_BACKOFF_SECONDS:.0f}s: {error}"
+        )
+
+    async def _load_persistent(self, keys: Iterable[EmbeddingCacheKey]) -> dict[EmbeddingCacheKey, list[float]]:
+        assert self.session_factory is not None
+        groups: dict[tuple[str, str, int], list[str]] = {}
+        for key in keys:
+            groups.setdefault((key.provider_type, key.model, key.dimensions), []).append(key.content_hash)
+
+        result: dict[EmbeddingCacheKey, list[float]] = {}
+        now = datetime.now(UTC)
+        try:
+            async with self.session_factory() as session:
+                for (provider_type, model, dimensions), hashes in groups.items():
+                    rows = await session.execute(
+                        select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding).where(  # type: ignore[call-overload]
+                            EmbeddingCacheEntry.provider_type == provider_type,
+                            EmbeddingCacheEntry.model == model,
+                            EmbeddingCacheEntry.dimensions == dimensions,
+                            EmbeddingCacheEntry.content_hash.in_(hashes),  # type: ignore[attr-defined]
+                        )
+                    )
+                    found = []
+                    for content_hash, embedding in rows.all():
+                        key = EmbeddingCacheKey(content_hash, provider_type, model, dimensions)
+                        result[key] = [float(value) for value in embedding]
+                        found.append(content_hash)
+                    if found:
+                        await session.execute(
+                            update(EmbeddingCacheEntry)
+                            .where(
+                                EmbeddingCacheEntry.provider_type == provider_type,  # type: ignore[arg-type]
+                                EmbeddingCacheEntry.model == model,  # type: ignore[arg-type]
+                                EmbeddingCacheEntry.dimensions == dimensions,  # type: ignore[arg-type]
+                                EmbeddingCacheEntry.content_hash.in_(found),  # type: ignore[attr-defined]
+                                EmbeddingCacheEntry.last_used_at < now - _TOUCH_INTERVAL,  # type: ignore[operator, arg-type]
+                            )
+                            .values(last_used_at=now)
+                        )
+                await session.commit()
+        except Exception as e:
+            self._persistent_failed("lookup", e)
+            return {}
+        return result
+
+    async def _store_persistent(self, entries: Mapping[EmbeddingCacheKey, list[float]]) -> None:
+        assert self.session_factory is not None
+        now = datetime.now(UTC)
+        values = [
+            {
+                "content_hash": key.content_hash,
+                "provider_type": key.provider_type,
+                "model": key.model,
+                "dimensions": key.dimensions,
+                "embedding": vector,
+                "last_used_at": now,
+            }
+            for key, vector in entries.items()
+        ]
+        try:
+            async with self.session_factory() as session:
+                insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+                await session.execute(insert(EmbeddingCacheEntry).values(values).on_conflict_do_nothing())
+                await session.commit()
+        except Exception as e:
+            self._persistent_failed("store", e)
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide embedding cache (None when disabled in settings)."""
+    global _embedding_cache
+    if not settings.embedding.embedding_cache_enabled:
+        return None
+    if _embedding_cache is None:
+        session_factory = None
+        if settings.embedding.embedding_cache_persistent:
+            from app.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        _embedding_cache = EmbeddingCache(settings.embedding.embedding_cache_max_entries, session_factory)
+    return _embedding_cache
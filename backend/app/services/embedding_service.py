@@ -2,23 +2,37 @@
 
 This service handles generating vector embeddings for messages and atoms using
 OpenAI and Ollama providers. Supports both single and batch embedding operations.
+
+Batch operations send many texts per provider request (OpenAI ``embeddings.create``
+with a list input, Ollama ``/api/embed``) and run several requests concurrently.
+Provider clients are pooled per event loop so connections are reused across calls.
+
+Results are cached by content hash, provider, model and dimensions (see
+``app.services.embedding_cache``), so re-embedding identical text is free.
 """
 
+import asyncio
+import hashlib
 import logging
 import uuid
-from typing import Protocol
+import weakref
+from collections.abc import Sequence
+from typing import Any, Protocol
 
 import httpx
 from core.config import settings
 from openai import AsyncOpenAI
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.atom import Atom
 from app.models.llm_provider import LLMProvider, ProviderType
 from app.models.message import Message
 from app.models.topic import Topic
 from app.services.credential_encryption import CredentialEncryption
+from app.services.embedding_cache import EmbeddingCacheKey, get_embedding_cache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +43,79 @@ class EmbeddingProvider(Protocol):
     async def generate_embedding(self, text: str) -> list[float]: ...
 
 
+_OLLAMA_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# Clients are bound to the event loop that created them, so pools are kept per loop.
+_client_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Any, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _loop_client_pool() -> dict[Any, Any]:
+    """Return the client pool for the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _client_pools.get(loop)
+    if pool is None:
+        pool = {}
+        _client_pools[loop] = pool
+    return pool
+
+
+async def close_embedding_clients() -> None:
+    """Close pooled embedding HTTP clients for the running event loop.
+
+    Called on API and worker shutdown to release keep-alive connections.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _client_pools.pop(loop, None)
+    if not pool:
+        return
+    for client in pool.values():
+        try:
+            if isinstance(client, httpx.AsyncClient):
+                await client.aclose()
+            else:
+                await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close embedding client: {e}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for request packing."""
+    return len(text) // 4 + 1
+
+
+def chunk_texts_for_requests(texts: Sequence[str], max_items: int, max_tokens: int) -> list[list[int]]:
+    """Split texts into request-sized groups of indices.
+
+    Each group holds at most ``max_items`` texts and at most ``max_tokens`` estimated
+    tokens. A single text exceeding the token budget gets a group of its own.
+
+    Args:
+        texts: Texts to pack
+        max_items: Maximum inputs per provider request
+        max_tokens: Maximum estimated tokens per provider request
+
+    Returns:
+        List of index groups preserving the original order
+    """
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+
+    for idx, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(idx)
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+    return groups
+
+
 class EmbeddingService:
     """Service for generating vector embeddings using LLM providers.
 
@@ -47,6 +134,9 @@ class EmbeddingService:
         """
         self.provider = provider
         self.encryptor = CredentialEncryption()
+        self._api_key: str | None = None
+        self._api_key_loaded = False
+        self.cache = get_embedding_cache()
 
         if self.provider.type not in (ProviderType.openai, ProviderType.ollama):
             raise ValueError(
@@ -121,20 +211,180 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Cannot generate embedding for empty text")
 
-        api_key = None
-        if self.provider.api_key_encrypted:
-            try:
-                api_key = self.encryptor.decrypt(self.provider.api_key_encrypted)
-            except Exception as e:
-                raise ValueError(f"Failed to decrypt API key for provider '{self.provider.name}': {e}") from e
+        key = self._cache_key(text) if self.cache else None
+        if self.cache and key:
+            cached = await self.cache.get_many([key])
+            if key in cached:
+                return cached[key]
+
+        if self.provider.type == ProviderType.openai:
+            embedding = await self._generate_openai_embedding(text, self._get_api_key())
+        elif self.provider.type == ProviderType.ollama:
+            embedding = await self._generate_ollama_embedding(text)
+        else:
+            raise ValueError(f"Unsupported provider type: {self.provider.type}")
+
+        if self.cache and key:
+            await self.cache.put_many({key: embedding})
+        return embedding
+
+    async def generate_embeddings(self, texts: Sequence[str]) -> list[list[float]]:
+        """Generate embeddings for many texts with batched provider requests.
+
+        Texts are packed into requests bounded by ``embedding_request_max_items`` and
+        ``embedding_request_max_tokens``; up to ``embedding_max_concurrency`` requests
+        run at once. Output order matches input order. Cached texts and duplicates
+        within ``texts`` are not sent to the provider.
+
+        Args:
+            texts: Texts to embed (must all be non-empty)
+
+        Returns:
+            Embedding vectors aligned with ``texts``
+
+        Raises:
+            ValueError: If any text is empty or provider configuration is invalid
+            Exception: If any provider request fails
+
+        Example:
+            >>> embeddings = await service.generate_embeddings(["first", "second"])
+            >>> len(embeddings)
+            2
+        """
+        return await self._generate_embeddings(texts, partial=False)  # type: ignore[return-value]
+
+    async def generate_embeddings_partial(self, texts: Sequence[str]) -> list[list[float] | None]:
+        """Like ``generate_embeddings``, but a failed provider request only fails its own texts.
+
+        Args:
+            texts: Texts to embed (must all be non-empty)
+
+        Returns:
+            Embedding vectors aligned with ``texts``; None for texts whose request failed
+
+        Raises:
+            ValueError: If any text is empty or provider configuration is invalid
+        """
+        return await self._generate_embeddings(texts, partial=True)
+
+    async def _generate_embeddings(self, texts: Sequence[str], partial: bool) -> list[list[float] | None]:
+        """Shared implementation of ``generate_embeddings`` and ``generate_embeddings_partial``."""
+        if not texts:
+            return []
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot generate embedding for empty text")
 
         if self.provider.type == ProviderType.openai:
-            return await self._generate_openai_embedding(text, api_key)
+            api_key = self._get_api_key()
+            if not api_key:
+                raise ValueError(
+                    f"Provider '{self.provider.name}' requires an API key. "
+                    "OpenAI providers must have an API key configured."
+                )
         elif self.provider.type == ProviderType.ollama:
-            return await self._generate_ollama_embedding(text)
+            if not self.provider.base_url:
+                raise ValueError(
+                    f"Provider '{self.provider.name}' is missing base_url. "
+                    "Ollama providers require a base_url configuration."
+                )
         else:
             raise ValueError(f"Unsupported provider type: {self.provider.type}")
 
+        keys = [self._cache_key(text) for text in texts] if self.cache else []
+        cached = await self.cache.get_many(keys) if self.cache else {}
+
+        # Only unique, uncached texts go to the provider
+        pending: dict[str, int] = {}
+        for i, text in enumerate(texts):
+            if not (keys and keys[i] in cached) and text not in pending:
+                pending[text] = i
+        pending_texts = list(pending)
+
+        groups = chunk_texts_for_requests(
+            pending_texts,
+            max_items=settings.embedding.embedding_request_max_items,
+            max_tokens=settings.embedding.embedding_request_max_tokens,
+        )
+        semaphore = asyncio.Semaphore(settings.embedding.embedding_max_concurrency)
+
+        async def run_group(indices: list[int]) -> list[list[float]]:
+            chunk = [pending_texts[i] for i in indices]
+            async with semaphore:
+                if self.provider.type == ProviderType.openai:
+                    return await self._generate_openai_embeddings(chunk, api_key)
+                return await self._generate_ollama_embeddings(chunk)
+
+        group_results = await asyncio.gather(*(run_group(indices) for indices in groups), return_exceptions=partial)
+
+        generated: dict[str, list[float]] = {}
+        for indices, vectors in zip(groups, group_results, strict=True):
+            if isinstance(vectors, BaseException):
+                logger.error(f"Embedding request for {len(indices)} texts failed: {vectors}")
+                continue
+            for idx, vector in zip(indices, vectors, strict=True):
+                generated[pending_texts[idx]] = vector
+
+        if self.cache and generated:
+            await self.cache.put_many({keys[pending[text]]: vector for text, vector in generated.items()})
+
+        embeddings = [
+            cached[keys[i]] if keys and keys[i] in cached else generated.get(text) for i, text in enumerate(texts)
+        ]
+
+        logger.debug(
+            f"Generated {len(texts)} embeddings ({len(pending_texts)} uncached) in {len(groups)} request(s) "
+            f"with provider '{self.provider.name}'"
+        )
+        return embeddings
+
+    def _cache_key(self, text: str) -> EmbeddingCacheKey:
+        """Build embedding cache key for text with this provider's model and dimensions."""
+        if self.provider.type == ProviderType.openai:
+            model = settings.embedding.openai_embedding_model
+            dimensions = settings.embedding.openai_embedding_dimensions
+        else:
+            model = settings.embedding.ollama_embedding_model
+            dimensions = settings.embedding.ollama_embedding_dimensions
+        return make_cache_key(text, self.provider.type.value, model, dimensions)
+
+    def _get_api_key(self) -> str | None:
+        """Decrypt the provider API key once per service instance.
+
+        Raises:
+            ValueError: If decryption fails
+        """
+        if not self._api_key_loaded:
+            if self.provider.api_key_encrypted:
+                try:
+                    self._api_key = self.encryptor.decrypt(self.provider.api_key_encrypted)
+                except Exception as e:
+                    raise ValueError(f"Failed to decrypt API key for provider '{self.provider.name}': {e}") from e
+            self._api_key_loaded = True
+        return self._api_key
+
+    def _get_openai_client(self, api_key: str) -> AsyncOpenAI:
+        """Return a pooled AsyncOpenAI client for this API key."""
+        pool = _loop_client_pool()
+        key = ("openai", hashlib.sha256(api_key.encode()).hexdigest(), self.provider.base_url)
+        client = pool.get(key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key)
+            pool[key] = client
+        return client
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled httpx client used for Ollama requests."""
+        pool = _loop_client_pool()
+        client = pool.get("httpx")
+        if client is None:
+            client = httpx.AsyncClient(timeout=_OLLAMA_TIMEOUT, limits=_HTTP_LIMITS)
+            pool["httpx"] = client
+        return client
+
+    def _ollama_base_url(self) -> str:
+        base_url = self.provider.base_url or ""
+        return base_url[: -len("/v1")] if base_url.endswith("/v1") else base_url
+
     async def _generate_openai_embedding(self, text: str, api_key: str | None) -> list[float]:
         """Generate embedding using OpenAI.
 
@@ -156,7 +406,7 @@ class EmbeddingService:
             )
 
         try:
-            client = AsyncOpenAI(api_key=api_key)
+            client = self._get_openai_client(api_key)
             response = await client.embeddings.create(
                 model=settings.embedding.openai_embedding_model, input=text, encoding_format="float"
             )
@@ -166,6 +416,38 @@ class EmbeddingService:
             logger.error(f"OpenAI embedding generation failed for provider '{self.provider.name}': {e}", exc_info=True)
             raise Exception(f"OpenAI embedding generation failed: {str(e)}") from e
 
+    async def _generate_openai_embeddings(self, texts: list[str], api_key: str | None) -> list[list[float]]:
+        """Generate embeddings for a chunk of texts with one OpenAI request.
+
+        Args:
+            texts: Texts to embed (one request worth)
+            api_key: Decrypted OpenAI API key
+
+        Returns:
+            Embedding vectors in input order
+
+        Raises:
+            Exception: If OpenAI API call fails or returns a partial result
+        """
+        if not api_key:
+            raise ValueError(f"Provider '{self.provider.name}' requires an API key.")
+
+        try:
+            client = self._get_openai_client(api_key)
+            response = await client.embeddings.create(
+                model=settings.embedding.openai_embedding_model, input=texts, encoding_format="float"
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            if len(data) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(data)}")
+            return [await self._validate_embedding(item.embedding) for item in data]
+        except Exception as e:
+            logger.error(
+                f"OpenAI batch embedding failed for provider '{self.provider.name}' ({len(texts)} texts): {e}",
+                exc_info=True,
+            )
+            raise Exception(f"OpenAI embedding generation failed: {str(e)}") from e
+
     async def _generate_ollama_embedding(self, text: str) -> list[float]:
         """Generate embedding using Ollama.
 
@@ -186,21 +468,16 @@ class EmbeddingService:
             )
 
         try:
-            base_url = (
-                self.provider.base_url.rstrip("/v1")
-                if self.provider.base_url.endswith("/v1")
-                else self.provider.base_url
+            embed_url = f"{self._ollama_base_url()}/api/embeddings"
+            client = self._get_http_client()
+            response = await client.post(
+                embed_url,
+                json={"model": settings.embedding.ollama_embedding_model, "prompt": text},
             )
-            embed_url = f"{base_url}/api/embeddings"
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    embed_url,
-                    json={"model": settings.embedding.ollama_embedding_model, "prompt": text},
-                )
-                response.raise_for_status()
-                data = response.json()
-                embedding: list[float] = data["embedding"]
-                return await self._validate_embedding(embedding)
+            response.raise_for_status()
+            data = response.json()
+            embedding: list[float] = data["embedding"]
+            return await self._validate_embedding(embedding)
         except httpx.HTTPError as e:
             logger.error(f"Ollama embedding generation failed for provider '{self.provider.name}': {e}", exc_info=True)
             raise Exception(f"Ollama embedding generation failed: {str(e)}") from e
@@ -210,6 +487,82 @@ class EmbeddingService:
             )
             raise Exception(f"Ollama embedding generation failed: {str(e)}") from e
 
+    async def _generate_ollama_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for a chunk of texts with one Ollama ``/api/embed`` request.
+
+        Args:
+            texts: Texts to embed (one request worth)
+
+        Returns:
+            Embedding vectors in input order (padded for database storage)
+
+        Raises:
+            Exception: If Ollama API call fails or returns a partial result
+        """
+        try:
+            client = self._get_http_client()
+            response = await client.post(
+                f"{self._ollama_base_url()}/api/embed",
+                json={"model": settings.embedding.ollama_embedding_model, "input": texts},
+            )
+            response.raise_for_status()
+            vectors: list[list[float]] = response.json()["embeddings"]
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+            return [await self._validate_embedding(vector) for vector in vectors]
+        except Exception as e:
+            logger.error(
+                f"Ollama batch embedding failed for provider '{self.provider.name}' ({len(texts)} texts): {e}",
+                exc_info=True,
+            )
+            raise Exception(f"Ollama embedding generation failed: {str(e)}") from e
+
+    @staticmethod
+    def _has_embedding(entity: Message | Atom | Topic) -> bool:
+        try:
+            return entity.embedding is not None and len(entity.embedding) > 0
+        except (ValueError, AttributeError):
+            return hasattr(entity.embedding, "__len__") and len(entity.embedding) > 0
+
+    @classmethod
+    async def _embedding_exists(cls, session: AsyncSession, entity: Message | Atom | Topic) -> bool:
+        """Check for a stored embedding without loading a deferred vector."""
+        state = inspect(entity, raiseerr=False)
+        if state is None or "embedding" not in state.unloaded:
+            return cls._has_embedding(entity)
+        model = type(entity)
+        stmt = select(model.embedding.is_not(None)).where(model.id == entity.id)  # type: ignore[union-attr, arg-type]
+        return bool(await session.scalar(stmt))
+
+    async def _embed_pending(
+        self, entities: Sequence[Message | Atom], texts: list[str], stats: dict[str, int], label: str
+    ) -> None:
+        """Embed pending entities with batched provider calls and update stats in place."""
+        valid = [(entity, text) for entity, text in zip(entities, texts, strict=True) if text and text.strip()]
+        for entity, text in zip(entities, texts, strict=True):
+            if not text or not text.strip():
+                logger.error(f"Failed to embed {label} {entity.id}: empty text")
+                stats["failed"] += 1
+
+        if not valid:
+            return
+
+        try:
+            embeddings = await self.generate_embeddings_partial([text for _, text in valid])
+        except Exception as e:
+            logger.error(f"Failed to embed {len(valid)} {label}s: {e}")
+            stats["failed"] += len(valid)
+            return
+
+        # A failed provider request only fails the entities it carried
+        for (entity, _), embedding in zip(valid, embeddings, strict=True):
+            if embedding is None:
+                logger.error(f"Failed to embed {label} {entity.id}: provider request failed")
+                stats["failed"] += 1
+                continue
+            entity.embedding = embedding
+            stats["success"] += 1
+
     async def embed_message(self, session: AsyncSession, message: Message) -> Message:
         """Generate and save embedding for a message.
 
@@ -225,13 +578,7 @@ class EmbeddingService:
             >>> updated = await service.embed_message(session, message)
             >>> assert updated.embedding is not None
         """
-        has_embedding = False
-        try:
-            has_embedding = message.embedding is not None and len(message.embedding) > 0
-        except (ValueError, AttributeError):
-            has_embedding = hasattr(message.embedding, "__len__") and len(message.embedding) > 0
-
-        if has_embedding:
+        if await self._embedding_exists(session, message):
             logger.debug(f"Message {message.id} already has embedding, skipping")
             return message
 
@@ -242,6 +589,7 @@ class EmbeddingService:
             session.add(message)
             await session.commit()
             await session.refresh(message)
+            set_committed_value(message, "embedding", embedding)
 
             logger.info(f"Successfully embedded message {message.id} ({len(embedding)} dimensions)")
             return message
@@ -266,13 +614,7 @@ class EmbeddingService:
             >>> updated = await service.embed_atom(session, atom)
             >>> assert updated.embedding is not None
         """
-        has_embedding = False
-        try:
-            has_embedding = atom.embedding is not None and len(atom.embedding) > 0
-        except (ValueError, AttributeError):
-            has_embedding = hasattr(atom.embedding, "__len__") and len(atom.embedding) > 0
-
-        if has_embedding:
+        if await self._embedding_exists(session, atom):
             logger.debug(f"Atom {atom.id} already has embedding, skipping")
             return atom
 
@@ -284,6 +626,7 @@ class EmbeddingService:
             session.add(atom)
             await session.commit()
             await session.refresh(atom)
+            set_committed_value(atom, "embedding", embedding)
 
             logger.info(f"Successfully embedded atom {atom.id} ({len(embedding)} dimensions)")
             return atom
@@ -308,12 +651,7 @@ class EmbeddingService:
             >>> updated = await service.embed_topic(session, topic)
             >>> assert updated.embedding is not None
         """
-        try:
-            has_embedding = isinstance(topic.embedding, list) and len(topic.embedding) > 0
-        except Exception:
-            has_embedding = False
-
-        if has_embedding:
+        if await self._embedding_exists(session, topic):
             logger.debug(f"Topic {topic.id} already has embedding, skipping")
             return topic
 
@@ -325,6 +663,7 @@ class EmbeddingService:
             session.add(topic)
             await session.commit()
             await session.refresh(topic)
+            set_committed_value(topic, "embedding", embedding)
 
             logger.info(f"Successfully embedded topic {topic.id} ({len(embedding)} dimensions)")
             return topic
@@ -369,30 +708,13 @@ class EmbeddingService:
 
             logger.info(f"Processing chunk {chunk_num}/{total_chunks} ({len(chunk_ids)} messages)")
 
-            stmt = select(Message).where(Message.id.in_(chunk_ids))  # type: ignore[union-attr]
+            stmt = select(Message).where(Message.id.in_(chunk_ids)).options(undefer(Message.embedding))  # type: ignore[attr-defined, arg-type]
             result = await session.execute(stmt)
             messages = result.scalars().all()
 
-            for msg in messages:
-                try:
-                    has_embedding = False
-                    try:
-                        has_embedding = msg.embedding is not None and len(msg.embedding) > 0
-                    except (ValueError, AttributeError):
-                        has_embedding = hasattr(msg.embedding, "__len__") and len(msg.embedding) > 0
-
-                    if has_embedding:
-                        stats["skipped"] += 1
-                        continue
-
-                    embedding = await self.generate_embedding(msg.content)
-                    msg.embedding = embedding
-                    session.add(msg)
-                    stats["success"] += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to embed message {msg.id}: {e}")
-                    stats["failed"] += 1
+            pending = [msg for msg in messages if not self._has_embedding(msg)]
+            stats["skipped"] += len(messages) - len(pending)
+            await self._embed_pending(pending, [msg.content for msg in pending], stats, "message")
 
             try:
                 await session.commit()
@@ -447,31 +769,13 @@ class EmbeddingService:
 
             logger.info(f"Processing chunk {chunk_num}/{total_chunks} ({len(chunk_ids)} atoms)")
 
-            stmt = select(Atom).where(Atom.id.in_(chunk_ids))  # type: ignore[union-attr]
+            stmt = select(Atom).where(Atom.id.in_(chunk_ids)).options(undefer(Atom.embedding))  # type: ignore[attr-defined, arg-type]
             result = await session.execute(stmt)
             atoms = result.scalars().all()
 
-            for atom in atoms:
-                try:
-                    has_embedding = False
-                    try:
-                        has_embedding = atom.embedding is not None and len(atom.embedding) > 0
-                    except (ValueError, AttributeError):
-                        has_embedding = hasattr(atom.embedding, "__len__") and len(atom.embedding) > 0
-
-                    if has_embedding:
-                        stats["skipped"] += 1
-                        continue
-
-                    text = f"{atom.title}\n\n{atom.content}"
-                    embedding = await self.generate_embedding(text)
-                    atom.embedding = embedding
-                    session.add(atom)
-                    stats["success"] += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to embed atom {atom.id}: {e}")
-                    stats["failed"] += 1
+            pending = [atom for atom in atoms if not self._has_embedding(atom)]
+            stats["skipped"] += len(atoms) - len(pending)
+            await self._embed_pending(pending, [f"{atom.title}\n\n{atom.content}" for atom in pending], stats, "atom")
 
             try:
                 await session.commit()
@@ -16,6 +16,7 @@ from __future__ import annotations
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
@@ -34,6 +35,7 @@ from app.api.v1.schemas.executive_summary import (
 )
 from app.models.atom import Atom, TopicAtom
 from app.models.topic import Topic
+from app.services.daily_rollup_service import ATOM_ROLLUP, DailyRollupService, atom_stats_source, split_period
 
 
 # Ukrainian month names for period formatting
@@ -313,49 +315,32 @@ class ExecutiveSummaryService:
         period_start, period_end = self._calculate_period_boundaries(period_days)
         period_label = self._format_period_label(period_start, period_end)
 
-        # Count decisions
-        decisions_count_query = (
-            select(func.count())
-            .select_from(Atom)
-            .where(
-                Atom.created_at >= period_start,  # type: ignore[arg-type]
-                Atom.user_approved == True,  # noqa: E712
-                Atom.archived == False,  # noqa: E712
-                Atom.type == "decision",
-            )
-        )
-        decisions_result = await self.session.execute(decisions_count_query)
-        decisions_count = decisions_result.scalar() or 0
-
-        # Count blockers
-        blockers_count_query = (
-            select(func.count())
-            .select_from(Atom)
-            .where(
-                Atom.created_at >= period_start,  # type: ignore[arg-type]
-                Atom.user_approved == True,  # noqa: E712
-                Atom.archived == False,  # noqa: E712
-                Atom.type == "blocker",
-            )
-        )
-        blockers_result = await self.session.execute(blockers_count_query)
-        blockers_count = blockers_result.scalar() or 0
-
-        # Count stale blockers
+        # Count decisions, blockers and stale blockers from the daily atom rollup
         stale_threshold = datetime.now(timezone.utc) - timedelta(days=STALE_BLOCKER_THRESHOLD_DAYS)
-        stale_blockers_query = (
-            select(func.count())
-            .select_from(Atom)
-            .where(
-                Atom.created_at >= period_start,  # type: ignore[arg-type]
-                Atom.created_at < stale_threshold,  # type: ignore[arg-type]
-                Atom.user_approved == True,  # noqa: E712
-                Atom.archived == False,  # noqa: E712
-                Atom.type == "blocker",
+        covered = (await DailyRollupService(self.session).get_covered_until())[ATOM_ROLLUP]
+        period_atoms = atom_stats_source(split_period(period_start, None, covered))
+        stale_atoms = atom_stats_source(split_period(period_start, stale_threshold, covered)).alias("stale_atoms")
+
+        def approved_count(source: Any, atom_type: str) -> Any:
+            return (
+                select(func.coalesce(func.sum(source.c.atom_count), 0))
+                .where(
+                    source.c.user_approved == True,  # noqa: E712
+                    source.c.archived == False,  # noqa: E712
+                    source.c.type == atom_type,
+                )
+                .scalar_subquery()
             )
+
+        counts_query = select(
+            approved_count(period_atoms, "decision").label("decisions"),
+            approved_count(period_atoms, "blocker").label("blockers"),
+            approved_count(stale_atoms, "blocker").label("stale_blockers"),
         )
-        stale_result = await self.session.execute(stale_blockers_query)
-        stale_blockers_count = stale_result.scalar() or 0
+        counts = (await self.session.execute(counts_query)).one()
+        decisions_count = counts.decisions
+        blockers_count = counts.blockers
+        stale_blockers_count = counts.stale_blockers
 
         # Count active topics (topics with atoms in period)
         active_topics_query = (
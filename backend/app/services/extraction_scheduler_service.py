@@ -230,6 +230,41 @@ class ExtractionSchedulerService:
         )
         await self.schedule_source.add_schedule(schedule)
 
+    async def schedule_system_task(self, schedule_id: str, task_name: str, cron: str) -> bool:
+        """
+        Add or replace a fixed (non-DB) cron schedule, e.g. maintenance jobs.
+
+        Schedule IDs without SCHEDULE_ID_PREFIX are left alone by sync_scheduled_tasks().
+
+        Args:
+            schedule_id: Stable schedule identifier
+            task_name: Registered TaskIQ task name
+            cron: Cron expression
+
+        Returns:
+            True if scheduled successfully, False otherwise
+        """
+        try:
+            try:
+                await self.schedule_source.delete_schedule(schedule_id)
+            except Exception:
+                pass  # Schedule might not exist
+
+            schedule = TaskIQScheduledTask(
+                task_name=task_name,
+                labels={},
+                args=[],
+                kwargs={},
+                schedule_id=schedule_id,
+                cron=cron,
+            )
+            await self.schedule_source.add_schedule(schedule)
+            logger.info(f"Scheduled system task '{task_name}' with cron: {cron}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to schedule system task {schedule_id}: {e}", exc_info=True)
+            return False
+
     async def get_scheduled_task_ids(self) -> list[UUID]:
         """
         Get list of currently scheduled task IDs.
@@ -0,0 +1,193 @@
+"""Streaming producer/consumer pipeline for historical message ingestion.
+
+Each chat is read by its own producer from ``SourceAdapter.fetch_history``
+(an async generator over the adapter's one shared connection, see
+``SourceAdapter.connected``) and cut into batches that go through a bounded queue to
+a single writer. Fetching several chats, writing to the database and
+whatever the writer triggers all overlap, while memory stays bounded by
+``queue_batches * batch_size`` messages no matter how large a chat is.
+
+Telegram FloodWait errors pause every producer (the limit is per account)
+and are paid from a shared wait budget; the chat resumes from the last
+message it produced.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from telethon.errors import FloodWaitError
+
+from app.services.source_adapters import SourceAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatBatch:
+    """Batch of fetched messages from one chat.
+
+    Attributes:
+        chat_index: 1-based position of the chat in the ingestion request
+        chat_id: Source-specific chat identifier
+        messages: Raw message dictionaries from the adapter
+    """
+
+    chat_index: int
+    chat_id: str
+    messages: list[dict[str, Any]]
+
+
+class FloodWaitBudgetExceeded(RuntimeError):
+    """Raised when rate-limit waits would exceed the ingestion wait budget."""
+
+
+class FloodWaitBudget:
+    """Shared rate-limit pause with a cap on the total time spent waiting."""
+
+    def __init__(self, max_wait_seconds: float):
+        self.max_wait_seconds = max_wait_seconds
+        self.waited_seconds = 0.0
+        self._resume_at = 0.0
+
+    async def wait(self, seconds: float, chat_id: str) -> None:
+        """Pause all producers for ``seconds``.
+
+        Raises:
+            FloodWaitBudgetExceeded: If the wait does not fit in the remaining budget
+        """
+        if self.waited_seconds + seconds > self.max_wait_seconds:
+            raise FloodWaitBudgetExceeded(
+                f"Rate limited for {seconds}s while fetching {chat_id}; "
+                f"wait budget of {self.max_wait_seconds:.0f}s exhausted ({self.waited_seconds:.0f}s used)"
+            )
+        self.waited_seconds += seconds
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+        logger.warning(f"Rate limited while fetching {chat_id}, pausing ingestion for {seconds}s")
+        await self.gate()
+
+    async def gate(self) -> None:
+        """Sleep until an active rate-limit pause is over."""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class IngestionPipeline:
+    """Fetch several chats concurrently and hand bounded batches to one writer.
+
+    Example:
+        >>> pipeline = IngestionPipeline(TelegramSourceAdapter())
+        >>> await pipeline.run(["-1002988379206"], write_batch, limit=1000)
+    """
+
+    def __init__(
+        self,
+        adapter: SourceAdapter,
+        batch_size: int = 100,
+        max_concurrent_chats: int = 3,
+        queue_batches: int = 4,
+        flood_wait_budget: float = 600.0,
+    ):
+        """Initialize pipeline.
+
+        Args:
+            adapter: Adapter shared by all chat producers (one connection per run)
+            batch_size: Messages per batch handed to the writer
+            max_concurrent_chats: Chats fetched at the same time
+            queue_batches: Batches buffered between producers and the writer
+            flood_wait_budget: Total seconds of rate-limit waits allowed per run
+        """
+        self.adapter = adapter
+        self.batch_size = batch_size
+        self.max_concurrent_chats = max_concurrent_chats
+        self.queue_batches = queue_batches
+        self.flood_wait_budget = flood_wait_budget
+
+    async def run(
+        self,
+        chat_ids: list[str],
+        write_batch: Callable[[ChatBatch], Awaitable[None]],
+        since: datetime | None = None,
+        limit: int | None = None,
+    ) -> None:
+        """Ingest chats until every producer and the writer are done.
+
+        Args:
+            chat_ids: Chats to fetch
+            write_batch: Coroutine storing one batch (called sequentially)
+            since: Only fetch messages after this datetime
+            limit: Maximum messages per chat (None = unlimited)
+
+        Raises:
+            Exception: First error of a producer or the writer; the rest of the
+                pipeline is cancelled
+        """
+        queue: asyncio.Queue[ChatBatch | None] = asyncio.Queue(maxsize=self.queue_batches)
+        slots = asyncio.Semaphore(self.max_concurrent_chats)
+        budget = FloodWaitBudget(self.flood_wait_budget)
+
+        async def produce_all() -> None:
+            async with asyncio.TaskGroup() as producers:
+                for index, chat_id in enumerate(chat_ids, 1):
+                    producers.create_task(self._produce(index, chat_id, queue, slots, budget, since, limit))
+            await queue.put(None)
+
+        async def write_all() -> None:
+            while (batch := await queue.get()) is not None:
+                await write_batch(batch)
+
+        try:
+            async with self.adapter.connected(), asyncio.TaskGroup() as group:
+                group.create_task(produce_all())
+                group.create_task(write_all())
+        except* Exception as errors:
+            raise _first_error(errors) from None
+
+    async def _produce(
+        self,
+        chat_index: int,
+        chat_id: str,
+        queue: asyncio.Queue[ChatBatch | None],
+        slots: asyncio.Semaphore,
+        budget: FloodWaitBudget,
+        since: datetime | None,
+        limit: int | None,
+    ) -> None:
+        async with slots:
+            batch: list[dict[str, Any]] = []
+            fetched = 0
+            offset_id = 0
+
+            while limit is None or fetched < limit:
+                remaining = None if limit is None else limit - fetched
+                try:
+                    history = self.adapter.fetch_history(chat_id, since=since, limit=remaining, offset_id=offset_id)
+                    async with aclosing(history):
+                        async for message in history:
+                            batch.append(message)
+                            fetched += 1
+                            offset_id = message.get("message_id") or offset_id
+                            if len(batch) >= self.batch_size:
+                                await budget.gate()
+                                await queue.put(ChatBatch(chat_index, chat_id, batch))
+                                batch = []
+                    break
+                except FloodWaitError as e:
+                    await budget.wait(e.seconds, chat_id)
+
+            if batch:
+                await queue.put(ChatBatch(chat_index, chat_id, batch))
+            logger.info(f"Finished fetching {fetched} messages from chat {chat_id}")
+
+
+def _first_error(group: BaseExceptionGroup) -> BaseException:
+    error: BaseException = group
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
@@ -8,10 +8,13 @@ from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
+import numpy as np
 from pydantic_ai import Agent as PydanticAgent, PromptedOutput
 from pydantic_ai.settings import ModelSettings
-from sqlalchemy import select
+from sqlalchemy import Select, and_, select, true, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.selectable import LateralFromClause
 
 if TYPE_CHECKING:
     from pydantic_ai.models.openai import OpenAIChatModel
@@ -41,6 +44,11 @@ from app.services.versioning import VersioningService
 
 logger = logging.getLogger(__name__)
 
+# Intra-batch merge thresholds, on the same (1 + cos) / 2 scale as the database dedup:
+# atoms that would otherwise become versions of each other, topics that find_or_create would merge
+INTRA_BATCH_ATOM_THRESHOLD = 0.95
+INTRA_BATCH_TOPIC_THRESHOLD = 0.85
+
 
 class KnowledgeOrchestrator:
     """Service for extracting topics and atoms from message batches using LLM.
@@ -74,6 +82,66 @@ class KnowledgeOrchestrator:
         self.project_config = project_config
         self.encryptor = CredentialEncryption()
 
+    @staticmethod
+    def build_context_query(message_ids: Sequence[uuid.UUID], context_window: int) -> Select[tuple[Message]]:
+        """Build a single query returning target messages plus their thread neighbours.
+
+        For every target, two LATERAL subqueries pick the ``context_window`` messages
+        before and after it in the same ``source_thread_id`` (NULL thread matches
+        NULL thread), ordered by ``sent_at``. Each LATERAL is a UNION ALL of an
+        equality branch and a NULL-thread branch so both stay index-friendly on
+        ``(source_thread_id, sent_at)``; only one branch returns rows per target.
+        Results are deduplicated server-side through ``IN (subquery)``.
+
+        Args:
+            message_ids: IDs of core messages
+            context_window: Number of messages to include before/after each target
+
+        Returns:
+            SELECT of unique Message rows ordered by sent_at
+        """
+        targets = (
+            select(Message.id, Message.source_thread_id, Message.sent_at)  # type: ignore[call-overload]
+            .where(Message.id.in_(message_ids))  # type: ignore[attr-defined]
+            .cte("targets")
+        )
+
+        def neighbours(before: bool) -> LateralFromClause:
+            branches = []
+            for null_thread in (False, True):
+                neighbour = aliased(Message)
+                if null_thread:
+                    same_thread = and_(
+                        neighbour.source_thread_id.is_(None),  # type: ignore[union-attr]
+                        targets.c.source_thread_id.is_(None),
+                    )
+                else:
+                    same_thread = neighbour.source_thread_id == targets.c.source_thread_id
+                if before:
+                    direction = neighbour.sent_at < targets.c.sent_at
+                    order = neighbour.sent_at.desc()  # type: ignore[attr-defined]
+                else:
+                    direction = neighbour.sent_at > targets.c.sent_at
+                    order = neighbour.sent_at.asc()  # type: ignore[attr-defined]
+                branches.append(
+                    select(neighbour.id).where(same_thread, direction).order_by(order).limit(context_window)  # type: ignore[call-overload]
+                )
+            return union_all(*branches).lateral("before" if before else "after")
+
+        before = neighbours(before=True)
+        after = neighbours(before=False)
+        context_ids = union_all(
+            select(targets.c.id),
+            select(before.c.id).select_from(targets.join(before, true())),
+            select(after.c.id).select_from(targets.join(after, true())),
+        ).subquery("context_ids")
+
+        return (
+            select(Message)
+            .where(Message.id.in_(select(context_ids.c.id)))  # type: ignore[attr-defined]
+            .order_by(Message.sent_at)  # type: ignore[arg-type]
+        )
+
     @staticmethod
     async def fetch_messages_with_context(
         session: AsyncSession,
@@ -85,6 +153,7 @@ class KnowledgeOrchestrator:
 
         If include_context is True, for each target message, fetches 'context_window'
         messages before and after within the same thread. Deduplicates results.
+        Context is resolved in a single round-trip (see ``build_context_query``).
 
         Args:
             session: Database session
@@ -95,70 +164,16 @@ class KnowledgeOrchestrator:
         Returns:
             List of unique Message objects sorted by sent_at
         """
-        # Fetch target messages first
-        stmt = select(Message).where(Message.id.in_(message_ids))
-        result = await session.execute(stmt)
-        target_messages = list(result.scalars().all())
-
-        if not include_context or not target_messages:
-            return sorted(target_messages, key=lambda m: m.sent_at)
+        if not message_ids:
+            return []
 
-        # Context expansion logic
-        # We need to find neighbors for each message in its thread
-        # To avoid N+1 queries for large batches, we could optimize, but
-        # for typical batch sizes (10-50), individual queries per thread group are acceptable.
-        
-        # Group by thread to optimize queries
-        thread_map: dict[str, list[Message]] = {}
-        for msg in target_messages:
-            thread_id = msg.source_thread_id or "general"
-            if thread_id not in thread_map:
-                thread_map[thread_id] = []
-            thread_map[thread_id].append(msg)
-
-        all_messages_map: dict[uuid.UUID, Message] = {m.id: m for m in target_messages if m.id}
-
-        for thread_id, msgs in thread_map.items():
-            # For each message in thread, get window
-            # We can optimize by getting the min/max time range for the thread's messages
-            # but gaps in time might miss context. Safer to query neighbors per message.
-            
-            # Optimization: If many messages in same thread are close, ranges overlap.
-            # But simple neighbor query is robust.
-            
-            for msg in msgs:
-                # Get N messages before
-                prev_stmt = (
-                    select(Message)
-                    .where(
-                        Message.source_thread_id == (None if thread_id == "general" else thread_id),
-                        Message.sent_at < msg.sent_at
-                    )
-                    .order_by(Message.sent_at.desc())
-                    .limit(context_window)
-                )
-                prev_res = await session.execute(prev_stmt)
-                for pm in prev_res.scalars():
-                    if pm.id not in all_messages_map:
-                        all_messages_map[pm.id] = pm # type: ignore[index]
-
-                # Get N messages after
-                next_stmt = (
-                    select(Message)
-                    .where(
-                        Message.source_thread_id == (None if thread_id == "general" else thread_id),
-                        Message.sent_at > msg.sent_at
-                    )
-                    .order_by(Message.sent_at.asc())
-                    .limit(context_window)
-                )
-                next_res = await session.execute(next_stmt)
-                for nm in next_res.scalars():
-                    if nm.id not in all_messages_map:
-                        all_messages_map[nm.id] = nm # type: ignore[index]
-
-        return sorted(all_messages_map.values(), key=lambda m: m.sent_at)
+        if not include_context or context_window <= 0:
+            stmt = select(Message).where(Message.id.in_(message_ids)).order_by(Message.sent_at)  # type: ignore[attr-defined, arg-type]
+        else:
+            stmt = KnowledgeOrchestrator.build_context_query(message_ids, context_window)
 
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
 
     async def extract_knowledge(
         self,
@@ -394,6 +409,46 @@ class KnowledgeOrchestrator:
         combined_text = " ".join(texts_to_check)
         return validate_output_language(combined_text, self.language)
 
+    @staticmethod
+    def cluster_duplicates(
+        vectors: Sequence[Sequence[float] | None], priorities: Sequence[float], threshold: float
+    ) -> list[int]:
+        """Group near-duplicate items of one extraction batch.
+
+        Pairwise similarities come from a single normalized matrix product.
+        Items are visited by descending priority (confidence); each unclaimed
+        item leads a cluster and claims every unclaimed item at least
+        ``threshold`` similar to it. Items without a vector stay on their own.
+
+        Args:
+            vectors: Embedding per item, None if unavailable
+            priorities: Leader preference per item (higher wins, ties by position)
+            threshold: Minimum similarity, as 1 - cosine_distance / 2
+
+        Returns:
+            Index of the cluster leader for every item
+        """
+        leaders = list(range(len(vectors)))
+        embedded = [i for i, vector in enumerate(vectors) if vector is not None]
+        if len(embedded) < 2:
+            return leaders
+
+        matrix = np.asarray([vectors[i] for i in embedded], dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        similar = (1.0 + matrix @ matrix.T) / 2.0 >= threshold
+
+        unclaimed = np.ones(len(embedded), dtype=bool)
+        for row in sorted(range(len(embedded)), key=lambda row: -priorities[embedded[row]]):
+            if not unclaimed[row]:
+                continue
+            members = np.flatnonzero(similar[row] & unclaimed)
+            unclaimed[members] = False
+            unclaimed[row] = False
+            for member in members:
+                leaders[embedded[member]] = embedded[row]
+        return leaders
+
     async def save_topics(
         self,
         extracted_topics: list[ExtractedTopic],
@@ -437,6 +492,9 @@ class KnowledgeOrchestrator:
         topic_map: dict[str, Topic] = {}
         version_created_topic_ids: list[int] = []
 
+        from app.models import TopicCreate
+
+        candidates: list[tuple[ExtractedTopic, TopicCreate]] = []
         for extracted_topic in extracted_topics:
             if extracted_topic.confidence < confidence_threshold:
                 logger.warning(
@@ -448,41 +506,53 @@ class KnowledgeOrchestrator:
             # Prepare topic data
             icon = auto_select_icon(extracted_topic.name, extracted_topic.description)
             color = auto_select_color(icon)
-            
-            from app.models import TopicCreate
-            topic_data = TopicCreate(
-                name=extracted_topic.name,
-                description=extracted_topic.description,
-                icon=icon,
-                color=color
+            candidates.append(
+                (
+                    extracted_topic,
+                    TopicCreate(name=extracted_topic.name, description=extracted_topic.description, icon=icon, color=color),
+                )
             )
 
-            # Use semantic dedup if available
-            if use_semantic_search and embedding_service and search_service:
-                result = await topic_crud.find_or_create(
-                    topic_data=topic_data,
-                    embedding_service=embedding_service,
-                    search_service=search_service,
-                    threshold=0.85
-                )
-                
-                # Convert TopicPublic back to Topic model for map (simplified)
-                # We need the ID to map it
-                topic_id = result.topic.id
-                
-                # We need the actual ORM object for the map if possible, or just enough for save_atoms
-                # Re-fetch the ORM object ensures we have what we need
-                topic_orm = await session.get(Topic, topic_id)
+        # Use semantic dedup if available: one embedding call and one vector query for the whole batch
+        if use_semantic_search and embedding_service and search_service:
+            embeddings = await topic_crud.embed_for_matching(
+                [topic_data for _, topic_data in candidates], embedding_service
+            )
+            # Merge near-duplicate topics of this batch before touching the database
+            leaders = self.cluster_duplicates(
+                [stored for _, stored in embeddings],
+                [extracted_topic.confidence for extracted_topic, _ in candidates],
+                INTRA_BATCH_TOPIC_THRESHOLD,
+            )
+            representatives = sorted(set(leaders))
+            if len(representatives) < len(candidates):
+                logger.info(f"Merged {len(candidates) - len(representatives)} intra-batch duplicate topics")
+            representative_results = await topic_crud.find_or_create_many(
+                [candidates[i][1] for i in representatives],
+                embedding_service=embedding_service,
+                search_service=search_service,
+                threshold=0.85,
+                embeddings=[embeddings[i] for i in representatives],
+            )
+            result_by_leader = dict(zip(representatives, representative_results, strict=True))
+            results = [result_by_leader[leader] for leader in leaders]
+            topic_ids = [found.topic.id for found in results]
+            topics_by_id = {
+                topic.id: topic
+                for topic in (
+                    await session.execute(
+                        select(Topic).where(Topic.id.in_(topic_ids)).execution_options(populate_existing=True)  # type: ignore[attr-defined]
+                    )
+                ).scalars()
+            }
+            for i, ((extracted_topic, _), found) in enumerate(zip(candidates, results, strict=True)):
+                topic_orm = topics_by_id.get(found.topic.id)
                 if topic_orm:
                     topic_map[extracted_topic.name] = topic_orm
-                    if result.was_merged:
-                         # Optional: Create version snapshot if we want to track updates to existing topics
-                         # For now, we assume "merged" means "reused" without change.
-                         pass
-                    else:
-                        logger.info(f"Created new topic '{extracted_topic.name}' (ID: {topic_id})")
-                
-            else:
+                    if not found.was_merged and leaders[i] == i:
+                        logger.info(f"Created new topic '{extracted_topic.name}' (ID: {found.topic.id})")
+        else:
+            for extracted_topic, topic_data in candidates:
                 # Fallback to exact name match (legacy logic)
                 result = await session.execute(select(Topic).where(Topic.name == extracted_topic.name))  # type: ignore[arg-type]
                 existing_topic = result.scalar_one_or_none()
@@ -495,8 +565,8 @@ class KnowledgeOrchestrator:
                     version_data = {
                         "name": extracted_topic.name,
                         "description": extracted_topic.description,
-                        "icon": icon,
-                        "color": color,
+                        "icon": topic_data.icon,
+                        "color": topic_data.color,
                     }
                     await versioning_service.create_topic_version(
                         db=session,
@@ -511,8 +581,8 @@ class KnowledgeOrchestrator:
                     new_topic = Topic(
                         name=extracted_topic.name,
                         description=extracted_topic.description,
-                        icon=icon,
-                        color=color,
+                        icon=topic_data.icon,
+                        color=topic_data.color,
                     )
                     session.add(new_topic)
                     await session.flush()
@@ -535,7 +605,7 @@ class KnowledgeOrchestrator:
         session: AsyncSession,
         confidence_threshold: float | None = None,
         created_by: str | None = None,
-    ) -> tuple[list[Atom], list[uuid.UUID]]:
+    ) -> tuple[list[Atom], list[uuid.UUID], dict[str, uuid.UUID]]:
         """Create atoms and link them to topics.
 
         For existing atoms, creates a version snapshot instead of direct update.
@@ -549,9 +619,11 @@ class KnowledgeOrchestrator:
             created_by: User ID who triggered extraction (default: "knowledge_extraction")
 
         Returns:
-            Tuple of (saved_atoms, version_created_atom_ids):
+            Tuple of (saved_atoms, version_created_atom_ids, atom_ids_by_title):
                 - saved_atoms: List of created or matched Atom entities
                 - version_created_atom_ids: List of atom IDs that had versions created
+                - atom_ids_by_title: Atom ID per extracted title, including
+                  intra-batch duplicates merged into another extraction's atom
         """
         if confidence_threshold is None:
             confidence_threshold = ai_config.knowledge_extraction.confidence_threshold
@@ -573,6 +645,9 @@ class KnowledgeOrchestrator:
         saved_atoms: list[Atom] = []
         version_created_atom_ids: list[uuid.UUID] = []
 
+        from app.models import AtomCreate
+
+        candidates: list[tuple[ExtractedAtom, AtomCreate, Topic]] = []
         for extracted_atom in extracted_atoms:
             if extracted_atom.confidence < confidence_threshold:
                 logger.warning(
@@ -588,10 +663,7 @@ class KnowledgeOrchestrator:
                 )
                 continue
 
-            topic = topic_map[extracted_atom.topic_name]
-
             # Prepare atom data
-            from app.models import AtomCreate
             atom_data = AtomCreate(
                 type=extracted_atom.type,
                 title=extracted_atom.title,
@@ -600,23 +672,59 @@ class KnowledgeOrchestrator:
                 user_approved=False,
                 meta={"source": "llm_extraction", "message_ids": [str(mid) for mid in extracted_atom.related_message_ids]}
             )
+            candidates.append((extracted_atom, atom_data, topic_map[extracted_atom.topic_name]))
 
-            current_atom = None
-
-            # Use semantic dedup
-            if use_semantic_dedup and embedding_service and search_service:
-                dedup_result = await atom_crud.create_with_dedup(
-                    atom_data=atom_data,
-                    embedding_service=embedding_service,
-                    search_service=search_service,
-                    threshold_high=0.95,
-                    threshold_mid=0.85,
-                    created_by=created_by or "knowledge_extraction"
+        # (atom, primary topic, extraction) in extraction order
+        resolved: list[tuple[Atom, Topic, ExtractedAtom]] = []
+
+        # Use semantic dedup: one embedding call and one vector query for the whole batch
+        embeddings: list[list[float]] | None = None
+        if use_semantic_dedup and embedding_service:
+            try:
+                embeddings = await embedding_service.generate_embeddings(
+                    [f"{atom_data.title}\n\n{atom_data.content}" for _, atom_data, _ in candidates]
                 )
-                
-                # Fetch ORM object
-                current_atom = await session.get(Atom, uuid.UUID(dedup_result.atom.id))
-                
+            except Exception as e:
+                logger.warning(f"Batch embedding failed: {e}. Saving atoms without semantic dedup.")
+
+        if embeddings is not None and embedding_service and search_service:
+            # Merge near-duplicate atoms of this batch before touching the database: the
+            # most confident one is saved once, carrying the source messages of all of them
+            leaders = self.cluster_duplicates(
+                embeddings,
+                [extracted_atom.confidence for extracted_atom, _, _ in candidates],
+                INTRA_BATCH_ATOM_THRESHOLD,
+            )
+            representatives = sorted(set(leaders))
+            if len(representatives) < len(candidates):
+                logger.info(f"Merged {len(candidates) - len(representatives)} intra-batch duplicate atoms")
+            for leader in representatives:
+                leader_meta = candidates[leader][1].meta
+                if leader_meta is None:
+                    continue
+                message_ids: list[str] = list(leader_meta["message_ids"])
+                for i, member_leader in enumerate(leaders):
+                    if member_leader == leader and i != leader:
+                        member_meta = candidates[i][1].meta or {}
+                        message_ids.extend(mid for mid in member_meta.get("message_ids", []) if mid not in message_ids)
+                leader_meta["message_ids"] = message_ids
+
+            dedup_results = await atom_crud.create_many_with_dedup(
+                [candidates[i][1] for i in representatives],
+                embedding_service=embedding_service,
+                search_service=search_service,
+                threshold_high=0.95,
+                threshold_mid=0.85,
+                created_by=created_by or "knowledge_extraction",
+                embeddings=[embeddings[i] for i in representatives],
+            )
+            atom_ids = [uuid.UUID(dedup_result.atom.id) for dedup_result in dedup_results]
+            atoms_by_id = {
+                atom.id: atom
+                for atom in (await session.execute(select(Atom).where(Atom.id.in_(atom_ids)))).scalars()  # type: ignore[attr-defined]
+            }
+
+            for dedup_result in dedup_results:
                 if dedup_result.action == DeduplicationAction.CREATED_VERSION:
                     version_created_atom_ids.append(uuid.UUID(dedup_result.atom.id))
                     logger.info(f"Created version for existing atom {dedup_result.atom.id} (similarity: {dedup_result.similarity_score:.3f})")
@@ -624,8 +732,16 @@ class KnowledgeOrchestrator:
                     logger.info(f"Created new atom {dedup_result.atom.id} marked similar to {dedup_result.similar_atom_id}")
                 else:
                     logger.info(f"Created new unique atom {dedup_result.atom.id}")
-            
-            else:
+
+            # Every extraction keeps its own primary topic, linked to its cluster's atom
+            result_by_leader = dict(zip(representatives, dedup_results, strict=True))
+            for (extracted_atom, _, topic), leader in zip(candidates, leaders, strict=True):
+                deduped_atom = atoms_by_id.get(uuid.UUID(result_by_leader[leader].atom.id))
+                if deduped_atom:
+                    resolved.append((deduped_atom, topic, extracted_atom))
+
+        else:
+            for extracted_atom, atom_data, topic in candidates:
                 # Fallback to legacy exact match
                 result = await session.execute(select(Atom).where(Atom.title == extracted_atom.title))
                 existing_atom = result.scalar_one_or_none()
@@ -658,35 +774,46 @@ class KnowledgeOrchestrator:
                     await session.flush()
                     current_atom = new_atom
 
-            if current_atom:
+                resolved.append((current_atom, topic, extracted_atom))
+
+        linked_atom_ids: set[uuid.UUID] = set()
+        atom_ids_by_title: dict[str, uuid.UUID] = {}
+        for current_atom, topic, extracted_atom in resolved:
+            if current_atom.id not in linked_atom_ids:
                 saved_atoms.append(current_atom)
-                
-                # Link to PRIMARY topic (from prompt)
-                # Note: create_with_dedup doesn't link topics, we do it here
-                await atom_crud.link_to_topic(
+            atom_ids_by_title[extracted_atom.title] = current_atom.id
+            
+            # Link to PRIMARY topic (from prompt)
+            # Note: create_many_with_dedup doesn't link topics, we do it here
+            await atom_crud.link_to_topic(
+                atom_id=current_atom.id,
+                topic_id=topic.id,
+                note=f"Extracted prompt assignment (confidence: {extracted_atom.confidence:.2f})"
+            )
+            
+            # AUTO-LINK to other semantically similar topics
+            # But only for NEW atoms (to avoid spamming links on every extraction of old atoms)
+            # Or maybe check if links exist? auto_link_atom checks existence internally.
+            if use_semantic_dedup and current_atom.id not in linked_atom_ids:
+                await topic_crud.auto_link_atom(
                     atom_id=current_atom.id,
-                    topic_id=topic.id,
-                    note=f"Extracted prompt assignment (confidence: {extracted_atom.confidence:.2f})"
+                    atom_content=f"{current_atom.title}\n\n{current_atom.content}",
+                    threshold=0.80
                 )
-                
-                # AUTO-LINK to other semantically similar topics
-                # But only for NEW atoms (to avoid spamming links on every extraction of old atoms)
-                # Or maybe check if links exist? auto_link_atom checks existence internally.
-                if use_semantic_dedup:
-                    await topic_crud.auto_link_atom(
-                        atom_id=current_atom.id,
-                        atom_content=f"{current_atom.title}\n\n{current_atom.content}",
-                        threshold=0.80
-                    )
+            linked_atom_ids.add(current_atom.id)
 
         await session.commit()
         logger.info(
             f"Saved {len(saved_atoms)} atoms to database ({len(version_created_atom_ids)} had versions created)"
         )
-        return saved_atoms, version_created_atom_ids
+        return saved_atoms, version_created_atom_ids, atom_ids_by_title
 
     async def link_atoms(
-        self, extracted_atoms: list[ExtractedAtom], saved_atoms: list[Atom], session: AsyncSession
+        self,
+        extracted_atoms: list[ExtractedAtom],
+        saved_atoms: list[Atom],
+        session: AsyncSession,
+        atom_ids_by_title: dict[str, uuid.UUID] | None = None,
     ) -> int:
         """Create atom link relationships based on extraction output.
 
@@ -694,11 +821,14 @@ class KnowledgeOrchestrator:
             extracted_atoms: Original extraction output with link information
             saved_atoms: Atoms that were actually saved to database
             session: Database session
+            atom_ids_by_title: Atom ID per extracted title from ``save_atoms``, so links
+                from or to extractions merged into another atom resolve to that atom
 
         Returns:
             Number of links created
         """
-        atom_title_to_id: dict[str, int] = {atom.title: atom.id for atom in saved_atoms if atom.id is not None}
+        atom_title_to_id: dict[str, uuid.UUID] = {atom.title: atom.id for atom in saved_atoms if atom.id is not None}
+        atom_title_to_id.update(atom_ids_by_title or {})
         links_created = 0
 
         for extracted_atom in extracted_atoms:
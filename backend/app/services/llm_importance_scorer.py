@@ -1,6 +1,8 @@
 
 import logging
-from typing import Any
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -11,11 +13,42 @@ from core.config import settings
 from app.llm.application.llm_service import LLMService
 from app.llm.domain.models import AgentConfig
 from app.models.agent_config import AgentConfig as DBAgentConfig
+from app.models.llm_provider import LLMProvider
 from app.models.message import Message
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+SCORER_AGENT_NAME = "importance_scorer"
+
+SYSTEM_PROMPT = (
+    "You are an expert Data Triage Judge for a DevOps/Engineering team. "
+    "Your task is to rate the 'Knowledge Value' of chat messages.\n"
+    "High Value (0.8-1.0): Bug reports, architectural decisions, incidents, technical insights, 'how-to' guides.\n"
+    "Medium Value (0.4-0.7): Status updates, coordination, clarifications.\n"
+    "Low Value (0.0-0.3): Social chatter, 'ok/thanks', logistical noise, scheduling.\n\n"
+    "IMPORTANT: \n"
+    "- Ignore language (support Ukrainian/English).\n"
+    "- Ignore date/time.\n"
+    "- Focus on SUBSTANCE and ACTIONABILITY."
+)
+
+BATCH_INSTRUCTIONS = (
+    "\n\nYou will receive several messages, each introduced by its ID. "
+    "Score every message independently and return exactly one result per message, "
+    "copying its ID verbatim into message_id."
+)
+
+
+class ScorerSettings(NamedTuple):
+    """Resolved scoring agent settings (cached by the agent registry)."""
+
+    provider_id: UUID | None
+    model_name: str
+    temperature: float
+    batch_size: int
+
+
 class ScoringAnalysis(BaseModel):
     """Structured output from LLM scoring."""
     importance_score: float = Field(..., description="Score from 0.0 to 1.0", ge=0.0, le=1.0)
@@ -26,18 +59,29 @@ class ScoringAnalysis(BaseModel):
         description="Key factors scores (0-1): knowledge_value, actionability, urgency"
     )
 
+class ScoredMessage(ScoringAnalysis):
+    """Scoring result for one message of a batch."""
+    message_id: str = Field(..., description="ID of the scored message, copied verbatim")
+
+class BatchScoringAnalysis(BaseModel):
+    """Structured output from batch LLM scoring."""
+    results: list[ScoredMessage] = Field(..., description="One result per message")
+
 class LLMImportanceScorer:
     """AI-based importance scorer using LLM Service."""
 
     def __init__(self, llm_service: LLMService):
         self.llm_service = llm_service
 
-    async def score_message(self, message: Message, db_session: AsyncSession) -> dict[str, Any]:
+    async def score_message(
+        self, message: Message, db_session: AsyncSession, author_name: str | None = None
+    ) -> dict[str, Any]:
         """Score a single message using LLM.
 
         Args:
             message: Message object to score
             db_session: Database session (passed to LLMService for provider resolution)
+            author_name: Already known author name (skips the User lookup)
 
         Returns:
             Dict compatible with legacy scorer structure:
@@ -47,22 +91,10 @@ class LLMImportanceScorer:
                 "noise_factors": dict
             }
         """
-        # Fetch author manually to avoid type errors and ensure it's loaded
-        author = await db_session.get(User, message.author_id)
-        author_name = author.full_name if author else "Unknown"
+        if author_name is None:
+            author = await db_session.get(User, message.author_id)
+            author_name = author.full_name if author else "Unknown"
         text_content = message.content or "[No Content]"
-        
-        system_prompt = (
-            "You are an expert Data Triage Judge for a DevOps/Engineering team. "
-            "Your task is to rate the 'Knowledge Value' of chat messages.\n"
-            "High Value (0.8-1.0): Bug reports, architectural decisions, incidents, technical insights, 'how-to' guides.\n"
-            "Medium Value (0.4-0.7): Status updates, coordination, clarifications.\n"
-            "Low Value (0.0-0.3): Social chatter, 'ok/thanks', logistical noise, scheduling.\n\n"
-            "IMPORTANT: \n"
-            "- Ignore language (support Ukrainian/English).\n"
-            "- Ignore date/time.\n"
-            "- Focus on SUBSTANCE and ACTIONABILITY."
-        )
 
         user_prompt = (
             f"Analyze this message:\n"
@@ -71,42 +103,8 @@ class LLMImportanceScorer:
             f"Output JSON with score, classification, brief reasoning, and factor scores."
         )
 
-        # Config First: Try to load agent configuration from DB
-        # Note: Agent renamed from "scoring_judge" to "importance_scorer" in seed_default_agent.py
-        stmt = select(DBAgentConfig).where(DBAgentConfig.name == "importance_scorer")
-        result = await db_session.execute(stmt)
-        db_agent_config = result.scalar_one_or_none()
-
-        if db_agent_config:
-            # Found custom config in DB - use it (Config First)
-            provider_id = db_agent_config.provider_id
-            model_name = db_agent_config.model_name
-            temperature = float(db_agent_config.temperature) if db_agent_config.temperature is not None else 0.0
-            
-            # Note: We still use the code-defined system_prompt as base, 
-            # but we could append custom_prompt from DB if needed.
-        else:
-            # Fallback to ENV/Defaults (Cold Start)
-            from app.models import ProviderType
-            try:
-                provider = await self.llm_service.provider_resolver.resolve_active(db_session, ProviderType.ollama)
-                provider_id = provider.id
-            except Exception:
-                logger.warning("Could not resolve active provider, expecting fallback")
-                provider_id = None
-            
-            model_name = settings.llm.ollama_model
-            temperature = 0.0
-
-        # Configure Agent (Domain Object)
-        agent_config = AgentConfig(
-            name="importance_scorer",
-            description="System agent for scoring message importance and triage",
-            model_name=model_name,
-            system_prompt=system_prompt,
-            output_type=ScoringAnalysis,
-            temperature=temperature,
-        )
+        scorer_settings = await self.get_settings(db_session)
+        agent_config = self._agent_config(scorer_settings, SYSTEM_PROMPT, ScoringAnalysis)
 
         try:
             # Execute
@@ -114,7 +112,7 @@ class LLMImportanceScorer:
                 session=db_session,
                 config=agent_config,
                 prompt=user_prompt,
-                provider_id=provider_id
+                provider_id=scorer_settings.provider_id
             )
             
             # The result.output should be an instance of ScoringAnalysis because of output_type
@@ -127,11 +125,7 @@ class LLMImportanceScorer:
 
             # Note: reasoning is logged above but NOT stored in noise_factors
             # noise_factors expects dict[str, float], reasoning is str
-            return {
-                "importance_score": analysis.importance_score,
-                "classification": analysis.classification,
-                "noise_factors": analysis.factors,  # Only numeric factors
-            }
+            return _to_result(analysis)
 
         except Exception as e:
             logger.error(f"LLM Scoring failed for message {message.id}: {e}")
@@ -141,3 +135,169 @@ class LLMImportanceScorer:
             # Let's return a special "Error" state/score or raise.
             # Raising allows the task to retry.
             raise e
+
+    async def score_messages(
+        self, messages: Sequence[Message], db_session: AsyncSession
+    ) -> dict[UUID, dict[str, Any]]:
+        """Score messages, several per LLM call.
+
+        Messages are sent in chunks of the provider's batch size with the system
+        prompt sent once per chunk. Any message missing from a batch response
+        (or a whole chunk whose call failed) is re-scored with ``score_message``.
+
+        Args:
+            messages: Messages to score
+            db_session: Database session
+
+        Returns:
+            Legacy-compatible scoring dicts by message ID; messages that failed
+            single-message scoring as well are left out
+        """
+        if not messages:
+            return {}
+
+        author_ids = {message.author_id for message in messages}
+        authors = await db_session.execute(select(User).where(User.id.in_(author_ids)))  # type: ignore[union-attr]
+        author_names = {user.id: user.full_name for user in authors.scalars()}
+
+        scorer_settings = await self.get_settings(db_session)
+        batch_size = max(scorer_settings.batch_size, 1)
+        results: dict[UUID, dict[str, Any]] = {}
+        leftovers: list[Message] = []
+
+        for start in range(0, len(messages), batch_size):
+            chunk = messages[start : start + batch_size]
+            if len(chunk) == 1:
+                leftovers.extend(chunk)
+                continue
+            scored = await self._score_batch(chunk, author_names, scorer_settings, db_session)
+            results.update(scored)
+            leftovers.extend(message for message in chunk if message.id not in scored)
+
+        if leftovers and len(leftovers) < len(messages):
+            logger.info(f"Falling back to single-message scoring for {len(leftovers)} message(s)")
+        for message in leftovers:
+            try:
+                results[message.id] = await self.score_message(
+                    message, db_session, author_name=author_names.get(message.author_id, "Unknown")
+                )
+            except Exception:
+                continue
+
+        return results
+
+    async def _score_batch(
+        self,
+        messages: Sequence[Message],
+        author_names: dict[int | None, str],
+        scorer_settings: ScorerSettings,
+        db_session: AsyncSession,
+    ) -> dict[UUID, dict[str, Any]]:
+        """Score one chunk in a single LLM call; returns only results with a known message ID."""
+        by_id = {str(message.id): message for message in messages}
+        entries = "\n\n".join(
+            f"ID: {message.id}\n"
+            f"Author: {author_names.get(message.author_id, 'Unknown')}\n"
+            f"Content: \"{message.content or '[No Content]'}\""
+            for message in messages
+        )
+        user_prompt = (
+            f"Analyze these {len(messages)} messages:\n\n{entries}\n\n"
+            f"Output JSON with one result per message: message_id, score, classification, "
+            f"brief reasoning, and factor scores."
+        )
+        agent_config = self._agent_config(scorer_settings, SYSTEM_PROMPT + BATCH_INSTRUCTIONS, BatchScoringAnalysis)
+
+        try:
+            result = await self.llm_service.execute_prompt(
+                session=db_session,
+                config=agent_config,
+                prompt=user_prompt,
+                provider_id=scorer_settings.provider_id,
+            )
+        except Exception as e:
+            logger.warning(f"LLM batch scoring failed for {len(messages)} messages: {e}")
+            return {}
+
+        analysis: BatchScoringAnalysis = result.output
+        scored: dict[UUID, dict[str, Any]] = {}
+        for item in analysis.results:
+            message = by_id.get(item.message_id.strip())
+            if message is None or message.id in scored:
+                continue
+            scored[message.id] = _to_result(item)
+
+        logger.info(f"LLM batch scored {len(scored)}/{len(messages)} messages")
+        return scored
+
+    async def get_batch_size(self, db_session: AsyncSession) -> int:
+        """Messages scored per LLM call for the configured provider."""
+        return max((await self.get_settings(db_session)).batch_size, 1)
+
+    async def get_settings(self, db_session: AsyncSession) -> ScorerSettings:
+        """Resolve scoring agent settings, cached by the agent registry."""
+        return await self.llm_service.registry.get_config(
+            SCORER_AGENT_NAME, lambda: self._load_agent_settings(db_session)
+        )
+
+    @staticmethod
+    def _agent_config(scorer_settings: ScorerSettings, system_prompt: str, output_type: type[BaseModel]) -> AgentConfig:
+        return AgentConfig(
+            name=SCORER_AGENT_NAME,
+            description="System agent for scoring message importance and triage",
+            model_name=scorer_settings.model_name,
+            system_prompt=system_prompt,
+            output_type=output_type,
+            temperature=scorer_settings.temperature,
+        )
+
+    async def _load_agent_settings(self, db_session: AsyncSession) -> ScorerSettings:
+        """Resolve provider, model, temperature and batch size for the scoring agent.
+
+        Cached by the agent registry; invalidated when the agent config changes via the API.
+        """
+        # Config First: Try to load agent configuration from DB
+        # Note: Agent renamed from "scoring_judge" to "importance_scorer" in seed_default_agent.py
+        stmt = select(DBAgentConfig).where(DBAgentConfig.name == SCORER_AGENT_NAME)
+        result = await db_session.execute(stmt)
+        db_agent_config = result.scalar_one_or_none()
+
+        provider: LLMProvider | None
+        if db_agent_config:
+            # Found custom config in DB - use it (Config First)
+            temperature = float(db_agent_config.temperature) if db_agent_config.temperature is not None else 0.0
+            provider = await db_session.get(LLMProvider, db_agent_config.provider_id)
+            return ScorerSettings(
+                db_agent_config.provider_id, db_agent_config.model_name, temperature, _batch_size_for(provider)
+            )
+
+        # Fallback to ENV/Defaults (Cold Start)
+        from app.models import ProviderType
+
+        try:
+            provider = await self.llm_service.provider_resolver.resolve_active(db_session, ProviderType.ollama)
+        except Exception:
+            logger.warning("Could not resolve active provider, expecting fallback")
+            provider = None
+
+        return ScorerSettings(
+            provider.id if provider else None, settings.llm.ollama_model, 0.0, _batch_size_for(provider)
+        )
+
+
+def _batch_size_for(provider: LLMProvider | None) -> int:
+    """Configured scoring batch size: by provider name, then provider type."""
+    sizes = settings.llm.scoring_batch_sizes
+    if provider is None:
+        return sizes.get(settings.llm.llm_provider, 1)
+    provider_type = getattr(provider.type, "value", provider.type)
+    return sizes.get(provider.name, sizes.get(provider_type, 1))
+
+
+def _to_result(analysis: ScoringAnalysis) -> dict[str, Any]:
+    """Convert LLM analysis to the legacy scorer structure."""
+    return {
+        "importance_score": analysis.importance_score,
+        "classification": analysis.classification,
+        "noise_factors": analysis.factors,  # Only numeric factors
+    }
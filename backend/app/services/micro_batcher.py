@@ -0,0 +1,100 @@
+"""Coalesce concurrent single-item calls into batched calls.
+
+Callers ``submit`` one item and await its own result, while items arriving
+within ``max_delay`` seconds (or until ``max_items`` are pending) are handed to
+one ``flush`` call. Used by the worker to store bursts of webhook messages in
+a single transaction instead of one per task.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher[T, R]:
+    """Batch items submitted concurrently within a short window.
+
+    ``flush`` receives the items in submission order and must return one
+    result per item (same order). If it raises, every caller of that batch
+    gets the exception.
+
+    Example:
+        >>> batcher = MicroBatcher(save_many, max_items=100, max_delay=0.2)
+        >>> result = await batcher.submit(item)
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[list[R]]],
+        max_items: int = 100,
+        max_delay: float = 0.2,
+    ):
+        """Initialize batcher.
+
+        Args:
+            flush: Coroutine processing one batch
+            max_items: Batch size that triggers an immediate flush
+            max_delay: Seconds the first item of a batch waits for more items
+        """
+        self.flush = flush
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[Any]] = set()
+
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Add item to the current batch and wait for its result."""
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._start_flush)
+        return await future
+
+    async def drain(self) -> None:
+        """Flush pending items now and wait for running batches."""
+        if self._pending:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, int]:
+        """Return batch and item counters."""
+        return {"batches": self.batches, "items": self.items, "pending": len(self._pending)}
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.flush([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch flush returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Batch flush of {len(batch)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,127 @@
+"""Keyset (cursor) pagination and optional row counts for list endpoints.
+
+Offset pagination scans and discards ``(page - 1) * page_size`` rows, so deep
+pages get linearly slower. List endpoints ordered by a timestamp also return a
+``next_cursor`` encoding the ``(timestamp, id)`` of the last row; passing it
+back continues with ``WHERE (timestamp, id) < cursor`` over the composite
+``(timestamp, id)`` indexes, at constant cost per page.
+
+Totals are optional (``count=exact|estimated|none``): the estimate comes from
+``pg_class.reltuples`` for unfiltered lists and from the planner
+(``EXPLAIN``) otherwise, falling back to an exact count on other databases.
+"""
+
+import base64
+import json
+import logging
+import uuid
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import ClauseElement, Executable, func, literal, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import Select
+
+logger = logging.getLogger(__name__)
+
+
+class CountMode(StrEnum):
+    """How list endpoints compute ``total``."""
+
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(payload)
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_filter(sort_column: Any, id_column: Any, cursor: str, descending: bool = True) -> ColumnElement[bool]:
+    """Rows strictly after the cursor in ``ORDER BY sort_column, id_column``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    key = tuple_(sort_column, id_column)
+    bound = tuple_(literal(sort_value, type_=sort_column.type), literal(row_id, type_=id_column.type))
+    return key < bound if descending else key > bound
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a select (PostgreSQL)."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)  # type: ignore[no-any-return]
+
+
+async def _estimate_rows(db: AsyncSession, statement: Select[Any], table: str | None) -> int | None:
+    if table is not None:
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        )
+        # -1 until the table was first analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    plan = await db.scalar(_Explain(statement))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, KeyError, IndexError, ValueError):
+        logger.warning(f"Could not read row estimate from plan: {plan!r}")
+        return None
+
+
+async def count_rows(
+    db: AsyncSession, statement: Select[Any], mode: CountMode, table: str | None = None
+) -> tuple[int | None, bool]:
+    """Count rows of a list query according to ``mode``.
+
+    Args:
+        db: Database session
+        statement: Row-level select with the list filters (not paginated)
+        mode: exact, estimated or none
+        table: Table name when the statement is unfiltered (uses pg_class estimate)
+
+    Returns:
+        Tuple of (total or None, whether total is an estimate)
+    """
+    if mode == CountMode.none:
+        return None, False
+
+    if mode == CountMode.estimated and db.bind.dialect.name == "postgresql":
+        estimate = await _estimate_rows(db, statement, table)
+        if estimate is not None:
+            return estimate, True
+
+    total = await db.scalar(select(func.count()).select_from(statement.subquery()))
+    return total or 0, False
@@ -191,6 +191,7 @@ class ProviderCRUD(BaseCRUD[LLMProvider]):
 
         await self.session.commit()
         await self.session.refresh(provider)
+        self._invalidate_cached_agents(provider_id)
 
         if schedule_validation and connection_changed:
             self.validator.schedule_validation(str(provider.id))
@@ -221,6 +222,8 @@ class ProviderCRUD(BaseCRUD[LLMProvider]):
         )
         has_references = ref_result.first() is not None
 
+        self._invalidate_cached_agents(provider_id)
+
         if has_references:
             provider.is_active = False
             await self.session.commit()
@@ -228,6 +231,12 @@ class ProviderCRUD(BaseCRUD[LLMProvider]):
 
         return await super().delete(provider_id)
 
+    def _invalidate_cached_agents(self, provider_id: UUID) -> None:
+        """Drop cached LLM agents built for this provider (this process)."""
+        from app.llm.application.agent_registry import agent_registry
+
+        agent_registry.invalidate_provider(provider_id)
+
     async def get_decrypted_api_key(self, provider_id: UUID) -> str | None:
         """Get decrypted API key for provider.
 
@@ -172,9 +172,8 @@ class RAGContextBuilder:
                 LIMIT $2
             """
 
-            conn = await session.connection()
-            raw_conn = await conn.get_raw_connection()
-            rows = await raw_conn.driver_connection.fetch(sql, query_vector, top_k)
+            driver_conn = await self.search_service.get_vector_connection(session, top_k)
+            rows = await driver_conn.fetch(sql, query_vector, top_k)
 
             proposals = [
                 {
@@ -236,9 +235,8 @@ class RAGContextBuilder:
                 LIMIT $2
             """
 
-            conn = await session.connection()
-            raw_conn = await conn.get_raw_connection()
-            rows = await raw_conn.driver_connection.fetch(sql, query_vector, top_k)
+            driver_conn = await self.search_service.get_vector_connection(session, top_k)
+            rows = await driver_conn.fetch(sql, query_vector, top_k)
 
             atoms = [
                 {
@@ -296,9 +294,8 @@ class RAGContextBuilder:
                 LIMIT $3
             """
 
-            conn = await session.connection()
-            raw_conn = await conn.get_raw_connection()
-            rows = await raw_conn.driver_connection.fetch(sql, query_vector, exclude_ids, top_k)
+            driver_conn = await self.search_service.get_vector_connection(session, top_k)
+            rows = await driver_conn.fetch(sql, query_vector, exclude_ids, top_k)
 
             messages = [
                 {
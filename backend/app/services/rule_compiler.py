@@ -0,0 +1,227 @@
+"""Compiled automation rules and the process-wide cache of the enabled rule set.
+
+Rule conditions are stored as JSON text. Instead of decoding and interpreting
+them for every evaluated version, each enabled rule is compiled once into a
+predicate closure: the field path is pre-split, the operator is resolved to a
+function and the expected value is converted up front (to float for numeric
+comparisons, lower-cased for string matching).
+
+The compiled rule set is cached per process. The automation API invalidates it
+whenever a rule changes; ``ttl`` bounds staleness for processes that did not
+see the change (e.g. workers).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.automation_rule import AutomationRule, ConditionOperator, LogicOperator, RuleAction
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+NUMERIC_OPERATORS: dict[str, Callable[[float, float], bool]] = {
+    ConditionOperator.gte: lambda actual, expected: actual >= expected,
+    ConditionOperator.lte: lambda actual, expected: actual <= expected,
+    ConditionOperator.gt: lambda actual, expected: actual > expected,
+    ConditionOperator.lt: lambda actual, expected: actual < expected,
+}
+
+STRING_OPERATORS: dict[str, Callable[[str, str], bool]] = {
+    ConditionOperator.contains: lambda actual, expected: expected in actual,
+    ConditionOperator.starts_with: lambda actual, expected: actual.startswith(expected),
+    ConditionOperator.ends_with: lambda actual, expected: actual.endswith(expected),
+}
+
+
+def _never(version_data: dict[str, Any]) -> bool:
+    return False
+
+
+def compile_field_getter(field_path: str) -> Callable[[dict[str, Any]], Any]:
+    """Build a getter for a dotted field path (None when missing or not a dict)."""
+    parts = tuple(field_path.split("."))
+
+    def get(version_data: dict[str, Any]) -> Any:
+        current: Any = version_data
+        for part in parts:
+            if not isinstance(current, dict):
+                return None
+            current = current.get(part)
+            if current is None:
+                return None
+        return current
+
+    return get
+
+
+def compile_condition(condition: Any) -> Predicate:
+    """Compile one condition dict into a predicate over version data.
+
+    Missing values and values that cannot be compared never match; string
+    operators are case-insensitive.
+    """
+    if not isinstance(condition, dict):
+        return _never
+    field = condition.get("field")
+    operator = condition.get("operator")
+    expected = condition.get("value")
+    if not field or not operator:
+        return _never
+
+    get = compile_field_getter(str(field))
+
+    if operator in NUMERIC_OPERATORS:
+        compare_numbers = NUMERIC_OPERATORS[operator]
+        try:
+            expected_number = float(expected)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return _never
+
+        def numeric(version_data: dict[str, Any]) -> bool:
+            actual = get(version_data)
+            if actual is None:
+                return False
+            try:
+                return compare_numbers(float(actual), expected_number)
+            except (TypeError, ValueError):
+                return False
+
+        return numeric
+
+    if operator in STRING_OPERATORS:
+        compare_strings = STRING_OPERATORS[operator]
+        expected_text = str(expected).lower()
+
+        def text(version_data: dict[str, Any]) -> bool:
+            actual = get(version_data)
+            return actual is not None and compare_strings(str(actual).lower(), expected_text)
+
+        return text
+
+    if operator == ConditionOperator.eq:
+        return lambda version_data: (actual := get(version_data)) is not None and bool(actual == expected)
+    if operator == ConditionOperator.neq:
+        return lambda version_data: (actual := get(version_data)) is not None and bool(actual != expected)
+
+    return _never
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Enabled automation rule with its conditions compiled into one predicate."""
+
+    id: int
+    name: str
+    action: RuleAction
+    priority: int
+    matches: Predicate
+
+
+def compile_rule(rule: AutomationRule) -> CompiledRule:
+    """Compile a rule; rules with invalid or empty conditions never match."""
+    try:
+        conditions = json.loads(rule.conditions)
+    except json.JSONDecodeError:
+        logger.warning(f"Automation rule {rule.id} has invalid conditions JSON, skipping")
+        conditions = None
+
+    if not conditions or not isinstance(conditions, list):
+        matches: Predicate = _never
+    else:
+        predicates = tuple(compile_condition(condition) for condition in conditions)
+        if rule.logic_operator == LogicOperator.AND:
+            matches = lambda version_data: all(predicate(version_data) for predicate in predicates)  # noqa: E731
+        else:
+            matches = lambda version_data: any(predicate(version_data) for predicate in predicates)  # noqa: E731
+
+    return CompiledRule(
+        id=rule.id,  # type: ignore[arg-type]
+        name=rule.name,
+        action=RuleAction(rule.action),
+        priority=rule.priority,
+        matches=matches,
+    )
+
+
+class RuleSetCache:
+    """Process-wide cache of the compiled enabled rules, in evaluation order.
+
+    Example:
+        >>> rules = await rule_set_cache.get(session)
+        >>> rule_set_cache.invalidate()
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds a compiled rule set stays valid without invalidation
+        """
+        self.ttl = ttl
+        self._rules: tuple[CompiledRule, ...] | None = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, session: AsyncSession) -> tuple[CompiledRule, ...]:
+        """Return compiled enabled rules (priority desc, id asc), loading them on a miss."""
+        rules = self._fresh()
+        if rules is not None:
+            self.hits += 1
+            return rules
+
+        async with self._lock:
+            rules = self._fresh()
+            if rules is not None:
+                self.hits += 1
+                return rules
+
+            self.misses += 1
+            generation = self._generation
+            query = (
+                select(AutomationRule)
+                .where(AutomationRule.enabled == True)  # type: ignore[arg-type]  # noqa: E712
+                .order_by(AutomationRule.priority.desc(), AutomationRule.id.asc())  # type: ignore[attr-defined,union-attr]
+            )
+            result = await session.execute(query)
+            rules = tuple(compile_rule(rule) for rule in result.scalars().all())
+
+            # A rule changed while loading: use the result once, but don't cache it
+            if generation == self._generation:
+                self._rules = rules
+                self._loaded_at = time.monotonic()
+            logger.debug(f"Compiled {len(rules)} enabled automation rules")
+            return rules
+
+    def invalidate(self) -> None:
+        """Drop the compiled rule set; the next evaluation recompiles it."""
+        self._generation += 1
+        self._rules = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Cache statistics for monitoring."""
+        return {
+            "cached_rules": len(self._rules) if self._rules is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _fresh(self) -> tuple[CompiledRule, ...] | None:
+        if self._rules is None or time.monotonic() - self._loaded_at > self.ttl:
+            return None
+        return self._rules
+
+
+rule_set_cache = RuleSetCache()
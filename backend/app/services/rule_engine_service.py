@@ -1,13 +1,18 @@
 """Rule engine service for evaluating automation rules against versions."""
 
-import json
+from collections import Counter
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import select, update
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.automation_rule import AutomationRule, ConditionOperator, LogicOperator, RuleAction, RuleCondition
+from app.models.atom_version import AtomVersion
+from app.models.automation_rule import AutomationRule, RuleAction, RuleCondition
+from app.models.topic_version import TopicVersion
+from app.services.rule_compiler import CompiledRule, rule_set_cache
+from app.services.rule_preview import preview_rule
 from app.services.versioning import VersioningService
 from app.services.websocket_manager import websocket_manager
 
@@ -39,178 +44,86 @@ class RuleEngineService:
         Returns:
             Tuple of (action, rule_id) if matched, otherwise (None, None)
         """
-        query = (
-            select(AutomationRule)
-            .where(AutomationRule.enabled == True)  # noqa: E712  # type: ignore[arg-type]
-            .order_by(AutomationRule.priority.desc(), AutomationRule.id.asc())
-        )
-        result = await session.execute(query)
-        rules = result.scalars().all()
-
-        for rule in rules:
-            if await self._evaluate_rule(session, rule, version_data):
-                await self._record_trigger(session, rule)
+        for rule in await rule_set_cache.get(session):
+            if rule.matches(version_data):
+                await self._record_trigger(session, rule.id)
                 await self._broadcast_rule_triggered(rule, entity_id, version_id)
                 return rule.action, rule.id
 
         return None, None
 
-    async def _evaluate_rule(
+    async def evaluate_versions(
         self,
         session: AsyncSession,
-        rule: AutomationRule,
-        version_data: dict[str, Any],
-    ) -> bool:
-        """
-        Evaluate rule conditions against version data.
-
-        Args:
-            session: Database session
-            rule: Automation rule to evaluate
-            version_data: Version data to check
-
-        Returns:
-            True if rule matches, False otherwise
+        versions: Sequence[TopicVersion | AtomVersion],
+    ) -> list[tuple[RuleAction | None, int | None]]:
         """
-        try:
-            conditions = json.loads(rule.conditions)
-        except json.JSONDecodeError:
-            return False
-
-        if not conditions:
-            return False
-
-        results = [self._evaluate_condition(condition, version_data) for condition in conditions]
+        Evaluate many versions against active rules in one pass.
 
-        if rule.logic_operator == LogicOperator.AND:
-            return all(results)
-        else:
-            return any(results)
-
-    def _evaluate_condition(
-        self,
-        condition: dict[str, Any],
-        version_data: dict[str, Any],
-    ) -> bool:
-        """
-        Evaluate single condition against version data.
+        Uses the same compiled rule set as ``evaluate_version`` and records
+        triggers with one UPDATE per matched rule and a single commit.
 
         Args:
-            condition: Condition dict with field, operator, value
-            version_data: Version data to check
-
-        Returns:
-            True if condition matches, False otherwise
-        """
-        field = condition.get("field")
-        operator = condition.get("operator")
-        expected_value = condition.get("value")
-
-        if not field or not operator:
-            return False
-
-        actual_value = self._extract_field_value(version_data, field)
-
-        if actual_value is None:
-            return False
-
-        try:
-            return self._apply_operator(operator, actual_value, expected_value)
-        except (TypeError, ValueError):
-            return False
-
-    def _extract_field_value(
-        self,
-        version_data: dict[str, Any],
-        field_path: str,
-    ) -> Any:
-        """
-        Extract field value from version data, supporting nested paths.
-
-        Args:
-            version_data: Version data dict
-            field_path: Field path (e.g., "confidence" or "topic.name")
-
-        Returns:
-            Extracted value or None if not found
-        """
-        parts = field_path.split(".")
-        current = version_data
-
-        for part in parts:
-            if isinstance(current, dict):
-                current = current.get(part)
-                if current is None:
-                    return None
-            else:
-                return None
-
-        return current
-
-    def _apply_operator(
-        self,
-        operator: str,
-        actual_value: Any,
-        expected_value: Any,
-    ) -> bool:
-        """
-        Apply comparison operator.
-
-        Args:
-            operator: Comparison operator
-            actual_value: Actual value from version data
-            expected_value: Expected value from condition
+            session: Database session
+            versions: Topic and/or atom versions to evaluate
 
         Returns:
-            Comparison result
-        """
-        if operator == ConditionOperator.gte:
-            return float(actual_value) >= float(expected_value)
-        elif operator == ConditionOperator.lte:
-            return float(actual_value) <= float(expected_value)
-        elif operator == ConditionOperator.gt:
-            return float(actual_value) > float(expected_value)
-        elif operator == ConditionOperator.lt:
-            return float(actual_value) < float(expected_value)
-        elif operator == ConditionOperator.eq:
-            return actual_value == expected_value
-        elif operator == ConditionOperator.neq:
-            return actual_value != expected_value
-        elif operator == ConditionOperator.contains:
-            return str(expected_value).lower() in str(actual_value).lower()
-        elif operator == ConditionOperator.starts_with:
-            return str(actual_value).lower().startswith(str(expected_value).lower())
-        elif operator == ConditionOperator.ends_with:
-            return str(actual_value).lower().endswith(str(expected_value).lower())
-        else:
-            return False
+            (action, rule_id) per version, in input order; (None, None) if no rule matched
+        """
+        rules = await rule_set_cache.get(session)
+        results: list[tuple[RuleAction | None, int | None]] = []
+        matched: list[tuple[CompiledRule, TopicVersion | AtomVersion]] = []
+
+        for version in versions:
+            rule = next((rule for rule in rules if rule.matches(version.data)), None)
+            if rule is None:
+                results.append((None, None))
+                continue
+            results.append((rule.action, rule.id))
+            matched.append((rule, version))
+
+        if matched:
+            hits = Counter(rule.id for rule, _ in matched)
+            for rule_id, count in hits.items():
+                await self._record_trigger(session, rule_id, count, commit=False)
+            await session.commit()
+            for rule, version in matched:
+                entity_id = version.topic_id if isinstance(version, TopicVersion) else version.atom_id
+                await self._broadcast_rule_triggered(rule, entity_id, version.id)  # type: ignore[arg-type]
+
+        return results
 
     async def _record_trigger(
         self,
         session: AsyncSession,
-        rule: AutomationRule,
+        rule_id: int,
+        count: int = 1,
+        commit: bool = True,
     ) -> None:
         """
         Record rule trigger (increment counters, update timestamp).
 
         Args:
             session: Database session
-            rule: Triggered rule
+            rule_id: Triggered rule ID
+            count: Number of versions the rule matched
+            commit: Commit after the update
         """
         stmt = (
             update(AutomationRule)
-            .where(AutomationRule.id == rule.id)
+            .where(AutomationRule.id == rule_id)
             .values(
-                triggered_count=AutomationRule.triggered_count + 1,
+                triggered_count=AutomationRule.triggered_count + count,
                 last_triggered=datetime.now(UTC),
             )
         )
         await session.execute(stmt)
-        await session.commit()
+        if commit:
+            await session.commit()
 
     async def _broadcast_rule_triggered(
         self,
-        rule: AutomationRule,
+        rule: CompiledRule,
         entity_id: int,
         version_id: int,
     ) -> None:
@@ -311,6 +224,8 @@ class RuleEngineService:
         """
         Preview rule impact on current pending versions.
 
+        Supported conditions run as SQL aggregates; see ``app.services.rule_preview``.
+
         Args:
             session: Database session
             conditions: List of conditions
@@ -319,7 +234,8 @@ class RuleEngineService:
         Returns:
             Tuple of (affected_count, sample_versions)
         """
-        return 0, []
+        preview = await preview_rule(session, conditions, logic_operator)
+        return preview.affected_count, preview.sample_versions
 
 
 rule_engine_service = RuleEngineService()
@@ -0,0 +1,290 @@
+"""Rule impact preview over pending topic and atom versions.
+
+Conditions are translated into SQL over the JSON ``data`` column wherever SQL
+reproduces the rule engine's semantics (``app.services.rule_compiler``)
+exactly, so a typical preview is one aggregate query per version table plus a
+query for sample rows.
+
+A translated condition is tri-state per row: matched, not matched, or
+undecided. Undecided covers values SQL cannot judge like Python does, e.g. a
+numeric comparison on a JSON string (``float()`` parses more than a SQL cast)
+or a non-ASCII pattern (SQLite only lower-cases ASCII). Conditions that cannot
+be translated at all (numeric path segments, unknown operators) are undecided
+for every row. Rows the decided conditions don't settle are fetched in keyset
+batches, and only their undecided conditions are evaluated in Python, one
+condition column at a time.
+"""
+
+import logging
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Float, Numeric, and_, case, cast, false, func, literal, null, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.atom_version import AtomVersion
+from app.models.automation_rule import ConditionOperator, LogicOperator, RuleCondition
+from app.models.topic_version import TopicVersion
+from app.services.rule_compiler import NUMERIC_OPERATORS, STRING_OPERATORS, Predicate, compile_condition
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 10
+BATCH_SIZE = 5_000
+
+VERSION_TABLES: tuple[tuple[str, type[TopicVersion] | type[AtomVersion], str], ...] = (
+    ("topic", TopicVersion, "topic_id"),
+    ("atom", AtomVersion, "atom_id"),
+)
+
+
+@dataclass
+class RulePreview:
+    """Preview result: number of matching pending versions and a sample of them."""
+
+    affected_count: int
+    sample_versions: list[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class TranslatedCondition:
+    """SQL form of a condition: ``matched`` is meaningful only where ``decided``."""
+
+    decided: ColumnElement[bool]
+    matched: ColumnElement[bool]
+
+
+class JsonField:
+    """Dialect-specific accessors for one dotted path inside a JSON column.
+
+    ``kind`` is the JSON type name (number, string, boolean, null, object,
+    array), NULL when the path is missing.
+    """
+
+    def __init__(self, dialect: str, data: Any, parts: Sequence[str]):
+        self.dialect = dialect
+        if dialect == "postgresql":
+            self.kind: ColumnElement[Any] = func.json_typeof(func.json_extract_path(data, *parts))
+            self.text: ColumnElement[Any] = func.json_extract_path_text(data, *parts)
+            # NUMERIC instead of float8: JSON numbers beyond the float8 range must not raise
+            self.number: ColumnElement[Any] = cast(self.text, Numeric)
+            self.is_true: ColumnElement[bool] = self.text == "true"
+        else:
+            path = "$" + "".join(f'."{part}"' for part in parts)
+            sqlite_type = func.json_type(data, path)
+            self.kind = case(
+                (sqlite_type.in_(("integer", "real")), "number"),
+                (sqlite_type == "text", "string"),
+                (sqlite_type.in_(("true", "false")), "boolean"),
+                else_=sqlite_type,
+            )
+            value = func.json_extract(data, path)
+            self.text = value
+            self.number = cast(value, Float)
+            self.is_true = sqlite_type == "true"
+
+    def number_literal(self, value: float) -> ColumnElement[Any]:
+        if self.dialect == "postgresql":
+            return literal(Decimal(repr(value)), Numeric)
+        return literal(value, Float)
+
+    def absent(self) -> ColumnElement[bool]:
+        return or_(self.kind.is_(None), self.kind == "null")
+
+    def of_kind(self, *kinds: str) -> ColumnElement[bool]:
+        return and_(self.kind.is_not(None), self.kind.in_(kinds))
+
+
+def translate_condition(dialect: str, data: Any, condition: RuleCondition) -> TranslatedCondition | None:
+    """Translate a condition into SQL, or None if it must be evaluated in Python."""
+    parts = condition.field.split(".")
+    if any(not part or part.isdigit() or '"' in part for part in parts):
+        return None
+    operator = condition.operator
+    expected = condition.value
+    if isinstance(expected, bool):
+        return None
+
+    field = JsonField(dialect, data, parts)
+    boolean_number = case((field.is_true, 1), else_=0)
+
+    if operator in NUMERIC_OPERATORS:
+        try:
+            threshold = float(expected)
+        except ValueError:
+            return TranslatedCondition(decided=true(), matched=false())
+        if not math.isfinite(threshold):
+            return None
+        number, flag = field.number_literal(threshold), literal(threshold, Float)
+        compare = {
+            ConditionOperator.gte: (field.number >= number, boolean_number >= flag),
+            ConditionOperator.lte: (field.number <= number, boolean_number <= flag),
+            ConditionOperator.gt: (field.number > number, boolean_number > flag),
+            ConditionOperator.lt: (field.number < number, boolean_number < flag),
+        }[operator]
+        return TranslatedCondition(
+            # float() of a JSON string is left to Python
+            decided=or_(field.kind.is_(None), field.kind != "string"),
+            matched=case(
+                (field.kind == "number", compare[0]),
+                (field.kind == "boolean", compare[1]),
+                else_=false(),
+            ),
+        )
+
+    if operator in (ConditionOperator.eq, ConditionOperator.neq):
+        if isinstance(expected, str):
+            equal = and_(field.of_kind("string"), field.text == expected)
+        else:
+            equal = case(
+                (field.kind == "number", field.number == field.number_literal(float(expected))),
+                (field.kind == "boolean", boolean_number == literal(float(expected), Float)),
+                else_=false(),
+            )
+        if operator == ConditionOperator.neq:
+            equal = and_(~field.absent(), ~equal)
+        return TranslatedCondition(decided=true(), matched=equal)
+
+    if operator in STRING_OPERATORS:
+        pattern = str(expected).lower()
+        if not pattern.isascii():
+            return None
+        compare_strings = STRING_OPERATORS[operator]
+        lowered = func.lower(field.text)
+        text_match = {
+            ConditionOperator.contains: lowered.contains(pattern, autoescape=True),
+            ConditionOperator.starts_with: lowered.startswith(pattern, autoescape=True),
+            ConditionOperator.ends_with: lowered.endswith(pattern, autoescape=True),
+        }[operator]
+        return TranslatedCondition(
+            # str() of numbers, objects and arrays is Python-specific
+            decided=or_(field.absent(), field.of_kind("string", "boolean")),
+            matched=case(
+                (field.kind == "string", text_match),
+                (
+                    field.kind == "boolean",
+                    case((field.is_true, compare_strings("true", pattern)), else_=compare_strings("false", pattern)),
+                ),
+                else_=false(),
+            ),
+        )
+
+    return None
+
+
+async def preview_rule(
+    session: AsyncSession,
+    conditions: Sequence[RuleCondition],
+    logic_operator: str,
+    sample_size: int = SAMPLE_SIZE,
+) -> RulePreview:
+    """Count pending versions a rule would match and collect a sample of them.
+
+    Args:
+        session: Database session
+        conditions: Rule conditions
+        logic_operator: "AND" or "OR" (anything but AND combines with OR, like the rule engine)
+        sample_size: Maximum sample versions returned
+
+    Returns:
+        RulePreview with the total across topic and atom versions
+    """
+    preview = RulePreview(affected_count=0, sample_versions=[])
+    if not conditions:
+        return preview
+
+    use_and = logic_operator == LogicOperator.AND
+    dialect = session.bind.dialect.name
+    predicates = [compile_condition(condition.model_dump(mode="json")) for condition in conditions]
+
+    for entity_type, model, entity_key in VERSION_TABLES:
+        table = model.__table__  # type: ignore[union-attr]
+        data = table.c.data
+        translated = [translate_condition(dialect, data, condition) for condition in conditions]
+        decided_true, decided_false = _combine(translated, use_and)
+        undecided = and_(~decided_true, ~decided_false)
+        pending = table.c.approved == False  # noqa: E712
+
+        counts = await session.execute(
+            select(func.count().filter(decided_true), func.count().filter(undecided)).where(pending)
+        )
+        matched_count, undecided_count = counts.one()
+        preview.affected_count += matched_count
+        logger.debug(
+            f"Rule preview on {entity_type} versions: {matched_count} matched in SQL, {undecided_count} left for Python"
+        )
+
+        columns = (table.c.id, table.c[entity_key], table.c.version, data, table.c.created_at)
+        needed = sample_size - len(preview.sample_versions)
+        if matched_count and needed > 0:
+            samples = await session.execute(
+                select(*columns).where(pending, decided_true).order_by(table.c.id.desc()).limit(needed)
+            )
+            preview.sample_versions += [_sample(entity_type, row) for row in samples]
+
+        if undecided_count:
+            tri_states = [
+                null() if sql is None else case((sql.decided, sql.matched), else_=null()) for sql in translated
+            ]
+            last_id = 0
+            while True:
+                rows = (
+                    await session.execute(
+                        select(*columns, *tri_states)
+                        .where(pending, undecided, table.c.id > last_id)
+                        .order_by(table.c.id)
+                        .limit(BATCH_SIZE)
+                    )
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                for row, matched in zip(rows, _evaluate_batch(rows, predicates, use_and), strict=True):
+                    if matched:
+                        preview.affected_count += 1
+                        if len(preview.sample_versions) < sample_size:
+                            preview.sample_versions.append(_sample(entity_type, row))
+
+    return preview
+
+
+def _combine(
+    translated: Sequence[TranslatedCondition | None], use_and: bool
+) -> tuple[ColumnElement[bool], ColumnElement[bool]]:
+    """Build (rule certainly matches, rule certainly does not match) from condition tri-states."""
+    sure_true = [false() if sql is None else and_(sql.decided, sql.matched) for sql in translated]
+    sure_false = [false() if sql is None else and_(sql.decided, ~sql.matched) for sql in translated]
+    if use_and:
+        return and_(*sure_true), or_(*sure_false)
+    return or_(*sure_true), and_(*sure_false)
+
+
+def _evaluate_batch(rows: Sequence[Any], predicates: Sequence[Predicate], use_and: bool) -> list[bool]:
+    """Finish undecided rows: run each condition in Python only where SQL left it open."""
+    offset = 5
+    results: list[bool] | None = None
+    for index, predicate in enumerate(predicates):
+        column = [row[offset + index] for row in rows]
+        column = [predicate(row[3]) if value is None else bool(value) for row, value in zip(rows, column, strict=True)]
+        if results is None:
+            results = column
+        elif use_and:
+            results = [a and b for a, b in zip(results, column, strict=True)]
+        else:
+            results = [a or b for a, b in zip(results, column, strict=True)]
+    return results or []
+
+
+def _sample(entity_type: str, row: Any) -> dict[str, Any]:
+    return {
+        "id": row[0],
+        "entity_type": entity_type,
+        "entity_id": str(row[1]),
+        "version": row[2],
+        "data": row[3],
+        "created_at": row[4].isoformat() if row[4] else None,
+    }
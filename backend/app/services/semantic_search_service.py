@@ -6,35 +6,158 @@ and general text-based search queries.
 """
 
 import logging
+import math
+from collections.abc import Sequence
+from typing import Any, ClassVar
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.config.ai_config import ai_config
 from app.models.atom import Atom
 from app.models.message import Message
 from app.models.topic import Topic
 from app.services.embedding_service import EmbeddingService
+from app.services.vector_query_builder import VectorQueryBuilder
 
 logger = logging.getLogger(__name__)
 
 
+def vector_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity on the 0.0-1.0 scale used by the SQL queries (``1 - distance / 2``)."""
+    dot = math.fsum(x * y for x, y in zip(a, b, strict=True))
+    norm = math.sqrt(math.fsum(x * x for x in a)) * math.sqrt(math.fsum(y * y for y in b))
+    if not norm:
+        return 0.5
+    return (1 + dot / norm) / 2
+
+
 class SemanticSearchService:
     """Service for vector-based semantic search using pgvector cosine similarity.
 
     Uses the <=> cosine distance operator from pgvector. Cosine distance ranges from
     0 (identical vectors) to 2 (opposite vectors). We convert this to a similarity
     score using: similarity = 1 - (distance / 2), which maps to 0.0-1.0 range.
+
+    Queries are served by HNSW indexes; ``ef_search`` trades recall for latency.
+    Top-k candidates are fetched in index order first and the similarity threshold
+    is applied afterwards, over-fetching adaptively when filters drop candidates.
     """
 
-    def __init__(self, embedding_service: EmbeddingService | None = None):
+    # pgvector version check is done once per process (iterative scans need >= 0.8)
+    _iterative_scan_supported: ClassVar[bool | None] = None
+
+    def __init__(self, embedding_service: EmbeddingService | None = None, ef_search: int | None = None):
         """Initialize semantic search service.
 
         Args:
             embedding_service: Optional embedding service for query vectorization.
                 Required for text-based search methods, optional for similarity
                 methods that use existing embeddings.
+            ef_search: HNSW query-time candidate list size (default: from config).
+                Higher values improve recall at the cost of latency.
         """
         self.embedding_service = embedding_service
+        self.ef_search = ef_search if ef_search is not None else ai_config.vector_search.hnsw_ef_search
+
+    async def get_vector_connection(self, session: AsyncSession, limit: int) -> Any:
+        """Return the asyncpg connection with ``hnsw.ef_search`` set for this transaction.
+
+        ``ef_search`` is raised to ``limit`` when smaller, since HNSW cannot return more
+        rows than its candidate list.
+
+        Args:
+            session: Database session
+            limit: Number of rows the caller will request
+
+        Returns:
+            Raw asyncpg connection bound to the session transaction
+        """
+        # Settings go through the session: it opens the transaction the raw connection
+        # would otherwise only start lazily, after SET LOCAL had already been discarded
+        iterative_scan = ai_config.vector_search.hnsw_iterative_scan
+        if iterative_scan != "off" and await self._supports_iterative_scan(session):
+            await session.execute(VectorQueryBuilder.build_iterative_scan_statement(iterative_scan))
+
+        ef_search = min(max(self.ef_search, limit), 1000)
+        await session.execute(VectorQueryBuilder.build_ef_search_statement(ef_search))
+
+        conn = await session.connection()
+        raw_conn = await conn.get_raw_connection()
+        driver_conn = raw_conn.driver_connection
+        assert driver_conn is not None, "Driver connection is None"
+        return driver_conn
+
+    @classmethod
+    async def _supports_iterative_scan(cls, session: AsyncSession) -> bool:
+        """Check (once per process) whether installed pgvector supports iterative scans."""
+        if cls._iterative_scan_supported is None:
+            try:
+                version = await session.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+                major, minor = (int(part) for part in str(version).split(".")[:2])
+                cls._iterative_scan_supported = (major, minor) >= (0, 8)
+            except (TypeError, ValueError):
+                cls._iterative_scan_supported = False
+            logger.info(f"pgvector iterative index scans supported: {cls._iterative_scan_supported}")
+        return cls._iterative_scan_supported
+
+    async def _search_top_k(
+        self,
+        session: AsyncSession,
+        table: str,
+        query_vector: str,
+        limit: int,
+        threshold: float,
+        where_conditions: str = "",
+        extra_params: Sequence[Any] = (),
+    ) -> list[dict[str, Any]]:
+        """Run an index-ordered top-k query and apply the similarity threshold afterwards.
+
+        Starts with ``limit * candidate_overfetch_factor`` candidates. If the index scan
+        returned fewer candidates than requested (filters dropped rows past
+        ``ef_search``) and every candidate passed the threshold, the candidate limit is
+        quadrupled and the query retried, up to ``max_candidates``.
+
+        Args:
+            session: Database session
+            table: Table with alias (e.g. "messages m")
+            query_vector: Query embedding as pgvector literal
+            limit: Maximum number of results
+            threshold: Minimum similarity score
+            where_conditions: Extra conditions using parameters ``$5`` onwards
+            extra_params: Values for the extra condition parameters
+
+        Returns:
+            Row dicts ordered by similarity (highest first), including ``similarity``
+        """
+        alias = table.split()[-1]
+        sql = VectorQueryBuilder.build_similarity_query(
+            table, select_clause=f"{alias}.*", where_conditions=where_conditions, positional=True
+        )
+        max_candidates = max(ai_config.vector_search.max_candidates, limit)
+        candidate_limit = min(limit * ai_config.vector_search.candidate_overfetch_factor, max_candidates)
+
+        while True:
+            driver_conn = await self.get_vector_connection(session, candidate_limit)
+            rows = [
+                dict(row)
+                for row in await driver_conn.fetch(sql, query_vector, candidate_limit, threshold, limit, *extra_params)
+            ]
+            candidate_count = rows[0]["candidate_count"] if rows else 0
+
+            truncated = len(rows) == candidate_count < candidate_limit
+            if len(rows) >= limit or not rows or not truncated or candidate_limit >= max_candidates:
+                break
+
+            candidate_limit = min(candidate_limit * 4, max_candidates)
+            logger.debug(
+                f"Over-fetching {table} candidates: {len(rows)}/{limit} results, retrying with {candidate_limit}"
+            )
+
+        for row in rows:
+            row.pop("candidate_count", None)
+        return rows
 
     async def search_messages(
         self,
@@ -77,28 +200,10 @@ class SemanticSearchService:
         query_vector = str(query_embedding)
 
         # Use raw SQL with asyncpg's native parameter binding
-        sql = """
-            SELECT
-                m.*,
-                1 - (m.embedding <=> $1::vector) / 2 AS similarity
-            FROM messages m
-            WHERE
-                m.embedding IS NOT NULL
-                AND (1 - (m.embedding <=> $1::vector) / 2) >= $2
-            ORDER BY m.embedding <=> $1::vector
-            LIMIT $3
-        """
-
-        # Get the raw asyncpg connection and execute
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-        rows = await driver_conn.fetch(sql, query_vector, threshold, limit)
+        rows = await self._search_top_k(session, "messages m", query_vector, limit, threshold)
 
         messages_with_scores: list[tuple[Message, float]] = []
         for row in rows:
-            # asyncpg returns dict-like Record objects
             message_dict = dict(row)
             similarity = message_dict.pop("similarity")
 
@@ -138,7 +243,7 @@ class SemanticSearchService:
         if threshold is None:
             threshold = ai_config.vector_search.semantic_search_threshold
 
-        source_message = await session.get(Message, message_id)
+        source_message = await session.get(Message, message_id, options=[undefer(Message.embedding)])  # type: ignore[arg-type]
         if not source_message:
             raise ValueError(f"Message {message_id} not found")
 
@@ -147,29 +252,12 @@ class SemanticSearchService:
 
         query_vector = str(source_message.embedding)
 
-        sql = """
-            SELECT
-                m.*,
-                1 - (m.embedding <=> $1::vector) / 2 AS similarity
-            FROM messages m
-            WHERE
-                m.embedding IS NOT NULL
-                AND m.id != $2
-                AND (1 - (m.embedding <=> $1::vector) / 2) >= $3
-            ORDER BY m.embedding <=> $1::vector
-            LIMIT $4
-        """
-
-        # Get the raw asyncpg connection and execute
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-        rows = await driver_conn.fetch(sql, query_vector, message_id, threshold, limit)
+        rows = await self._search_top_k(
+            session, "messages m", query_vector, limit, threshold, "m.id != $5", (message_id,)
+        )
 
         messages_with_scores: list[tuple[Message, float]] = []
         for row in rows:
-            # asyncpg returns dict-like Record objects
             message_dict = dict(row)
             similarity = message_dict.pop("similarity")
 
@@ -260,28 +348,10 @@ class SemanticSearchService:
         query_embedding = await self.embedding_service.generate_embedding(query)
         query_vector = str(query_embedding)
 
-        sql = """
-            SELECT
-                a.*,
-                1 - (a.embedding <=> $1::vector) / 2 AS similarity
-            FROM atoms a
-            WHERE
-                a.embedding IS NOT NULL
-                AND (1 - (a.embedding <=> $1::vector) / 2) >= $2
-            ORDER BY a.embedding <=> $1::vector
-            LIMIT $3
-        """
-
-        # Get the raw asyncpg connection and execute
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-        rows = await driver_conn.fetch(sql, query_vector, threshold, limit)
+        rows = await self._search_top_k(session, "atoms a", query_vector, limit, threshold)
 
         atoms_with_scores: list[tuple[Atom, float]] = []
         for row in rows:
-            # asyncpg returns dict-like Record objects
             atom_dict = dict(row)
             similarity = atom_dict.pop("similarity")
 
@@ -321,7 +391,7 @@ class SemanticSearchService:
         if threshold is None:
             threshold = ai_config.vector_search.semantic_search_threshold
 
-        source_atom = await session.get(Atom, atom_id)
+        source_atom = await session.get(Atom, atom_id, options=[undefer(Atom.embedding)])  # type: ignore[arg-type]
         if not source_atom:
             raise ValueError(f"Atom {atom_id} not found")
 
@@ -330,29 +400,10 @@ class SemanticSearchService:
 
         query_vector = str(source_atom.embedding)
 
-        sql = """
-            SELECT
-                a.*,
-                1 - (a.embedding <=> $1::vector) / 2 AS similarity
-            FROM atoms a
-            WHERE
-                a.embedding IS NOT NULL
-                AND a.id != $2
-                AND (1 - (a.embedding <=> $1::vector) / 2) >= $3
-            ORDER BY a.embedding <=> $1::vector
-            LIMIT $4
-        """
-
-        # Get the raw asyncpg connection and execute
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-        rows = await driver_conn.fetch(sql, query_vector, atom_id, threshold, limit)
+        rows = await self._search_top_k(session, "atoms a", query_vector, limit, threshold, "a.id != $5", (atom_id,))
 
         atoms_with_scores: list[tuple[Atom, float]] = []
         for row in rows:
-            # asyncpg returns dict-like Record objects
             atom_dict = dict(row)
             similarity = atom_dict.pop("similarity")
 
@@ -363,6 +414,58 @@ class SemanticSearchService:
 
         return atoms_with_scores
 
+    async def search_by_vectors(
+        self,
+        session: AsyncSession,
+        table: str,
+        embeddings: Sequence[list[float]],
+        limit: int = 10,
+        threshold: float | None = None,
+        select_clause: str | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Find nearest neighbours of many embeddings with a single query.
+
+        Batch counterpart of the per-vector searches, used for deduplicating a whole
+        extraction at once.
+
+        Args:
+            session: Database session
+            table: Table with alias (e.g. "atoms a")
+            embeddings: Query embedding vectors
+            limit: Maximum number of neighbours per vector
+            threshold: Minimum similarity score (default: from config)
+            select_clause: Columns to return (default: the alias id)
+
+        Returns:
+            One list of row dicts per embedding (input order), each ordered by
+            similarity (highest first) and including ``similarity``
+        """
+        if threshold is None:
+            threshold = ai_config.vector_search.semantic_search_threshold
+
+        if not embeddings:
+            return []
+
+        alias = table.split()[-1]
+        sql = VectorQueryBuilder.build_batch_similarity_query(table, select_clause or f"{alias}.id")
+        candidate_limit = min(
+            limit * ai_config.vector_search.candidate_overfetch_factor,
+            max(ai_config.vector_search.max_candidates, limit),
+        )
+
+        driver_conn = await self.get_vector_connection(session, candidate_limit)
+        rows = await driver_conn.fetch(
+            sql, [str(embedding) for embedding in embeddings], candidate_limit, threshold, limit
+        )
+
+        neighbours: list[list[dict[str, Any]]] = [[] for _ in embeddings]
+        for row in rows:
+            row_dict = dict(row)
+            neighbours[row_dict.pop("query_index")].append(row_dict)
+
+        logger.info(f"Resolved neighbours of {len(embeddings)} vectors in {table} (threshold={threshold})")
+        return neighbours
+
     async def search_atoms_by_vector(
         self,
         session: AsyncSession,
@@ -404,40 +507,12 @@ class SemanticSearchService:
 
         query_vector = str(embedding)
 
-        # Get the raw asyncpg connection
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-
-        # Build SQL with optional exclusion and execute
         if exclude_atom_id:
-            sql = """
-                SELECT
-                    a.*,
-                    1 - (a.embedding <=> $1::vector) / 2 AS similarity
-                FROM atoms a
-                WHERE
-                    a.embedding IS NOT NULL
-                    AND a.id != $2::uuid
-                    AND (1 - (a.embedding <=> $1::vector) / 2) >= $3
-                ORDER BY a.embedding <=> $1::vector
-                LIMIT $4
-            """
-            rows = await driver_conn.fetch(sql, query_vector, exclude_atom_id, threshold, limit)
+            rows = await self._search_top_k(
+                session, "atoms a", query_vector, limit, threshold, "a.id != $5::uuid", (exclude_atom_id,)
+            )
         else:
-            sql = """
-                SELECT
-                    a.*,
-                    1 - (a.embedding <=> $1::vector) / 2 AS similarity
-                FROM atoms a
-                WHERE
-                    a.embedding IS NOT NULL
-                    AND (1 - (a.embedding <=> $1::vector) / 2) >= $2
-                ORDER BY a.embedding <=> $1::vector
-                LIMIT $3
-            """
-            rows = await driver_conn.fetch(sql, query_vector, threshold, limit)
+            rows = await self._search_top_k(session, "atoms a", query_vector, limit, threshold)
 
         atoms_with_scores: list[tuple[Atom, float]] = []
         for row in rows:
@@ -448,8 +523,7 @@ class SemanticSearchService:
             atoms_with_scores.append((atom, float(similarity)))
 
         logger.info(
-            f"Found {len(atoms_with_scores)} atoms by vector search "
-            f"(threshold={threshold}, exclude={exclude_atom_id})"
+            f"Found {len(atoms_with_scores)} atoms by vector search (threshold={threshold}, exclude={exclude_atom_id})"
         )
 
         return atoms_with_scores
@@ -494,23 +568,7 @@ class SemanticSearchService:
         query_embedding = await self.embedding_service.generate_embedding(query)
         query_vector = str(query_embedding)
 
-        sql = """
-            SELECT
-                t.*,
-                1 - (t.embedding <=> $1::vector) / 2 AS similarity
-            FROM topics t
-            WHERE
-                t.embedding IS NOT NULL
-                AND (1 - (t.embedding <=> $1::vector) / 2) >= $2
-            ORDER BY t.embedding <=> $1::vector
-            LIMIT $3
-        """
-
-        conn = await session.connection()
-        raw_conn = await conn.get_raw_connection()
-        driver_conn = raw_conn.driver_connection
-        assert driver_conn is not None, "Driver connection is None"
-        rows = await driver_conn.fetch(sql, query_vector, threshold, limit)
+        rows = await self._search_top_k(session, "topics t", query_vector, limit, threshold)
 
         topics_with_scores: list[tuple[Topic, float]] = []
         for row in rows:
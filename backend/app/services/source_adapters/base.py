@@ -10,9 +10,11 @@ with consistent API.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, AsyncGenerator
+from typing import Any
 
 
 @dataclass
@@ -52,8 +54,19 @@ class SourceAdapter(ABC):
     - get_message_count: Estimate message count for time range
     - fetch_history: Stream historical messages
     - test_connection: Verify source is accessible
+
+    Adapters holding a connection override ``connected`` so several
+    ``fetch_history`` iterators can share one connection.
     """
 
+    @asynccontextmanager
+    async def connected(self) -> AsyncIterator[None]:
+        """Keep one connection open for every call made inside the block.
+
+        The default opens nothing; calls manage their own connections.
+        """
+        yield
+
     @abstractmethod
     async def get_message_count(self, chat_id: str, since: datetime | None = None) -> MessageCountResult:
         """Get estimated message count for a chat/channel.
@@ -78,6 +91,7 @@ class SourceAdapter(ABC):
         chat_id: str,
         since: datetime | None = None,
         limit: int | None = None,
+        offset_id: int = 0,
     ) -> AsyncGenerator[dict[str, Any], None]:
         """Fetch historical messages from a chat/channel.
 
@@ -85,6 +99,7 @@ class SourceAdapter(ABC):
             chat_id: Source-specific chat/channel identifier
             since: Only fetch messages after this datetime (None = all messages)
             limit: Maximum number of messages to fetch (None = unlimited)
+            offset_id: Resume after this message ID (0 = start from the newest)
 
         Yields:
             Raw message dictionaries compatible with Message model
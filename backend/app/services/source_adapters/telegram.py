@@ -7,8 +7,10 @@ Uses Telethon Client API (MTProto) for:
 """
 
 import logging
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator
+from typing import Any
 
 from telethon.errors import FloodWaitError, AuthKeyError
 from telethon.tl.types import Message as TelethonMessage
@@ -24,6 +26,11 @@ class TelegramSourceAdapter(SourceAdapter):
 
     Uses TelegramClientService (Telethon) for API access.
     Requires user authentication (not bot token).
+
+    A session string allows only one connection at a time: Telegram rejects
+    a second concurrent connection on the same auth key with
+    AuthKeyDuplicatedError and revokes the session. Concurrent fetches must
+    run inside ``connected()`` so they share one client.
     """
 
     def __init__(self, client_service: TelegramClientService | None = None):
@@ -34,6 +41,19 @@ class TelegramSourceAdapter(SourceAdapter):
                            (creates default if None)
         """
         self.client_service = client_service or TelegramClientService()
+        self._shared_connection = False
+
+    @asynccontextmanager
+    async def connected(self) -> AsyncIterator[None]:
+        """Connect once and share the client with every fetch_history inside the block."""
+        await self.client_service.connect()
+        self._shared_connection = True
+        try:
+            yield
+        finally:
+            self._shared_connection = False
+            if self.client_service.client:
+                await self.client_service.disconnect()
 
     async def get_message_count(self, chat_id: str, since: datetime | None = None) -> MessageCountResult:
         """Get message count from Telegram chat.
@@ -200,9 +220,11 @@ class TelegramSourceAdapter(SourceAdapter):
         Yields:
             Message dictionaries compatible with Message model
         """
+        owns_connection = not self._shared_connection
         try:
-            # Connect to Telegram
-            await self.client_service.connect()
+            # Connect to Telegram unless a shared connection is open
+            if owns_connection:
+                await self.client_service.connect()
 
             if not self.client_service.client:
                 logger.error("Client not connected, cannot fetch history")
@@ -242,8 +264,8 @@ class TelegramSourceAdapter(SourceAdapter):
             raise
 
         finally:
-            # Always disconnect
-            if self.client_service.client:
+            # Disconnect only a connection this call opened
+            if owns_connection and self.client_service.client:
                 await self.client_service.disconnect()
 
     async def test_connection(self) -> ConnectionTestResult:
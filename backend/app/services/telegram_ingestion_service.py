@@ -1,10 +1,15 @@
 """Service for ingesting historical messages from Telegram."""
 
+import asyncio
 import logging
+import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, NamedTuple
 
 from core.config import settings
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -12,13 +17,30 @@ from app.models import (
     Message,
     MessageIngestionJob,
     Source,
+    User,
 )
+from app.services.avatar_resolver import get_avatar_resolver
 from app.services.telegram_client_service import get_telegram_client_service
-from app.services.user_service import identify_or_create_user
-from app.webhook_service import TelegramWebhookService
+from app.services.user_service import (
+    TelegramIdentity,
+    TelegramSender,
+    identify_or_create_user,
+    upsert_telegram_users,
+)
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement (asyncpg allows at most 32767 bind parameters)
+BULK_INSERT_CHUNK = 1000
+
+
+class BulkStoreResult(NamedTuple):
+    """Outcome counters of ``store_messages_bulk``."""
+
+    stored: int
+    skipped: int
+    errors: int
+
 
 class TelegramIngestionService:
     """Service for fetching historical messages from Telegram groups."""
@@ -29,7 +51,7 @@ class TelegramIngestionService:
         self.bot_token = bot_token or settings.telegram.telegram_bot_token
         if not self.bot_token:
             raise ValueError("Telegram bot token is required")
-        self.telegram_service = TelegramWebhookService(bot_token=self.bot_token)
+        self.avatar_resolver = get_avatar_resolver()
 
     async def fetch_chat_history(
         self,
@@ -150,13 +172,10 @@ class TelegramIngestionService:
 
             avatar_url = user.avatar_url
             if not avatar_url:
-                try:
-                    avatar_url = await self.telegram_service.get_user_avatar_url(telegram_user_id)
-                    if avatar_url:
-                        user.avatar_url = avatar_url
-                        await db.flush()
-                except Exception as e:
-                    logger.warning(f"Failed to fetch avatar for user {telegram_user_id}: {e}")
+                avatar_url = await self.avatar_resolver.resolve(telegram_user_id)
+                if avatar_url:
+                    user.avatar_url = avatar_url
+                    await db.flush()
 
             db_message = Message(
                 external_message_id=message_id,
@@ -179,6 +198,123 @@ class TelegramIngestionService:
             logger.error(f"Error storing message: {e}")
             return False, "error"
 
+    async def store_messages_bulk(
+        self,
+        db: AsyncSession,
+        messages_data: list[dict[str, Any]],
+        source: Source,
+        chat_id: str,
+    ) -> BulkStoreResult:
+        """
+        Store a batch of fetched messages with set-based statements.
+
+        Senders are resolved with ``upsert_telegram_users`` and messages are
+        written with multi-row ``INSERT ... ON CONFLICT DO NOTHING`` on the
+        (source_id, source_channel_id, external_message_id) key. Messages stored
+        before the chat id was recorded have no channel and are not covered by
+        that key, so ids already stored without a channel are skipped with one
+        lookup per chunk. Avatars are resolved through the shared avatar
+        resolver, concurrently and only for users without one. Does not
+        commit; the caller commits once per batch.
+
+        Returns:
+            BulkStoreResult with stored, skipped (duplicate) and error counts
+        """
+        senders: dict[int, TelegramSender] = {}
+        parsed: list[tuple[dict[str, Any], int]] = []
+        errors = 0
+        for message_data in messages_data:
+            from_user = message_data.get("from") or {}
+            telegram_user_id = from_user.get("id")
+            if not message_data.get("message_id") or not telegram_user_id:
+                errors += 1
+                continue
+            senders.setdefault(
+                telegram_user_id,
+                TelegramSender(
+                    first_name=from_user.get("first_name", ""),
+                    last_name=from_user.get("last_name"),
+                    language_code=from_user.get("language_code"),
+                    is_bot=from_user.get("is_bot", False),
+                ),
+            )
+            parsed.append((message_data, telegram_user_id))
+
+        if not parsed:
+            return BulkStoreResult(0, 0, errors)
+
+        identities = await upsert_telegram_users(db, senders, source_id=source.id)  # type: ignore[arg-type]
+        avatars = await self._resolve_avatars(db, identities)
+
+        rows = []
+        for message_data, telegram_user_id in parsed:
+            identity = identities[telegram_user_id]
+            timestamp = message_data.get("date")
+            rows.append({
+                "id": uuid.uuid4(),
+                "external_message_id": str(message_data["message_id"]),
+                "content": message_data.get("text") or "[No text content]",
+                "sent_at": datetime.fromtimestamp(timestamp) if timestamp else datetime.utcnow(),
+                "source_channel_id": chat_id,
+                "source_id": source.id,
+                "author_id": identity.user_id,
+                "telegram_profile_id": identity.telegram_profile_id,
+                "avatar_url": avatars.get(telegram_user_id),
+                "analyzed": False,
+                "analysis_status": "pending",
+                "status": "pending",
+            })
+
+        insert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+        stored = 0
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            chunk = rows[start : start + BULK_INSERT_CHUNK]
+            legacy_ids = set(
+                (
+                    await db.execute(
+                        select(Message.external_message_id).where(
+                            Message.source_id == source.id,
+                            Message.source_channel_id.is_(None),  # type: ignore[union-attr]
+                            Message.external_message_id.in_([row["external_message_id"] for row in chunk]),  # type: ignore[attr-defined]
+                        )
+                    )
+                ).scalars()
+            )
+            chunk = [row for row in chunk if row["external_message_id"] not in legacy_ids]
+            if not chunk:
+                continue
+            stmt = (
+                insert(Message)
+                .values(chunk)
+                .on_conflict_do_nothing(
+                    index_elements=["source_id", "source_channel_id", "external_message_id"],
+                    index_where=Message.source_channel_id.is_not(None),  # type: ignore[union-attr]
+                )
+                .returning(Message.id)  # type: ignore[call-overload]
+            )
+            stored += len((await db.execute(stmt)).all())
+
+        logger.info(f"Bulk stored {stored}/{len(rows)} messages from chat {chat_id} ({len(senders)} senders)")
+        return BulkStoreResult(stored, len(rows) - stored, errors)
+
+    async def _resolve_avatars(
+        self,
+        db: AsyncSession,
+        identities: dict[int, TelegramIdentity],
+    ) -> dict[int, str | None]:
+        """Known avatar URL per Telegram user, resolving missing ones concurrently."""
+        avatars = {telegram_user_id: identity.avatar_url for telegram_user_id, identity in identities.items()}
+        missing = [telegram_user_id for telegram_user_id, avatar_url in avatars.items() if not avatar_url]
+        resolved = await asyncio.gather(
+            *(self.avatar_resolver.resolve(telegram_user_id) for telegram_user_id in missing)
+        )
+        for telegram_user_id, avatar_url in zip(missing, resolved, strict=True):
+            avatars[telegram_user_id] = avatar_url
+            if avatar_url:
+                user_id = identities[telegram_user_id].user_id
+                await db.execute(update(User).where(User.id == user_id).values(avatar_url=avatar_url))  # type: ignore[arg-type]
+        return avatars
+
     async def update_job_progress(
         self,
         db: AsyncSession,
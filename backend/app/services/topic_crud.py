@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, List, Tuple
@@ -11,7 +12,7 @@ from typing import TYPE_CHECKING, List, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy import desc
 from sqlalchemy import func as sa_func
-from sqlmodel import func, select
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models import (
@@ -29,6 +30,8 @@ from app.models.atom import TopicAtom
 from app.models.llm_provider import LLMProvider
 from app.models.message import Message
 from app.services.base_crud import BaseCRUD
+from app.services.pagination import CountMode, count_rows, encode_cursor, keyset_filter
+from app.services.semantic_search_service import vector_similarity
 
 if TYPE_CHECKING:
     from app.services.embedding_service import EmbeddingService
@@ -54,6 +57,23 @@ class FindOrCreateResult:
     matched_topic_name: str | None = None
 
 
+@dataclass
+class TopicListPage:
+    """One page of TopicCRUD.list.
+
+    Attributes:
+        items: Topics of the page
+        total: Total matching topics (None when not counted)
+        total_is_estimate: True if total comes from planner statistics
+        next_cursor: Keyset cursor of the next page (created_* sorts only)
+    """
+
+    items: list[TopicPublic]
+    total: int | None
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+
+
 class TopicCRUD(BaseCRUD[Topic]):
     """CRUD service for Topic operations.
 
@@ -78,41 +98,64 @@ class TopicCRUD(BaseCRUD[Topic]):
         Returns:
             Topic or None if not found
         """
-        # Query with aggregations for atoms_count and message_count
-        query = select(  # type: ignore[call-overload]
-            Topic.id,
-            Topic.name,
-            Topic.description,
-            Topic.icon,
-            Topic.color,
-            Topic.is_active,
-            Topic.created_at,
-            Topic.updated_at,
-            sa_func.count(sa_func.distinct(TopicAtom.atom_id)).label("atoms_count"),
-            sa_func.count(sa_func.distinct(Message.id)).label("message_count"),
-        ).where(Topic.id == topic_id).outerjoin(TopicAtom, TopicAtom.topic_id == Topic.id).outerjoin(Message, Message.topic_id == Topic.id).group_by(Topic.id, Topic.name, Topic.description, Topic.icon, Topic.color, Topic.is_active, Topic.created_at, Topic.updated_at)
+        return (await self.get_many([topic_id])).get(topic_id)
 
-        result = await self.session.execute(query)
-        row = result.one_or_none()
+    async def get_many(self, topic_ids: Sequence[uuid.UUID]) -> dict[uuid.UUID, TopicPublic]:
+        """Get topics by ID with counts in one query.
 
-        if not row:
-            return None
-
-        color = convert_to_hex_if_needed(row.color) if row.color else None
+        Args:
+            topic_ids: Topic UUIDs to retrieve
 
-        return TopicPublic(
-            id=row.id,
-            name=row.name,
-            description=row.description,
-            icon=row.icon,
-            color=color,
-            is_active=row.is_active,
-            created_at=row.created_at.isoformat() if row.created_at else "",
-            updated_at=row.updated_at.isoformat() if row.updated_at else "",
-            atoms_count=row.atoms_count,
-            message_count=row.message_count,
+        Returns:
+            Mapping of topic ID to topic (missing IDs are absent)
+        """
+        # Query with aggregations for atoms_count and message_count
+        query = (
+            select(  # type: ignore[call-overload]
+                Topic.id,
+                Topic.name,
+                Topic.description,
+                Topic.icon,
+                Topic.color,
+                Topic.is_active,
+                Topic.created_at,
+                Topic.updated_at,
+                sa_func.count(sa_func.distinct(TopicAtom.atom_id)).label("atoms_count"),
+                sa_func.count(sa_func.distinct(Message.id)).label("message_count"),
+            )
+            .where(Topic.id.in_(set(topic_ids)))  # type: ignore[attr-defined]
+            .outerjoin(TopicAtom, TopicAtom.topic_id == Topic.id)
+            .outerjoin(Message, Message.topic_id == Topic.id)
+            .group_by(
+                Topic.id,
+                Topic.name,
+                Topic.description,
+                Topic.icon,
+                Topic.color,
+                Topic.is_active,
+                Topic.created_at,
+                Topic.updated_at,
+            )
         )
 
+        result = await self.session.execute(query)
+
+        return {
+            row.id: TopicPublic(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                icon=row.icon,
+                color=convert_to_hex_if_needed(row.color) if row.color else None,
+                is_active=row.is_active,
+                created_at=row.created_at.isoformat() if row.created_at else "",
+                updated_at=row.updated_at.isoformat() if row.updated_at else "",
+                atoms_count=row.atoms_count,
+                message_count=row.message_count,
+            )
+            for row in result.all()
+        }
+
     async def list(
         self,
         skip: int = 0,
@@ -120,11 +163,13 @@ class TopicCRUD(BaseCRUD[Topic]):
         search: str | None = None,
         sort_by: str | None = "created_desc",
         is_active: bool | None = None,
-    ) -> tuple[list[TopicPublic], int]:
+        cursor: str | None = None,
+        count: CountMode = CountMode.exact,
+    ) -> TopicListPage:
         """List topics with pagination, search, and sorting.
 
         Args:
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             search: Search query to filter by name or description (case-insensitive)
             sort_by: Sort criteria. Options:
@@ -134,12 +179,23 @@ class TopicCRUD(BaseCRUD[Topic]):
                 - "created_asc": Sort by created_at ascending
                 - "updated_desc": Sort by updated_at descending
             is_active: Filter by active status. None returns all topics.
+            cursor: next_cursor of the previous page (created_desc/created_asc only)
+            count: How to compute the total
 
         Returns:
-            Tuple of (list of topics, total count)
+            Page of topics with total and next cursor
+
+        Raises:
+            ValueError: If the cursor is malformed or the sort does not support cursors
         """
+        descending = sort_by not in ("name_asc", "name_desc", "created_asc", "updated_desc")
+        keyset = descending or sort_by == "created_asc"
+        if cursor and not keyset:
+            raise ValueError("cursor pagination is only supported for created_desc and created_asc")
+        after_cursor = keyset_filter(Topic.created_at, Topic.id, cursor, descending=descending) if cursor else None
+
         # Count query for total (without joins for performance)
-        count_base = select(Topic)
+        count_base = select(Topic.id)
         if is_active is not None:
             count_base = count_base.where(Topic.is_active == is_active)
         if search:
@@ -147,9 +203,10 @@ class TopicCRUD(BaseCRUD[Topic]):
             count_base = count_base.where(
                 (Topic.name.ilike(f"%{search_filter}%")) | (Topic.description.ilike(f"%{search_filter}%"))  # type: ignore[attr-defined]
             )
-        count_query = select(func.count()).select_from(count_base.subquery())
-        count_result = await self.session.execute(count_query)
-        total = count_result.scalar_one()
+        filtered = is_active is not None or bool(search)
+        total, total_is_estimate = await count_rows(
+            self.session, count_base, count, table=None if filtered else "topics"
+        )
 
         # Main query with aggregations for atoms_count and message_count
         query = select(  # type: ignore[call-overload]
@@ -183,13 +240,14 @@ class TopicCRUD(BaseCRUD[Topic]):
         elif sort_by == "name_desc":
             query = query.order_by(desc(Topic.name))
         elif sort_by == "created_asc":
-            query = query.order_by(Topic.created_at)
+            query = query.order_by(Topic.created_at, Topic.id)
         elif sort_by == "updated_desc":
             query = query.order_by(desc(Topic.updated_at))  # type: ignore[arg-type]
         else:
-            query = query.order_by(desc(Topic.created_at))  # type: ignore[arg-type]
+            query = query.order_by(desc(Topic.created_at), desc(Topic.id))  # type: ignore[arg-type]
 
-        query = query.offset(skip).limit(limit)
+        query = query.where(after_cursor) if after_cursor is not None else query.offset(skip)
+        query = query.limit(limit)
         result = await self.session.execute(query)
         rows = result.all()
 
@@ -211,7 +269,16 @@ class TopicCRUD(BaseCRUD[Topic]):
                 )
             )
 
-        return public_topics, total
+        next_cursor = None
+        if keyset and len(rows) == limit:
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return TopicListPage(
+            items=public_topics,
+            total=total,
+            total_is_estimate=total_is_estimate,
+            next_cursor=next_cursor,
+        )
 
     async def create(self, topic_data: TopicCreate) -> TopicPublic:  # type: ignore[override]
         """Create a new topic.
@@ -360,6 +427,138 @@ class TopicCRUD(BaseCRUD[Topic]):
 
         return FindOrCreateResult(topic=new_topic, was_merged=False)
 
+    async def embed_for_matching(
+        self,
+        topics_data: Sequence[TopicCreate],
+        embedding_service: EmbeddingService,
+    ) -> List[Tuple[List[float] | None, List[float] | None]]:
+        """Embed the search and stored texts of topics in one provider call.
+
+        Args:
+            topics_data: Topics to embed
+            embedding_service: Service for generating embeddings
+
+        Returns:
+            (search vector, stored vector) per topic; None where the text is
+            empty or embedding failed
+        """
+        search_texts = [f"{data.name} {data.description or ''}".strip() for data in topics_data]
+        searchable = [i for i, text in enumerate(search_texts) if text]
+        if len(searchable) < len(topics_data):
+            logger.warning("Empty topic data provided, creating topic without similarity check")
+
+        # Same texts as find_or_create (search) and embed_topic (stored embedding)
+        texts = [search_texts[i] for i in searchable] + [f"{data.name}\n\n{data.description}" for data in topics_data]
+        try:
+            vectors = await embedding_service.generate_embeddings(texts)
+        except Exception as e:
+            logger.warning(f"Batch embedding failed: {e}. Creating topics without similarity check.")
+            return [(None, None)] * len(topics_data)
+
+        search_vectors = dict(zip(searchable, vectors[: len(searchable)], strict=True))
+        stored_vectors = vectors[len(searchable) :]
+        return [(search_vectors.get(i), stored_vectors[i]) for i in range(len(topics_data))]
+
+    async def find_or_create_many(
+        self,
+        topics_data: Sequence[TopicCreate],
+        embedding_service: EmbeddingService,
+        search_service: SemanticSearchService,
+        threshold: float = 0.85,
+        embeddings: Sequence[Tuple[List[float] | None, List[float] | None]] | None = None,
+    ) -> List[FindOrCreateResult]:
+        """Batch version of find_or_create with the same merge decisions.
+
+        Search and storage texts of all topics are embedded in one provider call
+        and nearest existing topics are resolved in one vector query. Topics
+        created earlier in the same batch are compared in memory, as
+        find_or_create called in a loop would have found them in the database.
+        All new topics are committed together, with their embeddings.
+
+        Args:
+            topics_data: Topics to find or create, in order
+            embedding_service: Service for generating embeddings
+            search_service: Service for semantic similarity search
+            threshold: Minimum similarity score to consider as match (default: 0.85)
+            embeddings: Vectors from embed_for_matching, when the caller already has them
+
+        Returns:
+            One FindOrCreateResult per input topic, in input order
+        """
+        if not topics_data:
+            return []
+
+        if embeddings is None:
+            embeddings = await self.embed_for_matching(topics_data, embedding_service)
+        search_vectors = {i: search for i, (search, _) in enumerate(embeddings) if search is not None}
+        stored_vectors = [stored for _, stored in embeddings]
+
+        try:
+            neighbours = await search_service.search_by_vectors(
+                self.session,
+                "topics t",
+                list(search_vectors.values()),
+                limit=3,
+                threshold=threshold,
+                select_clause="t.id, t.name",
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error during semantic search: {e}")
+            neighbours = [[] for _ in search_vectors]
+        best_existing = {
+            i: (rows[0]["id"], rows[0]["name"], float(rows[0]["similarity"]))
+            for i, rows in zip(search_vectors, neighbours, strict=True)
+            if rows
+        }
+
+        created: List[Topic] = []
+        decisions: List[Tuple[uuid.UUID, float | None, str | None]] = []
+        for i, data in enumerate(topics_data):
+            best = best_existing.get(i)
+            if i in search_vectors:
+                for topic in created:
+                    if topic.embedding is None:
+                        continue
+                    score = vector_similarity(search_vectors[i], topic.embedding)
+                    if score >= threshold and (best is None or score > best[2]):
+                        best = (topic.id, topic.name, score)
+
+            if best is not None and best[2] >= threshold:
+                logger.info(
+                    f"Found similar topic '{best[1]}' (score: {best[2]:.3f}) "
+                    f"for proposed topic '{data.name}'. Returning existing topic."
+                )
+                decisions.append((best[0], best[2], best[1]))
+                continue
+
+            logger.info(f"No similar topic found for '{data.name}'. Creating new topic.")
+            icon = data.icon or auto_select_icon(data.name, data.description)
+            color = data.color or auto_select_color(icon)
+            topic = Topic(
+                name=data.name,
+                description=data.description,
+                icon=icon,
+                color=convert_to_hex_if_needed(color) if color else None,
+                embedding=stored_vectors[i],
+            )
+            created.append(topic)
+            decisions.append((topic.id, None, None))
+
+        if created:
+            self.session.add_all(created)
+            await self.session.commit()
+
+        topics = await self.get_many([topic_id for topic_id, _, _ in decisions])
+        return [
+            FindOrCreateResult(
+                topic=topics[topic_id],
+                was_merged=score is not None,
+                similarity_score=score,
+                matched_topic_name=matched_name,
+            )
+            for topic_id, score, matched_name in decisions
+        ]
+
     async def update(self, topic_id: uuid.UUID, topic_data: TopicUpdate) -> TopicPublic | None:  # type: ignore[override]
         """Update an existing topic.
 
@@ -0,0 +1,77 @@
+"""Queries over messages not yet assigned to a topic.
+
+The knowledge extraction trigger needs the number of unprocessed messages in
+the lookback window after every saved batch. Instead of ``COUNT(*)`` over the
+window it sums the trigger-maintained hourly ``unprocessed_message_buckets``
+and counts only the partial hour at the window start, so the check costs the
+same however large the backlog is.
+
+Candidates for extraction are read through the partial index
+``ix_messages_unprocessed_conversation`` (source_channel_id, source_thread_id,
+sent_at WHERE topic_id IS NULL), loading only the columns conversation
+grouping needs.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.models.unprocessed_message_bucket import UnprocessedMessageBucket
+
+
+def _next_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+async def count_unprocessed_messages(db: AsyncSession, since: datetime) -> int:
+    """Count messages without topic sent at or after ``since``.
+
+    Args:
+        db: Database session
+        since: Start of the window (naive UTC, like ``Message.sent_at``)
+
+    Returns:
+        Exact number of unprocessed messages in the window
+    """
+    boundary = _next_hour(since)
+    whole_hours = select(func.coalesce(func.sum(UnprocessedMessageBucket.message_count), 0)).where(
+        UnprocessedMessageBucket.bucket_start >= boundary  # type: ignore[arg-type]
+    )
+    partial_hour = (
+        select(func.count())
+        .select_from(Message)
+        .where(Message.topic_id.is_(None), Message.sent_at >= since, Message.sent_at < boundary)  # type: ignore[union-attr, arg-type]
+    )
+    total = await db.scalar(select(whole_hours.scalar_subquery() + partial_hour.scalar_subquery()))
+    return int(total or 0)
+
+
+async def load_unprocessed_messages(db: AsyncSession, since: datetime) -> list[Row]:
+    """Load id and threading columns of unprocessed messages in the window.
+
+    Rows are ordered like the partial index (channel, thread, sent_at) and can
+    be passed to ``group_messages_by_conversation``.
+    """
+    stmt = (
+        select(Message.id, Message.source_channel_id, Message.source_thread_id, Message.sent_at)  # type: ignore[call-overload]
+        .where(Message.topic_id.is_(None), Message.sent_at >= since)  # type: ignore[union-attr]
+        .order_by(Message.source_channel_id, Message.source_thread_id, Message.sent_at)
+    )
+    return list((await db.execute(stmt)).all())
+
+
+async def prune_unprocessed_buckets(db: AsyncSession, before: datetime) -> int:
+    """Delete hourly buckets that ended before ``before`` (commits).
+
+    Returns:
+        Number of deleted buckets
+    """
+    result = await db.execute(
+        delete(UnprocessedMessageBucket).where(
+            UnprocessedMessageBucket.bucket_start < before - timedelta(hours=1)  # type: ignore[arg-type]
+        )
+    )
+    await db.commit()
+    return result.rowcount or 0  # type: ignore[attr-defined]
@@ -1,16 +1,173 @@
-"""User service for user identification and management."""
+"""User service for user identification and management.
 
-import logging
+Live messages resolve their author through ``identify_telegram_author``, which
+is backed by a process-wide identity cache (Telegram user -> user/profile ids
+and last written profile fields, source name -> id). Known senders cost no
+queries; profile rows are only written when the fields in a message differ.
+
+Each API/worker process has its own cache. Edits to users and profiles go
+through ``invalidate_identity``, which evicts the entries in every process via
+NATS (``IDENTITY_CACHE_SUBJECT``). Entries also expire after
+``IDENTITY_CACHE_TTL_SECONDS`` as a bound for missed messages, and callers
+invalidate the sender when a write using cached ids fails.
+"""
 
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.models.legacy import Source
 from app.models.telegram_profile import TelegramProfile
 from app.models.user import User
+from app.services.websocket_manager import websocket_manager
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on how long a change made by another process can go unnoticed
+IDENTITY_CACHE_TTL_SECONDS = 300.0
+IDENTITY_CACHE_SUBJECT = "control.identity_cache"
+
+
+class TelegramSender(NamedTuple):
+    """Telegram sender data as found in a message."""
+
+    first_name: str
+    last_name: str | None = None
+    language_code: str | None = None
+    is_bot: bool = False
+
+
+class TelegramIdentity(NamedTuple):
+    """Resolved User and TelegramProfile ids for a Telegram user."""
+
+    user_id: int
+    telegram_profile_id: int
+    avatar_url: str | None
+
+
+class TelegramAuthor(NamedTuple):
+    """Cached identity of a Telegram message author."""
+
+    user_id: int
+    telegram_profile_id: int
+    full_name: str
+    avatar_url: str | None
+    profile: TelegramSender  # Profile fields last written to the database
+
+
+class IdentityCache:
+    """LRU cache of Telegram author identities and source ids with a TTL.
+
+    Example:
+        >>> author = identity_cache.get_author(telegram_user_id)
+        >>> identity_cache.invalidate_author(telegram_user_id)
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = IDENTITY_CACHE_TTL_SECONDS):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum cached authors (least recently used evicted)
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._authors: OrderedDict[int, tuple[float, TelegramAuthor]] = OrderedDict()
+        self._sources: dict[str, tuple[float, int]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_author(self, telegram_user_id: int) -> TelegramAuthor | None:
+        """Return cached author, None when missing or expired."""
+        cached = self._authors.get(telegram_user_id)
+        if cached is None or cached[0] <= time.monotonic():
+            self._authors.pop(telegram_user_id, None)
+            self.misses += 1
+            return None
+        self._authors.move_to_end(telegram_user_id)
+        self.hits += 1
+        return cached[1]
+
+    def put_author(self, telegram_user_id: int, author: TelegramAuthor) -> None:
+        """Cache author for ``ttl`` seconds."""
+        self._authors[telegram_user_id] = (time.monotonic() + self.ttl, author)
+        self._authors.move_to_end(telegram_user_id)
+        while len(self._authors) > self.max_entries:
+            self._authors.popitem(last=False)
+
+    def update_author(self, telegram_user_id: int, author: TelegramAuthor) -> None:
+        """Replace a cached author without extending its lifetime."""
+        cached = self._authors.get(telegram_user_id)
+        if cached is not None:
+            self._authors[telegram_user_id] = (cached[0], author)
+
+    def get_source_id(self, name: str) -> int | None:
+        """Return cached source id, None when missing or expired."""
+        cached = self._sources.get(name)
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        return cached[1]
+
+    def put_source_id(self, name: str, source_id: int) -> None:
+        """Cache source id for ``ttl`` seconds."""
+        self._sources[name] = (time.monotonic() + self.ttl, source_id)
+
+    def invalidate_author(self, telegram_user_id: int) -> None:
+        """Drop a cached author."""
+        self._authors.pop(telegram_user_id, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop cached authors linked to a user."""
+        for telegram_user_id in [key for key, (_, author) in self._authors.items() if author.user_id == user_id]:
+            del self._authors[telegram_user_id]
+
+    def invalidate_sources(self) -> None:
+        """Drop cached source ids."""
+        self._sources.clear()
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._authors.clear()
+        self._sources.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {"authors": len(self._authors), "sources": len(self._sources), "hits": self.hits, "misses": self.misses}
+
+
+identity_cache = IdentityCache()
+
+
+def handle_identity_invalidation(message: dict[str, Any]) -> None:
+    """Apply an invalidation published by ``invalidate_identity`` to this process."""
+    if message.get("user_id") is not None:
+        identity_cache.invalidate_user(int(message["user_id"]))
+    if message.get("telegram_user_id") is not None:
+        identity_cache.invalidate_author(int(message["telegram_user_id"]))
+
+
+async def invalidate_identity(user_id: int | None = None, telegram_user_id: int | None = None) -> None:
+    """Drop cached authors of a user and/or Telegram user in every process.
+
+    Args:
+        user_id: User whose linked authors are dropped
+        telegram_user_id: Telegram user whose author is dropped
+    """
+    message = {"user_id": user_id, "telegram_user_id": telegram_user_id}
+    handle_identity_invalidation(message)
+    await websocket_manager.publish_control(IDENTITY_CACHE_SUBJECT, message)
+
 
 async def get_or_create_source(db: AsyncSession, name: str) -> Source:
     """Get existing source or create new one.
@@ -42,6 +199,25 @@ async def get_or_create_source(db: AsyncSession, name: str) -> Source:
     return source
 
 
+async def get_source_id(db: AsyncSession, name: str) -> int:
+    """Get id of the source with ``name``, creating it if needed (cached).
+
+    Args:
+        db: Database session
+        name: Source name and type (e.g., "telegram")
+
+    Returns:
+        int: Source ID
+    """
+    source_id = identity_cache.get_source_id(name)
+    if source_id is None:
+        source = await get_or_create_source(db, name)
+        assert source.id is not None
+        source_id = source.id
+        identity_cache.put_source_id(name, source_id)
+    return source_id
+
+
 async def find_user_by_phone(db: AsyncSession, phone: str) -> User | None:
     """Find user by phone number.
 
@@ -111,6 +287,7 @@ async def identify_or_create_user(
     language_code: str | None = None,
     is_bot: bool = False,
     is_premium: bool = False,
+    commit: bool = True,
 ) -> tuple[User, TelegramProfile]:
     """Identify or create user and telegram profile.
 
@@ -133,28 +310,31 @@ async def identify_or_create_user(
         language_code: Telegram language code (optional)
         is_bot: Whether Telegram account is a bot
         is_premium: Whether user has Telegram Premium
+        commit: Commit changes; when False they are only flushed into the caller's transaction
 
     Returns:
         tuple[User, TelegramProfile]: User and their Telegram profile
     """
-    telegram_source = await get_or_create_source(db, name="telegram")
-
-    # Try to find existing TelegramProfile
-    stmt = select(TelegramProfile).where(TelegramProfile.telegram_user_id == telegram_user_id)
-    result = await db.execute(stmt)
-    tg_profile = result.scalar_one_or_none()
-
-    if tg_profile:
-        tg_profile.first_name = first_name
-        tg_profile.last_name = last_name
-        tg_profile.language_code = language_code
-        tg_profile.is_premium = is_premium
-        await db.commit()
-        await db.refresh(tg_profile)
-
-        user_stmt = select(User).where(User.id == tg_profile.user_id)
-        user_result = await db.execute(user_stmt)
-        existing_user = user_result.scalar_one()
+    # Try to find existing TelegramProfile (with its User)
+    stmt = (
+        select(TelegramProfile, User)
+        .join(User, User.id == TelegramProfile.user_id)  # type: ignore[arg-type]
+        .where(TelegramProfile.telegram_user_id == telegram_user_id)
+    )
+    existing = (await db.execute(stmt)).one_or_none()
+
+    if existing:
+        tg_profile, existing_user = existing
+        profile_fields = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "language_code": language_code,
+            "is_premium": is_premium,
+        }
+        if any(getattr(tg_profile, field) != value for field, value in profile_fields.items()):
+            for field, value in profile_fields.items():
+                setattr(tg_profile, field, value)
+            await _save(db, commit)
 
         logger.info(f"Found existing user {existing_user.id} for Telegram user {telegram_user_id}")
         return existing_user, tg_profile
@@ -181,10 +361,11 @@ async def identify_or_create_user(
             is_bot=False,
         )
         db.add(user)
-        await db.commit()
+        await _save(db, commit)
         await db.refresh(user)
         logger.info(f"Created new user {user.id} for Telegram user {telegram_user_id}")
 
+    telegram_source = await get_or_create_source(db, name="telegram")
     tg_profile = TelegramProfile(
         telegram_user_id=telegram_user_id,
         first_name=first_name,
@@ -196,8 +377,156 @@ async def identify_or_create_user(
         source_id=telegram_source.id,
     )
     db.add(tg_profile)
-    await db.commit()
+    await _save(db, commit)
     await db.refresh(tg_profile)
 
     logger.info(f"Created TelegramProfile for user {user.id}")
     return user, tg_profile
+
+
+async def _save(db: AsyncSession, commit: bool) -> None:
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+
+
+async def upsert_telegram_users(
+    db: AsyncSession, senders: Mapping[int, TelegramSender], source_id: int
+) -> dict[int, TelegramIdentity]:
+    """Identify or create users and telegram profiles for many senders at once.
+
+    Set-based counterpart of ``identify_or_create_user`` for bulk ingestion
+    (no phone/email auto-linking): one lookup of existing profiles, one
+    multi-row insert of missing users and one profile upsert refreshing names.
+    Does not commit.
+
+    Args:
+        db: Database session
+        senders: Sender data by Telegram user ID
+        source_id: Telegram source ID for new profiles
+
+    Returns:
+        dict[int, TelegramIdentity]: Resolved identities by Telegram user ID
+    """
+    if not senders:
+        return {}
+
+    existing_stmt = (
+        select(TelegramProfile.telegram_user_id, TelegramProfile.user_id, User.avatar_url)
+        .join(User, User.id == TelegramProfile.user_id)  # type: ignore[arg-type]
+        .where(TelegramProfile.telegram_user_id.in_(senders))  # type: ignore[attr-defined]
+    )
+    existing = {row.telegram_user_id: row for row in (await db.execute(existing_stmt)).all()}
+
+    user_ids = {telegram_user_id: row.user_id for telegram_user_id, row in existing.items()}
+    missing = [telegram_user_id for telegram_user_id in senders if telegram_user_id not in existing]
+    if missing:
+        created = await db.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),  # type: ignore[call-overload]
+            [
+                {
+                    "first_name": senders[telegram_user_id].first_name,
+                    "last_name": senders[telegram_user_id].last_name,
+                    "is_active": True,
+                    "is_bot": False,
+                    "ui_language": "uk",
+                }
+                for telegram_user_id in missing
+            ],
+        )
+        user_ids.update(zip(missing, created.scalars().all(), strict=True))
+        logger.info(f"Created {len(missing)} new user(s) for Telegram senders")
+
+    upsert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+    stmt = upsert(TelegramProfile).values([
+        {
+            "telegram_user_id": telegram_user_id,
+            "first_name": sender.first_name,
+            "last_name": sender.last_name,
+            "language_code": sender.language_code,
+            "is_bot": sender.is_bot,
+            "is_premium": False,
+            "user_id": user_ids[telegram_user_id],
+            "source_id": source_id,
+        }
+        for telegram_user_id, sender in senders.items()
+    ])
+    # A profile created concurrently keeps its user; the returned user_id is authoritative
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["telegram_user_id"],
+        set_={
+            "first_name": stmt.excluded.first_name,
+            "last_name": stmt.excluded.last_name,
+            "language_code": func.coalesce(stmt.excluded.language_code, TelegramProfile.language_code),
+            "updated_at": func.now(),
+        },
+    ).returning(TelegramProfile.telegram_user_id, TelegramProfile.id, TelegramProfile.user_id)  # type: ignore[call-overload]
+
+    identities: dict[int, TelegramIdentity] = {}
+    for telegram_user_id, profile_id, user_id in (await db.execute(stmt)).all():
+        known = existing.get(telegram_user_id)
+        avatar_url = known.avatar_url if known is not None and known.user_id == user_id else None
+        identities[telegram_user_id] = TelegramIdentity(user_id, profile_id, avatar_url)
+    return identities
+
+
+async def identify_telegram_author(db: AsyncSession, telegram_user_id: int, sender: TelegramSender) -> TelegramAuthor:
+    """Identify or create the author of a live Telegram message (cached).
+
+    Does not commit. Known senders are served from ``identity_cache`` without
+    queries; their profile is updated only when ``sender`` differs from the
+    fields last written. Unknown senders go through ``identify_or_create_user``.
+    Callers should ``identity_cache.invalidate_author`` if storing the message
+    with the returned ids fails.
+
+    Args:
+        db: Database session
+        telegram_user_id: Telegram user ID
+        sender: Sender data from the message
+
+    Returns:
+        TelegramAuthor: Resolved user and profile
+    """
+    author = identity_cache.get_author(telegram_user_id)
+    if author is None:
+        user, tg_profile = await identify_or_create_user(
+            db=db,
+            telegram_user_id=telegram_user_id,
+            first_name=sender.first_name,
+            last_name=sender.last_name,
+            language_code=sender.language_code,
+            is_bot=sender.is_bot,
+            commit=False,
+        )
+        assert user.id is not None and tg_profile.id is not None
+        author = TelegramAuthor(
+            user_id=user.id,
+            telegram_profile_id=tg_profile.id,
+            full_name=user.full_name,
+            avatar_url=user.avatar_url,
+            profile=sender,
+        )
+        identity_cache.put_author(telegram_user_id, author)
+    elif author.profile != sender:
+        await db.execute(
+            update(TelegramProfile)
+            .where(TelegramProfile.id == author.telegram_profile_id)  # type: ignore[arg-type]
+            .values(
+                first_name=sender.first_name,
+                last_name=sender.last_name,
+                language_code=sender.language_code,
+                is_premium=False,
+                updated_at=func.now(),
+            )
+        )
+        author = author._replace(profile=sender)
+        identity_cache.update_author(telegram_user_id, author)
+
+    return author
+
+
+async def set_author_avatar(db: AsyncSession, telegram_user_id: int, author: TelegramAuthor, avatar_url: str) -> None:
+    """Store a resolved avatar on the author's User (without commit) and in the cache."""
+    await db.execute(update(User).where(User.id == author.user_id).values(avatar_url=avatar_url))  # type: ignore[arg-type]
+    identity_cache.update_author(telegram_user_id, author._replace(avatar_url=avatar_url))
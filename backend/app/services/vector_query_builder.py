@@ -1,49 +1,185 @@
 """Base class for building pgvector similarity queries."""
 
-from typing import TypeVar
+from typing import Literal, TypeVar
+
+from sqlalchemy import TextClause, text
 
 T = TypeVar("T")
 
+SimilarityQueryMode = Literal["top_k", "filter"]
+IterativeScanMode = Literal["off", "strict_order", "relaxed_order"]
+
+# Positional ($n) equivalents of the named parameters used by build_similarity_query.
+# Extra conditions passed in positional mode must start numbering at $5.
+_POSITIONAL_PARAMS = {
+    ":query_vector": "$1",
+    ":candidate_limit": "$2",
+    ":threshold": "$3",
+    ":limit": "$4",
+}
+
 
 class VectorQueryBuilder:
     """Base class for building pgvector similarity queries."""
 
+    @staticmethod
+    def build_ef_search_statement(ef_search: int) -> TextClause:
+        """Build statement that sets HNSW ``ef_search`` for the current transaction.
+
+        Uses ``set_config(..., true)`` (``SET LOCAL`` scope) so the value can be bound.
+        Execute it through the session: the transaction must already be open, which
+        is not yet the case on the raw asyncpg connection.
+
+        Args:
+            ef_search: HNSW query-time candidate list size (1-1000)
+
+        Returns:
+            SQL statement, reset on commit/rollback
+        """
+        value = int(ef_search)
+        if not 1 <= value <= 1000:
+            raise ValueError(f"hnsw.ef_search must be between 1 and 1000, got {value}")
+        return text("SELECT set_config('hnsw.ef_search', :value, true)").bindparams(value=str(value))
+
+    @staticmethod
+    def build_iterative_scan_statement(mode: IterativeScanMode) -> TextClause:
+        """Build statement that sets HNSW iterative index scans (pgvector >= 0.8).
+
+        Iterative scans keep reading the index when filters drop candidates, so
+        filtered top-k queries return k rows instead of at most ``ef_search`` minus
+        the filtered ones.
+
+        Args:
+            mode: "off", "strict_order" or "relaxed_order"
+
+        Returns:
+            SQL statement (``SET LOCAL`` scope, see ``build_ef_search_statement``)
+        """
+        if mode not in ("off", "strict_order", "relaxed_order"):
+            raise ValueError(f"Unsupported hnsw.iterative_scan mode: {mode}")
+        return text("SELECT set_config('hnsw.iterative_scan', :mode, true)").bindparams(mode=mode)
+
     @staticmethod
     def build_similarity_query(
         table: str,
         select_clause: str = "*",
         where_conditions: str = "",
         order_by: str | None = None,
+        mode: SimilarityQueryMode = "top_k",
+        positional: bool = False,
     ) -> str:
         """Build reusable vector similarity query.
 
+        In "top_k" mode (default) the inner query only orders by cosine distance and
+        limits to ``:candidate_limit`` rows, which lets Postgres use an index-ordered
+        HNSW scan. The similarity threshold is applied to those candidates afterwards.
+        Callers over-fetch by passing ``:candidate_limit`` >= ``:limit``.
+
+        "filter" mode keeps the legacy form with the threshold in the WHERE clause,
+        which forces distance evaluation on every row.
+
+        Parameters: ``:query_vector``, ``:candidate_limit`` (top_k only),
+        ``:threshold``, ``:limit``. With ``positional=True`` they become ``$1``-``$4``
+        for asyncpg, and the result also carries a ``candidate_count`` column (rows
+        returned by the index scan) used for adaptive over-fetching.
+
         Args:
             table: Table name (e.g., "messages m")
             select_clause: Columns to select (default: "*")
             where_conditions: Additional WHERE conditions
-            order_by: Custom ORDER BY (default: cosine distance)
+            order_by: Custom ORDER BY (default: cosine distance; filter mode only)
+            mode: "top_k" (index-friendly) or "filter" (legacy)
+            positional: Emit asyncpg-style positional parameters
 
         Returns:
             SQL query template
         """
-        table_alias = table.split()[0] if " " in table else table
+        if positional and mode != "top_k":
+            raise ValueError("Positional parameters are only supported in top_k mode")
+
+        table_alias = table.split()[-1]
 
-        base_conditions = f"{table_alias}.embedding IS NOT NULL"
-        similarity_threshold = f"(1 - ({table_alias}.embedding <=> :query_vector::vector) / 2) >= :threshold"
+        distance = f"{table_alias}.embedding <=> :query_vector::vector"
 
-        where_clause = base_conditions
+        where_clause = f"{table_alias}.embedding IS NOT NULL"
         if where_conditions:
             where_clause += f" AND {where_conditions}"
-        where_clause += f" AND {similarity_threshold}"
-
-        order_clause = order_by or f"{table_alias}.embedding <=> :query_vector::vector"
 
-        return f"""
+        if mode == "filter":
+            where_clause += f" AND (1 - ({distance}) / 2) >= :threshold"
+            order_clause = order_by or distance
+            sql = f"""
             SELECT
                 {select_clause},
-                1 - ({table_alias}.embedding <=> :query_vector::vector) / 2 AS similarity
+                1 - ({distance}) / 2 AS similarity
             FROM {table}
             WHERE {where_clause}
             ORDER BY {order_clause}
             LIMIT :limit
         """
+        else:
+            candidate_count = ", count(*) OVER () AS candidate_count" if positional else ""
+            sql = f"""
+            WITH candidates AS (
+                SELECT
+                    {select_clause},
+                    1 - ({distance}) / 2 AS similarity
+                FROM {table}
+                WHERE {where_clause}
+                ORDER BY {distance}
+                LIMIT :candidate_limit
+            )
+            SELECT *
+            FROM (SELECT c.*{candidate_count} FROM candidates c) ranked
+            WHERE ranked.similarity >= :threshold
+            ORDER BY ranked.similarity DESC
+            LIMIT :limit
+        """
+
+        if positional:
+            for name, placeholder in _POSITIONAL_PARAMS.items():
+                sql = sql.replace(name, placeholder)
+        return sql
+
+    @staticmethod
+    def build_batch_similarity_query(table: str, select_clause: str = "*") -> str:
+        """Build top-k similarity query for many query vectors in one round trip.
+
+        Each query vector (``$1``, a text array of pgvector literals) gets its own
+        index-ordered top-k scan through ``CROSS JOIN LATERAL``, with the same
+        candidate/threshold semantics as ``build_similarity_query`` in "top_k" mode.
+        Rows carry ``query_index``, the 0-based position of their query vector.
+
+        Parameters (asyncpg positional): ``$1`` query vectors, ``$2`` candidate
+        limit, ``$3`` threshold, ``$4`` limit per query vector.
+
+        Args:
+            table: Table name with alias (e.g., "atoms a")
+            select_clause: Columns to select (default: "*")
+
+        Returns:
+            SQL query template
+        """
+        table_alias = table.split()[-1]
+        distance = f"{table_alias}.embedding <=> q.query_vector::vector"
+
+        return f"""
+            SELECT q.ord - 1 AS query_index, ranked.*
+            FROM unnest($1::text[]) WITH ORDINALITY AS q(query_vector, ord)
+            CROSS JOIN LATERAL (
+                SELECT *
+                FROM (
+                    SELECT
+                        {select_clause},
+                        1 - ({distance}) / 2 AS similarity
+                    FROM {table}
+                    WHERE {table_alias}.embedding IS NOT NULL
+                    ORDER BY {distance}
+                    LIMIT $2
+                ) candidates
+                WHERE candidates.similarity >= $3
+                ORDER BY candidates.similarity DESC
+                LIMIT $4
+            ) ranked
+            ORDER BY q.ord, ranked.similarity DESC
+        """
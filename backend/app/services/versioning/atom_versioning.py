@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.atom import Atom
 from app.models.atom_version import AtomVersion
+from app.services.versioning.bulk_operations import bulk_approve, bulk_reject
 
 
 class AtomVersioningService:
@@ -154,46 +155,10 @@ class AtomVersioningService:
         Returns:
             Tuple of (success_count, failed_ids, error_messages)
         """
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(AtomVersion).where(AtomVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            if version.approved:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version already approved"
-                continue
-
-            try:
-                entity = await db.get(Atom, version.atom_id)
-
-                if entity:
-                    for key, value in version.data.items():
-                        if hasattr(entity, key):
-                            setattr(entity, key, value)
-
-                version.approved = True
-                version.approved_at = datetime.now(UTC)
-                success_count += 1
-            except Exception as e:
-                failed_ids.append(version_id)
-                errors[version_id] = str(e)
-
+        result = await bulk_approve(db, AtomVersion, Atom, "atom_id", version_ids)
         await db.commit()
 
-        return success_count, failed_ids, errors
+        return result
 
     async def bulk_reject_atom_versions(
         self, db: AsyncSession, version_ids: list[int]
@@ -208,28 +173,10 @@ class AtomVersioningService:
         Returns:
             Tuple of (success_count, failed_ids, error_messages)
         """
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(AtomVersion).where(AtomVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            success_count += 1
-
+        result = await bulk_reject(db, AtomVersion, "atom_id", version_ids)
         await db.commit()
 
-        return success_count, failed_ids, errors
+        return result
 
     async def _get_latest_atom_version(self, db: AsyncSession, atom_id: int) -> AtomVersion | None:
         """Get the latest version for an atom."""
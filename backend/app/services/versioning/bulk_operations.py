@@ -0,0 +1,225 @@
+"""Set-based bulk approve/reject of entity versions.
+
+A bulk review locks all requested versions with one
+``SELECT ... FOR UPDATE SKIP LOCKED``, marks the approved ones with one
+UPDATE and applies their data to the entities with one
+``UPDATE ... FROM (VALUES ...)`` per entity type, instead of a SAVEPOINT,
+a locking SELECT and an entity load per version. Statements are chunked only
+to stay under the bind-parameter limit of the database protocol.
+"""
+
+import uuid
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Boolean, case, cast, literal, select, union_all, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import column
+from sqlalchemy.sql.expression import FromClause
+
+from app.models.atom import Atom
+from app.models.atom_version import AtomVersion
+from app.models.topic import Topic
+from app.models.topic_version import TopicVersion
+
+BulkResult = tuple[int, list[int], dict[int, str]]
+VersionModel = type[TopicVersion] | type[AtomVersion]
+EntityModel = type[Topic] | type[Atom]
+
+# PostgreSQL accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 30_000
+# SQLite row sources are UNION ALL selects, limited to 500 terms
+SQLITE_MAX_COMPOUND_SELECT = 500
+
+NOT_FOUND = "Version not found"
+ALREADY_APPROVED = "Version already approved"
+LOCKED = "Version is locked by another review, please retry"
+
+
+async def bulk_approve(
+    db: AsyncSession,
+    version_model: VersionModel,
+    entity_model: EntityModel,
+    entity_key: str,
+    version_ids: list[int],
+) -> BulkResult:
+    """Approve versions and apply their data to the entities, in request order.
+
+    Versions of the same entity are applied in the order requested, so the
+    last one wins for every field, as with one-by-one approval. The caller
+    commits.
+
+    Args:
+        db: Database session
+        version_model: TopicVersion or AtomVersion
+        entity_model: Topic or Atom
+        entity_key: Version column referencing the entity ("topic_id" or "atom_id")
+        version_ids: Version IDs to approve
+
+    Returns:
+        Tuple of (success_count, failed_ids, error_messages)
+    """
+    locked, errors = await _lock_versions(db, version_model, entity_key, version_ids)
+
+    updatable = {c.name for c in entity_model.__table__.columns if not c.primary_key}  # type: ignore[union-attr]
+    failed_ids: list[int] = []
+    approved_ids: list[int] = []
+    entity_data: dict[uuid.UUID, dict[str, Any]] = {}
+    for version_id in version_ids:
+        if version_id in errors:
+            failed_ids.append(version_id)
+            continue
+        entity_id, data, approved = locked[version_id]
+        if approved:
+            failed_ids.append(version_id)
+            errors[version_id] = ALREADY_APPROVED
+            continue
+        locked[version_id] = (entity_id, data, True)
+        approved_ids.append(version_id)
+        entity_data.setdefault(entity_id, {}).update((k, v) for k, v in data.items() if k in updatable)
+
+    if approved_ids:
+        approved_at = datetime.now(UTC)
+        for chunk in _chunks(approved_ids, MAX_BIND_PARAMS):
+            await db.execute(
+                update(version_model)
+                .where(version_model.id.in_(chunk))  # type: ignore[union-attr]
+                .values(approved=True, approved_at=approved_at)
+                .execution_options(synchronize_session=False)
+            )
+        await _apply_entity_data(db, entity_model, entity_data)
+        await _refresh_loaded(db, version_model, approved_ids)
+        await _refresh_loaded(db, entity_model, list(entity_data))
+
+    return len(approved_ids), failed_ids, errors
+
+
+async def bulk_reject(
+    db: AsyncSession,
+    version_model: VersionModel,
+    entity_key: str,
+    version_ids: list[int],
+) -> BulkResult:
+    """Reject versions (mark as reviewed but not applied).
+
+    Rejection changes no rows; the versions are locked like for approval so
+    a concurrent review of the same versions is reported per id. The caller
+    commits.
+
+    Args:
+        db: Database session
+        version_model: TopicVersion or AtomVersion
+        entity_key: Version column referencing the entity ("topic_id" or "atom_id")
+        version_ids: Version IDs to reject
+
+    Returns:
+        Tuple of (success_count, failed_ids, error_messages)
+    """
+    _, errors = await _lock_versions(db, version_model, entity_key, version_ids)
+    failed_ids = [version_id for version_id in version_ids if version_id in errors]
+    return len(version_ids) - len(failed_ids), failed_ids, errors
+
+
+async def _lock_versions(
+    db: AsyncSession,
+    version_model: VersionModel,
+    entity_key: str,
+    version_ids: Sequence[int],
+) -> tuple[dict[int, tuple[uuid.UUID, dict[str, Any], bool]], dict[int, str]]:
+    """Lock the requested versions, skipping rows another transaction holds.
+
+    Returns:
+        Tuple of ({version_id: (entity_id, data, approved)}, {version_id: error})
+        for every requested id
+    """
+    requested = list(dict.fromkeys(version_ids))
+    locked: dict[int, tuple[uuid.UUID, dict[str, Any], bool]] = {}
+    for chunk in _chunks(requested, MAX_BIND_PARAMS):
+        result = await db.execute(
+            select(  # type: ignore[call-overload]
+                version_model.id, getattr(version_model, entity_key), version_model.data, version_model.approved
+            )
+            .where(version_model.id.in_(chunk))  # type: ignore[union-attr]
+            .with_for_update(skip_locked=True)
+        )
+        locked.update((row[0], (row[1], row[2], row[3])) for row in result)
+
+    missing = [version_id for version_id in requested if version_id not in locked]
+    held_elsewhere: set[int] = set()
+    for chunk in _chunks(missing, MAX_BIND_PARAMS):
+        result = await db.execute(
+            select(version_model.id).where(version_model.id.in_(chunk))  # type: ignore[call-overload,union-attr]
+        )
+        held_elsewhere.update(result.scalars())
+
+    errors = {version_id: LOCKED if version_id in held_elsewhere else NOT_FOUND for version_id in missing}
+    return locked, errors
+
+
+async def _apply_entity_data(
+    db: AsyncSession, entity_model: EntityModel, entity_data: dict[uuid.UUID, dict[str, Any]]
+) -> None:
+    """Write per-entity field values with UPDATE ... FROM (VALUES ...).
+
+    Each field gets a value and a presence flag, so entities whose versions
+    set different fields share one statement and keep untouched fields.
+    """
+    table = entity_model.__table__  # type: ignore[union-attr]
+    fields = sorted({key for data in entity_data.values() for key in data})
+    if not fields:
+        return
+
+    columns = [column("id", table.c.id.type)]
+    for field in fields:
+        columns += [column(field, table.c[field].type), column(f"has_{field}", Boolean)]
+    rows = [
+        (entity_id, *[item for field in fields for item in (data.get(field), field in data)])
+        for entity_id, data in entity_data.items()
+    ]
+
+    rows_per_statement = MAX_BIND_PARAMS // len(columns)
+    if db.bind.dialect.name != "postgresql":
+        rows_per_statement = min(rows_per_statement, SQLITE_MAX_COMPOUND_SELECT)
+    for chunk in _chunks(rows, rows_per_statement):
+        source = _values_source(db, columns, chunk)
+        await db.execute(
+            update(table)
+            .where(table.c.id == source.c.id)
+            .values({
+                field: case(
+                    (source.c[f"has_{field}"], cast(source.c[field], table.c[field].type)),
+                    else_=table.c[field],
+                )
+                for field in fields
+            })
+        )
+
+
+def _values_source(db: AsyncSession, columns: list[Any], rows: Sequence[tuple[Any, ...]]) -> FromClause:
+    """Row source for the entity UPDATE: VALUES on PostgreSQL, UNION ALL elsewhere.
+
+    SQLite cannot name the columns of a VALUES list.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return values(*columns, name="v").data(list(rows))
+    selects = [
+        select(*[literal(value, col.type).label(col.name) for col, value in zip(columns, row, strict=True)])
+        for row in rows
+    ]
+    return union_all(*selects).subquery("v")
+
+
+async def _refresh_loaded(db: AsyncSession, model: VersionModel | EntityModel, ids: Sequence[Any]) -> None:
+    """Reload objects of ``model`` already in the session that the bulk UPDATEs changed."""
+    wanted = set(ids)
+    loaded = [key[1][0] for key in db.identity_map.keys() if key[0] is model and key[1][0] in wanted]
+    for chunk in _chunks(loaded, MAX_BIND_PARAMS):
+        await db.execute(
+            select(model).where(model.id.in_(chunk)).execution_options(populate_existing=True)  # type: ignore[union-attr]
+        )
+
+
+def _chunks[T](items: Sequence[T], size: int) -> list[Sequence[T]]:
+    """Split items into consecutive slices of at most ``size``."""
+    return [items[start : start + size] for start in range(0, len(items), size)]
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.topic import Topic
 from app.models.topic_version import TopicVersion
+from app.services.versioning.bulk_operations import bulk_approve, bulk_reject
 
 
 class TopicVersioningService:
@@ -158,46 +159,10 @@ class TopicVersioningService:
         Returns:
             Tuple of (success_count, failed_ids, error_messages)
         """
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(TopicVersion).where(TopicVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            if version.approved:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version already approved"
-                continue
-
-            try:
-                entity = await db.get(Topic, version.topic_id)
-
-                if entity:
-                    for key, value in version.data.items():
-                        if hasattr(entity, key):
-                            setattr(entity, key, value)
-
-                version.approved = True
-                version.approved_at = datetime.now(UTC)
-                success_count += 1
-            except Exception as e:
-                failed_ids.append(version_id)
-                errors[version_id] = str(e)
-
+        result = await bulk_approve(db, TopicVersion, Topic, "topic_id", version_ids)
         await db.commit()
 
-        return success_count, failed_ids, errors
+        return result
 
     async def bulk_reject_topic_versions(
         self, db: AsyncSession, version_ids: list[int]
@@ -212,28 +177,10 @@ class TopicVersioningService:
         Returns:
             Tuple of (success_count, failed_ids, error_messages)
         """
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(TopicVersion).where(TopicVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            success_count += 1
-
+        result = await bulk_reject(db, TopicVersion, "topic_id", version_ids)
         await db.commit()
 
-        return success_count, failed_ids, errors
+        return result
 
     async def _get_latest_topic_version(self, db: AsyncSession, topic_id: int) -> TopicVersion | None:
         """Get the latest version for a topic."""
@@ -13,6 +13,7 @@ from app.models.atom import Atom
 from app.models.atom_version import AtomVersion
 from app.models.topic import Topic
 from app.models.topic_version import TopicVersion
+from app.services.versioning.bulk_operations import bulk_approve, bulk_reject
 from app.services.websocket_manager import websocket_manager
 
 EntityType = Literal["topic", "atom"]
@@ -383,108 +384,24 @@ class VersioningService:
     async def _bulk_approve_topic_versions(
         self, db: AsyncSession, version_ids: list[int]
     ) -> tuple[int, list[int], dict[int, str]]:
-        """Bulk approve topic versions with sequential transaction-safe processing."""
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        for version_id in version_ids:
-            try:
-                async with db.begin_nested():
-                    stmt = select(TopicVersion).where(TopicVersion.id == version_id).with_for_update()
-                    result = await db.execute(stmt)
-                    version = result.scalar_one_or_none()
-
-                    if not version:
-                        failed_ids.append(version_id)
-                        errors[version_id] = "Version not found"
-                        continue
-
-                    if version.approved:
-                        failed_ids.append(version_id)
-                        errors[version_id] = "Version already approved"
-                        continue
-
-                    entity = await db.get(Topic, version.topic_id)
-                    if entity:
-                        for key, value in version.data.items():
-                            if hasattr(entity, key):
-                                setattr(entity, key, value)
-
-                    version.approved = True
-                    version.approved_at = datetime.now(UTC)
-                    success_count += 1
-            except ConflictError:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version already approved"
-            except NotFoundError:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-            except LockedError as e:
-                failed_ids.append(version_id)
-                errors[version_id] = str(e)
-            except Exception as e:
-                failed_ids.append(version_id)
-                errors[version_id] = f"Unexpected error: {str(e)}"
-
+        """Bulk approve topic versions with set-based locking and updates."""
+        result = await bulk_approve(db, TopicVersion, Topic, "topic_id", version_ids)
         await db.commit()
 
         await self._broadcast_pending_count_update(db)
 
-        return success_count, failed_ids, errors
+        return result
 
     async def _bulk_approve_atom_versions(
         self, db: AsyncSession, version_ids: list[int]
     ) -> tuple[int, list[int], dict[int, str]]:
-        """Bulk approve atom versions with sequential transaction-safe processing."""
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        for version_id in version_ids:
-            try:
-                async with db.begin_nested():
-                    stmt = select(AtomVersion).where(AtomVersion.id == version_id).with_for_update()
-                    result = await db.execute(stmt)
-                    version = result.scalar_one_or_none()
-
-                    if not version:
-                        failed_ids.append(version_id)
-                        errors[version_id] = "Version not found"
-                        continue
-
-                    if version.approved:
-                        failed_ids.append(version_id)
-                        errors[version_id] = "Version already approved"
-                        continue
-
-                    entity = await db.get(Atom, version.atom_id)
-                    if entity:
-                        for key, value in version.data.items():
-                            if hasattr(entity, key):
-                                setattr(entity, key, value)
-
-                    version.approved = True
-                    version.approved_at = datetime.now(UTC)
-                    success_count += 1
-            except ConflictError:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version already approved"
-            except NotFoundError:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-            except LockedError as e:
-                failed_ids.append(version_id)
-                errors[version_id] = str(e)
-            except Exception as e:
-                failed_ids.append(version_id)
-                errors[version_id] = f"Unexpected error: {str(e)}"
-
+        """Bulk approve atom versions with set-based locking and updates."""
+        result = await bulk_approve(db, AtomVersion, Atom, "atom_id", version_ids)
         await db.commit()
 
         await self._broadcast_pending_count_update(db)
 
-        return success_count, failed_ids, errors
+        return result
 
     async def bulk_reject_versions(
         self,
@@ -512,59 +429,23 @@ class VersioningService:
         self, db: AsyncSession, version_ids: list[int]
     ) -> tuple[int, list[int], dict[int, str]]:
         """Bulk reject topic versions."""
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(TopicVersion).where(TopicVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            success_count += 1
-
+        result = await bulk_reject(db, TopicVersion, "topic_id", version_ids)
         await db.commit()
 
         await self._broadcast_pending_count_update(db)
 
-        return success_count, failed_ids, errors
+        return result
 
     async def _bulk_reject_atom_versions(
         self, db: AsyncSession, version_ids: list[int]
     ) -> tuple[int, list[int], dict[int, str]]:
         """Bulk reject atom versions."""
-        success_count = 0
-        failed_ids: list[int] = []
-        errors: dict[int, str] = {}
-
-        stmt = select(AtomVersion).where(AtomVersion.id.in_(version_ids))  # type: ignore[arg-type]
-        result = await db.execute(stmt)
-        versions = list(result.scalars().all())
-
-        version_map = {v.id: v for v in versions}
-
-        for version_id in version_ids:
-            version = version_map.get(version_id)
-            if not version:
-                failed_ids.append(version_id)
-                errors[version_id] = "Version not found"
-                continue
-
-            success_count += 1
-
+        result = await bulk_reject(db, AtomVersion, "atom_id", version_ids)
         await db.commit()
 
         await self._broadcast_pending_count_update(db)
 
-        return success_count, failed_ids, errors
+        return result
 
     async def get_pending_versions_count(self, db: AsyncSession) -> int:
         """
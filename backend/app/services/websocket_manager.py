@@ -9,6 +9,9 @@ Features:
 - Cross-process NATS relay (worker → API → WebSocket)
 - Heartbeat system for connection health monitoring
 - Message sequencing for replay on reconnect
+- Per-connection bounded send queues drained by a writer task, so one slow
+  client never delays delivery to the others (or the NATS relay)
+- Control messages between all API/worker processes (e.g. cache invalidation)
 """
 
 import asyncio
@@ -16,6 +19,7 @@ import json
 import os
 import time
 import uuid
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -35,6 +39,10 @@ class ConnectionInfo:
     topics: set[str] = field(default_factory=set)
     connected_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     last_pong: datetime = field(default_factory=lambda: datetime.now(UTC))
+    send_queue: asyncio.Queue[str] = field(default_factory=asyncio.Queue)
+    writer_task: asyncio.Task[None] | None = None
+    dropped_frames: int = 0
+    backlogged_since: float | None = None  # monotonic time the queue first overflowed
 
 
 class WebSocketManager:
@@ -46,12 +54,22 @@ class WebSocketManager:
     Cross-process communication:
     - Worker process: Publishes messages to NATS subjects (websocket.{topic})
     - API process: Subscribes to NATS subjects and relays to WebSocket clients
+
+    Delivery: broadcasts only enqueue frames; each connection has a bounded send
+    queue and its own writer task. When a queue is full the oldest frame is dropped
+    (clients can replay gaps via ``_seq``); a connection that stays backlogged for
+    SLOW_CONSUMER_TIMEOUT is closed so it reconnects and replays.
     """
 
     # Heartbeat configuration
     PING_INTERVAL = 20  # Send ping every N seconds
     PONG_TIMEOUT = 30  # Connection stale if no pong within N seconds
 
+    # Send queue configuration
+    SEND_QUEUE_SIZE = 100  # Frames buffered per connection (matches MessageBuffer.MAX_SIZE)
+    SEND_TIMEOUT = 10  # Connection dead if a single send takes longer than N seconds
+    SLOW_CONSUMER_TIMEOUT = 5  # Close connection if its queue overflows for N seconds
+
     def __init__(self) -> None:
         """Initialize WebSocket manager."""
         # Connection storage: topic -> {conn_id: ConnectionInfo}
@@ -61,9 +79,15 @@ class WebSocketManager:
         self._lock = asyncio.Lock()
         self._nats_client: NATSClient | None = None
         self._nats_subscriptions: list[Subscription] = []
+        self._control_handlers: dict[str, Callable[[dict[str, Any]], None]] = {}
         self._is_worker = self._detect_worker_process()
         self._startup_complete = False
         self._heartbeat_task: asyncio.Task[None] | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        # Delivery metrics
+        self._frames_sent = 0
+        self._frames_dropped = 0
+        self._slow_consumer_disconnects = 0
         logger.info(
             f"🔧 WebSocketManager initialized: is_worker={self._is_worker}, TASKIQ_WORKER={os.getenv('TASKIQ_WORKER')}"
         )
@@ -97,7 +121,9 @@ class WebSocketManager:
             id=conn_id,
             websocket=websocket,
             topics=set(topics),
+            send_queue=asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE),
         )
+        conn_info.writer_task = asyncio.create_task(self._run_writer(conn_info))
 
         async with self._lock:
             # Store in reverse index
@@ -146,6 +172,11 @@ class WebSocketManager:
                 if topic in self._connections:
                     self._connections[topic].pop(target_conn.id, None)
 
+            # Stop writer (unless the writer itself is disconnecting after a failed send)
+            writer_task = target_conn.writer_task
+            if writer_task is not None and writer_task is not asyncio.current_task():
+                writer_task.cancel()
+
             logger.info(f"🔌 Connection {target_conn.id} disconnected")
 
     async def subscribe(self, conn_id: str, topic: str) -> bool:
@@ -222,6 +253,7 @@ class WebSocketManager:
             await self._nats_client.connect(servers=nats_servers)
             logger.info(f"NATS client connected for WebSocketManager (worker={self._is_worker})")
 
+            await self._subscribe_to_control_subjects()
             if not self._is_worker:
                 await self._subscribe_to_nats_topics()
                 # Start heartbeat loop only in API process
@@ -249,6 +281,53 @@ class WebSocketManager:
             except Exception as e:
                 logger.error(f"❌ Failed to subscribe to {subject}: {e}")
 
+    def add_control_handler(self, subject: str, handler: Callable[[dict[str, Any]], None]) -> None:
+        """Handle control messages published by any process on a NATS subject.
+
+        Must be called before ``startup``. Every process subscribes, so the
+        publishing process receives its own messages too.
+
+        Args:
+            subject: NATS subject (e.g. "control.identity_cache")
+            handler: Called with the decoded message
+        """
+        self._control_handlers[subject] = handler
+
+    async def publish_control(self, subject: str, message: dict[str, Any]) -> None:
+        """Publish a control message to all API/worker processes.
+
+        Args:
+            subject: NATS subject registered with ``add_control_handler``
+            message: Message data (JSON serializable)
+        """
+        if not self._nats_client:
+            logger.debug(f"NATS client not initialized, control message on {subject} not published")
+            return
+
+        try:
+            await self._nats_client.publish(subject, json.dumps(message).encode())
+        except Exception as e:
+            logger.error(f"❌ Failed to publish control message to {subject}: {e}")
+
+    async def _subscribe_to_control_subjects(self) -> None:
+        """Subscribe registered control handlers (API and worker processes)."""
+        if not self._nats_client:
+            return
+
+        for subject, handler in self._control_handlers.items():
+
+            async def handle(msg: Any, handler: Callable[[dict[str, Any]], None] = handler) -> None:
+                try:
+                    handler(json.loads(msg.data.decode()))
+                except Exception as e:
+                    logger.error(f"❌ Error handling control message on {msg.subject}: {e}")
+
+            try:
+                self._nats_subscriptions.append(await self._nats_client.subscribe(subject, cb=handle))
+                logger.info(f"📡 Subscribed to NATS control subject: {subject}")
+            except Exception as e:
+                logger.error(f"❌ Failed to subscribe to {subject}: {e}")
+
     async def _handle_nats_message(self, msg: Any) -> None:
         """Handle incoming NATS message and relay to WebSocket clients.
 
@@ -267,8 +346,12 @@ class WebSocketManager:
             logger.error(f"❌ Error handling NATS message: {e}")
 
     async def shutdown(self) -> None:
-        """Cleanup NATS connection, subscriptions, and heartbeat task."""
+        """Cleanup NATS connection, subscriptions, heartbeat and writer tasks."""
         try:
+            for conn_info in list(self._conn_by_id.values()):
+                if conn_info.writer_task is not None:
+                    conn_info.writer_task.cancel()
+
             # Cancel heartbeat task
             if self._heartbeat_task:
                 self._heartbeat_task.cancel()
@@ -326,18 +409,10 @@ class WebSocketManager:
         conn_ids = [c.id[:8] for c in conn_infos]  # Short IDs for readability
         logger.debug(f"[Heartbeat] Sending ping to {len(conn_infos)} connections: {conn_ids}")
 
-        disconnected_ids: list[str] = []
+        # Failed sends are handled by each connection's writer task
         for conn_info in conn_infos:
-            try:
-                await conn_info.websocket.send_text(ping_json)
-            except Exception as e:
-                logger.warning(f"Failed to send ping to {conn_info.id}: {e}")
-                disconnected_ids.append(conn_info.id)
-
-        # Cleanup connections that failed to receive ping
-        if disconnected_ids:
-            for conn_id in disconnected_ids:
-                await self.disconnect(conn_id=conn_id)
+            if not self._enqueue(conn_info, ping_json):
+                await self._drop_slow_consumer(conn_info)
 
     async def _cleanup_stale_connections(self) -> None:
         """Remove connections that haven't sent pong within PONG_TIMEOUT."""
@@ -375,6 +450,35 @@ class WebSocketManager:
                 self._conn_by_id[conn_id].last_pong = datetime.now(UTC)
                 logger.debug(f"Pong received from {conn_id}")
 
+    async def send_to_connection(self, conn_id: str, message: dict[str, Any]) -> bool:
+        """Queue a frame for one connection (acks, replayed messages).
+
+        Frames go through the connection's send queue so they are serialized with
+        broadcasts by its writer task. Unlike broadcasts, nothing is dropped: the
+        caller waits for queue space, and a connection that does not free any
+        within SLOW_CONSUMER_TIMEOUT is closed.
+
+        Args:
+            conn_id: Target connection ID
+            message: Message to send
+
+        Returns:
+            False if the connection is gone or was closed as a slow consumer
+        """
+        conn_info = self._conn_by_id.get(conn_id)
+        if conn_info is None:
+            return False
+
+        from app.core.json_encoder import UUIDJSONEncoder
+
+        frame = json.dumps(message, cls=UUIDJSONEncoder)
+        try:
+            await asyncio.wait_for(conn_info.send_queue.put(frame), timeout=self.SLOW_CONSUMER_TIMEOUT)
+        except TimeoutError:
+            await self._drop_slow_consumer(conn_info)
+            return False
+        return True
+
     async def broadcast(self, topic: str, message: dict[str, Any]) -> None:
         """Broadcast message to all subscribers of a topic.
 
@@ -452,23 +556,89 @@ class WebSocketManager:
             f"Broadcasting {message.get('type', 'unknown')} (seq={seq}) to {len(conn_infos)} client(s) on topic {topic}"
         )
 
-        disconnected_ids: list[str] = []
-        for conn_info in conn_infos:
+        # Enqueue only: writer tasks deliver concurrently, failed sends disconnect there
+        slow_consumers = [conn_info for conn_info in conn_infos if not self._enqueue(conn_info, message_json)]
+        for conn_info in slow_consumers:
+            await self._drop_slow_consumer(conn_info)
+
+    def _enqueue(self, conn_info: ConnectionInfo, frame: str) -> bool:
+        """Queue frame for a connection, dropping its oldest frame when full.
+
+        Returns:
+            False if the connection has been backlogged for longer than
+            SLOW_CONSUMER_TIMEOUT and should be closed, True otherwise
+        """
+        queue = conn_info.send_queue
+        try:
+            queue.put_nowait(frame)
+            conn_info.backlogged_since = None
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        queue.get_nowait()
+        queue.put_nowait(frame)
+        conn_info.dropped_frames += 1
+        self._frames_dropped += 1
+
+        now = time.monotonic()
+        if conn_info.backlogged_since is None:
+            conn_info.backlogged_since = now
+            logger.warning(f"Connection {conn_info.id} send queue full, dropping oldest frames")
+            return True
+        return now - conn_info.backlogged_since < self.SLOW_CONSUMER_TIMEOUT
+
+    async def _run_writer(self, conn_info: ConnectionInfo) -> None:
+        """Background task: drain a connection's send queue into its WebSocket."""
+        try:
+            while True:
+                frame = await conn_info.send_queue.get()
+                await asyncio.wait_for(conn_info.websocket.send_text(frame), timeout=self.SEND_TIMEOUT)
+                self._frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to send to connection {conn_info.id}: {e}")
+            await self.disconnect(conn_id=conn_info.id)
+
+    async def _drop_slow_consumer(self, conn_info: ConnectionInfo) -> None:
+        """Disconnect a connection that cannot keep up and close its socket in the background."""
+        if conn_info.id not in self._conn_by_id:
+            return
+        logger.warning(
+            f"Closing slow consumer {conn_info.id}: {conn_info.send_queue.qsize()} frames queued, "
+            f"{conn_info.dropped_frames} dropped"
+        )
+        self._slow_consumer_disconnects += 1
+        await self.disconnect(conn_id=conn_info.id)
+
+        async def close() -> None:
             try:
-                await conn_info.websocket.send_text(message_json)
+                # 1013 = try again later; client reconnects with lastSeq and replays
+                await asyncio.wait_for(conn_info.websocket.close(code=1013), timeout=self.SEND_TIMEOUT)
             except Exception as e:
-                logger.warning(f"Failed to send to connection {conn_info.id}: {e}")
-                disconnected_ids.append(conn_info.id)
-
-        # Cleanup disconnected connections
-        if disconnected_ids:
-            async with self._lock:
-                for disc_conn_id in disconnected_ids:
-                    disc_conn = self._conn_by_id.pop(disc_conn_id, None)
-                    if disc_conn:
-                        for t in disc_conn.topics:
-                            if t in self._connections:
-                                self._connections[t].pop(disc_conn_id, None)
+                logger.debug(f"Failed to close slow consumer {conn_info.id}: {e}")
+
+        task = asyncio.create_task(close())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def get_delivery_stats(self) -> dict[str, int]:
+        """Get send queue and delivery metrics.
+
+        Returns:
+            Connection count, total/max queue depth, sent and dropped frame
+            counters and number of slow consumers disconnected
+        """
+        depths = [conn_info.send_queue.qsize() for conn_info in self._conn_by_id.values()]
+        return {
+            "connections": len(depths),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "frames_sent": self._frames_sent,
+            "frames_dropped": self._frames_dropped,
+            "slow_consumer_disconnects": self._slow_consumer_disconnects,
+        }
 
     def get_connection_count(self, topic: str | None = None) -> int:
         """Get number of active connections.
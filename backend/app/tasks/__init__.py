@@ -5,6 +5,7 @@ Tasks are now organized into focused modules:
 - analysis.py: Analysis runs and classification experiments
 - ingestion.py: Message ingestion and webhook processing
 - knowledge.py: Knowledge extraction, embeddings, and scheduled tasks
+- metrics.py: Dashboard daily rollup and embedding cache maintenance
 - scoring.py: Message importance scoring
 
 All tasks are re-exported from this __init__.py for backward compatibility.
@@ -16,6 +17,7 @@ from app.tasks.ingestion import (
     process_message,
     queue_knowledge_extraction_if_needed,
     save_telegram_message,
+    save_telegram_messages,
 )
 from app.tasks.knowledge import (
     embed_atoms_batch_task,
@@ -24,7 +26,8 @@ from app.tasks.knowledge import (
     scheduled_auto_approval_task,
     scheduled_knowledge_extraction_task,
 )
-from app.tasks.scoring import score_message_task, score_unscored_messages_task
+from app.tasks.metrics import prune_embedding_cache_task, refresh_daily_rollups_task
+from app.tasks.scoring import score_message_task, score_messages_batch_task, score_unscored_messages_task
 
 KNOWLEDGE_EXTRACTION_THRESHOLD = ai_config.knowledge_extraction.message_threshold
 KNOWLEDGE_EXTRACTION_LOOKBACK_HOURS = ai_config.knowledge_extraction.lookback_hours
@@ -33,10 +36,12 @@ __all__ = [
     # Ingestion
     "process_message",
     "save_telegram_message",
+    "save_telegram_messages",
     "ingest_telegram_messages_task",
     "queue_knowledge_extraction_if_needed",
     # Scoring
     "score_message_task",
+    "score_messages_batch_task",
     "score_unscored_messages_task",
     # Knowledge
     "embed_messages_batch_task",
@@ -44,6 +49,9 @@ __all__ = [
     "extract_knowledge_from_messages_task",
     "scheduled_knowledge_extraction_task",
     "scheduled_auto_approval_task",
+    # Metrics
+    "refresh_daily_rollups_task",
+    "prune_embedding_cache_task",
     # Config constants (backward compatibility)
     "KNOWLEDGE_EXTRACTION_THRESHOLD",
     "KNOWLEDGE_EXTRACTION_LOOKBACK_HOURS",
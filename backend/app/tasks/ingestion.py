@@ -2,18 +2,37 @@ import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from core.config import settings
 from core.taskiq_config import nats_broker
 from loguru import logger
-from sqlalchemy import func, select
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.config.ai_config import ai_config
 from app.database import AsyncSessionLocal
 from app.models import AgentConfig, IngestionStatus, Message, MessageIngestionJob
-from app.services.batching_service import group_messages_by_conversation, select_conversations_for_batch
+from app.services.avatar_resolver import get_avatar_resolver
+from app.services.batching_service import (
+    group_messages_by_conversation,
+    group_unprocessed_by_conversation,
+    select_conversations_for_batch,
+)
+from app.services.ingestion_pipeline import ChatBatch, IngestionPipeline
+from app.services.micro_batcher import MicroBatcher
+from app.services.source_adapters import TelegramSourceAdapter
 from app.services.telegram_ingestion_service import telegram_ingestion_service
-from app.services.user_service import get_or_create_source, identify_or_create_user
+from app.services.unprocessed_messages import count_unprocessed_messages, load_unprocessed_messages
+from app.services.user_service import (
+    TelegramAuthor,
+    TelegramSender,
+    get_or_create_source,
+    get_source_id,
+    identify_telegram_author,
+    identity_cache,
+    set_author_avatar,
+)
 from app.services.websocket_manager import websocket_manager
-from app.webhook_service import telegram_webhook_service
 
 
 async def queue_knowledge_extraction_if_needed(message_id: uuid.UUID, db: Any) -> None:
@@ -28,7 +47,7 @@ async def queue_knowledge_extraction_if_needed(message_id: uuid.UUID, db: Any) -
         db: Database session
 
     Logic:
-        - Count messages without topic_id in last 24 hours
+        - Count messages without topic_id in last 24 hours (hourly counter, not COUNT(*))
         - If count >= KNOWLEDGE_EXTRACTION_THRESHOLD, trigger extraction
         - Use first active LLM provider found
         - Process all unprocessed messages in batch
@@ -37,11 +56,7 @@ async def queue_knowledge_extraction_if_needed(message_id: uuid.UUID, db: Any) -
 
     cutoff_time = datetime.utcnow() - timedelta(hours=ai_config.knowledge_extraction.lookback_hours)
 
-    count_stmt = (
-        select(func.count()).select_from(Message).where(Message.topic_id.is_(None), Message.sent_at >= cutoff_time)  # type: ignore[union-attr]
-    )
-    result = await db.execute(count_stmt)
-    unprocessed_count = result.scalar() or 0
+    unprocessed_count = await count_unprocessed_messages(db, cutoff_time)
 
     logger.debug(
         f"Knowledge extraction check: {unprocessed_count} unprocessed messages in last "
@@ -61,21 +76,15 @@ async def queue_knowledge_extraction_if_needed(message_id: uuid.UUID, db: Any) -
         logger.warning("No active agent config 'knowledge_extractor' found for knowledge extraction, skipping")
         return
 
-    # Fetch all unprocessed messages for intelligent conversation-aware batching
-    messages_stmt = (
-        select(Message)
-        .where(Message.topic_id.is_(None), Message.sent_at >= cutoff_time)  # type: ignore[union-attr, arg-type]
-        .order_by(Message.source_channel_id, Message.source_thread_id, Message.sent_at)  # type: ignore[arg-type]
-    )
-    messages_result = await db.execute(messages_stmt)
-    all_messages = list(messages_result.scalars().all())
+    # Group by conversation (channel + thread) with time-gap fallback
+    if ai_config.analysis.sql_grouping:
+        grouped = await group_unprocessed_by_conversation(db, cutoff_time)
+    else:
+        grouped = group_messages_by_conversation(await load_unprocessed_messages(db, cutoff_time))
 
-    if not all_messages:
+    if not grouped:
         return
 
-    # Group by conversation (channel + thread) with time-gap fallback
-    grouped = group_messages_by_conversation(all_messages)
-
     # Select complete conversations up to batch size
     message_ids = select_conversations_for_batch(grouped, ai_config.knowledge_extraction.batch_size)
 
@@ -101,132 +110,196 @@ async def process_message(message: str) -> str:
     return f"Processed: {message}"
 
 
-@nats_broker.task
-async def save_telegram_message(telegram_data: dict[str, Any]) -> str:
-    """Background task to save Telegram message to database"""
-    from app.tasks.scoring import score_message_task
+def _skipped(message: dict[str, Any]) -> str | None:
+    """Reason for not storing a webhook message, None if it can be stored."""
+    from_user = message.get("from", {})
+    if not (from_user.get("id") or message.get("user_id")):
+        logger.warning(f"Message {message['message_id']} has no sender, skipping")
+        return f"❌ Skipped message {message['message_id']}: no sender"
+    return None
+
+
+async def save_telegram_messages(updates: list[dict[str, Any]]) -> list[str]:
+    """Save a batch of Telegram webhook updates in one transaction.
 
+    Authors are resolved through the identity cache, messages are written
+    with one multi-row ``INSERT ... ON CONFLICT DO NOTHING`` (redelivered
+    updates are skipped), and scoring plus the knowledge extraction threshold
+    check run once for the whole batch. If the batch fails, each update is
+    retried on its own so a malformed update only fails itself.
+
+    Args:
+        updates: Telegram update payloads containing a ``message``
+
+    Returns:
+        One result string per update (same order)
+    """
     try:
-        logger.info(
-            f"Starting to save Telegram message: {telegram_data.get('message', {}).get('message_id', 'unknown')}"
-        )
+        return await _save_telegram_batch(updates)
+    except Exception as e:
+        logger.error(f"❌ Failed to save batch of {len(updates)} Telegram messages: {e}")
+        if len(updates) == 1:
+            logger.exception("Full traceback:")
+            return [f"Error: {str(e)}"]
 
-        async with AsyncSessionLocal() as db:
-            message = telegram_data["message"]
-            logger.debug(f"Processing message data: {message}")
+    logger.info(f"Retrying {len(updates)} Telegram messages one by one")
+    results: list[str] = []
+    for update in updates:
+        results += await save_telegram_messages([update])
+    return results
 
-            source = await get_or_create_source(db, name="telegram")
 
-            from_user = message.get("from", {})
-            telegram_user_id = from_user.get("id") or message.get("user_id")
-
-            if not telegram_user_id:
-                logger.warning(f"Message {message['message_id']} has no sender, skipping")
-                return f"❌ Skipped message {message['message_id']}: no sender"
-
-            first_name = from_user.get("first_name", "Unknown")
-            last_name = from_user.get("last_name")
-            language_code = from_user.get("language_code")
-            is_bot = from_user.get("is_bot", False)
-
-            user, tg_profile = await identify_or_create_user(
-                db=db,
-                telegram_user_id=telegram_user_id,
-                first_name=first_name,
-                last_name=last_name,
-                language_code=language_code,
-                is_bot=is_bot,
-            )
+async def _save_telegram_batch(updates: list[dict[str, Any]]) -> list[str]:
+    """Store updates in one transaction; raises if any of them cannot be stored."""
+    from app.tasks.scoring import score_messages_batch_task
 
-            # Attempt to retrieve user avatar
-            avatar_url = user.avatar_url
-            if not avatar_url:
-                try:
-                    avatar_url = await telegram_webhook_service.get_user_avatar_url(int(telegram_user_id))
-                    if avatar_url:
-                        user.avatar_url = avatar_url
-                        await db.flush()
-                        logger.info(f"Fetched and updated avatar for user {user.id}")
-                except Exception as exc:
-                    logger.warning(f"Failed to fetch avatar for Telegram user {telegram_user_id}: {exc}")
-
-            # Extract threading information from Telegram data
-            chat_data = message.get("chat", {})
-            reply_to = message.get("reply_to_message")
-
-            # Persist message in database
-            db_message = Message(
-                external_message_id=str(message["message_id"]),
-                content=message.get("text", message.get("caption", "[Media]")),
-                sent_at=datetime.fromtimestamp(message["date"]),
-                source_id=source.id,
-                author_id=user.id,
-                telegram_profile_id=tg_profile.id,
-                avatar_url=avatar_url,
-                analyzed=False,
-                # Threading fields (source-agnostic)
-                source_channel_id=str(chat_data.get("id")) if chat_data.get("id") else None,
-                source_thread_id=str(message.get("message_thread_id")) if message.get("message_thread_id") else None,
-                source_parent_id=str(reply_to.get("message_id")) if reply_to else None,
-            )
+    results: list[str | None] = [_skipped(update["message"]) for update in updates]
+    pending = [index for index, result in enumerate(results) if result is None]
+    if not pending:
+        return [result or "" for result in results]
 
-            db.add(db_message)
-            logger.debug(f"Added message to session: {db_message.external_message_id}")
+    logger.info(f"Saving batch of {len(pending)} Telegram messages")
+    telegram_user_ids: set[int] = set()
+    try:
+        async with AsyncSessionLocal() as db:
+            source_id = await get_source_id(db, name="telegram")
+
+            rows: list[dict[str, Any]] = []
+            authors: list[TelegramAuthor] = []
+            for index in pending:
+                message = updates[index]["message"]
+                from_user = message.get("from", {})
+                telegram_user_id = from_user.get("id") or message.get("user_id")
+                telegram_user_ids.add(telegram_user_id)
+
+                sender = TelegramSender(
+                    first_name=from_user.get("first_name", "Unknown"),
+                    last_name=from_user.get("last_name"),
+                    language_code=from_user.get("language_code"),
+                    is_bot=from_user.get("is_bot", False),
+                )
+                # Known senders are resolved from the identity cache without queries
+                author = await identify_telegram_author(db, telegram_user_id, sender)
 
+                # Attempt to retrieve user avatar
+                if not author.avatar_url:
+                    avatar_url = await get_avatar_resolver().resolve(int(telegram_user_id))
+                    if avatar_url:
+                        await set_author_avatar(db, telegram_user_id, author, avatar_url)
+                        author = author._replace(avatar_url=avatar_url)
+                        logger.info(f"Fetched and updated avatar for user {author.user_id}")
+                authors.append(author)
+
+                # Extract threading information from Telegram data
+                chat_data = message.get("chat", {})
+                reply_to = message.get("reply_to_message")
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "external_message_id": str(message["message_id"]),
+                    "content": message.get("text", message.get("caption", "[Media]")),
+                    "sent_at": datetime.fromtimestamp(message["date"]),
+                    "source_id": source_id,
+                    "author_id": author.user_id,
+                    "telegram_profile_id": author.telegram_profile_id,
+                    "avatar_url": author.avatar_url,
+                    "analyzed": False,
+                    "analysis_status": "pending",
+                    "status": "pending",
+                    # Threading fields (source-agnostic)
+                    "source_channel_id": str(chat_data.get("id")) if chat_data.get("id") else None,
+                    "source_thread_id": (
+                        str(message.get("message_thread_id")) if message.get("message_thread_id") else None
+                    ),
+                    "source_parent_id": str(reply_to.get("message_id")) if reply_to else None,
+                })
+
+            insert = sqlite_insert if db.bind.dialect.name == "sqlite" else pg_insert
+            stmt = (
+                insert(Message)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    index_elements=["source_id", "source_channel_id", "external_message_id"],
+                    index_where=Message.source_channel_id.is_not(None),  # type: ignore[union-attr]
+                )
+                .returning(Message.id)  # type: ignore[call-overload]
+            )
+            stored_ids = set((await db.execute(stmt)).scalars().all())
             await db.commit()
-            await db.refresh(db_message)
-            logger.info(f"✅ Successfully committed Telegram message {message['message_id']} from {user.full_name}")
-
-            # Trigger async importance scoring for the new message
-            if db_message.id is not None:
+            logger.info(f"✅ Committed {len(stored_ids)}/{len(rows)} Telegram messages in one transaction")
+
+            stored = [(row, author) for row, author in zip(rows, authors, strict=True) if row["id"] in stored_ids]
+            for index, row in zip(pending, rows, strict=True):
+                if row["id"] in stored_ids:
+                    results[index] = f"Saved message {row['external_message_id']}"
+                else:
+                    results[index] = f"Skipped duplicate message {row['external_message_id']}"
+
+            if stored:
+                message_ids = [row["id"] for row, _ in stored]
+                # Trigger async importance scoring for the whole batch
                 try:
-                    await score_message_task.kiq(db_message.id)
-                    logger.info(f"📊 Queued scoring task for message {db_message.id}")
+                    await score_messages_batch_task.kiq(message_ids)
+                    logger.info(f"📊 Queued scoring task for {len(message_ids)} messages")
                 except Exception as exc:
-                    logger.warning(f"Failed to queue scoring task for message {db_message.id}: {exc}")
+                    logger.warning(f"Failed to queue scoring task for {len(message_ids)} messages: {exc}")
 
-                # Queue knowledge extraction if threshold reached
+                # Queue knowledge extraction if threshold reached (checked once per batch)
                 try:
-                    await queue_knowledge_extraction_if_needed(db_message.id, db)
+                    await queue_knowledge_extraction_if_needed(message_ids[-1], db)
                 except Exception as exc:
-                    logger.warning(f"Failed to queue knowledge extraction for message {db_message.id}: {exc}")
+                    logger.warning(f"Failed to queue knowledge extraction after batch save: {exc}")
 
-            # Broadcast full message data after persisting to DB
-            try:
-                from app.services.websocket_manager import websocket_manager
+    except Exception:
+        # Cached ids may be stale (e.g. rows changed by another process) or rolled back
+        for telegram_user_id in telegram_user_ids:
+            identity_cache.invalidate_author(telegram_user_id)
+        identity_cache.invalidate_sources()
+        raise
 
-                connection_count = websocket_manager.get_connection_count("messages")
-                logger.info(f"📡 Broadcasting message.updated to {connection_count} WebSocket clients")
-
-                await websocket_manager.broadcast(
-                    "messages",
-                    {
-                        "type": "message.updated",
-                        "data": {
-                            "id": db_message.id,
-                            "external_message_id": db_message.external_message_id,
-                            "author_id": user.id,
-                            "author_name": user.full_name,
-                            "source_id": source.id,
-                            "source_name": source.name,
-                            "persisted": True,
-                            "avatar_url": avatar_url,
-                        },
+    # Broadcast full message data after persisting to DB
+    for row, author in stored:
+        try:
+            await websocket_manager.broadcast(
+                "messages",
+                {
+                    "type": "message.updated",
+                    "data": {
+                        "id": row["id"],
+                        "external_message_id": row["external_message_id"],
+                        "author_id": author.user_id,
+                        "author_name": author.full_name,
+                        "source_id": source_id,
+                        "source_name": "telegram",
+                        "persisted": True,
+                        "avatar_url": author.avatar_url,
                     },
-                )
-                logger.info(f"✅ message.updated broadcast sent for message {message['message_id']}")
-            except Exception as exc:  # pragma: no cover - defensive logging
-                logger.warning(
-                    "Failed to broadcast persisted update for message %s: %s",
-                    message["message_id"],
-                    exc,
-                )
+                },
+            )
+        except Exception as exc:  # pragma: no cover - defensive logging
+            logger.warning(f"Failed to broadcast persisted update for message {row['external_message_id']}: {exc}")
+
+    return [result or "" for result in results]
+
 
-            return f"Saved message {message['message_id']}"
+telegram_message_batcher: MicroBatcher[dict[str, Any], str] = MicroBatcher(
+    save_telegram_messages,
+    max_items=settings.telegram.save_batch_max_messages,
+    max_delay=settings.telegram.save_batch_window_ms / 1000,
+)
 
+
+@nats_broker.task
+async def save_telegram_message(telegram_data: dict[str, Any]) -> str:
+    """Background task to save Telegram message to database.
+
+    Messages received by the worker within a short window are coalesced by
+    ``telegram_message_batcher`` and saved together (see ``save_telegram_messages``).
+    """
+    logger.info(f"Starting to save Telegram message: {telegram_data.get('message', {}).get('message_id', 'unknown')}")
+    try:
+        return await telegram_message_batcher.submit(telegram_data)
     except Exception as e:
         logger.error(f"❌ Failed to save Telegram message: {e}")
-        logger.exception("Full traceback:")
         return f"Error: {str(e)}"
 
 
@@ -240,6 +313,10 @@ async def ingest_telegram_messages_task(
     """
     Background task for ingesting messages from Telegram chats.
 
+    Chats are streamed concurrently through IngestionPipeline; each batch is
+    bulk-stored and committed with the job progress while the next pages are
+    being fetched.
+
     Args:
         job_id: MessageIngestionJob ID for tracking
         chat_ids: List of Telegram chat IDs or usernames
@@ -288,107 +365,94 @@ async def ingest_telegram_messages_task(
             total_skipped = 0
             total_errors = 0
 
-            # Process each chat sequentially
-            for chat_idx, chat_id in enumerate(chat_ids, 1):
-                logger.info(f"Processing chat {chat_idx}/{len(chat_ids)}: {chat_id}")
-
-                batch_size = 100  # Telegram API limit
-                offset_id = 0
-                messages_from_chat = 0
-
-                while messages_from_chat < limit:
-                    # Fetch messages in batches with optional time filter
-                    try:
-                        messages = await telegram_ingestion_service.fetch_chat_history(
-                            chat_id=chat_id,
-                            limit=min(batch_size, limit - messages_from_chat),
-                            offset_id=offset_id,
-                            offset_date=offset_date,
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to fetch messages from {chat_id}: {e}")
-                        # Mark job as failed
-                        job.status = IngestionStatus.failed
-                        job.error_log = {"error": str(e), "timestamp": datetime.now(UTC).isoformat()}
-                        await db.commit()
-
-                        # Broadcast failure
-                        await websocket_manager.broadcast(
-                            "ingestion",
-                            {
-                                "type": "ingestion.failed",
-                                "data": {
-                                    "job_id": job_id,
-                                    "status": "failed",
-                                    "error": str(e),
-                                },
-                            },
+            async def write_batch(batch: ChatBatch) -> None:
+                """Store one fetched batch and report progress (runs while other pages are fetched)."""
+                nonlocal total_fetched, total_stored, total_skipped, total_errors
+                if job is None:
+                    return
+                messages = batch.messages
+
+                # Store the whole batch with set-based upserts; committed below with job progress
+                try:
+                    async with db.begin_nested():
+                        stored = await telegram_ingestion_service.store_messages_bulk(
+                            db, messages, source, chat_id=batch.chat_id
                         )
-                        return f"Ingestion failed: {e}"
-
-                    if not messages:
-                        logger.info(f"No more messages from chat {chat_id}")
-                        break
-
-                    # Process messages in current batch
-                    batch_stored = 0
-                    batch_skipped = 0
-                    batch_errors = 0
-
-                    for msg in messages:
-                        success, reason = await telegram_ingestion_service.store_message(db, msg, source)
-
-                        if reason == "stored":
-                            batch_stored += 1
-                        elif reason == "duplicate":
-                            batch_skipped += 1
-                        else:
-                            batch_errors += 1
-
-                    total_fetched += len(messages)
-                    total_stored += batch_stored
-                    total_skipped += batch_skipped
-                    total_errors += batch_errors
-                    messages_from_chat += len(messages)
-
-                    await telegram_ingestion_service.update_job_progress(
-                        db=db,
-                        job=job,
-                        messages_fetched=len(messages),
-                        messages_stored=batch_stored,
-                        messages_skipped=batch_skipped,
-                        errors_count=batch_errors,
-                        current_batch=chat_idx,
-                    )
+                    batch_stored, batch_skipped, batch_errors = stored
+                except Exception as e:
+                    logger.error(f"Failed to store batch of {len(messages)} messages from {batch.chat_id}: {e}")
+                    batch_stored, batch_skipped, batch_errors = 0, 0, len(messages)
+
+                total_fetched += len(messages)
+                total_stored += batch_stored
+                total_skipped += batch_skipped
+                total_errors += batch_errors
+
+                await telegram_ingestion_service.update_job_progress(
+                    db=db,
+                    job=job,
+                    messages_fetched=len(messages),
+                    messages_stored=batch_stored,
+                    messages_skipped=batch_skipped,
+                    errors_count=batch_errors,
+                    current_batch=batch.chat_index,
+                )
 
-                    # Send real-time progress updates
-                    await websocket_manager.broadcast(
-                        "ingestion",
-                        {
-                            "type": "ingestion.progress",
-                            "data": {
-                                "job_id": job_id,
-                                "chat_id": chat_id,
-                                "messages_fetched": total_fetched,
-                                "messages_stored": total_stored,
-                                "messages_skipped": total_skipped,
-                                "errors_count": total_errors,
-                                "current_chat": chat_idx,
-                                "total_chats": len(chat_ids),
-                            },
+                # Send real-time progress updates
+                await websocket_manager.broadcast(
+                    "ingestion",
+                    {
+                        "type": "ingestion.progress",
+                        "data": {
+                            "job_id": job_id,
+                            "chat_id": batch.chat_id,
+                            "messages_fetched": total_fetched,
+                            "messages_stored": total_stored,
+                            "messages_skipped": total_skipped,
+                            "errors_count": total_errors,
+                            "current_chat": batch.chat_index,
+                            "total_chats": len(chat_ids),
                         },
-                    )
-
-                    if messages:
-                        offset_id = messages[-1].get("message_id", 0)
+                    },
+                )
 
-                    # Persist batch changes
-                    await db.commit()
+                logger.info(
+                    f"Batch complete: chat={batch.chat_id}, fetched={len(messages)}, "
+                    f"stored={batch_stored}, skipped={batch_skipped}, errors={batch_errors}"
+                )
 
-                    logger.info(
-                        f"Batch complete: fetched={len(messages)}, "
-                        f"stored={batch_stored}, skipped={batch_skipped}, errors={batch_errors}"
-                    )
+            # Chats are fetched concurrently over one Telegram connection and streamed
+            # through a bounded queue into write_batch
+            pipeline = IngestionPipeline(
+                TelegramSourceAdapter(),
+                batch_size=100,  # Telegram API page size
+                max_concurrent_chats=settings.telegram.ingestion_max_concurrent_chats,
+                queue_batches=settings.telegram.ingestion_queue_batches,
+                flood_wait_budget=settings.telegram.ingestion_flood_wait_budget,
+            )
+            try:
+                await pipeline.run([str(chat_id) for chat_id in chat_ids], write_batch, since=offset_date, limit=limit)
+            except Exception as e:
+                logger.error(f"Failed to ingest messages from {chat_ids}: {e}")
+                await db.rollback()
+                # Mark job as failed
+                job.status = IngestionStatus.failed
+                job.error_log = {"error": str(e), "timestamp": datetime.now(UTC).isoformat()}
+                await db.commit()
+
+                # Broadcast failure
+                await websocket_manager.broadcast(
+                    "ingestion",
+                    {
+                        "type": "ingestion.failed",
+                        "data": {
+                            "job_id": job_id,
+                            "status": "failed",
+                            "error": str(e),
+                        },
+                    },
+                )
+                return f"Ingestion failed: {e}"
 
             # Finalize ingestion job
             job.status = IngestionStatus.completed
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, timedelta, UTC
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -10,7 +10,7 @@ from uuid import UUID
 
 from core.taskiq_config import nats_broker
 from loguru import logger
-from sqlalchemy import func, select
+from sqlalchemy import select
 
 from app.config.ai_config import ai_config
 from app.database import AsyncSessionLocal, get_db_session_context
@@ -26,6 +26,7 @@ from app.services.embedding_service import EmbeddingService
 from app.services.knowledge.knowledge_orchestrator import KnowledgeOrchestrator as KnowledgeExtractionService
 from app.services.rag_context_builder import RAGContextBuilder
 from app.services.semantic_search_service import SemanticSearchService
+from app.services.unprocessed_messages import count_unprocessed_messages
 from app.services.websocket_manager import websocket_manager
 
 
@@ -345,10 +346,10 @@ async def extract_knowledge_from_messages_task(
             )
             return await handle_cancellation(db, extraction_run_id, "after_topics")
 
-        saved_atoms, version_created_atom_ids = await service.save_atoms(
+        saved_atoms, version_created_atom_ids, atom_ids_by_title = await service.save_atoms(
             extraction_output.atoms, topic_map, db, created_by=created_by or "system"
         )
-        links_created = await service.link_atoms(extraction_output.atoms, saved_atoms, db)
+        links_created = await service.link_atoms(extraction_output.atoms, saved_atoms, db, atom_ids_by_title)
         messages_updated = await service.update_messages(messages, topic_map, extraction_output.topics, db)
 
         logger.info(
@@ -505,13 +506,7 @@ async def scheduled_knowledge_extraction_task() -> dict[str, Any]:
         async with AsyncSessionLocal() as db:
             cutoff_time = datetime.utcnow() - timedelta(hours=ai_config.knowledge_extraction.lookback_hours)
 
-            count_stmt = (
-                select(func.count())
-                .select_from(Message)
-                .where(Message.topic_id.is_(None), Message.sent_at >= cutoff_time)  # type: ignore[arg-type,union-attr]
-            )
-            result = await db.execute(count_stmt)
-            unprocessed_count = result.scalar() or 0
+            unprocessed_count = await count_unprocessed_messages(db, cutoff_time)
 
             if unprocessed_count == 0:
                 logger.info("No unprocessed messages found, skipping extraction")
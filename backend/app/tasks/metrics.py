@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from core.config import settings
+from core.taskiq_config import nats_broker
+from loguru import logger
+
+from app.config.ai_config import ai_config
+from app.database import AsyncSessionLocal
+from app.services.daily_rollup_service import DailyRollupService
+from app.services.embedding_cache import get_embedding_cache
+from app.services.unprocessed_messages import prune_unprocessed_buckets
+
+# Every 15 minutes: keeps the live (non-rollup) tail of dashboard queries short
+DAILY_ROLLUP_REFRESH_CRON = "*/15 * * * *"
+# Daily, off-peak: bounds the persistent embedding cache to recently used entries
+EMBEDDING_CACHE_PRUNE_CRON = "30 3 * * *"
+
+
+@nats_broker.task
+async def refresh_daily_rollups_task() -> dict[str, Any]:
+    """Scheduled task that brings dashboard daily rollups up to date.
+
+    Returns:
+        Dictionary with status and number of rebuilt days per rollup table
+        (-1 = full rebuild).
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            rebuilt = await DailyRollupService(db).refresh()
+            # Hourly unprocessed-message buckets are only read inside the extraction lookback window
+            cutoff = datetime.utcnow() - timedelta(hours=ai_config.knowledge_extraction.lookback_hours)
+            await prune_unprocessed_buckets(db, cutoff)
+        logger.info(f"Daily rollups refreshed: {rebuilt}")
+        return {"status": "success", "rebuilt": rebuilt}
+    except Exception as e:
+        logger.error(f"Daily rollup refresh failed: {e}", exc_info=True)
+        return {"status": "error", "reason": str(e)}
+
+
+@nats_broker.task
+async def prune_embedding_cache_task() -> dict[str, Any]:
+    """Scheduled task that deletes embedding cache entries unused for EMBEDDING_CACHE_TTL_DAYS.
+
+    Returns:
+        Dictionary with status and number of deleted entries.
+    """
+    cache = get_embedding_cache()
+    if cache is None:
+        return {"status": "skipped", "reason": "embedding cache disabled"}
+    try:
+        deleted = await cache.prune(timedelta(days=settings.embedding.embedding_cache_ttl_days))
+        logger.info(f"Pruned {deleted} unused embedding cache entries")
+        return {"status": "success", "deleted": deleted}
+    except Exception as e:
+        logger.error(f"Embedding cache prune failed: {e}", exc_info=True)
+        return {"status": "error", "reason": str(e)}
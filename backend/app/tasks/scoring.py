@@ -18,6 +18,59 @@ from app.services.websocket_manager import websocket_manager
 from app.tasks.knowledge import embed_messages_batch_task
 
 
+def _detect_language(message: Message) -> None:
+    """Set ``detected_language`` from content if not known yet."""
+    if message.content and not message.detected_language:
+        try:
+            detected_lang = detect(message.content)
+            message.detected_language = detected_lang if detected_lang in ("uk", "en", "ru") else "other"
+        except LangDetectException:
+            message.detected_language = "unknown"
+
+
+async def _score_in_batches(
+    db: Any, scorer: LLMImportanceScorer, messages: list[Message], detect_language: bool = False
+) -> tuple[list[uuid.UUID], int]:
+    """Score messages several per LLM call and commit each batch.
+
+    Returns:
+        Tuple of (scored message IDs, failed count)
+    """
+    scored_ids: list[uuid.UUID] = []
+    failed_count = 0
+
+    # Several messages per LLM call; missing results fall back to single scoring inside the scorer
+    batch_size = await scorer.get_batch_size(db)
+
+    for start in range(0, len(messages), batch_size):
+        batch = messages[start : start + batch_size]
+        try:
+            scoring_results = await scorer.score_messages(batch, db)
+        except Exception as e:
+            logger.error(f"Failed to score batch of {len(batch)} messages: {e}")
+            failed_count += len(batch)
+            continue
+
+        for message in batch:
+            scoring_result = scoring_results.get(message.id)
+            if scoring_result is None:
+                logger.error(f"Failed to score message {message.id}")
+                failed_count += 1
+                continue
+
+            message.importance_score = scoring_result["importance_score"]
+            message.noise_classification = scoring_result["classification"]
+            message.noise_factors = scoring_result["noise_factors"]
+            if detect_language:
+                _detect_language(message)
+            scored_ids.append(message.id)
+
+        await db.commit()
+        logger.info(f"Progress: {start + len(batch)}/{len(messages)} messages scored and committed")
+
+    return scored_ids, failed_count
+
+
 @nats_broker.task
 async def score_message_task(message_id: uuid.UUID) -> dict[str, Any]:
     """Background task to score a single message using LLMImportanceScorer (AI Judge).
@@ -56,12 +109,7 @@ async def score_message_task(message_id: uuid.UUID) -> dict[str, Any]:
         message.noise_factors = noise_factors
 
         # Detect language (legacy/utility)
-        if message.content and not message.detected_language:
-            try:
-                detected_lang = detect(message.content)
-                message.detected_language = detected_lang if detected_lang in ("uk", "en", "ru") else "other"
-            except LangDetectException:
-                message.detected_language = "unknown"
+        _detect_language(message)
 
         await db.commit()
 
@@ -108,6 +156,8 @@ async def score_unscored_messages_task(limit: int = 100) -> dict[str, int]:
 
     Processes unscored messages in batches, calculates importance scores,
     and updates database records. Designed for bulk scoring operations.
+    Each batch is scored with one LLM call (batch size per provider, see
+    ``settings.llm.scoring_batch_sizes``) and committed as a unit.
 
     Args:
         limit: Maximum number of messages to score (default: 100)
@@ -150,29 +200,9 @@ async def score_unscored_messages_task(limit: int = 100) -> dict[str, int]:
         resolver = ProviderResolver(crud)
         llm_service = LLMService(provider_resolver=resolver, framework_name="pydantic_ai")
         scorer = LLMImportanceScorer(llm_service)
-        
-        scored_count = 0
-        failed_count = 0
-
-        for idx, message in enumerate(messages, 1):
-            try:
-                scoring_result = await scorer.score_message(message, db)
-
-                message.importance_score = scoring_result["importance_score"]  # type: ignore[assignment]
-                message.noise_classification = scoring_result["classification"]  # type: ignore[assignment]
-                message.noise_factors = scoring_result["noise_factors"]  # type: ignore[assignment]
-
-                scored_count += 1
 
-                if idx % 5 == 0:
-                    await db.commit()
-                    logger.info(f"Progress: {idx}/{total_found} messages scored and committed")
-
-            except Exception as e:
-                logger.error(f"Failed to score message {message.id}: {e}")
-                failed_count += 1
-
-        await db.commit()
+        scored_ids, failed_count = await _score_in_batches(db, scorer, messages)
+        scored_count = len(scored_ids)
 
         logger.info(f"Batch scoring completed: {scored_count} scored, {failed_count} failed out of {total_found}")
 
@@ -197,3 +227,58 @@ async def score_unscored_messages_task(limit: int = 100) -> dict[str, int]:
     except Exception as e:
         logger.error(f"Batch scoring task failed: {e}", exc_info=True)
         raise
+
+
+@nats_broker.task
+async def score_messages_batch_task(message_ids: list[uuid.UUID]) -> dict[str, int]:
+    """Background task to score a batch of newly stored messages.
+
+    Batched counterpart of ``score_message_task`` for messages saved together
+    (see ``save_telegram_messages``): messages are scored several per LLM call,
+    get their language detected and are queued for embedding with one task.
+
+    Args:
+        message_ids: Messages to score (already scored ones are skipped)
+
+    Returns:
+        Statistics dictionary with total_found, scored and failed counts
+    """
+    logger.info(f"Starting scoring task for batch of {len(message_ids)} messages")
+
+    db_context = get_db_session_context()
+    db = await anext(db_context)
+
+    try:
+        stmt = (
+            select(Message)
+            .where(Message.id.in_(message_ids), Message.importance_score.is_(None))  # type: ignore[attr-defined, union-attr]
+            .order_by(Message.sent_at)  # type: ignore[arg-type]
+        )
+        messages = list((await db.execute(stmt)).scalars().all())
+        if not messages:
+            return {"total_found": 0, "scored": 0, "failed": 0}
+
+        crud = ProviderCRUD(db)  # type: ignore[arg-type]
+        resolver = ProviderResolver(crud)
+        llm_service = LLMService(provider_resolver=resolver, framework_name="pydantic_ai")
+        scorer = LLMImportanceScorer(llm_service)
+
+        scored_ids, failed_count = await _score_in_batches(db, scorer, messages, detect_language=True)
+
+        if scored_ids:
+            try:
+                provider = await resolver.resolve_active(db)
+                if provider and provider.id:
+                    await embed_messages_batch_task.kiq(message_ids=scored_ids, provider_id=str(provider.id))
+            except Exception as embed_err:
+                logger.warning(f"Failed to queue embedding for {len(scored_ids)} messages: {embed_err}")
+
+        stats = {"total_found": len(messages), "scored": len(scored_ids), "failed": failed_count}
+        await websocket_manager.broadcast("noise_filtering", {"event": "batch_scored", "data": stats})
+
+        logger.info(f"Batch scoring completed: {len(scored_ids)} scored, {failed_count} failed out of {len(messages)}")
+        return stats
+
+    except Exception as e:
+        logger.error(f"Batch scoring task failed for {len(message_ids)} messages: {e}", exc_info=True)
+        raise
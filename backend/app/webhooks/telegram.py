@@ -2,9 +2,9 @@ from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Request, Response
 
+from app.services.avatar_resolver import get_avatar_resolver
 from app.services.websocket_manager import websocket_manager
 from app.tasks import save_telegram_message
-from app.webhook_service import telegram_webhook_service
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 
@@ -32,13 +32,8 @@ async def telegram_webhook(request: Request) -> dict[str, str]:
             logger.info(f"Webhook received: user_id={user_id}, message_id={message.get('message_id')}")
 
             if user_id:
-                try:
-                    avatar_url = await telegram_webhook_service.get_user_avatar_url(int(user_id))
-                    if avatar_url:
-                        logger.debug(f"Fetched avatar URL for user {user_id}")
-                except Exception as exc:
-                    logger.warning(f"Failed to fetch avatar for user {user_id}: {exc}")
-                    avatar_url = None
+                # Cached only: unknown avatars are resolved in the background, never on the response path
+                avatar_url = await get_avatar_resolver().get_cached(int(user_id))
 
             first_name = from_user.get("first_name", "")
             last_name = from_user.get("last_name", "")
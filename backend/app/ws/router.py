@@ -57,9 +57,10 @@ async def websocket_endpoint(
     conn_id = await websocket_manager.connect(websocket, topic_list, accept=True)
 
     try:
-        # Send connection confirmation with connection ID
-        await websocket.send_text(
-            json.dumps({
+        # Send connection confirmation with connection ID (all frames go through the send queue)
+        await websocket_manager.send_to_connection(
+            conn_id,
+            {
                 "type": "connection",
                 "data": {
                     "status": "connected",
@@ -67,12 +68,12 @@ async def websocket_endpoint(
                     "message": "Ready for real-time updates",
                     "topics": topic_list,
                 },
-            })
+            },
         )
 
         # Replay missed messages for each topic if lastSeq provided
         if last_sequences:
-            await _replay_missed_messages(websocket, topic_list, last_sequences)
+            await _replay_missed_messages(conn_id, topic_list, last_sequences)
 
         # Listen for client messages
         while True:
@@ -88,25 +89,27 @@ async def websocket_endpoint(
                     await websocket_manager.handle_pong(conn_id)
                 elif action == "subscribe" and topic:
                     success = await websocket_manager.subscribe(conn_id, topic)
-                    await websocket.send_text(
-                        json.dumps({
+                    await websocket_manager.send_to_connection(
+                        conn_id,
+                        {
                             "type": "subscription",
                             "data": {
                                 "action": "subscribed" if success else "failed",
                                 "topic": topic,
                             },
-                        })
+                        },
                     )
                 elif action == "unsubscribe" and topic:
                     success = await websocket_manager.unsubscribe(conn_id, topic)
-                    await websocket.send_text(
-                        json.dumps({
+                    await websocket_manager.send_to_connection(
+                        conn_id,
+                        {
                             "type": "subscription",
                             "data": {
                                 "action": "unsubscribed" if success else "failed",
                                 "topic": topic,
                             },
-                        })
+                        },
                     )
             except json.JSONDecodeError:
                 # Ignore invalid JSON messages
@@ -117,14 +120,14 @@ async def websocket_endpoint(
 
 
 async def _replay_missed_messages(
-    websocket: WebSocket,
+    conn_id: str,
     topics: list[str],
     last_sequences: dict[str, int],
 ) -> None:
     """Replay missed messages to client after reconnection.
 
     Args:
-        websocket: WebSocket connection
+        conn_id: Connection ID
         topics: Topics the client is subscribed to
         last_sequences: Last sequence numbers received per topic
     """
@@ -141,12 +144,10 @@ async def _replay_missed_messages(
             logger.info(f"Replaying {len(missed_messages)} missed messages for topic {topic} (since seq {since_seq})")
 
             for msg in missed_messages:
-                try:
-                    await websocket.send_text(json.dumps(msg))
-                    total_replayed += 1
-                except Exception as e:
-                    logger.warning(f"Failed to replay message: {e}")
+                if not await websocket_manager.send_to_connection(conn_id, msg):
+                    logger.warning(f"Stopped replay: connection {conn_id} closed")
                     break
+                total_replayed += 1
 
     if total_replayed > 0:
         logger.info(f"Replayed {total_replayed} total messages to connection")
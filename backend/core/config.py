@@ -35,6 +35,46 @@ class TelegramSettings(BaseSettings):
         default=None,
         validation_alias=AliasChoices("TELEGRAM_SESSION_STRING", "telegram_session_string"),
     )
+    # Bot API file links are guaranteed valid for at least one hour
+    avatar_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=60,
+        validation_alias=AliasChoices("TELEGRAM_AVATAR_CACHE_TTL_SECONDS", "avatar_cache_ttl_seconds"),
+    )
+    avatar_cache_persistent: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("TELEGRAM_AVATAR_CACHE_PERSISTENT", "avatar_cache_persistent"),
+    )
+    ingestion_max_concurrent_chats: int = Field(
+        default=3,
+        ge=1,
+        le=20,
+        validation_alias=AliasChoices("INGESTION_MAX_CONCURRENT_CHATS", "ingestion_max_concurrent_chats"),
+    )
+    ingestion_queue_batches: int = Field(
+        default=4,
+        ge=1,
+        le=100,
+        validation_alias=AliasChoices("INGESTION_QUEUE_BATCHES", "ingestion_queue_batches"),
+    )
+    ingestion_flood_wait_budget: int = Field(
+        default=600,
+        ge=0,
+        validation_alias=AliasChoices("INGESTION_FLOOD_WAIT_BUDGET", "ingestion_flood_wait_budget"),
+    )
+    # Webhook messages arriving within the window are stored in one transaction
+    save_batch_max_messages: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        validation_alias=AliasChoices("TELEGRAM_SAVE_BATCH_MAX_MESSAGES", "save_batch_max_messages"),
+    )
+    save_batch_window_ms: int = Field(
+        default=200,
+        ge=0,
+        le=5000,
+        validation_alias=AliasChoices("TELEGRAM_SAVE_BATCH_WINDOW_MS", "save_batch_window_ms"),
+    )
 
 
 class LLMSettings(BaseSettings):
@@ -57,6 +97,11 @@ class LLMSettings(BaseSettings):
         default="qwen3:14b",
         validation_alias=AliasChoices("OLLAMA_MODEL", "ollama_model"),
     )
+    # Messages scored per LLM call, keyed by provider name or type (1 disables batching)
+    scoring_batch_sizes: dict[str, int] = Field(
+        default={"ollama": 20, "openai": 25, "gemini": 25},
+        validation_alias=AliasChoices("SCORING_BATCH_SIZES", "scoring_batch_sizes"),
+    )
 
 
 class TaskIQSettings(BaseSettings):
@@ -109,6 +154,43 @@ class EmbeddingSettings(BaseSettings):
         le=1000,
         validation_alias=AliasChoices("EMBEDDING_BATCH_SIZE", "embedding_batch_size"),
     )
+    embedding_request_max_items: int = Field(
+        default=32,
+        ge=1,
+        le=2048,
+        validation_alias=AliasChoices("EMBEDDING_REQUEST_MAX_ITEMS", "embedding_request_max_items"),
+    )
+    embedding_request_max_tokens: int = Field(
+        default=100_000,
+        ge=1000,
+        le=300_000,
+        validation_alias=AliasChoices("EMBEDDING_REQUEST_MAX_TOKENS", "embedding_request_max_tokens"),
+    )
+    embedding_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        validation_alias=AliasChoices("EMBEDDING_MAX_CONCURRENCY", "embedding_max_concurrency"),
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("EMBEDDING_CACHE_ENABLED", "embedding_cache_enabled"),
+    )
+    embedding_cache_max_entries: int = Field(
+        default=10_000,
+        ge=0,
+        le=1_000_000,
+        validation_alias=AliasChoices("EMBEDDING_CACHE_MAX_ENTRIES", "embedding_cache_max_entries"),
+    )
+    embedding_cache_persistent: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("EMBEDDING_CACHE_PERSISTENT", "embedding_cache_persistent"),
+    )
+    embedding_cache_ttl_days: int = Field(
+        default=30,
+        ge=1,
+        validation_alias=AliasChoices("EMBEDDING_CACHE_TTL_DAYS", "embedding_cache_ttl_days"),
+    )
 
 
 class AppSettings(BaseSettings):
@@ -6,10 +6,13 @@ It imports all task definitions to ensure they are registered with the broker
 and initializes the WebSocketManager for cross-process broadcasting.
 """
 
+from app.services.user_service import IDENTITY_CACHE_SUBJECT, handle_identity_invalidation
 from app.services.websocket_manager import websocket_manager
 from app.tasks import (  # noqa: F401
     ingest_telegram_messages_task,
     process_message,
+    prune_embedding_cache_task,
+    refresh_daily_rollups_task,
     save_telegram_message,
 )
 from loguru import logger
@@ -31,6 +34,8 @@ async def on_worker_startup(state: TaskiqState) -> None:
     logger.info(
         f"🚀 Initializing WebSocketManager for worker process, NATS servers: {settings.taskiq.taskiq_nats_servers}"
     )
+    # Evict identity cache entries edited through the API
+    websocket_manager.add_control_handler(IDENTITY_CACHE_SUBJECT, handle_identity_invalidation)
     try:
         await websocket_manager.startup(settings.taskiq.taskiq_nats_servers)
         logger.info("✅ WebSocketManager startup completed")
@@ -40,9 +45,17 @@ async def on_worker_startup(state: TaskiqState) -> None:
 
 @nats_broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
 async def on_worker_shutdown(state: TaskiqState) -> None:
-    """Cleanup WebSocketManager on worker shutdown."""
+    """Cleanup WebSocketManager and pooled HTTP clients on worker shutdown."""
+    from app.services.avatar_resolver import close_avatar_resolver
+    from app.services.embedding_service import close_embedding_clients
+    from app.tasks.ingestion import telegram_message_batcher
+
+    # Store webhook messages still waiting for their batch window
+    await telegram_message_batcher.drain()
     logger.info("🛑 Shutting down WebSocketManager for worker process")
     await websocket_manager.shutdown()
+    await close_embedding_clients()
+    await close_avatar_resolver()
 
 
 __all__ = ["nats_broker"]
@@ -198,6 +198,41 @@ async def test_list_atoms_pagination_limit(client: AsyncClient, multiple_atoms:
     assert data["total"] == 5
 
 
+@pytest.mark.asyncio
+async def test_list_atoms_cursor_pagination(client: AsyncClient, db_session: AsyncSession):
+    """Test following next_cursor walks all atoms without overlap, ties broken by id."""
+    created_at = [datetime(2026, 10, 1, 12, minute, tzinfo=UTC) for minute in (0, 1, 1, 1, 2)]
+    db_session.add_all(
+        Atom(type=AtomType.insight.value, title=f"Atom {i}", content="Content", created_at=moment)
+        for i, moment in enumerate(created_at)
+    )
+    await db_session.commit()
+
+    first = (await client.get("/api/v1/atoms?limit=2&count=none")).json()
+    assert first["total"] is None
+
+    ids = [item["id"] for item in first["items"]]
+    cursor = first["next_cursor"]
+    for _ in range(5):
+        if not cursor:
+            break
+        data = (await client.get("/api/v1/atoms", params={"limit": 2, "cursor": cursor})).json()
+        assert data["total"] == 5
+        ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+
+    offset_ids = [item["id"] for item in (await client.get("/api/v1/atoms")).json()["items"]]
+    assert len(offset_ids) == 5
+    assert ids == offset_ids
+
+
+@pytest.mark.asyncio
+async def test_list_atoms_invalid_cursor(client: AsyncClient):
+    """Test bad request for a malformed cursor."""
+    response = await client.get("/api/v1/atoms?cursor=bogus")
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_list_atoms_invalid_pagination_negative_skip(client: AsyncClient):
     """Test validation error for negative skip value."""
@@ -234,3 +234,19 @@ async def test_test_task_with_invalid_message_id_type(client: AsyncClient) -> No
 
     # Should return 422 for validation error
     assert response.status_code == 422, f"Expected 422, got {response.status_code}"
+
+
+@pytest.mark.asyncio
+async def test_websocket_stats_returns_delivery_metrics(client: AsyncClient) -> None:
+    """Test WebSocket stats endpoint exposes queue depth and frame counters."""
+    response = await client.get("/api/v1/health/websocket")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "connections",
+        "queue_depth_total",
+        "queue_depth_max",
+        "frames_sent",
+        "frames_dropped",
+        "slow_consumer_disconnects",
+    }
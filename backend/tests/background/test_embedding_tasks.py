@@ -24,6 +24,18 @@ from app.tasks import embed_atoms_batch_task, embed_messages_batch_task
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+def _batch_create_side_effect(embedding: list[float]):
+    """Build an embeddings.create side effect returning one item per input text."""
+
+    async def create(**kwargs):
+        inputs = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+        response = MagicMock()
+        response.data = [MagicMock(embedding=embedding, index=i) for i in range(len(inputs))]
+        return response
+
+    return create
+
+
 @pytest.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create test user."""
@@ -118,9 +130,7 @@ class TestEmbeddingBackgroundTasks:
             mock_encryptor_class.return_value = mock_encryptor
 
             mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.data = [MagicMock(embedding=mock_embedding)]
-            mock_client.embeddings.create.return_value = mock_response
+            mock_client.embeddings.create.side_effect = _batch_create_side_effect(mock_embedding)
             mock_openai.return_value = mock_client
 
             result = await embed_messages_batch_task(message_ids=message_ids, provider_id=str(test_provider.id))
@@ -172,9 +182,7 @@ class TestEmbeddingBackgroundTasks:
             mock_encryptor_class.return_value = mock_encryptor
 
             mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.data = [MagicMock(embedding=mock_embedding)]
-            mock_client.embeddings.create.return_value = mock_response
+            mock_client.embeddings.create.side_effect = _batch_create_side_effect(mock_embedding)
             mock_openai.return_value = mock_client
 
             result = await embed_atoms_batch_task(atom_ids=atom_ids, provider_id=str(test_provider.id))
@@ -241,7 +249,7 @@ class TestEmbeddingBackgroundTasks:
         await db_session.commit()
         await db_session.refresh(valid_msg)
 
-        message_ids = [valid_msg.id, 99999, 88888]
+        message_ids = [valid_msg.id, uuid4(), uuid4()]
 
         mock_embedding = [0.3] * 1536
 
@@ -258,9 +266,7 @@ class TestEmbeddingBackgroundTasks:
             mock_encryptor_class.return_value = mock_encryptor
 
             mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.data = [MagicMock(embedding=mock_embedding)]
-            mock_client.embeddings.create.return_value = mock_response
+            mock_client.embeddings.create.side_effect = _batch_create_side_effect(mock_embedding)
             mock_openai.return_value = mock_client
 
             result = await embed_messages_batch_task(message_ids=message_ids, provider_id=str(test_provider.id))
@@ -17,6 +17,9 @@ if not os.getenv("TELEGRAM_BOT_TOKEN"):
     os.environ["TELEGRAM_BOT_TOKEN"] = "test_dummy_token_for_testing"
 if not os.getenv("ENCRYPTION_KEY"):
     os.environ["ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+# Embedding cache stays in-process only; the persistent tier would hit the real database
+os.environ.setdefault("EMBEDDING_CACHE_PERSISTENT", "false")
+os.environ.setdefault("TELEGRAM_AVATAR_CACHE_PERSISTENT", "false")
 
 
 # Monkey patch JSONB BEFORE any imports from app
@@ -33,7 +36,12 @@ postgresql.JSONB = SQLiteJSON
 
 # Now safe to import app modules
 from app.database import get_db_session
+from app.llm.application.agent_registry import agent_registry
 from app.main import app
+from app.services.avatar_resolver import get_avatar_resolver
+from app.services.embedding_cache import get_embedding_cache
+from app.services.rule_compiler import rule_set_cache
+from app.services.user_service import identity_cache
 
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -86,6 +94,18 @@ async def override_get_db_session():
 app.dependency_overrides[get_db_session] = override_get_db_session
 
 
+@pytest.fixture(autouse=True)
+async def clear_process_caches():
+    """Start every test with empty process-local caches."""
+    cache = get_embedding_cache()
+    if cache:
+        cache.clear()
+    get_avatar_resolver().clear()
+    identity_cache.clear()
+    await agent_registry.clear()
+    rule_set_cache.invalidate()
+
+
 @pytest.fixture(scope="function")
 async def db_session():
     """Create a fresh database for each test."""
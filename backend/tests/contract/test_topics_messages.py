@@ -284,3 +284,40 @@ async def test_messages_sorted_by_sent_at_desc(
 
     sent_times = [datetime.fromisoformat(msg["sent_at"].replace("Z", "+00:00")) for msg in data]
     assert sent_times == sorted(sent_times, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_messages_cursor_pages_match_offset_order(
+    client: AsyncClient,
+    messages_with_topic: list[Message],
+    messages_without_topic: list[Message],
+) -> None:
+    """Test following next_cursor returns every message once, in offset order."""
+    offset_response = await client.get("/api/v1/messages", params={"page_size": 100})
+    expected = [item["id"] for item in offset_response.json()["items"]]
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"page_size": 3, "count": "none"}
+    for _ in range(5):
+        response = await client.get("/api/v1/messages", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert data["total_pages"] is None
+        seen.extend(item["id"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert len(expected) == 8
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+async def test_messages_cursor_rejected(client: AsyncClient) -> None:
+    """Test malformed cursors and cursors with non-keyset sorts are rejected."""
+    response = await client.get("/api/v1/messages", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = await client.get("/api/v1/messages", params={"cursor": "x", "sort_by": "author_name"})
+    assert response.status_code == 400
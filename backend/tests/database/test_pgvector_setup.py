@@ -14,6 +14,7 @@ import os
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 
 @pytest.mark.asyncio
@@ -92,7 +93,7 @@ class TestPgvectorSetup:
         )
         db_session.add(msg)
         await db_session.commit()
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
 
         assert msg.embedding is None
 
@@ -136,7 +137,7 @@ class TestPgvectorSetup:
         )
         db_session.add(msg)
         await db_session.commit()
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
 
         assert msg.embedding is not None
         assert len(msg.embedding) == 1536
@@ -193,7 +194,9 @@ class TestPgvectorSetup:
         from sqlalchemy import select
 
         result = await db_session.execute(
-            select(Message).where(Message.external_message_id.like("pgvector_dim_%"))  # type: ignore[union-attr]
+            select(Message)
+            .where(Message.external_message_id.like("pgvector_dim_%"))  # type: ignore[union-attr]
+            .options(undefer(Message.embedding))
         )
         messages = result.scalars().all()
 
@@ -19,6 +19,7 @@ from app.models.message import Message
 from app.models.user import User
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 
 @pytest.fixture
@@ -71,7 +72,7 @@ async def test_message_vector_storage_and_retrieval(
 
     db_session.add(message)
     await db_session.commit()
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     retrieved = await db_session.get(Message, message.id)
 
@@ -99,7 +100,7 @@ async def test_message_vector_update(
 
     db_session.add(message)
     await db_session.commit()
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     assert message.embedding is None
 
@@ -107,7 +108,7 @@ async def test_message_vector_update(
     message.embedding = new_embedding
     db_session.add(message)
     await db_session.commit()
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     assert message.embedding is not None
     assert len(message.embedding) == 1536
@@ -132,7 +133,7 @@ async def test_message_null_embedding_handling(
 
     db_session.add(message)
     await db_session.commit()
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     retrieved = await db_session.get(Message, message.id)
 
@@ -156,7 +157,7 @@ async def test_atom_vector_storage_and_retrieval(db_session: AsyncSession) -> No
 
     db_session.add(atom)
     await db_session.commit()
-    await db_session.refresh(atom)
+    await db_session.refresh(atom, ["embedding"])
 
     retrieved = await db_session.get(Atom, atom.id)
 
@@ -178,7 +179,7 @@ async def test_atom_vector_update(db_session: AsyncSession) -> None:
 
     db_session.add(atom)
     await db_session.commit()
-    await db_session.refresh(atom)
+    await db_session.refresh(atom, ["embedding"])
 
     assert atom.embedding is None
 
@@ -186,7 +187,7 @@ async def test_atom_vector_update(db_session: AsyncSession) -> None:
     atom.embedding = new_embedding
     db_session.add(atom)
     await db_session.commit()
-    await db_session.refresh(atom)
+    await db_session.refresh(atom, ["embedding"])
 
     assert atom.embedding is not None
     assert len(atom.embedding) == 1536
@@ -205,7 +206,7 @@ async def test_atom_null_embedding_handling(db_session: AsyncSession) -> None:
 
     db_session.add(atom)
     await db_session.commit()
-    await db_session.refresh(atom)
+    await db_session.refresh(atom, ["embedding"])
 
     retrieved = await db_session.get(Atom, atom.id)
 
@@ -238,7 +239,7 @@ async def test_multiple_messages_with_different_embeddings(
     await db_session.commit()
 
     for i, msg in enumerate(messages):
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
         retrieved = await db_session.get(Message, msg.id)
         assert retrieved is not None
         assert retrieved.embedding is not None
@@ -273,7 +274,7 @@ async def test_query_messages_with_embeddings_only(
     db_session.add_all([msg_with_embedding, msg_without_embedding])
     await db_session.commit()
 
-    query = select(Message).where(Message.embedding.is_not(None))
+    query = select(Message).where(Message.embedding.is_not(None)).options(undefer(Message.embedding))
     result = await db_session.execute(query)
     messages_with_embeddings = result.scalars().all()
 
@@ -302,7 +303,7 @@ async def test_query_atoms_with_embeddings_only(db_session: AsyncSession) -> Non
     db_session.add_all([atom_with_embedding, atom_without_embedding])
     await db_session.commit()
 
-    query = select(Atom).where(Atom.embedding.is_not(None))
+    query = select(Atom).where(Atom.embedding.is_not(None)).options(undefer(Atom.embedding))
     result = await db_session.execute(query)
     atoms_with_embeddings = result.scalars().all()
 
@@ -332,7 +333,7 @@ async def test_embedding_persists_after_refresh(
     db_session.add(message)
     await db_session.commit()
     message_id = message.id
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     retrieved = await db_session.get(Message, message_id)
     assert retrieved is not None
@@ -367,7 +368,7 @@ async def test_embedding_dimension_consistency(
 
     await db_session.commit()
 
-    query = select(Message).where(Message.embedding.is_not(None))
+    query = select(Message).where(Message.embedding.is_not(None)).options(undefer(Message.embedding))
     result = await db_session.execute(query)
     messages = result.scalars().all()
 
@@ -0,0 +1,127 @@
+"""Performance tests for knowledge extraction context-window fetching.
+
+Benchmarks ``KnowledgeOrchestrator.fetch_messages_with_context`` (single LATERAL
+query) against the previous per-message approach (two queries per target) for
+several batch sizes, reporting query count and latency.
+
+NOTE: Marked with @pytest.mark.performance. LATERAL joins require PostgreSQL,
+so the benchmark is skipped on SQLite.
+
+Run with: pytest tests/performance/test_context_window_performance.py -v -s
+"""
+
+import time
+import uuid
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from app.models.enums import SourceType
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.user import User
+from app.services.knowledge.knowledge_orchestrator import KnowledgeOrchestrator
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+THREADS = 20
+MESSAGES_PER_THREAD = 200
+CONTEXT_WINDOW = 5
+BATCH_SIZES = (10, 25, 50)
+
+
+@contextmanager
+def count_queries(session: AsyncSession) -> Iterator[list[str]]:
+    """Collect SQL statements executed on the session's engine."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def fetch_context_per_message(
+    session: AsyncSession, message_ids: Sequence[uuid.UUID], context_window: int
+) -> list[Message]:
+    """Previous implementation: two neighbour queries per target message."""
+    result = await session.execute(select(Message).where(Message.id.in_(message_ids)))
+    found = {m.id: m for m in result.scalars().all()}
+    for msg in list(found.values()):
+        for before in (True, False):
+            stmt = (
+                select(Message)
+                .where(
+                    Message.source_thread_id == msg.source_thread_id,
+                    Message.sent_at < msg.sent_at if before else Message.sent_at > msg.sent_at,
+                )
+                .order_by(Message.sent_at.desc() if before else Message.sent_at.asc())
+                .limit(context_window)
+            )
+            for neighbour in (await session.execute(stmt)).scalars():
+                found.setdefault(neighbour.id, neighbour)
+    return sorted(found.values(), key=lambda m: m.sent_at)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_context_window_single_query_vs_per_message(db_session: AsyncSession) -> None:
+    """Benchmark: query count and latency by batch size, old vs new approach.
+
+    Both approaches must return identical message sets.
+    Note: Requires PostgreSQL. Skipped on SQLite.
+    """
+    if db_session.bind.dialect.name == "sqlite":
+        pytest.skip("LATERAL joins require PostgreSQL")
+
+    user = User(first_name="Context", last_name="Bench", is_active=True, is_bot=False)
+    source = Source(name="Context Bench", type=SourceType.telegram, is_active=True)
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    base_time = datetime.now(UTC) - timedelta(days=1)
+    messages = [
+        Message(
+            external_message_id=f"ctx_{thread}_{i}",
+            content=f"Thread {thread} message {i}",
+            sent_at=base_time + timedelta(seconds=i * THREADS + thread),
+            source_thread_id=None if thread == 0 else f"thread_{thread}",
+            source_id=source.id,
+            author_id=user.id,
+        )
+        for thread in range(THREADS)
+        for i in range(MESSAGES_PER_THREAD)
+    ]
+    db_session.add_all(messages)
+    await db_session.commit()
+
+    print(f"\n✓ Context window benchmark ({len(messages)} messages, window ±{CONTEXT_WINDOW})")
+    for batch_size in BATCH_SIZES:
+        target_ids = [m.id for m in messages[:: len(messages) // batch_size][:batch_size]]
+
+        with count_queries(db_session) as legacy_queries:
+            start = time.perf_counter()
+            legacy = await fetch_context_per_message(db_session, target_ids, CONTEXT_WINDOW)
+            legacy_ms = (time.perf_counter() - start) * 1000
+
+        with count_queries(db_session) as new_queries:
+            start = time.perf_counter()
+            current = await KnowledgeOrchestrator.fetch_messages_with_context(
+                db_session, target_ids, include_context=True, context_window=CONTEXT_WINDOW
+            )
+            new_ms = (time.perf_counter() - start) * 1000
+
+        assert [m.id for m in current] == [m.id for m in legacy]
+        assert len(new_queries) == 1
+
+        print(
+            f"  - batch {batch_size:>3}: per-message {len(legacy_queries):>3} queries {legacy_ms:8.2f}ms | "
+            f"single query {len(new_queries)} query {new_ms:8.2f}ms"
+        )
@@ -0,0 +1,126 @@
+"""Performance tests for dashboard aggregates.
+
+Benchmarks DashboardService metrics, trends and message trends against a
+large messages table (1M rows by default, DASHBOARD_BENCHMARK_ROWS to override).
+Rows are generated server-side with generate_series. Latencies are measured
+before and after building the daily rollups.
+
+NOTE: Marked with @pytest.mark.performance. Requires PostgreSQL; skipped on SQLite.
+
+Run with: pytest tests/performance/test_dashboard_performance.py -v -s
+"""
+
+import os
+import time
+
+import pytest
+from app.models.enums import SourceType
+from app.models.legacy import Source
+from app.models.topic import Topic
+from app.models.user import User
+from app.services.daily_rollup_service import DailyRollupService
+from app.services.dashboard_service import DashboardService
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DASHBOARD_BENCHMARK_ROWS = int(os.getenv("DASHBOARD_BENCHMARK_ROWS", "1000000"))
+BENCHMARK_TOPICS = 500
+BENCHMARK_DAYS = 90
+BENCHMARK_REPEATS = 5
+
+
+async def _seed_messages(db_session: AsyncSession, rows: int) -> None:
+    """Insert topics and ``rows`` messages spread over the last BENCHMARK_DAYS days."""
+    user = User(first_name="Dashboard", last_name="Bench", is_active=True, is_bot=False)
+    source = Source(name="Dashboard Bench", type=SourceType.telegram, is_active=True)
+    topics = [Topic(name=f"Bench topic {i}", description="benchmark") for i in range(BENCHMARK_TOPICS)]
+    db_session.add_all([user, source, *topics])
+    await db_session.commit()
+
+    await db_session.execute(
+        text(
+            """
+            INSERT INTO messages (
+                id, external_message_id, content, sent_at, source_id, author_id,
+                analyzed, analysis_status, status, topic_id, noise_classification
+            )
+            SELECT
+                gen_random_uuid(),
+                'dash_' || g,
+                'benchmark message ' || g,
+                now() - random() * CAST(:days AS integer) * interval '1 day',
+                :source_id,
+                :author_id,
+                false,
+                'pending',
+                'pending',
+                (CAST(:topic_ids AS uuid[]))[1 + (g % CAST(:topic_count AS integer))],
+                (ARRAY['signal', 'noise', 'spam', 'low_quality', NULL])[1 + (g % 5)]
+            FROM generate_series(1, :rows) AS g
+            """
+        ),
+        {
+            "days": BENCHMARK_DAYS,
+            "source_id": source.id,
+            "author_id": user.id,
+            "topic_ids": [topic.id for topic in topics],
+            "topic_count": len(topics),
+            "rows": rows,
+        },
+    )
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE messages"))
+
+
+async def _measure(coro_factory, repeats: int = BENCHMARK_REPEATS) -> float:
+    """Return median latency in milliseconds."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await coro_factory()
+        durations.append((time.perf_counter() - start) * 1000)
+    return sorted(durations)[len(durations) // 2]
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_dashboard_aggregates_at_scale(db_session: AsyncSession) -> None:
+    """Benchmark: dashboard aggregate latency at 1M messages.
+
+    Note: Requires PostgreSQL. Skipped on SQLite.
+    """
+    if db_session.bind.dialect.name == "sqlite":
+        pytest.skip("Large dataset generation requires PostgreSQL")
+
+    start = time.perf_counter()
+    await _seed_messages(db_session, DASHBOARD_BENCHMARK_ROWS)
+    seed_duration = time.perf_counter() - start
+
+    service = DashboardService(db_session)
+    trends_ms = {
+        period: await _measure(lambda p=period: service.get_trends(period=p)) for period in ("today", "week", "month")
+    }
+    metrics_ms = await _measure(lambda: service.get_metrics(period="today"))
+    message_trends_ms = await _measure(lambda: service.get_message_trends(days=30))
+
+    trends = await service.get_trends(period="month", limit=5)
+    assert len(trends.trends) == 5
+    assert trends.trends[0].count >= trends.trends[-1].count
+
+    print(f"\n✓ Dashboard aggregates ({DASHBOARD_BENCHMARK_ROWS} messages, seeded in {seed_duration:.1f}s)")
+    for period, duration in trends_ms.items():
+        print(f"  - get_trends({period}): {duration:.2f}ms")
+    print(f"  - get_metrics(today): {metrics_ms:.2f}ms")
+    print(f"  - get_message_trends(30): {message_trends_ms:.2f}ms")
+
+    start = time.perf_counter()
+    await DailyRollupService(db_session).refresh()
+    refresh_duration = time.perf_counter() - start
+
+    rollup_trends_ms = await _measure(lambda: service.get_trends(period="month"))
+    rollup_message_trends_ms = await _measure(lambda: service.get_message_trends(days=30))
+    assert (await service.get_trends(period="month", limit=5)) == trends
+
+    print(f"✓ With daily rollups (initial refresh {refresh_duration:.1f}s)")
+    print(f"  - get_trends(month): {rollup_trends_ms:.2f}ms")
+    print(f"  - get_message_trends(30): {rollup_message_trends_ms:.2f}ms")
@@ -0,0 +1,126 @@
+"""Performance tests for the message list endpoint.
+
+Benchmarks ``GET /api/v1/messages?page_size=1000`` over messages that all carry
+1536-dimension embeddings, reporting rows/s, RSS growth and peak Python
+allocations. The same list query is also run with the embedding columns
+undeferred to show what loading the vectors costs.
+
+NOTE: Marked with @pytest.mark.performance. Runs on SQLite with a small dataset;
+use PostgreSQL and MESSAGE_LIST_BENCHMARK_ROWS for realistic numbers.
+
+Run with: pytest tests/performance/test_message_list_performance.py -v -s
+"""
+
+import os
+import random
+import time
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from app.models.enums import SourceType
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.topic import Topic
+from app.models.user import User
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+MESSAGE_LIST_BENCHMARK_ROWS = int(os.getenv("MESSAGE_LIST_BENCHMARK_ROWS", "1000"))
+PAGE_SIZE = 1000
+EMBEDDING_DIMENSIONS = 1536
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process in MB (0.0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return 0.0
+
+
+async def _measure(run: Callable[[], Awaitable[int]]) -> tuple[float, float, float]:
+    """Return (rows/s, RSS growth MB, peak traced allocations MB) of one run."""
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = await run()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows / duration, _rss_mb() - rss_before, peak / 1024 / 1024
+
+
+async def _seed_messages(db_session: AsyncSession, rows: int) -> None:
+    """Insert ``rows`` embedded messages spread over topics."""
+    user = User(first_name="List", last_name="Bench", is_active=True, is_bot=False)
+    source = Source(name="List Bench", type=SourceType.telegram, is_active=True)
+    topics = [Topic(name=f"Bench topic {i}", description="benchmark") for i in range(10)]
+    db_session.add_all([user, source, *topics])
+    await db_session.commit()
+
+    rng = random.Random(42)
+    now = datetime.now(UTC)
+    values: list[dict[str, Any]] = [
+        {
+            "id": uuid.uuid4(),
+            "external_message_id": f"list_{i}",
+            "content": f"benchmark message {i}",
+            "sent_at": now - timedelta(minutes=i),
+            "source_id": source.id,
+            "author_id": user.id,
+            "topic_id": topics[i % len(topics)].id,
+            "embedding": [rng.random() for _ in range(EMBEDDING_DIMENSIONS)],
+        }
+        for i in range(rows)
+    ]
+    for chunk in range(0, rows, 500):
+        await db_session.execute(insert(Message), values[chunk : chunk + 500])
+    await db_session.commit()
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_message_list_page_of_1000(db_session: AsyncSession, client: AsyncClient) -> None:
+    """Benchmark: GET /messages?page_size=1000 does not load embeddings."""
+    await _seed_messages(db_session, MESSAGE_LIST_BENCHMARK_ROWS)
+    db_session.expunge_all()
+
+    async def list_page() -> int:
+        response = await client.get("/api/v1/messages", params={"page_size": PAGE_SIZE})
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert all(item["embedding"] is None for item in items)
+        return len(items)
+
+    async def load_rows(*options: Any) -> int:
+        statement = (
+            select(Message, User, Source, Topic)
+            .join(User)
+            .join(Source)
+            .outerjoin(Topic)
+            .order_by(Message.sent_at.desc())  # type: ignore[attr-defined]
+            .limit(PAGE_SIZE)
+            .options(*options)
+        )
+        rows = (await db_session.execute(statement)).all()
+        db_session.expunge_all()
+        return len(rows)
+
+    await list_page()  # warm up imports, statement cache and app startup
+    endpoint = await _measure(list_page)
+    deferred = await _measure(load_rows)
+    eager = await _measure(lambda: load_rows(undefer(Message.embedding), undefer(Topic.embedding)))
+
+    print(f"\n✓ GET /messages?page_size={PAGE_SIZE} ({MESSAGE_LIST_BENCHMARK_ROWS} embedded messages)")
+    print(f"  - endpoint: {endpoint[0]:.0f} rows/s, RSS +{endpoint[1]:.1f}MB, peak alloc {endpoint[2]:.1f}MB")
+    print(f"  - query, embeddings deferred: {deferred[0]:.0f} rows/s, peak alloc {deferred[2]:.1f}MB")
+    print(f"  - query, embeddings loaded:   {eager[0]:.0f} rows/s, peak alloc {eager[2]:.1f}MB")
+
+    assert deferred[2] < eager[2]
@@ -7,6 +7,7 @@ Tests benchmark:
 4. Batch embedding throughput
 5. Vector similarity query performance
 6. Large dataset handling
+7. HNSW approximate vs exact recall at 100k+ rows
 
 NOTE: These tests are marked with @pytest.mark.performance and should be
 run separately from regular test suite. They require a real database with
@@ -15,12 +16,14 @@ pgvector extension enabled.
 Run with: pytest tests/performance/ -v --tb=short
 """
 
+import os
 import time
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from app.config.ai_config import ai_config
 from app.models.atom import Atom
 from app.models.enums import SourceType
 from app.models.legacy import Source
@@ -30,8 +33,14 @@ from app.models.user import User
 from app.services.embedding_service import EmbeddingService
 from app.services.rag_context_builder import RAGContextBuilder
 from app.services.semantic_search_service import SemanticSearchService
+from app.services.vector_query_builder import VectorQueryBuilder
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+ANN_BENCHMARK_ROWS = int(os.getenv("ANN_BENCHMARK_ROWS", "100000"))
+ANN_BENCHMARK_QUERIES = 20
+ANN_BENCHMARK_TOP_K = 10
+
 
 @pytest.fixture
 async def openai_provider(db_session: AsyncSession) -> LLMProvider:
@@ -102,7 +111,7 @@ async def test_embedding_generation_performance(
     )
     db_session.add(message)
     await db_session.commit()
-    await db_session.refresh(message)
+    await db_session.refresh(message, ["embedding"])
 
     with (
         patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
@@ -157,7 +166,7 @@ async def test_batch_embedding_throughput(
 
     await db_session.commit()
     for msg in messages:
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
 
     message_ids = [msg.id for msg in messages]
 
@@ -169,10 +178,13 @@ async def test_batch_embedding_throughput(
         mock_encryptor.decrypt.return_value = "sk-test"
         mock_encryptor_class.return_value = mock_encryptor
 
+        async def create_embeddings(**kwargs):
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[0.1] * 1536, index=i) for i in range(len(kwargs["input"]))]
+            return response
+
         mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
-        mock_client.embeddings.create.return_value = mock_response
+        mock_client.embeddings.create.side_effect = create_embeddings
         mock_openai.return_value = mock_client
 
         service = EmbeddingService(openai_provider)
@@ -343,7 +355,7 @@ async def test_vector_storage_performance(
     storage_duration = time.time() - start_time
 
     for msg in messages:
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
 
     start_time = time.time()
     retrieved = await db_session.get(Message, messages[50].id)
@@ -386,7 +398,7 @@ async def test_find_similar_messages_performance(
 
     await db_session.commit()
     for msg in messages:
-        await db_session.refresh(msg)
+        await db_session.refresh(msg, ["embedding"])
 
     source_message = messages[0]
 
@@ -449,6 +461,84 @@ async def test_atom_search_performance(
         print(f"\n✓ Atom search (50 atoms): {duration * 1000:.2f}ms, {len(results)} results")
 
 
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_hnsw_recall_vs_exact_search(db_session: AsyncSession) -> None:
+    """Benchmark: HNSW approximate top-k vs exact top-k at 100k+ rows.
+
+    Builds an HNSW index with the configured build parameters on a temporary table
+    of random 1536-dim vectors, then compares recall@k and latency of index scans
+    at several ef_search values against an exact sequential scan.
+
+    Row count is configurable with ANN_BENCHMARK_ROWS (default 100k).
+    Note: Requires PostgreSQL with pgvector. Skipped on SQLite.
+    """
+    dialect = db_session.bind.dialect.name
+    if dialect == "sqlite":
+        pytest.skip("Vector similarity operations require PostgreSQL with pgvector")
+
+    conn = await db_session.connection()
+    raw_conn = await conn.get_raw_connection()
+    driver_conn = raw_conn.driver_connection
+
+    await driver_conn.execute("CREATE TEMP TABLE ann_bench (id bigserial PRIMARY KEY, embedding vector(1536))")
+    await driver_conn.execute(
+        """
+        INSERT INTO ann_bench (embedding)
+        SELECT (SELECT array_agg(random()::real - 0.5) FROM generate_series(1, 1536) WHERE s > 0)::vector
+        FROM generate_series(1, $1) AS s
+        """,
+        ANN_BENCHMARK_ROWS,
+    )
+
+    build_start = time.time()
+    await driver_conn.execute(
+        f"""
+        CREATE INDEX ON ann_bench USING hnsw (embedding vector_cosine_ops)
+        WITH (m = {ai_config.vector_search.hnsw_m}, ef_construction = {ai_config.vector_search.hnsw_ef_construction})
+        """
+    )
+    build_duration = time.time() - build_start
+    await driver_conn.execute("ANALYZE ann_bench")
+
+    query_rows = await driver_conn.fetch(
+        "SELECT embedding::text AS embedding FROM ann_bench ORDER BY random() LIMIT $1", ANN_BENCHMARK_QUERIES
+    )
+    queries = [row["embedding"] for row in query_rows]
+    top_k_sql = "SELECT id FROM ann_bench ORDER BY embedding <=> $1::vector LIMIT $2"
+
+    # Through the session: SET LOCAL needs the transaction asyncpg only opens on the first session statement
+    await db_session.execute(text("SELECT set_config('enable_indexscan', 'off', true)"))
+    exact_results: list[set[int]] = []
+    exact_start = time.time()
+    for query in queries:
+        rows = await driver_conn.fetch(top_k_sql, query, ANN_BENCHMARK_TOP_K)
+        exact_results.append({row["id"] for row in rows})
+    exact_latency_ms = (time.time() - exact_start) * 1000 / len(queries)
+    await db_session.execute(text("SELECT set_config('enable_indexscan', 'on', true)"))
+
+    print(f"\n✓ HNSW index build ({ANN_BENCHMARK_ROWS} rows): {build_duration:.1f}s")
+    print(f"  - exact scan: {exact_latency_ms:.2f}ms/query")
+
+    recall_by_ef: dict[int, float] = {}
+    for ef_search in (ANN_BENCHMARK_TOP_K, 40, 100, 200):
+        await db_session.execute(VectorQueryBuilder.build_ef_search_statement(ef_search))
+        hits = 0
+        ann_start = time.time()
+        for query, expected in zip(queries, exact_results, strict=True):
+            rows = await driver_conn.fetch(top_k_sql, query, ANN_BENCHMARK_TOP_K)
+            hits += len(expected & {row["id"] for row in rows})
+        ann_latency_ms = (time.time() - ann_start) * 1000 / len(queries)
+        recall_by_ef[ef_search] = hits / (len(queries) * ANN_BENCHMARK_TOP_K)
+        print(
+            f"  - hnsw ef_search={ef_search}: recall@{ANN_BENCHMARK_TOP_K}={recall_by_ef[ef_search]:.3f}, {ann_latency_ms:.2f}ms/query"
+        )
+
+    # Recall must not degrade as the candidate list grows
+    assert recall_by_ef[200] >= recall_by_ef[ANN_BENCHMARK_TOP_K]
+    assert recall_by_ef[200] >= 0.9, f"HNSW recall@{ANN_BENCHMARK_TOP_K} at ef_search=200 too low"
+
+
 @pytest.mark.performance
 def test_performance_summary() -> None:
     """Print performance test summary and targets.
@@ -467,6 +557,7 @@ def test_performance_summary() -> None:
     print("Vector retrieval:            <50ms")
     print("Similarity search:           <100ms (100 messages)")
     print("Atom search:                 <50ms (50 atoms)")
+    print("HNSW recall@10 (100k rows):  >=0.9 at ef_search=200")
     print("=" * 60)
     print("\nNOTE: Tests use SQLite in-memory DB, not PostgreSQL.")
     print("Actual production performance may vary with pgvector.")
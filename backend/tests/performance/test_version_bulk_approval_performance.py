@@ -0,0 +1,123 @@
+"""Performance tests for set-based bulk version approval.
+
+Benchmarks ``VersioningService.bulk_approve_versions`` at 10,000 pending topic
+versions against the previous per-version approach (SAVEPOINT, locking SELECT
+and entity load per id), reporting statement count and latency. The legacy
+approach is measured on a slice and extrapolated.
+
+NOTE: Marked with @pytest.mark.performance. Runs on SQLite (no row locks) and
+PostgreSQL (FOR UPDATE SKIP LOCKED, UPDATE ... FROM (VALUES ...)).
+
+Run with: pytest tests/performance/test_version_bulk_approval_performance.py -v -s
+"""
+
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from app.models.topic import Topic
+from app.models.topic_version import TopicVersion
+from app.services.versioning import VersioningService
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TOPICS = 1_000
+VERSIONS_PER_TOPIC = 10
+LEGACY_SAMPLE = 500
+
+
+@contextmanager
+def count_queries(session: AsyncSession) -> Iterator[list[str]]:
+    """Collect SQL statements executed on the session's engine."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def approve_per_version(session: AsyncSession, version_ids: list[int]) -> int:
+    """Previous implementation: one SAVEPOINT, lock and entity load per version."""
+    approved = 0
+    for version_id in version_ids:
+        async with session.begin_nested():
+            stmt = select(TopicVersion).where(TopicVersion.id == version_id).with_for_update()
+            version = (await session.execute(stmt)).scalar_one_or_none()
+            if not version or version.approved:
+                continue
+            entity = await session.get(Topic, version.topic_id)
+            if entity:
+                for key, value in version.data.items():
+                    if hasattr(entity, key):
+                        setattr(entity, key, value)
+            version.approved = True
+            version.approved_at = datetime.now(UTC)
+            approved += 1
+    await session.commit()
+    return approved
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_bulk_approve_10k_versions_set_based_vs_per_version(db_session: AsyncSession) -> None:
+    """Benchmark: statement count and latency for approving 10k versions.
+
+    The set-based path must use a constant number of statements and leave
+    every topic at the data of its last requested version.
+    """
+    topic_ids = [uuid.uuid4() for _ in range(TOPICS)]
+    await db_session.execute(
+        insert(Topic),
+        [{"id": topic_id, "name": f"Topic {i}", "description": "Original"} for i, topic_id in enumerate(topic_ids)],
+    )
+    await db_session.execute(
+        insert(TopicVersion),
+        [
+            {
+                "topic_id": topic_id,
+                "version": version,
+                "data": {"name": f"Topic {i} v{version}", "description": f"Revision {version}"},
+                "approved": False,
+            }
+            for version in range(1, VERSIONS_PER_TOPIC + 1)
+            for i, topic_id in enumerate(topic_ids)
+        ],
+    )
+    await db_session.commit()
+    version_ids = list((await db_session.execute(select(TopicVersion.id).order_by(TopicVersion.id))).scalars())
+    legacy_ids, bulk_ids = version_ids[:LEGACY_SAMPLE], version_ids[LEGACY_SAMPLE:]
+
+    with count_queries(db_session) as legacy_queries:
+        start = time.perf_counter()
+        assert await approve_per_version(db_session, legacy_ids) == LEGACY_SAMPLE
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+    with count_queries(db_session) as bulk_queries:
+        start = time.perf_counter()
+        success_count, failed_ids, _ = await VersioningService().bulk_approve_versions(db_session, "topic", bulk_ids)
+        bulk_ms = (time.perf_counter() - start) * 1000
+
+    assert success_count == len(bulk_ids)
+    assert failed_ids == []
+    names = dict((await db_session.execute(select(Topic.id, Topic.name))).all())
+    assert all(names[topic_id] == f"Topic {i} v{VERSIONS_PER_TOPIC}" for i, topic_id in enumerate(topic_ids))
+    # lock, version UPDATE, entity UPDATE (chunked by 500 topics on SQLite) and the pending-count queries
+    assert len(bulk_queries) <= 10
+
+    scale = len(bulk_ids) / LEGACY_SAMPLE
+    print(f"\n✓ Bulk approval benchmark ({len(version_ids)} versions of {TOPICS} topics)")
+    print(
+        f"  - per-version: {len(legacy_queries) * scale:>8.0f} statements {legacy_ms * scale:10.2f}ms "
+        f"(extrapolated from {LEGACY_SAMPLE})"
+    )
+    print(f"  - set-based:   {len(bulk_queries):>8} statements {bulk_ms:10.2f}ms")
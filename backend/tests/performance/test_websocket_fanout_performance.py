@@ -0,0 +1,75 @@
+"""Performance tests for WebSocket fan-out.
+
+Measures delivery latency of one broadcast to 5k in-process connections while a
+few of them are slow. Sends are simulated, so this isolates the manager's
+fan-out overhead from network I/O.
+
+NOTE: Marked with @pytest.mark.performance. Slow CI runners can raise the 100ms
+p99 target with FANOUT_P99_TARGET_MS.
+
+Run with: pytest tests/performance/test_websocket_fanout_performance.py -v -s
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.services.websocket_manager import WebSocketManager
+
+FANOUT_CONNECTIONS = int(os.getenv("FANOUT_CONNECTIONS", "5000"))
+SLOW_CONNECTIONS = 10
+P99_TARGET_MS = float(os.getenv("FANOUT_P99_TARGET_MS", "100"))
+
+
+class TimingWebSocket:
+    """WebSocket stub recording when each frame was delivered."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.delivered_at: list[float] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        await asyncio.sleep(self.delay)
+        self.delivered_at.append(time.perf_counter())
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_broadcast_p99_delivery_latency() -> None:
+    """Benchmark: p99 delivery latency to 5k connections with slow consumers."""
+    manager = WebSocketManager()
+    manager._is_worker = False
+    sockets = [TimingWebSocket(delay=5 if i < SLOW_CONNECTIONS else 0.0) for i in range(FANOUT_CONNECTIONS)]
+    for ws in sockets:
+        await manager.connect(ws, ["metrics"])  # type: ignore[arg-type]
+
+    with patch("app.services.message_buffer.message_buffer") as buffer:
+        buffer.add = AsyncMock(return_value=1)
+        start = time.perf_counter()
+        await manager.broadcast("metrics", {"type": "metrics.update", "data": {"value": 1}})
+        broadcast_ms = (time.perf_counter() - start) * 1000
+
+        fast = sockets[SLOW_CONNECTIONS:]
+        deadline = time.perf_counter() + 5
+        while any(not ws.delivered_at for ws in fast) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+
+    latencies = sorted((ws.delivered_at[0] - start) * 1000 for ws in fast if ws.delivered_at)
+    assert len(latencies) == len(fast)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+
+    for ws in sockets:
+        await manager.disconnect(websocket=ws)  # type: ignore[arg-type]
+
+    print(f"\n✓ Fan-out to {FANOUT_CONNECTIONS} connections ({SLOW_CONNECTIONS} slow)")
+    print(f"  - broadcast() returned in {broadcast_ms:.2f}ms")
+    print(f"  - p50 delivery: {latencies[len(latencies) // 2]:.2f}ms, p99 delivery: {p99:.2f}ms")
+    assert p99 < P99_TARGET_MS
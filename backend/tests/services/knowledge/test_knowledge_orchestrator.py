@@ -0,0 +1,205 @@
+"""Tests for KnowledgeOrchestrator message context fetching and intra-batch dedup.
+
+Tests cover:
+1. build_context_query - single LATERAL query shape
+2. fetch_messages_with_context - one round-trip regardless of batch size
+3. cluster_duplicates - vectorized grouping of near-duplicate extractions
+4. save_atoms - intra-batch duplicates saved once and linkable by any member's title,
+   no dedup when embedding fails
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from app.models import Atom, AtomLink, ProviderType, Topic, TopicAtom
+from app.services.knowledge.knowledge_orchestrator import KnowledgeOrchestrator
+from app.services.knowledge.knowledge_schemas import ExtractedAtom
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _vector(*components: float) -> list[float]:
+    """1536-d vector starting with the given components."""
+    return [*components, *([0.0] * (1536 - len(components)))]
+
+
+class TestBuildContextQuery:
+    """Tests for build_context_query."""
+
+    def test_uses_lateral_neighbours_per_target(self) -> None:
+        """Neighbours come from LATERAL subqueries, deduplicated via IN (subquery)."""
+        stmt = KnowledgeOrchestrator.build_context_query([uuid4(), uuid4()], context_window=3)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("JOIN LATERAL") == 2
+        assert "source_thread_id IS NULL AND targets.source_thread_id IS NULL" in sql
+        assert "WHERE messages.id IN (SELECT context_ids.id" in sql
+        assert sql.rstrip().endswith("ORDER BY messages.sent_at")
+
+
+class TestFetchMessagesWithContext:
+    """Tests for fetch_messages_with_context."""
+
+    @pytest.mark.parametrize("batch_size", [1, 50])
+    async def test_single_query_for_any_batch_size(self, batch_size: int) -> None:
+        """Context expansion is one query, not two per target message."""
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        await KnowledgeOrchestrator.fetch_messages_with_context(
+            session, [uuid4() for _ in range(batch_size)], include_context=True
+        )
+
+        session.execute.assert_awaited_once()
+
+    async def test_empty_ids_skip_database(self) -> None:
+        """No IDs means no query."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        assert await KnowledgeOrchestrator.fetch_messages_with_context(session, [], include_context=True) == []
+        session.execute.assert_not_awaited()
+
+
+class TestClusterDuplicates:
+    """Tests for cluster_duplicates."""
+
+    def test_most_confident_item_leads_its_duplicates(self) -> None:
+        """Near-duplicates join the highest-priority member; distinct items stay alone."""
+        vectors = [_vector(1.0), _vector(0.0, 1.0), _vector(0.99, 0.1), _vector(1.0, 0.01)]
+
+        leaders = KnowledgeOrchestrator.cluster_duplicates(vectors, [0.7, 0.9, 0.8, 0.7], threshold=0.95)
+
+        assert leaders == [2, 1, 2, 2]
+
+    def test_missing_vectors_and_threshold(self) -> None:
+        """Items without vectors never merge; pairs below the threshold stay apart."""
+        vectors = [_vector(1.0), None, _vector(0.8, 0.6)]
+
+        assert KnowledgeOrchestrator.cluster_duplicates(vectors, [0.9, 0.9, 0.9], threshold=0.95) == [0, 1, 2]
+        assert KnowledgeOrchestrator.cluster_duplicates(vectors, [0.9, 0.9, 0.9], threshold=0.9) == [0, 1, 0]
+
+
+class TestSaveAtomsIntraBatchDedup:
+    """Tests for intra-batch dedup in save_atoms."""
+
+    async def test_duplicates_saved_once_with_all_sources_and_topics(self, db_session: AsyncSession) -> None:
+        """Duplicates become one atom linked to each of their topics, not versions of each other."""
+        topics = [Topic(name=name, description=name, icon="Icon", color="#000000") for name in ("API", "Auth")]
+        db_session.add_all(topics)
+        await db_session.commit()
+        message_ids = [uuid4(), uuid4(), uuid4()]
+        extracted_atoms = [
+            ExtractedAtom(
+                title="Login fails",
+                content="500 on login",
+                confidence=0.8,
+                topic_name="API",
+                related_message_ids=[message_ids[0]],
+            ),
+            ExtractedAtom(
+                title="Login broken",
+                content="Login returns 500",
+                confidence=0.9,
+                topic_name="Auth",
+                related_message_ids=[message_ids[1], message_ids[0]],
+            ),
+            ExtractedAtom(
+                title="Use JWT",
+                content="Switch to JWT",
+                confidence=0.9,
+                topic_name="Auth",
+                related_message_ids=[message_ids[2]],
+            ),
+        ]
+        orchestrator = KnowledgeOrchestrator(agent_config=MagicMock(), provider=MagicMock(type=ProviderType.openai))
+        search = AsyncMock(return_value=[[], []])
+
+        with (
+            patch(
+                "app.services.embedding_service.EmbeddingService.generate_embeddings",
+                AsyncMock(return_value=[_vector(1.0), _vector(0.99, 0.1), _vector(0.0, 1.0)]),
+            ),
+            patch("app.services.semantic_search_service.SemanticSearchService.search_by_vectors", search),
+            patch("app.services.topic_crud.TopicCRUD.auto_link_atom", AsyncMock(return_value=[])),
+        ):
+            saved_atoms, version_ids, _ = await orchestrator.save_atoms(
+                extracted_atoms, {topic.name: topic for topic in topics}, db_session, confidence_threshold=0.7
+            )
+
+        assert version_ids == []
+        assert [atom.title for atom in saved_atoms] == ["Login broken", "Use JWT"]
+        assert len(search.await_args.args[2]) == 2
+        atoms = (await db_session.execute(select(Atom))).scalars().all()
+        assert len(atoms) == 2
+        assert saved_atoms[0].meta["message_ids"] == [str(message_ids[1]), str(message_ids[0])]
+        links = (await db_session.execute(select(TopicAtom).where(TopicAtom.atom_id == saved_atoms[0].id))).scalars()
+        assert {link.topic_id for link in links} == {topics[0].id, topics[1].id}
+
+    async def test_links_to_merged_duplicates_resolve_to_their_atom(self, db_session: AsyncSession) -> None:
+        """Links naming a merged duplicate's title point at the atom it was merged into."""
+        topic = Topic(name="Auth", description="Auth", icon="Icon", color="#000000")
+        db_session.add(topic)
+        await db_session.commit()
+        extracted_atoms = [
+            ExtractedAtom(title="Login fails", content="500 on login", confidence=0.8, topic_name="Auth"),
+            ExtractedAtom(title="Login broken", content="Login returns 500", confidence=0.9, topic_name="Auth"),
+            ExtractedAtom(
+                title="Use JWT",
+                content="Switch to JWT",
+                confidence=0.9,
+                topic_name="Auth",
+                links_to_atom_titles=["Login fails"],
+                link_types=["solves"],
+            ),
+        ]
+        orchestrator = KnowledgeOrchestrator(agent_config=MagicMock(), provider=MagicMock(type=ProviderType.openai))
+
+        with (
+            patch(
+                "app.services.embedding_service.EmbeddingService.generate_embeddings",
+                AsyncMock(return_value=[_vector(1.0), _vector(0.99, 0.1), _vector(0.0, 1.0)]),
+            ),
+            patch(
+                "app.services.semantic_search_service.SemanticSearchService.search_by_vectors",
+                AsyncMock(return_value=[[], []]),
+            ),
+            patch("app.services.topic_crud.TopicCRUD.auto_link_atom", AsyncMock(return_value=[])),
+        ):
+            saved_atoms, _, atom_ids_by_title = await orchestrator.save_atoms(
+                extracted_atoms, {"Auth": topic}, db_session, confidence_threshold=0.7
+            )
+        links_created = await orchestrator.link_atoms(extracted_atoms, saved_atoms, db_session, atom_ids_by_title)
+
+        login_atom, jwt_atom = saved_atoms
+        assert atom_ids_by_title["Login fails"] == login_atom.id
+        assert links_created == 1
+        link = (await db_session.execute(select(AtomLink))).scalar_one()
+        assert (link.from_atom_id, link.to_atom_id) == (jwt_atom.id, login_atom.id)
+
+    async def test_embedding_failure_saves_without_dedup(self, db_session: AsyncSession) -> None:
+        """A provider error falls back to exact-title matching instead of aborting the save."""
+        topic = Topic(name="API", description="API", icon="Icon", color="#000000")
+        db_session.add(topic)
+        await db_session.commit()
+        extracted_atoms = [
+            ExtractedAtom(title=title, content=title, confidence=0.9, topic_name="API", related_message_ids=[uuid4()])
+            for title in ("Login fails", "Login broken")
+        ]
+        orchestrator = KnowledgeOrchestrator(agent_config=MagicMock(), provider=MagicMock(type=ProviderType.openai))
+
+        with (
+            patch(
+                "app.services.embedding_service.EmbeddingService.generate_embeddings",
+                AsyncMock(side_effect=ValueError("provider unavailable")),
+            ),
+            patch("app.services.topic_crud.TopicCRUD.auto_link_atom", AsyncMock(return_value=[])),
+        ):
+            saved_atoms, version_ids, _ = await orchestrator.save_atoms(
+                extracted_atoms, {"API": topic}, db_session, confidence_threshold=0.7
+            )
+
+        assert version_ids == []
+        assert [atom.title for atom in saved_atoms] == ["Login fails", "Login broken"]
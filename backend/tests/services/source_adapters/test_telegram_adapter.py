@@ -7,6 +7,7 @@ Covers:
 - Error handling (rate limits, auth errors)
 """
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, Mock, patch
 from typing import Any
@@ -360,6 +361,33 @@ async def test_fetch_history_client_not_connected(telegram_adapter, mock_client_
     assert len(fetched) == 0, f"Expected 0 messages when client not connected, got {len(fetched)}"
 
 
+@pytest.mark.asyncio
+async def test_fetch_history_shares_connection(
+    telegram_adapter, mock_client_service, mock_telethon_client, mock_telethon_message
+):
+    """Test concurrent fetches inside connected() reuse one client connection."""
+    # Setup
+    mock_client_service.client = mock_telethon_client
+
+    async def mock_iter_messages(*args, **kwargs):
+        yield mock_telethon_message
+
+    mock_telethon_client.iter_messages = mock_iter_messages
+
+    async def fetch(chat_id: str) -> list[dict[str, Any]]:
+        return [message async for message in telegram_adapter.fetch_history(chat_id)]
+
+    # Execute
+    async with telegram_adapter.connected():
+        results = await asyncio.gather(fetch("-1001"), fetch("-1002"))
+        mock_client_service.disconnect.assert_not_called()
+
+    # Assert
+    assert [len(fetched) for fetched in results] == [1, 1]
+    mock_client_service.connect.assert_called_once()
+    mock_client_service.disconnect.assert_called_once()
+
+
 # ==================== test_connection TESTS ====================
 
 
@@ -0,0 +1,69 @@
+"""Tests for the shared Telegram avatar resolver."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from app.models.telegram_avatar_cache import TelegramAvatarCacheEntry
+from app.services.avatar_resolver import AvatarResolver
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+def _resolver(fetch: AsyncMock, **kwargs) -> AvatarResolver:
+    resolver = AvatarResolver(bot_token="test-token", ttl_seconds=3600, **kwargs)
+    resolver._fetch = fetch  # type: ignore[method-assign]
+    return resolver
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_fetch() -> None:
+    """Test concurrent resolves of the same user cost a single Bot API lookup."""
+
+    async def slow_fetch(telegram_user_id: int) -> str:
+        await asyncio.sleep(0.01)
+        return f"https://cdn/{telegram_user_id}.jpg"
+
+    fetch = AsyncMock(side_effect=slow_fetch)
+    resolver = _resolver(fetch)
+
+    results = await asyncio.gather(*(resolver.resolve(7) for _ in range(20)), resolver.resolve(8))
+
+    assert results == ["https://cdn/7.jpg"] * 20 + ["https://cdn/8.jpg"]
+    assert fetch.await_count == 2
+    assert await resolver.resolve(7) == "https://cdn/7.jpg"
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_refetched_and_failures_not_cached_long() -> None:
+    """Test stale entries and failed lookups are retried."""
+    fetch = AsyncMock(side_effect=[None, RuntimeError("Bad Request"), "https://cdn/new.jpg"])
+    resolver = _resolver(fetch)
+
+    assert await resolver.resolve(1) is None
+    resolver._memory[1] = (time.time() - 1, None)
+    assert await resolver.resolve(1) is None
+    resolver._memory[1] = (time.time() - 1, None)
+    assert await resolver.resolve(1) == "https://cdn/new.jpg"
+    assert fetch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_cached_never_waits_on_telegram(db_session: AsyncSession) -> None:
+    """Test the webhook path returns cached values and refreshes misses in the background."""
+    fetch = AsyncMock(return_value="https://cdn/5.jpg")
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    resolver = _resolver(fetch, session_factory=session_factory)
+
+    assert await resolver.get_cached(5) is None
+    await asyncio.gather(*resolver._background)
+    assert fetch.await_count == 1
+    assert await resolver.get_cached(5) == "https://cdn/5.jpg"
+
+    # A second process sees the persisted value without calling Telegram
+    other = _resolver(AsyncMock(), session_factory=session_factory)
+    assert await other.resolve(5) == "https://cdn/5.jpg"
+    other._fetch.assert_not_awaited()  # type: ignore[attr-defined]
+    entry = await db_session.get(TelegramAvatarCacheEntry, 5)
+    assert entry is not None and entry.avatar_url == "https://cdn/5.jpg"
@@ -5,12 +5,16 @@ from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models import Message, Source, SourceType, Topic, User
 from app.services.batching_service import (
     get_thread_statistics,
     group_messages_by_conversation,
+    group_unprocessed_by_conversation,
     select_conversations_for_batch,
 )
+from app.services.unprocessed_messages import load_unprocessed_messages
 
 
 def create_mock_message(
@@ -220,3 +224,83 @@ class TestGetThreadStatistics:
         assert result["with_channel_id"] == 2, f"Expected 2 with_channel_id, got {result}"
         assert result["ungrouped"] == 1, f"Expected 1 ungrouped, got {result}"
         assert result["with_parent_id"] == 2, f"Expected 2 with_parent_id (replies), got {result}"
+
+
+class TestGroupUnprocessedByConversation:
+    """Parity of SQL-side grouping with the Python implementation."""
+
+    async def test_matches_python_grouping(self, db_session: AsyncSession) -> None:
+        """Same conversation keys, members and batches as the Python path."""
+        user = User(first_name="Test", last_name="User", email="batching@example.com")
+        source = Source(name="Telegram", type=SourceType.telegram)
+        topic = Topic(name="Done", description="Processed", icon="Icon", color="#000")
+        db_session.add_all([user, source, topic])
+        await db_session.commit()
+
+        base_time = datetime(2024, 1, 1, 10, 0)
+        # (minutes after base, channel, thread)
+        layout = [
+            (0, "channel-1", None),
+            (5, "channel-1", None),
+            (7, "channel-1", "thread-a"),
+            (16, "channel-1", None),  # 11 min after previous unthreaded message -> new gap
+            (20, "channel-2", None),
+            (21, "channel-1", "thread-a"),
+            (40, "channel-2", None),
+            (41, None, "thread-b"),
+            (42, "", "thread-c"),
+            (43, None, None),
+            (44, "", None),
+            (70, "channel-1", None),
+            (95, "channel-1", None),
+        ]
+        messages = [
+            Message(
+                external_message_id=f"msg_{i}",
+                content="hello",
+                sent_at=base_time + timedelta(minutes=minutes),
+                source_id=source.id,
+                author_id=user.id,
+                source_channel_id=channel,
+                source_thread_id=thread,
+            )
+            for i, (minutes, channel, thread) in enumerate(layout)
+        ]
+        # Excluded: already has a topic, or older than the window
+        messages.append(
+            Message(
+                external_message_id="processed",
+                content="hello",
+                sent_at=base_time + timedelta(minutes=10),
+                source_id=source.id,
+                author_id=user.id,
+                source_channel_id="channel-1",
+                topic_id=topic.id,
+            )
+        )
+        messages.append(
+            Message(
+                external_message_id="old",
+                content="hello",
+                sent_at=base_time - timedelta(days=2),
+                source_id=source.id,
+                author_id=user.id,
+                source_channel_id="channel-1",
+            )
+        )
+        db_session.add_all(messages)
+        await db_session.commit()
+
+        since = base_time - timedelta(hours=1)
+        python_grouped = group_messages_by_conversation(await load_unprocessed_messages(db_session, since))
+        sql_grouped = await group_unprocessed_by_conversation(db_session, since)
+
+        assert {k: [m.id for m in v] for k, v in sql_grouped.items()} == {
+            k: [m.id for m in v] for k, v in python_grouped.items()
+        }
+        assert "channel-1:timegap_3" in sql_grouped
+        assert "default:thread-c" in sql_grouped
+        for max_size in (1, 3, 5, 50):
+            assert select_conversations_for_batch(sql_grouped, max_size) == select_conversations_for_batch(
+                python_grouped, max_size
+            )
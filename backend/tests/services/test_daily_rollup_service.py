@@ -0,0 +1,176 @@
+"""Tests for incrementally maintained daily rollups."""
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from app.models.atom import Atom
+from app.models.daily_stats import AtomDailyStats, MessageDailyStats
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.topic import Topic
+from app.models.user import User
+from app.services.daily_rollup_service import (
+    ATOM_ROLLUP,
+    MESSAGE_ROLLUP,
+    DailyRollupService,
+    RollupSplit,
+    split_period,
+)
+from app.services.dashboard_service import DashboardService
+from app.services.executive_summary_service import ExecutiveSummaryService
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def test_split_period_uses_whole_covered_days() -> None:
+    """Test partial boundary days and the uncovered tail are left for live aggregation."""
+    start = datetime(2025, 1, 1, 12)
+    end = datetime(2025, 1, 10, 6)
+
+    assert split_period(start, end, date(2025, 1, 5)) == RollupSplit(
+        date(2025, 1, 2),
+        date(2025, 1, 5),
+        [(start, datetime(2025, 1, 2)), (datetime(2025, 1, 5), end)],
+    )
+    assert split_period(datetime(2025, 1, 1), datetime(2025, 1, 3), date(2025, 1, 5)) == RollupSplit(
+        date(2025, 1, 1), date(2025, 1, 3), []
+    )
+    assert split_period(start, None, None) == RollupSplit(None, None, [(start, None)])
+    assert split_period(start, None, date(2025, 1, 2)) == RollupSplit(None, None, [(start, None)])
+
+
+@pytest.fixture
+async def seeded(db_session: AsyncSession) -> dict[str, Topic]:
+    """Create messages and atoms spread over the last ten days."""
+    user = User(first_name="Roll", last_name="Up")
+    source = Source(name="Rollup Source", type="telegram")
+    topics = {"alpha": Topic(name="Alpha", description="d"), "beta": Topic(name="Beta", description="d")}
+    db_session.add_all([user, source, *topics.values()])
+    await db_session.commit()
+
+    today_start = datetime.combine(datetime.utcnow().date(), time.min)
+    classifications = ["signal", "noise", "spam", None]
+    rows: list[Message | Atom] = []
+    for days_ago in range(10):
+        for i in range(days_ago % 4 + 1):
+            sent_at = today_start - timedelta(days=days_ago) + timedelta(hours=3 * i + 1)
+            rows.append(
+                Message(
+                    external_message_id=f"m_{days_ago}_{i}",
+                    content="c",
+                    sent_at=sent_at,
+                    source_id=source.id,
+                    author_id=user.id,
+                    topic_id=topics["alpha" if i % 2 else "beta"].id,
+                    noise_classification=classifications[i % 4],
+                )
+            )
+            rows.append(
+                Atom(
+                    type=["decision", "blocker", "problem"][i % 3],
+                    title=f"a_{days_ago}_{i}",
+                    content="c",
+                    user_approved=i % 2 == 0,
+                    created_at=sent_at,
+                )
+            )
+    db_session.add_all(rows)
+    await db_session.commit()
+    # Rows written within the refresh overlap window count as changed; age them
+    long_ago = today_start - timedelta(days=30)
+    await db_session.execute(update(Message).values(updated_at=long_ago))
+    await db_session.execute(update(Atom).values(updated_at=long_ago))
+    await db_session.commit()
+    return topics
+
+
+async def _snapshot(session: AsyncSession) -> tuple:
+    dashboard = DashboardService(session)
+    metrics = await dashboard.get_metrics(period="yesterday")
+    trends = await dashboard.get_trends(period="week")
+    message_trends = await dashboard.get_message_trends(days=14)
+    summary = await ExecutiveSummaryService(session).get_summary_stats(period_days=7)
+    return (
+        metrics.messages,
+        metrics.atoms,
+        metrics.topics,
+        metrics.trends,
+        trends.trends,
+        message_trends.data,
+        summary.stats,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollup_results_match_live_aggregation(db_session: AsyncSession, seeded: dict[str, Topic]) -> None:
+    """Test dashboard and summary stats are identical with and without rollups."""
+    live = await _snapshot(db_session)
+
+    rebuilt = await DailyRollupService(db_session).refresh()
+
+    assert rebuilt == {MESSAGE_ROLLUP: -1, ATOM_ROLLUP: -1}
+    covered = await DailyRollupService(db_session).get_covered_until()
+    assert covered == dict.fromkeys((MESSAGE_ROLLUP, ATOM_ROLLUP), datetime.utcnow().date())
+    rolled_messages = await db_session.scalar(select(func.sum(MessageDailyStats.message_count)))
+    today_messages = await db_session.scalar(
+        select(func.count()).where(Message.sent_at >= datetime.combine(datetime.utcnow().date(), time.min))
+    )
+    assert rolled_messages == await db_session.scalar(select(func.count()).select_from(Message)) - today_messages
+    assert await _snapshot(db_session) == live
+
+
+@pytest.mark.asyncio
+async def test_refresh_rebuilds_changed_and_deleted_days(db_session: AsyncSession, seeded: dict[str, Topic]) -> None:
+    """Test updates and deletes on covered days are picked up by the next refresh."""
+    service = DailyRollupService(db_session)
+    await service.refresh()
+
+    old_day_start = datetime.combine(datetime.utcnow().date() - timedelta(days=5), time.min)
+    await db_session.execute(
+        update(Message)
+        .where(Message.sent_at >= old_day_start, Message.sent_at < old_day_start + timedelta(days=1))
+        .values(topic_id=seeded["alpha"].id, noise_classification="signal", updated_at=datetime.utcnow())
+    )
+    atom = (await db_session.execute(select(Atom).where(Atom.title == "a_3_0"))).scalar_one()
+    await db_session.delete(atom)
+    await db_session.commit()
+
+    rebuilt = await service.refresh()
+
+    assert rebuilt == {MESSAGE_ROLLUP: 1, ATOM_ROLLUP: 1}
+    live_counts = await db_session.execute(
+        select(Message.topic_id, func.count())
+        .where(Message.sent_at < datetime.combine(datetime.utcnow().date(), time.min))
+        .group_by(Message.topic_id)
+    )
+    rolled_counts = await db_session.execute(
+        select(MessageDailyStats.topic_id, func.sum(MessageDailyStats.message_count)).group_by(
+            MessageDailyStats.topic_id
+        )
+    )
+    assert dict(rolled_counts.tuples().all()) == dict(live_counts.tuples().all())
+    assert await db_session.scalar(select(func.sum(AtomDailyStats.atom_count))) == await db_session.scalar(
+        select(func.count())
+        .select_from(Atom)
+        .where(
+            Atom.created_at < datetime.combine(datetime.utcnow().date(), time.min)  # type: ignore[operator]
+        )
+    )
+
+    # The updated messages are still inside the overlap window; the atom day is settled
+    assert await service.refresh() == {MESSAGE_ROLLUP: 1, ATOM_ROLLUP: 0}
+
+
+@pytest.mark.asyncio
+async def test_reset_falls_back_to_live_aggregation(db_session: AsyncSession, seeded: dict[str, Topic]) -> None:
+    """Test resetting a rollup drops its rows and watermark."""
+    service = DailyRollupService(db_session)
+    await service.refresh()
+    live = await _snapshot(db_session)
+
+    await service.reset(MESSAGE_ROLLUP)
+    await db_session.commit()
+
+    assert (await service.get_covered_until())[MESSAGE_ROLLUP] is None
+    assert await db_session.scalar(select(func.count()).select_from(MessageDailyStats)) == 0
+    assert await _snapshot(db_session) == live
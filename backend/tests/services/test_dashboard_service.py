@@ -0,0 +1,142 @@
+"""Tests for DashboardService set-based aggregates."""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+from app.models.atom import Atom
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.topic import Topic
+from app.models.user import User
+from app.services.dashboard_service import DashboardService
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@pytest.fixture
+async def author_and_source(db_session: AsyncSession) -> tuple[User, Source]:
+    """Create message author and source."""
+    user = User(first_name="Dash", last_name="Board")
+    source = Source(name="Dashboard Source", type="telegram")
+    db_session.add_all([user, source])
+    await db_session.commit()
+    return user, source
+
+
+def _message(
+    author_and_source: tuple[User, Source],
+    key: str,
+    sent_at: datetime,
+    topic: Topic | None = None,
+    classification: str | None = None,
+) -> Message:
+    user, source = author_and_source
+    return Message(
+        external_message_id=key,
+        content=f"Message {key}",
+        sent_at=sent_at,
+        source_id=source.id,
+        author_id=user.id,
+        topic_id=topic.id if topic else None,
+        noise_classification=classification,
+    )
+
+
+@pytest.fixture
+def today_start() -> datetime:
+    """Start of the current UTC day (naive, as used by the service)."""
+    return datetime.combine(datetime.utcnow().date(), time.min)
+
+
+@pytest.mark.asyncio
+async def test_get_trends_ranks_over_all_topics(
+    db_session: AsyncSession, author_and_source: tuple[User, Source], today_start: datetime
+) -> None:
+    """Test the busiest topic wins even when it is not in the first page of topics."""
+    topics = [Topic(name=f"Topic {i:02d}", description="d") for i in range(15)]
+    db_session.add_all(topics)
+    await db_session.commit()
+
+    current = today_start - timedelta(days=2)
+    previous = today_start - timedelta(days=10)
+    messages = [_message(author_and_source, f"quiet_{i}", current, topics[i]) for i in range(3)]
+    messages += [_message(author_and_source, f"busy_{i}", current, topics[-1]) for i in range(4)]
+    messages += [_message(author_and_source, f"busy_prev_{i}", previous, topics[-1]) for i in range(6)]
+    messages += [_message(author_and_source, f"prev_only_{i}", previous, topics[5]) for i in range(2)]
+    db_session.add_all(messages)
+    await db_session.commit()
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await DashboardService(db_session).get_trends(period="week", limit=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Rollup watermark lookup + one grouped query
+    assert len(statements) == 2
+    assert [(t.keyword, t.count, t.delta) for t in response.trends] == [
+        ("Topic 14", 4, -2),
+        ("Topic 00", 1, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_counts_both_periods(
+    db_session: AsyncSession, author_and_source: tuple[User, Source], today_start: datetime
+) -> None:
+    """Test message, atom and topic aggregates for current and previous day."""
+    topic = Topic(name="Active", description="d")
+    db_session.add(topic)
+    await db_session.commit()
+
+    yesterday = today_start - timedelta(hours=12)
+    day_before = today_start - timedelta(hours=36)
+    db_session.add_all([
+        _message(author_and_source, "s1", yesterday, topic, "signal"),
+        _message(author_and_source, "s2", yesterday, None, "signal"),
+        _message(author_and_source, "n1", yesterday, None, "spam"),
+        _message(author_and_source, "u1", yesterday),
+        _message(author_and_source, "old", day_before, None, "noise"),
+        Atom(type="problem", title="a1", content="c", user_approved=True, created_at=yesterday),
+        Atom(type="problem", title="a2", content="c", created_at=yesterday),
+        Atom(type="decision", title="a3", content="c", archived=True, created_at=yesterday),
+        Atom(type="decision", title="a4", content="c", created_at=day_before),
+    ])
+    await db_session.commit()
+
+    metrics = await DashboardService(db_session).get_metrics(period="yesterday")
+
+    assert metrics.messages.model_dump() == {"total": 4, "signal_count": 2, "noise_count": 1, "signal_ratio": 0.5}
+    assert metrics.trends["messages"].previous == 1
+    assert metrics.atoms.total == 3
+    assert metrics.atoms.approved == 1
+    assert metrics.atoms.pending_review == 1
+    assert metrics.atoms.by_type == {"problem": 2, "decision": 1}
+    assert metrics.trends["atoms"].previous == 1
+    assert metrics.topics.model_dump() == {"total": 1, "active_today": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_message_trends_fills_days(
+    db_session: AsyncSession, author_and_source: tuple[User, Source], today_start: datetime
+) -> None:
+    """Test daily signal/noise breakdown with zero-filled gaps."""
+    db_session.add_all([
+        _message(author_and_source, "t1", today_start + timedelta(minutes=5), None, "signal"),
+        _message(author_and_source, "t2", today_start + timedelta(minutes=6), None, "low_quality"),
+        _message(author_and_source, "y1", today_start - timedelta(hours=2), None, "noise"),
+    ])
+    await db_session.commit()
+
+    response = await DashboardService(db_session).get_message_trends(days=7)
+
+    assert len(response.data) == 7
+    assert (response.data[-1].signal, response.data[-1].noise) == (1, 1)
+    assert (response.data[-2].signal, response.data[-2].noise) == (0, 1)
+    assert all(point.signal == point.noise == 0 for point in response.data[:-2])
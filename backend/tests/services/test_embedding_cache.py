@@ -0,0 +1,163 @@
+"""Tests for the content-addressed embedding cache."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from app.models.embedding_cache import EmbeddingCacheEntry
+from app.models.llm_provider import LLMProvider, ProviderType
+from app.services.embedding_cache import EmbeddingCache, make_cache_key
+from app.services.embedding_service import EmbeddingService
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@pytest.fixture
+def openai_provider() -> LLMProvider:
+    """Create OpenAI provider for testing."""
+    return LLMProvider(
+        id=uuid4(),
+        name="Cache Test OpenAI",
+        type=ProviderType.openai,
+        api_key_encrypted=b"encrypted_key",
+        is_active=True,
+    )
+
+
+def _key(text: str, model: str = "text-embedding-3-small"):
+    return make_cache_key(text, "openai", model, 1536)
+
+
+def test_cache_key_depends_on_text_and_model() -> None:
+    """Test keys differ per text and per model but are stable for identical input."""
+    assert _key("hello") == _key("hello")
+    assert _key("hello") != _key("hello!")
+    assert _key("hello") != _key("hello", model="text-embedding-3-large")
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_lru_eviction_and_counters() -> None:
+    """Test LRU evicts least recently used entries and counters track hits/misses."""
+    cache = EmbeddingCache(max_entries=2)
+    await cache.put_many({_key("a"): [0.1], _key("b"): [0.2]})
+
+    assert await cache.get_many([_key("a")]) == {_key("a"): [0.1]}
+    await cache.put_many({_key("c"): [0.3]})
+
+    found = await cache.get_many([_key("a"), _key("b"), _key("c")])
+    assert set(found) == {_key("a"), _key("c")}
+    assert cache.get_stats() == {
+        "memory_hits": 3,
+        "persistent_hits": 0,
+        "misses": 1,
+        "hit_rate": 0.75,
+        "memory_entries": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_shared_between_caches(db_session: AsyncSession) -> None:
+    """Test entries written by one process-level cache are found by another."""
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    vector = [0.25] * 1536
+
+    writer = EmbeddingCache(max_entries=10, session_factory=session_factory)
+    await writer.put_many({_key("persisted"): vector})
+    await writer.put_many({_key("persisted"): vector})  # duplicate insert is ignored
+
+    reader = EmbeddingCache(max_entries=10, session_factory=session_factory)
+    found = await reader.get_many([_key("persisted"), _key("unknown")])
+
+    assert found[_key("persisted")] == pytest.approx(vector)
+    assert reader.persistent_hits == 1
+    assert reader.misses == 1
+
+    # Promoted into the memory tier
+    await reader.get_many([_key("persisted")])
+    assert reader.memory_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_entries_unused_for_max_age(db_session: AsyncSession) -> None:
+    """Test hits refresh last_used_at so only entries nobody reads are pruned."""
+    session_factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    cache = EmbeddingCache(max_entries=0, session_factory=session_factory)
+    await cache.put_many({_key("read"): [0.1] * 1536, _key("stale"): [0.2] * 1536})
+    await db_session.execute(update(EmbeddingCacheEntry).values(last_used_at=datetime.now(UTC) - timedelta(days=40)))
+    await db_session.commit()
+
+    await cache.get_many([_key("read")])
+    deleted = await cache.prune(timedelta(days=30))
+
+    remaining = (await db_session.execute(select(EmbeddingCacheEntry.content_hash))).scalars().all()
+    assert deleted == 1
+    assert remaining == [_key("read").content_hash]
+    assert await EmbeddingCache(max_entries=0).prune(timedelta(days=30)) == 0
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_failure_falls_back_to_miss() -> None:
+    """Test database errors are treated as misses instead of failing embedding."""
+    session_factory = MagicMock(side_effect=RuntimeError("database down"))
+    cache = EmbeddingCache(max_entries=10, session_factory=session_factory)
+
+    assert await cache.get_many([_key("x")]) == {}
+    assert cache.misses == 1
+
+    # Persistent tier is skipped during backoff
+    await cache.get_many([_key("y")])
+    assert session_factory.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_embedding_uses_cache(openai_provider: LLMProvider) -> None:
+    """Test repeated text is embedded once and served from cache afterwards."""
+    embedding = [0.1] * 1536
+    with (
+        patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
+        patch("app.services.embedding_service.AsyncOpenAI") as mock_openai,
+    ):
+        mock_encryptor_class.return_value.decrypt.return_value = "sk-test-key"
+        mock_client = AsyncMock()
+        mock_client.embeddings.create.return_value = MagicMock(data=[MagicMock(embedding=embedding)])
+        mock_openai.return_value = mock_client
+
+        service = EmbeddingService(openai_provider)
+        service.cache = EmbeddingCache(max_entries=10)
+
+        assert await service.generate_embedding("same text") == embedding
+        assert await service.generate_embedding("same text") == embedding
+
+        mock_client.embeddings.create.assert_awaited_once()
+        assert service.cache.memory_hits == 1
+        assert service.cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_skips_cached_and_duplicate_texts(openai_provider: LLMProvider) -> None:
+    """Test batch generation only sends unique uncached texts to the provider."""
+    cached_vector = [0.9] * 1536
+
+    async def create(**kwargs):
+        return MagicMock(data=[MagicMock(embedding=[0.1] * 1536, index=i) for i in range(len(kwargs["input"]))])
+
+    with (
+        patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
+        patch("app.services.embedding_service.AsyncOpenAI") as mock_openai,
+    ):
+        mock_encryptor_class.return_value.decrypt.return_value = "sk-test-key"
+        mock_client = AsyncMock()
+        mock_client.embeddings.create.side_effect = create
+        mock_openai.return_value = mock_client
+
+        service = EmbeddingService(openai_provider)
+        service.cache = EmbeddingCache(max_entries=10)
+        await service.cache.put_many({service._cache_key("cached"): cached_vector})
+
+        embeddings = await service.generate_embeddings(["new", "cached", "new", "other"])
+
+        assert embeddings[1] == cached_vector
+        assert embeddings[0] == embeddings[2] == [0.1] * 1536
+        mock_client.embeddings.create.assert_awaited_once()
+        assert mock_client.embeddings.create.await_args.kwargs["input"] == ["new", "other"]
@@ -18,7 +18,7 @@ import pytest
 from app.models.atom import Atom
 from app.models.llm_provider import LLMProvider, ProviderType
 from app.models.message import Message
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, chunk_texts_for_requests
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -52,6 +52,18 @@ def mock_embedding() -> list[float]:
     return [0.1] * 1536
 
 
+def _batch_create_side_effect(embedding: list[float]):
+    """Build an embeddings.create side effect returning one item per input text."""
+
+    async def create(**kwargs):
+        inputs = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+        response = MagicMock()
+        response.data = [MagicMock(embedding=embedding, index=i) for i in range(len(inputs))]
+        return response
+
+    return create
+
+
 @pytest.mark.asyncio
 async def test_generate_embedding_openai(openai_provider: LLMProvider, mock_embedding: list[float]) -> None:
     """Test OpenAI embedding generation."""
@@ -253,9 +265,7 @@ async def test_embed_messages_batch(openai_provider: LLMProvider, mock_embedding
         mock_encryptor_class.return_value = mock_encryptor
 
         mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=mock_embedding)]
-        mock_client.embeddings.create.return_value = mock_response
+        mock_client.embeddings.create.side_effect = _batch_create_side_effect(mock_embedding)
         mock_openai.return_value = mock_client
 
         service = EmbeddingService(openai_provider)
@@ -265,6 +275,7 @@ async def test_embed_messages_batch(openai_provider: LLMProvider, mock_embedding
         assert stats["failed"] == 0
         assert stats["skipped"] == 0
         assert mock_session.commit.await_count == 1
+        mock_client.embeddings.create.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -350,9 +361,7 @@ async def test_embed_atoms_batch(openai_provider: LLMProvider, mock_embedding: l
         mock_encryptor_class.return_value = mock_encryptor
 
         mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=mock_embedding)]
-        mock_client.embeddings.create.return_value = mock_response
+        mock_client.embeddings.create.side_effect = _batch_create_side_effect(mock_embedding)
         mock_openai.return_value = mock_client
 
         service = EmbeddingService(openai_provider)
@@ -362,6 +371,125 @@ async def test_embed_atoms_batch(openai_provider: LLMProvider, mock_embedding: l
         assert stats["failed"] == 0
         assert stats["skipped"] == 0
         assert mock_session.commit.await_count == 1
+        mock_client.embeddings.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_openai_chunks_requests(
+    openai_provider: LLMProvider, mock_embedding: list[float]
+) -> None:
+    """Test batch generation packs texts into multi-input requests and preserves order."""
+    with (
+        patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
+        patch("app.services.embedding_service.AsyncOpenAI") as mock_openai,
+        patch("app.services.embedding_service.settings") as mock_settings,
+    ):
+        mock_settings.embedding.embedding_request_max_items = 2
+        mock_settings.embedding.embedding_request_max_tokens = 100_000
+        mock_settings.embedding.embedding_max_concurrency = 2
+        mock_settings.embedding.openai_embedding_dimensions = 1536
+
+        mock_encryptor = MagicMock()
+        mock_encryptor.decrypt.return_value = "sk-test-key"
+        mock_encryptor_class.return_value = mock_encryptor
+
+        async def create(**kwargs):
+            response = MagicMock()
+            # Return items out of order to verify index-based reordering
+            response.data = [
+                MagicMock(embedding=[float(len(text))] * 1536, index=i) for i, text in enumerate(kwargs["input"])
+            ][::-1]
+            return response
+
+        mock_client = AsyncMock()
+        mock_client.embeddings.create.side_effect = create
+        mock_openai.return_value = mock_client
+
+        service = EmbeddingService(openai_provider)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        result = await service.generate_embeddings(texts)
+
+        assert [vector[0] for vector in result] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert mock_client.embeddings.create.await_count == 3
+        assert mock_openai.call_count == 1
+        mock_encryptor.decrypt.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_embed_atoms_batch_fails_only_texts_of_failed_request(
+    openai_provider: LLMProvider, mock_embedding: list[float]
+) -> None:
+    """Test a failed provider request fails its own atoms while other requests' embeddings are kept."""
+    mock_session = AsyncMock(spec=AsyncSession)
+
+    atoms = [
+        Atom(id=i, type="problem", title=f"Problem {i}", content=f"Content {i}", embedding=None) for i in range(1, 6)
+    ]
+
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = atoms
+    mock_session.execute.return_value = mock_result
+
+    with (
+        patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
+        patch("app.services.embedding_service.AsyncOpenAI") as mock_openai,
+        patch("app.services.embedding_service.settings") as mock_settings,
+    ):
+        mock_settings.embedding.embedding_request_max_items = 2
+        mock_settings.embedding.embedding_request_max_tokens = 100_000
+        mock_settings.embedding.embedding_max_concurrency = 2
+        mock_settings.embedding.openai_embedding_dimensions = 1536
+
+        mock_encryptor = MagicMock()
+        mock_encryptor.decrypt.return_value = "sk-test-key"
+        mock_encryptor_class.return_value = mock_encryptor
+
+        succeed = _batch_create_side_effect(mock_embedding)
+
+        async def create(**kwargs):
+            if any("Problem 3" in text for text in kwargs["input"]):
+                raise RuntimeError("provider unavailable")
+            return await succeed(**kwargs)
+
+        mock_client = AsyncMock()
+        mock_client.embeddings.create.side_effect = create
+        mock_openai.return_value = mock_client
+
+        service = EmbeddingService(openai_provider)
+        stats = await service.embed_atoms_batch(mock_session, [1, 2, 3, 4, 5], batch_size=100)
+
+        assert stats == {"success": 3, "failed": 2, "skipped": 0}
+        assert [atom.embedding is not None for atom in atoms] == [True, True, False, False, True]
+        assert mock_session.commit.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_ollama_uses_batch_endpoint(ollama_provider: LLMProvider) -> None:
+    """Test Ollama batch generation calls /api/embed once and pads vectors."""
+    with patch("app.services.embedding_service.httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json = MagicMock(return_value={"embeddings": [[0.2] * 1024, [0.3] * 1024]})
+        mock_response.raise_for_status = MagicMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_client_class.return_value = mock_client
+
+        service = EmbeddingService(ollama_provider)
+        result = await service.generate_embeddings(["first", "second"])
+
+        assert len(result) == 2
+        assert all(len(vector) == 1536 for vector in result)
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args.args[0].endswith("/api/embed")
+        assert mock_client.post.call_args.kwargs["json"]["input"] == ["first", "second"]
+
+
+def test_chunk_texts_for_requests_respects_limits() -> None:
+    """Test request packing honours both item and token limits."""
+    texts = ["x" * 40, "x" * 40, "x" * 40, "x" * 400, "x"]
+
+    assert chunk_texts_for_requests(texts, max_items=2, max_tokens=10_000) == [[0, 1], [2, 3], [4]]
+    assert chunk_texts_for_requests(texts, max_items=10, max_tokens=50) == [[0, 1, 2], [3], [4]]
 
 
 @pytest.mark.asyncio
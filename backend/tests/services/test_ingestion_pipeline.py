@@ -0,0 +1,135 @@
+"""Tests for the streaming ingestion pipeline."""
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+import pytest
+from app.services.ingestion_pipeline import ChatBatch, FloodWaitBudgetExceeded, IngestionPipeline
+from app.services.source_adapters import ConnectionTestResult, MessageCountResult, SourceAdapter
+from telethon.errors import FloodWaitError
+
+
+class FakeAdapter(SourceAdapter):
+    """Adapter yielding ``size`` messages per chat, newest first, with optional FloodWaits."""
+
+    def __init__(self, state: dict[str, Any]):
+        self.state = state
+        self.connections = 0
+        self.connected_fetches = 0
+        self.is_connected = False
+
+    @asynccontextmanager
+    async def connected(self) -> AsyncIterator[None]:
+        self.connections += 1
+        self.is_connected = True
+        try:
+            yield
+        finally:
+            self.is_connected = False
+
+    async def get_message_count(self, chat_id: str, since: datetime | None = None) -> MessageCountResult:
+        return MessageCountResult(count=self.state["size"], is_estimate=False, error=None, source_id=chat_id)
+
+    async def fetch_history(
+        self,
+        chat_id: str,
+        since: datetime | None = None,
+        limit: int | None = None,
+        offset_id: int = 0,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        self.connected_fetches += self.is_connected
+        self.state["active"] += 1
+        self.state["max_active"] = max(self.state["max_active"], self.state["active"])
+        try:
+            start = offset_id - 1 if offset_id else self.state["size"]
+            for count, message_id in enumerate(range(start, 0, -1)):
+                if limit is not None and count >= limit:
+                    return
+                if message_id in self.state["flood_at"].get(chat_id, set()):
+                    self.state["flood_at"][chat_id].discard(message_id)
+                    raise FloodWaitError(request=None, capture=self.state["flood_seconds"])
+                await asyncio.sleep(0)
+                self.state["produced"] += 1
+                yield {"message_id": message_id, "chat": chat_id}
+        finally:
+            self.state["active"] -= 1
+
+    async def test_connection(self) -> ConnectionTestResult:
+        return ConnectionTestResult(success=True, error=None)
+
+
+def _state(size: int, **overrides: Any) -> dict[str, Any]:
+    return {"size": size, "active": 0, "max_active": 0, "produced": 0, "flood_at": {}, "flood_seconds": 0} | overrides
+
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_chats_concurrently_with_bounded_buffer() -> None:
+    """Test every message is written once while at most a bounded number is in flight."""
+    state = _state(250)
+    written: list[ChatBatch] = []
+    in_flight: list[int] = []
+
+    async def write_batch(batch: ChatBatch) -> None:
+        written.append(batch)
+        in_flight.append(state["produced"] - sum(len(b.messages) for b in written))
+        await asyncio.sleep(0.001)
+
+    adapter = FakeAdapter(state)
+    pipeline = IngestionPipeline(adapter, batch_size=20, max_concurrent_chats=2, queue_batches=2)
+    await pipeline.run(["a", "b", "c"], write_batch)
+
+    ids = sorted((batch.chat_id, message["message_id"]) for batch in written for message in batch.messages)
+    assert ids == sorted((chat, i) for chat in "abc" for i in range(1, 251))
+    assert {batch.chat_index for batch in written if batch.chat_id == "c"} == {3}
+    assert state["max_active"] == 2
+    # All chats share one connection
+    assert adapter.connections == 1
+    assert adapter.connected_fetches == 3
+    # Queued batches plus one partial batch per producer
+    assert max(in_flight) <= (2 + 2) * 20
+
+
+@pytest.mark.asyncio
+async def test_pipeline_resumes_after_flood_wait_within_budget() -> None:
+    """Test a FloodWait resumes the chat from the last message without gaps or duplicates."""
+    state = _state(50, flood_at={"a": {30}}, flood_seconds=0)
+    written: list[int] = []
+
+    async def write_batch(batch: ChatBatch) -> None:
+        written.extend(message["message_id"] for message in batch.messages)
+
+    await IngestionPipeline(FakeAdapter(state), batch_size=8).run(["a"], write_batch, limit=40)
+
+    assert written == list(range(50, 10, -1))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fails_when_flood_wait_exceeds_budget() -> None:
+    """Test rate-limit waits beyond the budget stop the whole run."""
+    state = _state(50, flood_at={"b": {45}}, flood_seconds=30)
+
+    async def write_batch(batch: ChatBatch) -> None:
+        await asyncio.sleep(0)
+
+    pipeline = IngestionPipeline(FakeAdapter(state), batch_size=5, flood_wait_budget=10)
+    with pytest.raises(FloodWaitBudgetExceeded):
+        await pipeline.run(["a", "b"], write_batch)
+    assert state["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_writer_errors() -> None:
+    """Test a failing writer cancels producers blocked on the full queue."""
+    state = _state(1000)
+
+    async def write_batch(batch: ChatBatch) -> None:
+        raise RuntimeError("database down")
+
+    pipeline = IngestionPipeline(FakeAdapter(state), batch_size=10, queue_batches=1)
+    with pytest.raises(RuntimeError, match="database down"):
+        await asyncio.wait_for(pipeline.run(["a", "b"], write_batch), timeout=5)
+    assert state["active"] == 0
+    assert state["produced"] < 100
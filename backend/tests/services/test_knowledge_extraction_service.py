@@ -445,7 +445,7 @@ async def test_save_atoms_creates_with_topic_links(agent_config, db_session: Asy
     ]
 
     service = KnowledgeExtractionService(agent_config=agent_config, provider=MagicMock())
-    saved_atoms, version_ids = await service.save_atoms(extracted_atoms, topic_map, db_session)
+    saved_atoms, version_ids, _ = await service.save_atoms(extracted_atoms, topic_map, db_session)
 
     assert len(saved_atoms) == 1
     assert saved_atoms[0].type == "problem"
@@ -493,7 +493,7 @@ async def test_save_atoms_filters_low_confidence(agent_config, db_session: Async
     ]
 
     service = KnowledgeExtractionService(agent_config=agent_config, provider=MagicMock())
-    saved_atoms, version_ids = await service.save_atoms(
+    saved_atoms, version_ids, _ = await service.save_atoms(
         extracted_atoms, topic_map, db_session, confidence_threshold=0.7
     )
 
@@ -521,7 +521,7 @@ async def test_save_atoms_skips_unknown_topics(agent_config, db_session: AsyncSe
     ]
 
     service = KnowledgeExtractionService(agent_config=agent_config, provider=MagicMock())
-    saved_atoms, version_ids = await service.save_atoms(extracted_atoms, topic_map, db_session)
+    saved_atoms, version_ids, _ = await service.save_atoms(extracted_atoms, topic_map, db_session)
 
     assert len(saved_atoms) == 0
     assert len(version_ids) == 0
@@ -564,7 +564,7 @@ async def test_save_atoms_creates_version_for_existing(agent_config, db_session:
     ]
 
     service = KnowledgeExtractionService(agent_config=agent_config, provider=MagicMock())
-    saved_atoms, version_ids = await service.save_atoms(extracted_atoms, topic_map, db_session, created_by="test_user")
+    saved_atoms, version_ids, _ = await service.save_atoms(extracted_atoms, topic_map, db_session, created_by="test_user")
 
     assert len(saved_atoms) == 1
     assert saved_atoms[0].id == existing_atom.id
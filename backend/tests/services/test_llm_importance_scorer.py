@@ -0,0 +1,99 @@
+"""Tests for batched LLM importance scoring."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.llm.application.agent_registry import LLMAgentRegistry
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.user import User
+from app.services.llm_importance_scorer import (
+    BatchScoringAnalysis,
+    LLMImportanceScorer,
+    ScoredMessage,
+    ScorerSettings,
+    ScoringAnalysis,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _analysis(score: float) -> dict:
+    return {"importance_score": score, "classification": "signal", "reasoning": "r", "factors": {"urgency": score}}
+
+
+@pytest.fixture
+async def messages(db_session: AsyncSession) -> list[Message]:
+    """Create five unscored messages."""
+    user = User(first_name="Score", last_name="Me", full_name="Score Me")
+    source = Source(name="Scoring Source", type="telegram")
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    rows = [
+        Message(
+            external_message_id=f"score_{i}",
+            content=f"Message {i}",
+            sent_at=datetime.now(UTC),
+            source_id=source.id,
+            author_id=user.id,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return rows
+
+
+def _scorer(execute_prompt: AsyncMock, batch_size: int = 3) -> LLMImportanceScorer:
+    llm_service = MagicMock(registry=LLMAgentRegistry(), execute_prompt=execute_prompt)
+    scorer = LLMImportanceScorer(llm_service)
+    scorer.get_settings = AsyncMock(return_value=ScorerSettings(None, "model", 0.0, batch_size))  # type: ignore[method-assign]
+    return scorer
+
+
+@pytest.mark.asyncio
+async def test_score_messages_batches_and_falls_back_for_missing_ids(
+    db_session: AsyncSession, messages: list[Message]
+) -> None:
+    """Test one call per batch, with single-message calls only for ids missing from a response."""
+
+    async def execute_prompt(session, config, prompt, provider_id=None):
+        if config.output_type is ScoringAnalysis:
+            return SimpleNamespace(output=ScoringAnalysis(**_analysis(0.1)))
+        batch = [m for m in messages if str(m.id) in prompt]
+        results = [ScoredMessage(message_id=str(m.id), **_analysis(0.9)) for m in batch if m is not messages[1]]
+        results.append(ScoredMessage(message_id="not-a-real-id", **_analysis(0.5)))
+        return SimpleNamespace(output=BatchScoringAnalysis(results=results))
+
+    mock = AsyncMock(side_effect=execute_prompt)
+
+    results = await _scorer(mock).score_messages(messages, db_session)
+
+    assert mock.await_count == 3  # two batches (3 + 2) and one fallback
+    assert set(results) == {m.id for m in messages}
+    assert results[messages[1].id]["importance_score"] == 0.1
+    assert all(results[m.id]["importance_score"] == 0.9 for m in messages if m is not messages[1])
+    batch_prompt = mock.await_args_list[0].kwargs["prompt"]
+    assert "Author: Score Me" in batch_prompt
+    assert batch_prompt.count("ID: ") == 3
+
+
+@pytest.mark.asyncio
+async def test_score_messages_falls_back_when_batch_call_fails(
+    db_session: AsyncSession, messages: list[Message]
+) -> None:
+    """Test a failed batch call is retried per message and per-message failures are left out."""
+
+    async def execute_prompt(session, config, prompt, provider_id=None):
+        if config.output_type is BatchScoringAnalysis or "Message 4" in prompt:
+            raise RuntimeError("LLM unavailable")
+        return SimpleNamespace(output=ScoringAnalysis(**_analysis(0.4)))
+
+    mock = AsyncMock(side_effect=execute_prompt)
+
+    results = await _scorer(mock, batch_size=5).score_messages(messages, db_session)
+
+    assert mock.await_count == 6
+    assert set(results) == {m.id for m in messages[:4]}
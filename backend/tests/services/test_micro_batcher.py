@@ -0,0 +1,52 @@
+"""Tests for the micro-batcher coalescing concurrent submissions."""
+
+import asyncio
+
+import pytest
+from app.services.micro_batcher import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_submissions_within_window_share_one_flush() -> None:
+    """Test items submitted together are flushed once, in order, with per-item results."""
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(flush, max_items=100, max_delay=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_full_batches_flush_without_waiting() -> None:
+    """Test reaching max_items flushes immediately instead of waiting for the window."""
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return items
+
+    batcher = MicroBatcher(flush, max_items=3, max_delay=60)
+    results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(6))), timeout=1)
+
+    assert results == list(range(6))
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    assert batcher.get_stats() == {"batches": 2, "items": 6, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_flush_errors_reach_every_caller() -> None:
+    """Test a failing flush raises in all callers of the batch."""
+
+    async def flush(items: list[int]) -> list[int]:
+        raise RuntimeError("database down")
+
+    batcher = MicroBatcher(flush, max_items=10, max_delay=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -1,10 +1,15 @@
 """Tests for RuleEngineService automation rule evaluation."""
 
 import json
+import uuid
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from app.models.atom_version import AtomVersion
 from app.models.automation_rule import AutomationRule, LogicOperator, RuleAction
+from app.models.topic_version import TopicVersion
+from app.services.rule_compiler import compile_condition, compile_field_getter, rule_set_cache
 from app.services.rule_engine_service import RuleEngineService
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -368,38 +373,42 @@ class TestRuleEvaluation:
         assert rule_id is None
 
 
+def _matches(operator: str, actual: Any, expected: Any) -> bool:
+    return compile_condition({"field": "value", "operator": operator, "value": expected})({"value": actual})
+
+
 class TestFieldExtraction:
     """Test field extraction logic."""
 
-    def test_extract_field_value_nested(self, rule_engine_service: RuleEngineService):
+    def test_extract_field_value_nested(self):
         """Test nested field extraction."""
         version_data = {"topic": {"name": "Test"}}
 
-        result = rule_engine_service._extract_field_value(version_data, "topic.name")
+        result = compile_field_getter("topic.name")(version_data)
 
         assert result == "Test"
 
-    def test_extract_field_value_simple(self, rule_engine_service: RuleEngineService):
+    def test_extract_field_value_simple(self):
         """Test simple field extraction."""
         version_data = {"confidence": 85}
 
-        result = rule_engine_service._extract_field_value(version_data, "confidence")
+        result = compile_field_getter("confidence")(version_data)
 
         assert result == 85
 
-    def test_extract_field_value_missing(self, rule_engine_service: RuleEngineService):
+    def test_extract_field_value_missing(self):
         """Test extraction of missing field."""
         version_data = {"confidence": 85}
 
-        result = rule_engine_service._extract_field_value(version_data, "missing")
+        result = compile_field_getter("missing")(version_data)
 
         assert result is None
 
-    def test_extract_field_value_deep_nested(self, rule_engine_service: RuleEngineService):
+    def test_extract_field_value_deep_nested(self):
         """Test deeply nested field extraction."""
         version_data = {"level1": {"level2": {"level3": "deep"}}}
 
-        result = rule_engine_service._extract_field_value(version_data, "level1.level2.level3")
+        result = compile_field_getter("level1.level2.level3")(version_data)
 
         assert result == "deep"
 
@@ -407,59 +416,59 @@ class TestFieldExtraction:
 class TestOperators:
     """Test comparison operators."""
 
-    def test_operator_gte(self, rule_engine_service: RuleEngineService):
+    def test_operator_gte(self):
         """Test >= operator."""
-        assert rule_engine_service._apply_operator("gte", 95, 90) is True
-        assert rule_engine_service._apply_operator("gte", 90, 90) is True
-        assert rule_engine_service._apply_operator("gte", 85, 90) is False
+        assert _matches("gte", 95, 90) is True
+        assert _matches("gte", 90, 90) is True
+        assert _matches("gte", 85, 90) is False
 
-    def test_operator_lte(self, rule_engine_service: RuleEngineService):
+    def test_operator_lte(self):
         """Test <= operator."""
-        assert rule_engine_service._apply_operator("lte", 45, 50) is True
-        assert rule_engine_service._apply_operator("lte", 50, 50) is True
-        assert rule_engine_service._apply_operator("lte", 55, 50) is False
+        assert _matches("lte", 45, 50) is True
+        assert _matches("lte", 50, 50) is True
+        assert _matches("lte", 55, 50) is False
 
-    def test_operator_gt(self, rule_engine_service: RuleEngineService):
+    def test_operator_gt(self):
         """Test > operator."""
-        assert rule_engine_service._apply_operator("gt", 95, 90) is True
-        assert rule_engine_service._apply_operator("gt", 90, 90) is False
-        assert rule_engine_service._apply_operator("gt", 85, 90) is False
+        assert _matches("gt", 95, 90) is True
+        assert _matches("gt", 90, 90) is False
+        assert _matches("gt", 85, 90) is False
 
-    def test_operator_lt(self, rule_engine_service: RuleEngineService):
+    def test_operator_lt(self):
         """Test < operator."""
-        assert rule_engine_service._apply_operator("lt", 45, 50) is True
-        assert rule_engine_service._apply_operator("lt", 50, 50) is False
-        assert rule_engine_service._apply_operator("lt", 55, 50) is False
+        assert _matches("lt", 45, 50) is True
+        assert _matches("lt", 50, 50) is False
+        assert _matches("lt", 55, 50) is False
 
-    def test_operator_eq(self, rule_engine_service: RuleEngineService):
+    def test_operator_eq(self):
         """Test == operator."""
-        assert rule_engine_service._apply_operator("eq", 50, 50) is True
-        assert rule_engine_service._apply_operator("eq", "test", "test") is True
-        assert rule_engine_service._apply_operator("eq", 50, 51) is False
+        assert _matches("eq", 50, 50) is True
+        assert _matches("eq", "test", "test") is True
+        assert _matches("eq", 50, 51) is False
 
-    def test_operator_neq(self, rule_engine_service: RuleEngineService):
+    def test_operator_neq(self):
         """Test != operator."""
-        assert rule_engine_service._apply_operator("neq", 50, 51) is True
-        assert rule_engine_service._apply_operator("neq", "test", "other") is True
-        assert rule_engine_service._apply_operator("neq", 50, 50) is False
+        assert _matches("neq", 50, 51) is True
+        assert _matches("neq", "test", "other") is True
+        assert _matches("neq", 50, 50) is False
 
-    def test_operator_contains(self, rule_engine_service: RuleEngineService):
+    def test_operator_contains(self):
         """Test contains operator."""
-        assert rule_engine_service._apply_operator("contains", "This is urgent", "urgent") is True
-        assert rule_engine_service._apply_operator("contains", "This is URGENT", "urgent") is True
-        assert rule_engine_service._apply_operator("contains", "This is normal", "urgent") is False
+        assert _matches("contains", "This is urgent", "urgent") is True
+        assert _matches("contains", "This is URGENT", "urgent") is True
+        assert _matches("contains", "This is normal", "urgent") is False
 
-    def test_operator_starts_with(self, rule_engine_service: RuleEngineService):
+    def test_operator_starts_with(self):
         """Test starts_with operator."""
-        assert rule_engine_service._apply_operator("starts_with", "Urgent: Fix bug", "Urgent") is True
-        assert rule_engine_service._apply_operator("starts_with", "urgent: Fix bug", "Urgent") is True
-        assert rule_engine_service._apply_operator("starts_with", "Fix urgent bug", "Urgent") is False
+        assert _matches("starts_with", "Urgent: Fix bug", "Urgent") is True
+        assert _matches("starts_with", "urgent: Fix bug", "Urgent") is True
+        assert _matches("starts_with", "Fix urgent bug", "Urgent") is False
 
-    def test_operator_ends_with(self, rule_engine_service: RuleEngineService):
+    def test_operator_ends_with(self):
         """Test ends_with operator."""
-        assert rule_engine_service._apply_operator("ends_with", "Issue is urgent", "urgent") is True
-        assert rule_engine_service._apply_operator("ends_with", "Issue is URGENT", "urgent") is True
-        assert rule_engine_service._apply_operator("ends_with", "Urgent issue", "urgent") is False
+        assert _matches("ends_with", "Issue is urgent", "urgent") is True
+        assert _matches("ends_with", "Issue is URGENT", "urgent") is True
+        assert _matches("ends_with", "Urgent issue", "urgent") is False
 
 
 class TestRuleTriggerRecording:
@@ -496,3 +505,82 @@ class TestRuleTriggerRecording:
 
         await db_session.refresh(sample_rule_approve)
         assert sample_rule_approve.last_triggered is not None
+
+
+class TestCompiledRuleSet:
+    """Test compiled rule caching and batch evaluation."""
+
+    def test_compile_condition_rejects_uncomparable_values(self):
+        """Values that cannot be compared or are missing never match."""
+        assert _matches("gt", "n/a", 50) is False
+        assert _matches("lt", "45", 50) is True
+        assert compile_condition({"field": "value", "operator": "gte", "value": 1})({}) is False
+        assert compile_condition({"field": "a.b", "operator": "gte", "value": 1})({"a": {"b": 2}}) is True
+        assert compile_condition({"field": "a.b", "operator": "gte", "value": 1})({"a": 2}) is False
+        assert compile_condition({"field": "a", "operator": "gte", "value": "x"})({"a": 2}) is False
+
+    @pytest.mark.asyncio
+    async def test_rule_set_compiled_once(
+        self,
+        db_session: AsyncSession,
+        rule_engine_service: RuleEngineService,
+        sample_rule_approve: AutomationRule,
+    ):
+        """Repeated evaluations reuse the cached rule set."""
+        misses = rule_set_cache.misses
+
+        for _ in range(3):
+            await rule_engine_service.evaluate_version(db_session, {"confidence": 10}, "topic", 1, 1)
+
+        assert rule_set_cache.misses == misses + 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_picks_up_rule_changes(
+        self,
+        db_session: AsyncSession,
+        rule_engine_service: RuleEngineService,
+        sample_rule_approve: AutomationRule,
+    ):
+        """A changed rule is seen only after invalidation."""
+        await rule_engine_service.evaluate_version(db_session, {"confidence": 95}, "topic", 1, 1)
+        sample_rule_approve.enabled = False
+        await db_session.commit()
+
+        action, _ = await rule_engine_service.evaluate_version(db_session, {"confidence": 95}, "topic", 1, 1)
+        assert action == RuleAction.approve
+
+        rule_set_cache.invalidate()
+        action, _ = await rule_engine_service.evaluate_version(db_session, {"confidence": 95}, "topic", 1, 1)
+        assert action is None
+
+    @pytest.mark.asyncio
+    async def test_evaluate_versions_batch(
+        self,
+        db_session: AsyncSession,
+        rule_engine_service: RuleEngineService,
+        sample_rule_approve: AutomationRule,
+        sample_rule_reject: AutomationRule,
+    ):
+        """Batch evaluation returns per-version results and records triggers per rule."""
+        topic_id, atom_id = uuid.uuid4(), uuid.uuid4()
+        versions = [
+            TopicVersion(id=1, topic_id=topic_id, version=1, data={"confidence": 95}),
+            TopicVersion(id=2, topic_id=topic_id, version=2, data={"confidence": 70}),
+            AtomVersion(id=3, atom_id=atom_id, version=1, data={"confidence": 20}),
+            AtomVersion(id=4, atom_id=atom_id, version=2, data={"confidence": 99}),
+        ]
+
+        results = await rule_engine_service.evaluate_versions(db_session, versions)
+
+        assert results == [
+            (RuleAction.approve, sample_rule_approve.id),
+            (None, None),
+            (RuleAction.reject, sample_rule_reject.id),
+            (RuleAction.approve, sample_rule_approve.id),
+        ]
+        await db_session.refresh(sample_rule_approve)
+        await db_session.refresh(sample_rule_reject)
+        assert sample_rule_approve.triggered_count == 2
+        assert sample_rule_reject.triggered_count == 1
+        broadcast = RuleEngineService._broadcast_rule_triggered
+        assert [call.args[1:] for call in broadcast.call_args_list] == [(topic_id, 1), (atom_id, 3), (atom_id, 4)]
@@ -0,0 +1,168 @@
+"""Tests for SQL-translated rule impact preview."""
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from app.models.atom import Atom
+from app.models.atom_version import AtomVersion
+from app.models.automation_rule import RuleCondition
+from app.models.topic import Topic
+from app.models.topic_version import TopicVersion
+from app.services import rule_preview
+from app.services.rule_compiler import compile_condition
+from app.services.rule_preview import preview_rule
+from sqlalchemy.ext.asyncio import AsyncSession
+
+VERSION_DATA: list[dict[str, Any]] = [
+    {"confidence": 95, "similarity": 90, "topic": {"name": "Urgent: fix prod"}},
+    {"confidence": 90.0, "similarity": 80, "topic": {"name": "Weekly sync"}},
+    {"confidence": "92", "similarity": "n/a", "topic": {"name": "urgent review"}},
+    {"confidence": " 1e2 ", "topic": "flat"},
+    {"confidence": True, "topic": {"name": None}},
+    {"confidence": None, "similarity": [1, 2], "topic": {"name": "Термінове ПИТАННЯ"}},
+    {"confidence": {"value": 99}, "topic": {"name": 100}},
+    {"confidence": 40, "flag": False, "topic": {"name": "50% done_now"}},
+    {},
+]
+
+CASES: list[tuple[list[dict[str, Any]], str]] = [
+    ([{"field": "confidence", "operator": "gte", "value": 90}], "AND"),
+    ([{"field": "confidence", "operator": "lt", "value": "50"}], "AND"),
+    (
+        [
+            {"field": "confidence", "operator": "gte", "value": 90},
+            {"field": "similarity", "operator": "gte", "value": 85},
+        ],
+        "AND",
+    ),
+    (
+        [
+            {"field": "confidence", "operator": "lte", "value": 1},
+            {"field": "similarity", "operator": "gt", "value": 85},
+        ],
+        "OR",
+    ),
+    ([{"field": "confidence", "operator": "eq", "value": 1}], "AND"),
+    ([{"field": "confidence", "operator": "eq", "value": "92"}], "AND"),
+    ([{"field": "confidence", "operator": "neq", "value": 95}], "AND"),
+    ([{"field": "flag", "operator": "eq", "value": 0}], "AND"),
+    ([{"field": "topic.name", "operator": "contains", "value": "URGENT"}], "AND"),
+    ([{"field": "topic.name", "operator": "starts_with", "value": "urgent"}], "AND"),
+    ([{"field": "topic.name", "operator": "ends_with", "value": "00"}], "AND"),
+    ([{"field": "topic.name", "operator": "contains", "value": "%"}], "AND"),
+    ([{"field": "topic.name", "operator": "contains", "value": "_"}], "AND"),
+    ([{"field": "topic.name", "operator": "contains", "value": "термінове"}], "AND"),
+    (
+        [
+            {"field": "topic.name", "operator": "contains", "value": "sync"},
+            {"field": "confidence", "operator": "gt", "value": "x"},
+        ],
+        "OR",
+    ),
+    ([{"field": "flag", "operator": "contains", "value": "fal"}], "AND"),
+    ([{"field": "similarity.0", "operator": "eq", "value": 1}], "AND"),
+]
+
+
+def python_matches(conditions: list[dict[str, Any]], logic_operator: str, data: dict[str, Any]) -> bool:
+    """Reference semantics: the rule engine's compiled predicates."""
+    results = [compile_condition(condition)(data) for condition in conditions]
+    return all(results) if logic_operator == "AND" else any(results)
+
+
+@pytest.fixture
+async def pending_versions(db_session: AsyncSession) -> dict[tuple[str, int], dict[str, Any]]:
+    """Pending topic and atom versions with mixed JSON value types, plus one approved version."""
+    topic = Topic(name="Preview topic", description="Topic")
+    atom = Atom(type="problem", title="Preview atom", content="Atom")
+    db_session.add_all([topic, atom])
+    await db_session.flush()
+
+    versions: list[TopicVersion | AtomVersion] = []
+    for index, data in enumerate(VERSION_DATA):
+        versions.append(TopicVersion(topic_id=topic.id, version=index + 1, data=data))
+        versions.append(AtomVersion(atom_id=atom.id, version=index + 1, data=data))
+    versions.append(TopicVersion(topic_id=topic.id, version=99, data={"confidence": 100}, approved=True))
+    db_session.add_all(versions)
+    await db_session.commit()
+
+    return {
+        ("topic" if isinstance(version, TopicVersion) else "atom", version.id): version.data  # type: ignore[misc]
+        for version in versions
+        if not version.approved
+    }
+
+
+class TestRulePreview:
+    """Preview counts must equal the rule engine's evaluation of every pending version."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("conditions,logic_operator", CASES)
+    async def test_preview_matches_rule_engine(
+        self,
+        db_session: AsyncSession,
+        pending_versions: dict[tuple[str, int], dict[str, Any]],
+        conditions: list[dict[str, Any]],
+        logic_operator: str,
+    ):
+        """SQL translation plus Python fallback agrees with Python-only evaluation."""
+        expected = {key for key, data in pending_versions.items() if python_matches(conditions, logic_operator, data)}
+
+        preview = await preview_rule(
+            db_session, [RuleCondition.model_validate(c) for c in conditions], logic_operator, sample_size=100
+        )
+
+        assert preview.affected_count == len(expected)
+        assert {(sample["entity_type"], sample["id"]) for sample in preview.sample_versions} == expected
+
+    @pytest.mark.asyncio
+    async def test_translated_conditions_skip_python(
+        self,
+        db_session: AsyncSession,
+        pending_versions: dict[tuple[str, int], dict[str, Any]],
+    ):
+        """Rows decided in SQL are never fetched for Python evaluation."""
+        conditions = [RuleCondition(field="flag", operator="eq", value=0)]
+
+        with patch.object(rule_preview, "_evaluate_batch", wraps=rule_preview._evaluate_batch) as evaluate_batch:
+            preview = await preview_rule(db_session, conditions, "AND")
+
+        assert preview.affected_count == 2
+        evaluate_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sample_size_limits_samples_not_count(
+        self,
+        db_session: AsyncSession,
+        pending_versions: dict[tuple[str, int], dict[str, Any]],
+    ):
+        """The count covers all matches; samples are capped."""
+        conditions = [RuleCondition(field="confidence", operator="gte", value=0)]
+
+        preview = await preview_rule(db_session, conditions, "AND", sample_size=3)
+
+        assert preview.affected_count == 12
+        assert len(preview.sample_versions) == 3
+        assert all(isinstance(sample["entity_id"], str) for sample in preview.sample_versions)
+
+    @pytest.mark.asyncio
+    async def test_no_pending_versions(self, db_session: AsyncSession):
+        """Empty tables yield an empty preview."""
+        preview = await preview_rule(db_session, [RuleCondition(field="confidence", operator="gte", value=1)], "AND")
+
+        assert preview.affected_count == 0
+        assert preview.sample_versions == []
+
+    def test_untranslatable_conditions(self):
+        """Numeric path segments, non-ASCII patterns and non-finite thresholds fall back to Python."""
+        data = TopicVersion.__table__.c.data  # type: ignore[attr-defined]
+
+        def translate(field: str, operator: str, value: Any) -> Any:
+            condition = RuleCondition(field=field, operator=operator, value=value)
+            return rule_preview.translate_condition("sqlite", data, condition)
+
+        assert translate("items.0", "eq", 1) is None
+        assert translate("name", "contains", "Ї") is None
+        assert translate("confidence", "gte", "inf") is None
+        assert translate("confidence", "gte", 90) is not None
@@ -0,0 +1,113 @@
+"""Tests for batched semantic deduplication of extracted topics and atoms.
+
+Vector search is mocked (SQLite has no pgvector); the tests check that the
+batch APIs make one embedding call and one neighbour query, and that atoms and
+topics created earlier in the batch are matched like the sequential versions
+would have found them in the database.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.models import Atom, AtomCreate, Topic, TopicCreate
+from app.models.atom_version import AtomVersion
+from app.services.atom_crud import AtomCRUD, DeduplicationAction
+from app.services.semantic_search_service import vector_similarity
+from app.services.topic_crud import TopicCRUD
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DIMENSIONS = 1536
+
+
+def _vector(**components: float) -> list[float]:
+    """Vector with the given components set (``e0=1.0`` sets index 0)."""
+    vector = [0.0] * DIMENSIONS
+    for name, value in components.items():
+        vector[int(name[1:])] = value
+    return vector
+
+
+def test_vector_similarity_matches_sql_scale() -> None:
+    """Test similarity uses 1 - cosine_distance / 2 like the pgvector queries."""
+    assert vector_similarity(_vector(e0=1.0), _vector(e0=2.0)) == pytest.approx(1.0)
+    assert vector_similarity(_vector(e0=1.0), _vector(e1=1.0)) == pytest.approx(0.5)
+    assert vector_similarity(_vector(e0=1.0), _vector(e0=0.8, e1=0.6)) == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_create_many_with_dedup_matches_db_and_batch_atoms(db_session: AsyncSession) -> None:
+    """Test thresholds apply to database neighbours and to atoms created earlier in the batch."""
+    existing = Atom(type="problem", title="Existing", content="Known problem", confidence=0.9)
+    db_session.add(existing)
+    await db_session.commit()
+
+    embeddings = [_vector(e1=1.0), _vector(e2=1.0), _vector(e2=1.0), _vector(e2=0.8, e3=0.6)]
+    embedding_service = MagicMock()
+    embedding_service.generate_embeddings = AsyncMock(return_value=embeddings)
+    search_service = MagicMock()
+    search_service.search_by_vectors = AsyncMock(return_value=[[{"id": existing.id, "similarity": 0.97}], [], [], []])
+
+    atoms_data = [
+        AtomCreate(type="problem", title=f"Atom {i}", content=f"Content {i}", confidence=0.9) for i in range(4)
+    ]
+    results = await AtomCRUD(db_session).create_many_with_dedup(atoms_data, embedding_service, search_service)
+
+    assert [result.action for result in results] == [
+        DeduplicationAction.CREATED_VERSION,
+        DeduplicationAction.CREATED_NEW,
+        DeduplicationAction.CREATED_VERSION,
+        DeduplicationAction.CREATED_SIMILAR,
+    ]
+    first_new = results[1].atom
+    assert results[0].similar_atom_id == existing.id
+    assert results[2].atom.id == first_new.id
+    assert str(results[3].similar_atom_id) == first_new.id
+    assert results[3].atom.meta["similar_to"] == first_new.id
+    assert results[3].similarity_score == pytest.approx(0.9)
+    embedding_service.generate_embeddings.assert_awaited_once()
+    search_service.search_by_vectors.assert_awaited_once()
+
+    atoms = (await db_session.execute(select(Atom))).scalars().all()
+    assert len(atoms) == 3
+    versions = (await db_session.execute(select(AtomVersion))).scalars().all()
+    assert sorted(str(version.atom_id) for version in versions) == sorted([str(existing.id), first_new.id])
+
+
+@pytest.mark.asyncio
+async def test_find_or_create_many_merges_into_db_and_batch_topics(db_session: AsyncSession) -> None:
+    """Test topics merge into existing ones and into topics created earlier in the batch."""
+    existing = Topic(name="Backend", description="APIs", icon="ServerIcon", color="#000000")
+    db_session.add(existing)
+    await db_session.commit()
+
+    vectors = {
+        "Backend services REST": _vector(e1=1.0),
+        "Mobile iOS": _vector(e2=1.0),
+        "Mobile\n\niOS": _vector(e3=1.0),
+        "Mobile apps iPhone": _vector(e3=0.9, e4=0.1),
+    }
+    embedding_service = MagicMock()
+    embedding_service.generate_embeddings = AsyncMock(
+        side_effect=lambda texts: [vectors.get(text, _vector(e5=1.0)) for text in texts]
+    )
+    search_service = MagicMock()
+    search_service.search_by_vectors = AsyncMock(
+        return_value=[[{"id": existing.id, "name": existing.name, "similarity": 0.9}], [], []]
+    )
+
+    topics_data = [
+        TopicCreate(name="Backend services", description="REST"),
+        TopicCreate(name="Mobile", description="iOS"),
+        TopicCreate(name="Mobile apps", description="iPhone"),
+    ]
+    results = await TopicCRUD(db_session).find_or_create_many(topics_data, embedding_service, search_service)
+
+    assert [result.was_merged for result in results] == [True, False, True]
+    assert results[0].topic.id == existing.id
+    assert results[2].topic.id == results[1].topic.id
+    assert results[2].matched_topic_name == "Mobile"
+    embedding_service.generate_embeddings.assert_awaited_once()
+
+    topics = (await db_session.execute(select(Topic))).scalars().all()
+    assert len(topics) == 2
@@ -16,15 +16,18 @@ Tests cover:
 """
 
 from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from app.config.ai_config import ai_config
 from app.models.atom import Atom
 from app.models.llm_provider import LLMProvider, ProviderType
 from app.models.message import Message
 from app.services.embedding_service import EmbeddingService
 from app.services.semantic_search_service import SemanticSearchService
+from app.services.vector_query_builder import VectorQueryBuilder
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -587,3 +590,133 @@ async def test_find_similar_atoms_empty_results(
 
     assert len(results) == 0
     mock_session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_vector_connection_sets_ef_search(mock_session: AsyncSession) -> None:
+    """Test ef_search is applied per transaction and never below the requested limit."""
+    driver_conn = AsyncMock()
+    raw_conn = MagicMock(driver_connection=driver_conn)
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = raw_conn
+    mock_session.connection.return_value = connection
+
+    search_service = SemanticSearchService(ef_search=100)
+
+    def last_setting() -> dict[str, Any]:
+        return mock_session.execute.await_args.args[0].compile().params
+
+    with patch.object(ai_config.vector_search, "hnsw_iterative_scan", "off"):
+        assert await search_service.get_vector_connection(mock_session, limit=10) is driver_conn
+        assert last_setting() == {"value": "100"}
+
+        await search_service.get_vector_connection(mock_session, limit=250)
+        assert last_setting() == {"value": "250"}
+
+    # Settings run through the session so they land in its transaction, not on the raw connection
+    driver_conn.execute.assert_not_awaited()
+
+
+def test_ef_search_statement_validation() -> None:
+    """Test ef_search statement rejects out-of-range values."""
+    statement = VectorQueryBuilder.build_ef_search_statement(40)
+    assert "set_config('hnsw.ef_search', :value, true)" in statement.text
+    assert statement.compile().params == {"value": "40"}
+
+    with pytest.raises(ValueError, match="hnsw.ef_search"):
+        VectorQueryBuilder.build_ef_search_statement(0)
+
+
+def test_build_similarity_query_top_k_applies_threshold_after_index_scan() -> None:
+    """Test top-k query orders by distance only and filters candidates afterwards."""
+    sql = VectorQueryBuilder.build_similarity_query("atoms a", select_clause="a.*", positional=True)
+
+    inner, outer = sql.split(")\n", 1)[0], sql.split("LIMIT $2", 1)[1]
+    assert "ORDER BY a.embedding <=> $1::vector" in inner
+    assert ">= $3" not in inner
+    assert "ranked.similarity >= $3" in outer
+    assert "candidate_count" in outer
+    assert outer.rstrip().endswith("LIMIT $4")
+
+
+def test_build_similarity_query_positional_requires_top_k() -> None:
+    """Test legacy filter mode keeps named parameters only."""
+    sql = VectorQueryBuilder.build_similarity_query("messages m", mode="filter")
+    assert "(1 - (m.embedding <=> :query_vector::vector) / 2) >= :threshold" in sql
+
+    with pytest.raises(ValueError, match="top_k"):
+        VectorQueryBuilder.build_similarity_query("messages m", mode="filter", positional=True)
+
+
+@pytest.mark.asyncio
+async def test_search_top_k_overfetches_when_filters_drop_candidates(mock_session: AsyncSession) -> None:
+    """Test candidate limit grows when the index scan returns fewer rows than requested."""
+    driver_conn = AsyncMock()
+    driver_conn.fetch.side_effect = [
+        [{"id": 1, "similarity": 0.9, "candidate_count": 1}],
+        [
+            {"id": 1, "similarity": 0.9, "candidate_count": 3},
+            {"id": 2, "similarity": 0.8, "candidate_count": 3},
+            {"id": 3, "similarity": 0.75, "candidate_count": 3},
+        ],
+    ]
+    search_service = SemanticSearchService()
+
+    with patch.object(search_service, "get_vector_connection", AsyncMock(return_value=driver_conn)):
+        rows = await search_service._search_top_k(mock_session, "atoms a", "[0.1]", limit=3, threshold=0.7)
+
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    assert all("candidate_count" not in row for row in rows)
+    first_limit = driver_conn.fetch.await_args_list[0].args[2]
+    second_limit = driver_conn.fetch.await_args_list[1].args[2]
+    assert second_limit == first_limit * 4
+
+
+@pytest.mark.asyncio
+async def test_search_top_k_stops_when_threshold_filters_results(mock_session: AsyncSession) -> None:
+    """Test no retry when candidates were available but fell below the threshold."""
+    driver_conn = AsyncMock()
+    driver_conn.fetch.return_value = [{"id": 1, "similarity": 0.9, "candidate_count": 6}]
+    search_service = SemanticSearchService()
+
+    with patch.object(search_service, "get_vector_connection", AsyncMock(return_value=driver_conn)):
+        rows = await search_service._search_top_k(mock_session, "topics t", "[0.1]", limit=3, threshold=0.85)
+
+    assert len(rows) == 1
+    driver_conn.fetch.assert_awaited_once()
+
+
+def test_build_batch_similarity_query_uses_lateral_top_k_per_vector() -> None:
+    """Test batch query runs one index-ordered top-k scan per unnested query vector."""
+    sql = VectorQueryBuilder.build_batch_similarity_query("atoms a", select_clause="a.id")
+
+    assert "unnest($1::text[]) WITH ORDINALITY" in sql
+    assert "CROSS JOIN LATERAL" in sql
+    assert "ORDER BY a.embedding <=> q.query_vector::vector" in sql
+    assert "candidates.similarity >= $3" in sql
+    assert "q.ord - 1 AS query_index" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_by_vectors_groups_rows_per_query_vector(mock_session: AsyncSession) -> None:
+    """Test one fetch resolves neighbours of every vector, returned in input order."""
+    driver_conn = AsyncMock()
+    driver_conn.fetch.return_value = [
+        {"query_index": 0, "id": 1, "similarity": 0.97},
+        {"query_index": 0, "id": 2, "similarity": 0.9},
+        {"query_index": 2, "id": 3, "similarity": 0.88},
+    ]
+    search_service = SemanticSearchService()
+
+    with patch.object(search_service, "get_vector_connection", AsyncMock(return_value=driver_conn)):
+        neighbours = await search_service.search_by_vectors(
+            mock_session, "atoms a", [[0.1], [0.2], [0.3]], limit=5, threshold=0.85
+        )
+
+    assert neighbours == [
+        [{"id": 1, "similarity": 0.97}, {"id": 2, "similarity": 0.9}],
+        [],
+        [{"id": 3, "similarity": 0.88}],
+    ]
+    driver_conn.fetch.assert_awaited_once()
+    assert driver_conn.fetch.await_args.args[1] == ["[0.1]", "[0.2]", "[0.3]"]
@@ -0,0 +1,132 @@
+"""Tests for bulk historical Telegram ingestion."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from app.models.legacy import Source
+from app.models.message import Message
+from app.models.telegram_profile import TelegramProfile
+from app.models.user import User
+from app.services.avatar_resolver import AvatarResolver
+from app.services.telegram_ingestion_service import BulkStoreResult, TelegramIngestionService
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+CHAT_ID = "-1002988379206"
+
+
+def _message(message_id: int, telegram_user_id: int | None, first_name: str = "Sender") -> dict:
+    return {
+        "message_id": message_id,
+        "text": f"Message {message_id}",
+        "date": 1_700_000_000 + message_id,
+        "from": {"id": telegram_user_id, "first_name": first_name},
+    }
+
+
+@pytest.fixture
+async def source(db_session: AsyncSession) -> Source:
+    """Telegram source with one known sender and one stored message."""
+    source = Source(name="telegram", type="telegram")
+    user = User(first_name="Known", avatar_url="https://cdn/known.jpg")
+    db_session.add_all([source, user])
+    await db_session.commit()
+    db_session.add_all([
+        TelegramProfile(telegram_user_id=1, first_name="Known", user_id=user.id, source_id=source.id),
+        Message(
+            external_message_id="10",
+            content="already stored",
+            sent_at=datetime(2023, 11, 14),
+            source_channel_id=CHAT_ID,
+            source_id=source.id,
+            author_id=user.id,
+        ),
+    ])
+    await db_session.commit()
+    return source
+
+
+@pytest.fixture
+def service() -> TelegramIngestionService:
+    service = TelegramIngestionService(bot_token="test-token")
+    service.avatar_resolver = AvatarResolver(bot_token="test-token", ttl_seconds=3600)
+    service.avatar_resolver._fetch = AsyncMock(return_value="https://cdn/new.jpg")  # type: ignore[method-assign]
+    return service
+
+
+@pytest.mark.asyncio
+async def test_store_messages_bulk_dedups_and_upserts_senders(
+    db_session: AsyncSession, source: Source, service: TelegramIngestionService
+) -> None:
+    """Test duplicates are skipped, senders resolved once and new users created."""
+    batch = [
+        _message(10, 1, "Renamed"),  # already stored
+        _message(11, 1, "Renamed"),
+        _message(12, 2, "Newcomer"),
+        _message(12, 2, "Newcomer"),  # duplicate within the batch
+        _message(13, None),  # no sender
+    ]
+
+    result = await service.store_messages_bulk(db_session, batch, source, CHAT_ID)
+    await db_session.commit()
+
+    assert result == BulkStoreResult(stored=2, skipped=2, errors=1)
+    stored = (
+        await db_session.execute(select(Message).where(Message.external_message_id.in_(["11", "12"])))  # type: ignore[attr-defined]
+    ).scalars()
+    by_id = {message.external_message_id: message for message in stored}
+    assert by_id["11"].avatar_url == "https://cdn/known.jpg"
+    assert by_id["12"].avatar_url == "https://cdn/new.jpg"
+    assert {message.source_channel_id for message in by_id.values()} == {CHAT_ID}
+
+    newcomer = await db_session.get(User, by_id["12"].author_id)
+    assert newcomer is not None
+    assert (newcomer.first_name, newcomer.avatar_url) == ("Newcomer", "https://cdn/new.jpg")
+    profiles = (await db_session.execute(select(TelegramProfile).order_by(TelegramProfile.telegram_user_id))).scalars()
+    assert [(p.telegram_user_id, p.first_name) for p in profiles] == [(1, "Renamed"), (2, "Newcomer")]
+    service.avatar_resolver._fetch.assert_awaited_once_with(2)  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_store_messages_bulk_is_idempotent(
+    db_session: AsyncSession, source: Source, service: TelegramIngestionService
+) -> None:
+    """Test re-importing a batch stores nothing and fetches no avatars again."""
+    service.avatar_resolver._fetch = AsyncMock(return_value=None)  # type: ignore[method-assign]
+    batch = [_message(i, 3 + i % 2) for i in range(20, 30)]
+
+    first = await service.store_messages_bulk(db_session, batch, source, CHAT_ID)
+    await db_session.commit()
+    second = await service.store_messages_bulk(db_session, batch, source, CHAT_ID)
+    await db_session.commit()
+
+    assert first == BulkStoreResult(stored=10, skipped=0, errors=0)
+    assert second == BulkStoreResult(stored=0, skipped=10, errors=0)
+    assert service.avatar_resolver._fetch.await_count == 2  # type: ignore[attr-defined]
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 3
+
+
+@pytest.mark.asyncio
+async def test_store_messages_bulk_skips_messages_stored_without_channel(
+    db_session: AsyncSession, source: Source, service: TelegramIngestionService
+) -> None:
+    """Test ids stored before channels were recorded are not inserted again."""
+    author_id = await db_session.scalar(select(User.id).where(User.first_name == "Known"))
+    db_session.add(
+        Message(
+            external_message_id="40",
+            content="legacy message",
+            sent_at=datetime(2023, 11, 14),
+            source_id=source.id,
+            author_id=author_id,
+        )
+    )
+    await db_session.commit()
+
+    result = await service.store_messages_bulk(db_session, [_message(40, 1), _message(41, 1)], source, CHAT_ID)
+    await db_session.commit()
+
+    assert result == BulkStoreResult(stored=1, skipped=1, errors=0)
+    count = select(func.count()).select_from(Message).where(Message.external_message_id.in_(["40", "41"]))
+    assert await db_session.scalar(count) == 2
@@ -0,0 +1,98 @@
+"""Tests for the trigger-maintained unprocessed message counter."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from app.models import Message, Source, SourceType, Topic, UnprocessedMessageBucket, User
+from app.services.unprocessed_messages import (
+    count_unprocessed_messages,
+    load_unprocessed_messages,
+    prune_unprocessed_buckets,
+)
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+HOUR = datetime(2026, 10, 17, 12, 0, 0)
+
+
+@pytest.fixture
+async def add_messages(db_session: AsyncSession):  # type: ignore[no-untyped-def]
+    """Factory storing messages sent at the given times."""
+    user = User(first_name="Test", last_name="User", email="counter@example.com")
+    source = Source(name="Telegram", type=SourceType.telegram)
+    db_session.add_all([user, source])
+    await db_session.commit()
+
+    async def add(*sent_at: datetime, channel: str = "chat") -> list[Message]:
+        messages = [
+            Message(
+                external_message_id=f"{channel}_{moment.isoformat()}_{i}",
+                content="hello",
+                sent_at=moment,
+                source_id=source.id,
+                author_id=user.id,
+                source_channel_id=channel,
+            )
+            for i, moment in enumerate(sent_at)
+        ]
+        db_session.add_all(messages)
+        await db_session.commit()
+        return messages
+
+    return add
+
+
+async def _buckets(db: AsyncSession) -> dict[datetime, int]:
+    rows = (await db.execute(select(UnprocessedMessageBucket))).scalars().all()
+    return {row.bucket_start: row.message_count for row in rows if row.message_count}
+
+
+@pytest.mark.asyncio
+async def test_triggers_track_inserts_topic_assignment_and_deletes(db_session: AsyncSession, add_messages) -> None:  # type: ignore[no-untyped-def]
+    """Test every write path on messages keeps the hourly counters exact."""
+    first, second, third = await add_messages(
+        HOUR + timedelta(minutes=5), HOUR + timedelta(minutes=50), HOUR + timedelta(hours=1, minutes=1)
+    )
+    assert await _buckets(db_session) == {HOUR: 2, HOUR + timedelta(hours=1): 1}
+
+    topic = Topic(name="Topic", description="Test", icon="Icon", color="#000")
+    db_session.add(topic)
+    await db_session.commit()
+    await db_session.execute(update(Message).where(Message.id == first.id).values(topic_id=topic.id))  # type: ignore[arg-type]
+    await db_session.execute(
+        update(Message).where(Message.id == third.id).values(sent_at=HOUR + timedelta(minutes=30))  # type: ignore[arg-type]
+    )
+    await db_session.execute(delete(Message).where(Message.id == first.id))  # type: ignore[arg-type]
+    await db_session.commit()
+
+    assert await _buckets(db_session) == {HOUR: 2}
+    assert await count_unprocessed_messages(db_session, HOUR - timedelta(hours=24)) == 2
+    rows = await load_unprocessed_messages(db_session, HOUR)
+    assert [row.id for row in rows] == [third.id, second.id]
+
+
+@pytest.mark.asyncio
+async def test_count_is_exact_at_window_boundary(db_session: AsyncSession, add_messages) -> None:  # type: ignore[no-untyped-def]
+    """Test the partial first hour is counted row by row and older messages excluded."""
+    await add_messages(
+        HOUR + timedelta(minutes=10),
+        HOUR + timedelta(minutes=40),
+        HOUR + timedelta(hours=2),
+        HOUR - timedelta(hours=3),
+    )
+
+    assert await count_unprocessed_messages(db_session, HOUR + timedelta(minutes=30)) == 2
+    assert await count_unprocessed_messages(db_session, HOUR) == 3
+    assert await count_unprocessed_messages(db_session, HOUR + timedelta(hours=3)) == 0
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_buckets_of_the_window(db_session: AsyncSession, add_messages) -> None:  # type: ignore[no-untyped-def]
+    """Test pruning drops only hours that ended before the window start."""
+    await add_messages(HOUR - timedelta(hours=30), HOUR - timedelta(minutes=20), HOUR + timedelta(minutes=1))
+
+    deleted = await prune_unprocessed_buckets(db_session, HOUR - timedelta(minutes=10))
+
+    assert deleted == 1
+    assert await _buckets(db_session) == {HOUR - timedelta(hours=1): 1, HOUR: 1}
+    assert await count_unprocessed_messages(db_session, HOUR - timedelta(minutes=10)) == 1
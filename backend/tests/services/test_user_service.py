@@ -0,0 +1,117 @@
+"""Tests for cached Telegram author identification."""
+
+from collections.abc import Iterator
+from unittest.mock import AsyncMock
+
+import pytest
+from app.models.legacy import Source
+from app.models.telegram_profile import TelegramProfile
+from app.models.user import User
+from app.services.user_service import (
+    IDENTITY_CACHE_SUBJECT,
+    TelegramSender,
+    get_source_id,
+    handle_identity_invalidation,
+    identify_telegram_author,
+    identity_cache,
+    invalidate_identity,
+    set_author_avatar,
+)
+from app.services.websocket_manager import websocket_manager
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@pytest.fixture
+def statements(db_session: AsyncSession) -> Iterator[list[str]]:
+    """SQL statements executed on the test engine."""
+    executed: list[str] = []
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        executed.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_known_sender_is_resolved_without_queries(db_session: AsyncSession, statements: list[str]) -> None:
+    """Test the first message creates the author and later ones hit the cache."""
+    sender = TelegramSender(first_name="Olena", last_name="K", language_code="uk")
+
+    source_id = await get_source_id(db_session, "telegram")
+    first = await identify_telegram_author(db_session, 42, sender)
+    await db_session.commit()
+    statements.clear()
+
+    assert await get_source_id(db_session, "telegram") == source_id
+    again = await identify_telegram_author(db_session, 42, sender)
+
+    assert statements == []
+    assert again == first
+    assert first.full_name == "Olena K"
+    assert identity_cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_profile_is_written_once(db_session: AsyncSession, statements: list[str]) -> None:
+    """Test only a changed profile causes a write, which later messages skip."""
+    await identify_telegram_author(db_session, 7, TelegramSender(first_name="Taras"))
+    await db_session.commit()
+    statements.clear()
+
+    renamed = TelegramSender(first_name="Taras", last_name="Sh")
+    author = await identify_telegram_author(db_session, 7, renamed)
+    await identify_telegram_author(db_session, 7, renamed)
+    await set_author_avatar(db_session, 7, author, "https://cdn/7.jpg")
+    await db_session.commit()
+
+    assert statements.count("UPDATE") == 2
+    assert "SELECT" not in statements
+    profile = (await db_session.execute(select(TelegramProfile))).scalar_one()
+    user = await db_session.get(User, author.user_id)
+    assert (profile.first_name, profile.last_name) == ("Taras", "Sh")
+    assert user is not None and user.avatar_url == "https://cdn/7.jpg"
+    assert identity_cache.get_author(7).avatar_url == "https://cdn/7.jpg"  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_invalidated_or_expired_authors_are_reloaded(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test invalidation and TTL expiry fall back to the database."""
+    sender = TelegramSender(first_name="Iryna")
+    author = await identify_telegram_author(db_session, 9, sender)
+    await db_session.commit()
+
+    identity_cache.invalidate_user(author.user_id)
+    assert identity_cache.get_author(9) is None
+
+    monkeypatch.setattr(identity_cache, "ttl", 0)
+    reloaded = await identify_telegram_author(db_session, 9, sender)
+    assert reloaded.user_id == author.user_id
+    assert identity_cache.get_author(9) is None
+    assert len((await db_session.execute(select(Source))).scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_published_to_other_processes(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test API edits evict locally and publish the eviction other processes apply."""
+    publish = AsyncMock()
+    monkeypatch.setattr(websocket_manager, "publish_control", publish)
+    first = await identify_telegram_author(db_session, 11, TelegramSender(first_name="Petro"))
+    await identify_telegram_author(db_session, 12, TelegramSender(first_name="Mykola"))
+    await db_session.commit()
+
+    await invalidate_identity(user_id=first.user_id)
+
+    assert identity_cache.get_author(11) is None
+    publish.assert_awaited_once_with(IDENTITY_CACHE_SUBJECT, {"user_id": first.user_id, "telegram_user_id": None})
+
+    # What a worker does with the published message
+    handle_identity_invalidation({"user_id": None, "telegram_user_id": 12})
+    assert identity_cache.get_author(12) is None
@@ -1,9 +1,11 @@
 """Unit tests for VersioningService."""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 from app.models.atom import Atom, AtomType
 from app.models.topic import Topic
-from app.services.versioning import VersioningService
+from app.services.versioning import BaseVersioningService, VersioningService
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -351,3 +353,50 @@ class TestVersionDiff:
 
         assert diff["summary"] == "No changes detected"
         assert len(diff["changes"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_applies_each_topics_fields_in_request_order(
+    db_session: AsyncSession, versioning_service: VersioningService, sample_topic: Topic
+) -> None:
+    """Test one set-based approval updates several topics and refreshes loaded objects."""
+    other = Topic(name="Other", description="Other description", icon="FolderIcon", color="#64748B")
+    db_session.add(other)
+    await db_session.commit()
+
+    rename = await versioning_service.create_topic_version(db_session, sample_topic.id, {"name": "Renamed"})
+    redescribe = await versioning_service.create_topic_version(db_session, sample_topic.id, {"description": "New"})
+    rename_again = await versioning_service.create_topic_version(db_session, sample_topic.id, {"name": "Final"})
+    other_version = await versioning_service.create_topic_version(db_session, other.id, {"color": "#000000"})
+
+    success_count, failed_ids, errors = await versioning_service.bulk_approve_versions(
+        db_session, "topic", [rename.id, redescribe.id, rename_again.id, other_version.id, rename.id, 999999]
+    )
+
+    assert success_count == 4
+    assert failed_ids == [rename.id, 999999]
+    assert errors == {rename.id: "Version already approved", 999999: "Version not found"}
+    assert (sample_topic.name, sample_topic.description, sample_topic.color) == ("Final", "New", "#64748B")
+    assert (other.name, other.color) == ("Other", "#000000")
+    assert rename.approved and rename_again.approved_at is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_approve_reports_versions_locked_by_another_review() -> None:
+    """Test versions skipped by FOR UPDATE SKIP LOCKED but present are reported as locked."""
+    locked_rows = MagicMock()
+    locked_rows.__iter__.return_value = iter([])
+    existing = MagicMock()
+    existing.scalars.return_value = [7]
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[locked_rows, existing])
+    db.commit = AsyncMock()
+
+    with patch.object(BaseVersioningService, "broadcast_pending_count_update", AsyncMock()):
+        success_count, failed_ids, errors = await VersioningService().bulk_approve_versions(db, "topic", [7, 8])
+
+    assert success_count == 0
+    assert failed_ids == [7, 8]
+    assert errors == {7: "Version is locked by another review, please retry", 8: "Version not found"}
+    lock_statement = db.execute.await_args_list[0].args[0]
+    assert lock_statement._for_update_arg.skip_locked
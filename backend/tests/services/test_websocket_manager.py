@@ -0,0 +1,152 @@
+"""Tests for WebSocketManager per-connection send queues."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.services.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    """WebSocket stub recording frames, optionally slow or failing."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.frames: list[dict] = []
+        self.closed_with: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        if self.fail:
+            raise RuntimeError("connection reset")
+        await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(data))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+@pytest.fixture
+def manager():
+    """Create API-side manager with an in-memory message buffer."""
+    manager = WebSocketManager()
+    manager._is_worker = False
+    seq = iter(range(1, 10_000))
+    with patch("app.services.message_buffer.message_buffer") as buffer:
+        buffer.add = AsyncMock(side_effect=lambda topic, message: next(seq))
+        yield manager
+
+
+async def _drain() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others(manager: WebSocketManager) -> None:
+    """Test broadcast returns immediately and fast clients get frames while a slow one is sending."""
+    slow = FakeWebSocket(delay=10)
+    fast = [FakeWebSocket() for _ in range(3)]
+    for ws in [slow, *fast]:
+        await manager.connect(ws, ["messages"])  # type: ignore[arg-type]
+
+    await asyncio.wait_for(manager.broadcast("messages", {"type": "message.new"}), timeout=1)
+    await _drain()
+
+    assert all(ws.frames == [{"type": "message.new", "_seq": 1}] for ws in fast)
+    assert slow.frames == []
+    assert manager.get_delivery_stats()["frames_sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_then_disconnects_slow_consumer(manager: WebSocketManager) -> None:
+    """Test overflow drops oldest frames and a persistently backlogged client is closed."""
+    manager.SEND_QUEUE_SIZE = 2
+    manager.SLOW_CONSUMER_TIMEOUT = 0
+    stuck = FakeWebSocket(delay=10)
+    conn_id = await manager.connect(stuck, ["messages"])  # type: ignore[arg-type]
+    await _drain()
+
+    # First frame is taken by the (stuck) writer, next two fill the queue
+    for i in range(3):
+        await manager.broadcast("messages", {"type": "event", "i": i})
+        await _drain()
+    await manager.broadcast("messages", {"type": "event", "i": 3})
+
+    queued = [json.loads(frame)["i"] for frame in list(manager._conn_by_id[conn_id].send_queue._queue)]  # type: ignore[attr-defined]
+    assert queued == [2, 3]
+    assert manager.get_delivery_stats()["frames_dropped"] == 1
+
+    await manager.broadcast("messages", {"type": "event", "i": 4})
+    await _drain()
+
+    assert manager.get_connection_count() == 0
+    assert stuck.closed_with == 1013
+    stats = manager.get_delivery_stats()
+    assert stats["frames_dropped"] == 2
+    assert stats["slow_consumer_disconnects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_send_disconnects_connection(manager: WebSocketManager) -> None:
+    """Test a send error removes the connection without affecting others."""
+    broken = FakeWebSocket(fail=True)
+    healthy = FakeWebSocket()
+    await manager.connect(broken, ["messages"])  # type: ignore[arg-type]
+    await manager.connect(healthy, ["messages"])  # type: ignore[arg-type]
+
+    await manager.broadcast("messages", {"type": "message.new"})
+    await _drain()
+
+    assert manager.get_connection_count("messages") == 1
+    assert healthy.frames == [{"type": "message.new", "_seq": 1}]
+
+
+@pytest.mark.asyncio
+async def test_direct_frames_share_the_send_queue_and_wait_for_space(manager: WebSocketManager) -> None:
+    """Test frames for one connection are queued behind broadcasts and never dropped."""
+    manager.SEND_QUEUE_SIZE = 2
+    ws = FakeWebSocket(delay=0.01)
+    conn_id = await manager.connect(ws, ["messages"])  # type: ignore[arg-type]
+
+    await manager.broadcast("messages", {"type": "event"})
+    for i in range(4):
+        assert await manager.send_to_connection(conn_id, {"type": "replay", "i": i})
+    await asyncio.sleep(0.1)
+
+    assert ws.frames == [{"type": "event", "_seq": 1}, *({"type": "replay", "i": i} for i in range(4))]
+    assert manager.get_delivery_stats()["frames_dropped"] == 0
+    assert await manager.send_to_connection("missing", {"type": "ack"}) is False
+
+
+@pytest.mark.asyncio
+async def test_control_messages_reach_registered_handlers(manager: WebSocketManager) -> None:
+    """Test control handlers are subscribed on startup and receive published messages."""
+    callbacks = {}
+
+    class FakeNATS:
+        async def connect(self, servers: str) -> None:
+            pass
+
+        async def subscribe(self, subject: str, cb):  # type: ignore[no-untyped-def]
+            callbacks[subject] = cb
+            return AsyncMock()
+
+        async def publish(self, subject: str, data: bytes) -> None:
+            if subject in callbacks:
+                await callbacks[subject](type("Msg", (), {"subject": subject, "data": data}))
+
+    received: list[dict] = []
+    manager._is_worker = True
+    manager.add_control_handler("control.test", received.append)
+    with patch("app.services.websocket_manager.NATSClient", FakeNATS):
+        await manager.startup("nats://test")
+
+    await manager.publish_control("control.test", {"user_id": 5})
+
+    assert list(callbacks) == ["control.test"]
+    assert received == [{"user_id": 5}]
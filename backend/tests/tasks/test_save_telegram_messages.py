@@ -0,0 +1,91 @@
+"""Tests for batched saving of Telegram webhook messages."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.models.message import Message
+from app.services.avatar_resolver import get_avatar_resolver
+from app.tasks import save_telegram_messages
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+CHAT_ID = -1002988379206
+
+
+def _update(message_id: int, telegram_user_id: int | None, first_name: str = "Sender") -> dict:
+    sender = {"id": telegram_user_id, "first_name": first_name} if telegram_user_id else {}
+    return {
+        "message": {
+            "message_id": message_id,
+            "date": 1_700_000_000 + message_id,
+            "text": f"Message {message_id}",
+            "chat": {"id": CHAT_ID},
+            "from": sender,
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_is_saved_in_one_transaction(db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a batch commits once, skips redeliveries and triggers scoring/extraction once."""
+    monkeypatch.setattr(get_avatar_resolver(), "_fetch", AsyncMock(return_value=None))
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    commits: list[object] = []
+    engine = db_session.bind.sync_engine  # type: ignore[union-attr]
+
+    def record_commit(conn) -> None:  # type: ignore[no-untyped-def]
+        commits.append(conn)
+
+    event.listen(engine, "commit", record_commit)
+
+    with (
+        patch("app.tasks.ingestion.AsyncSessionLocal", session_factory),
+        patch("app.tasks.scoring.score_messages_batch_task") as scoring_task,
+        patch("app.tasks.ingestion.queue_knowledge_extraction_if_needed", new=AsyncMock()) as queue_extraction,
+    ):
+        scoring_task.kiq = AsyncMock()
+        await save_telegram_messages([_update(1, 10, "Olena")])
+        commits.clear()
+
+        results = await save_telegram_messages([
+            _update(1, 10, "Olena"),  # redelivered
+            _update(2, 10, "Olena"),
+            _update(3, 20, "Taras"),
+            _update(4, None),
+        ])
+
+    event.remove(engine, "commit", record_commit)
+    # New sender's user and profile are flushed into the single batch commit
+    assert len(commits) == 1
+    assert results == [
+        "Skipped duplicate message 1",
+        "Saved message 2",
+        "Saved message 3",
+        "❌ Skipped message 4: no sender",
+    ]
+    assert await db_session.scalar(select(func.count()).select_from(Message)) == 3
+    stored_ids = scoring_task.kiq.await_args_list[-1].args[0]
+    assert len(stored_ids) == 2
+    assert queue_extraction.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_message(db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test malformed updates fail on their own while the rest of the batch is stored."""
+    monkeypatch.setattr(get_avatar_resolver(), "_fetch", AsyncMock(return_value=None))
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    no_date = _update(2, 30, "Iryna")
+    del no_date["message"]["date"]
+
+    with (
+        patch("app.tasks.ingestion.AsyncSessionLocal", session_factory),
+        patch("app.tasks.scoring.score_messages_batch_task") as scoring_task,
+        patch("app.tasks.ingestion.queue_knowledge_extraction_if_needed", new=AsyncMock()),
+    ):
+        scoring_task.kiq = AsyncMock()
+        results = await save_telegram_messages([_update(1, 10, "Olena"), no_date, {"edited_message": {}}])
+
+    assert results[0] == "Saved message 1"
+    assert results[1].startswith("Error:")
+    assert results[2].startswith("Error:")
+    assert await db_session.scalar(select(func.count()).select_from(Message)) == 1
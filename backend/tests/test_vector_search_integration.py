@@ -24,6 +24,7 @@ from app.models.user import User
 from app.services.embedding_service import EmbeddingService
 from app.services.semantic_search_service import SemanticSearchService
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 
 @pytest.fixture
@@ -96,7 +97,7 @@ class TestVectorSearchIntegration:
         )
         db_session.add(atom_without_embedding)
         await db_session.commit()
-        await db_session.refresh(atom_without_embedding)
+        await db_session.refresh(atom_without_embedding, ["embedding"])
 
         atom_id = atom_without_embedding.id
         assert atom_without_embedding.embedding is None
@@ -105,7 +106,7 @@ class TestVectorSearchIntegration:
         atom_without_embedding.embedding = new_embedding
         db_session.add(atom_without_embedding)
         await db_session.commit()
-        await db_session.refresh(atom_without_embedding)
+        await db_session.refresh(atom_without_embedding, ["embedding"])
 
         retrieved = await db_session.get(Atom, atom_id)
         assert retrieved is not None
@@ -134,7 +135,7 @@ class TestVectorSearchIntegration:
         )
         db_session.add(message_without_embedding)
         await db_session.commit()
-        await db_session.refresh(message_without_embedding)
+        await db_session.refresh(message_without_embedding, ["embedding"])
 
         msg_id = message_without_embedding.id
         assert message_without_embedding.embedding is None
@@ -143,7 +144,7 @@ class TestVectorSearchIntegration:
         message_without_embedding.embedding = new_embedding
         db_session.add(message_without_embedding)
         await db_session.commit()
-        await db_session.refresh(message_without_embedding)
+        await db_session.refresh(message_without_embedding, ["embedding"])
 
         retrieved = await db_session.get(Message, msg_id)
         assert retrieved is not None
@@ -194,7 +195,7 @@ class TestVectorSearchIntegration:
             db_session.add(atom)
         await db_session.commit()
         for atom in atoms:
-            await db_session.refresh(atom)
+            await db_session.refresh(atom, ["embedding"])
 
         with (
             patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
@@ -275,7 +276,7 @@ class TestVectorSearchIntegration:
             db_session.add(msg)
         await db_session.commit()
         for msg in messages:
-            await db_session.refresh(msg)
+            await db_session.refresh(msg, ["embedding"])
 
         with (
             patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
@@ -338,7 +339,7 @@ class TestVectorSearchIntegration:
         await db_session.commit()
 
         for atom in atoms:
-            await db_session.refresh(atom)
+            await db_session.refresh(atom, ["embedding"])
             assert atom.embedding is not None
             assert len(atom.embedding) == 1536
 
@@ -372,7 +373,7 @@ class TestVectorSearchIntegration:
         await db_session.commit()
 
         for entity in [msg_without_embedding, atom_without_embedding]:
-            await db_session.refresh(entity)
+            await db_session.refresh(entity, ["embedding"])
             assert entity.embedding is None
 
     async def test_search_with_similarity_threshold(
@@ -405,7 +406,7 @@ class TestVectorSearchIntegration:
             db_session.add(atom)
         await db_session.commit()
         for atom in atoms:
-            await db_session.refresh(atom)
+            await db_session.refresh(atom, ["embedding"])
 
         with (
             patch("app.services.embedding_service.CredentialEncryption") as mock_encryptor_class,
@@ -455,7 +456,7 @@ class TestVectorSearchIntegration:
         db_session.add(atom)
         await db_session.commit()
         atom_id = atom.id
-        await db_session.refresh(atom)
+        await db_session.refresh(atom, ["embedding"])
 
         retrieved = await db_session.get(Atom, atom_id)
         assert retrieved is not None
@@ -487,7 +488,7 @@ class TestVectorSearchIntegration:
             db_session.add(atom)
         await db_session.commit()
         for atom in atoms:
-            await db_session.refresh(atom)
+            await db_session.refresh(atom, ["embedding"])
 
         atom_ids = [a.id for a in atoms]
 
@@ -525,7 +526,7 @@ class TestVectorSearchIntegration:
             db_session.add(atom)
         await db_session.commit()
         for atom in atoms:
-            await db_session.refresh(atom)
+            await db_session.refresh(atom, ["embedding"])
 
         top_results = [(atoms[i], 0.9 - i * 0.05) for i in range(5)]
 
@@ -576,14 +577,14 @@ class TestVectorSearchIntegration:
 
         db_session.add(atom)
         await db_session.commit()
-        await db_session.refresh(atom)
+        await db_session.refresh(atom, ["embedding"])
 
         assert atom.embedding[0] == pytest.approx(0.1)
 
         atom.embedding = updated_embedding
         db_session.add(atom)
         await db_session.commit()
-        await db_session.refresh(atom)
+        await db_session.refresh(atom, ["embedding"])
 
         retrieved = await db_session.get(Atom, atom.id)
         assert retrieved is not None
@@ -633,7 +634,7 @@ class TestVectorSearchIntegration:
 
         from sqlalchemy import select
 
-        query = select(Message).where(Message.embedding.is_not(None))
+        query = select(Message).where(Message.embedding.is_not(None)).options(undefer(Message.embedding))
         result = await db_session.execute(query)
         embedded_messages = result.scalars().all()
 
@@ -0,0 +1,142 @@
+"""Unit tests for LLMAgentRegistry agent caching."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from app.llm.application.agent_registry import LLMAgentRegistry
+from app.llm.application.framework_registry import FrameworkRegistry
+from app.llm.application.llm_service import LLMService
+from app.llm.application.provider_resolver import ProviderResolver
+from app.llm.domain.models import AgentConfig
+from app.models import LLMProvider, ProviderType
+from app.services.provider_crud import ProviderCRUD
+
+
+class CountingFramework:
+    """Framework stub counting created agents."""
+
+    def __init__(self) -> None:
+        self.created = 0
+
+    async def create_agent(self, config, provider_config):
+        self.created += 1
+        await asyncio.sleep(0)
+        return MagicMock(name=f"agent_{self.created}")
+
+    def supports_streaming(self):
+        return False
+
+
+@pytest.fixture
+def framework():
+    FrameworkRegistry._frameworks = {}
+    FrameworkRegistry._default = None
+    framework = CountingFramework()
+    FrameworkRegistry.register("counting", framework)
+    yield framework
+    FrameworkRegistry._frameworks = {}
+    FrameworkRegistry._default = None
+
+
+@pytest.fixture
+def provider() -> LLMProvider:
+    return LLMProvider(
+        id=uuid4(),
+        name="Cached Provider",
+        type=ProviderType.openai,
+        api_key_encrypted=b"encrypted-1",
+        is_active=True,
+    )
+
+
+def _service(provider: LLMProvider, registry: LLMAgentRegistry) -> tuple[LLMService, AsyncMock]:
+    crud = MagicMock(spec=ProviderCRUD)
+    crud.get = AsyncMock(return_value=MagicMock(id=provider.id))
+    crud.get_decrypted_api_key = AsyncMock(return_value="sk-test")
+    session = AsyncMock()
+    session.get = AsyncMock(return_value=provider)
+    return LLMService(ProviderResolver(crud), framework_name="counting", registry=registry), session
+
+
+@pytest.mark.asyncio
+async def test_create_agent_reuses_agent_for_same_provider_and_config(framework, provider) -> None:
+    """Test repeat calls skip key decryption and agent construction."""
+    registry = LLMAgentRegistry()
+    service, session = _service(provider, registry)
+    config = AgentConfig(name="scorer", model_name="gpt-4o-mini", temperature=0.0)
+
+    agents = await asyncio.gather(*[service.create_agent(session, config, provider_id=provider.id) for _ in range(5)])
+
+    assert framework.created == 1
+    assert all(agent is agents[0] for agent in agents)
+    service.provider_resolver.crud.get_decrypted_api_key.assert_awaited_once()
+    assert registry.get_stats()["hits"] == 4
+
+    other = await service.create_agent(session, config.model_copy(update={"temperature": 0.5}), provider_id=provider.id)
+    assert other is not agents[0]
+    assert framework.created == 2
+
+
+@pytest.mark.asyncio
+async def test_changed_provider_settings_build_new_agent(framework, provider) -> None:
+    """Test a provider updated elsewhere (new key) is never served a stale agent."""
+    registry = LLMAgentRegistry()
+    service, session = _service(provider, registry)
+    config = AgentConfig(name="scorer", model_name="gpt-4o-mini")
+
+    first = await service.create_agent(session, config, provider_id=provider.id)
+    provider.api_key_encrypted = b"encrypted-2"
+    second = await service.create_agent(session, config, provider_id=provider.id)
+
+    assert first is not second
+    assert framework.created == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_by_provider_and_agent_name(framework, provider) -> None:
+    """Test explicit invalidation drops agents and cached configs."""
+    registry = LLMAgentRegistry()
+    service, session = _service(provider, registry)
+
+    await service.create_agent(session, AgentConfig(name="scorer", model_name="m"), provider_id=provider.id)
+    await service.create_agent(session, AgentConfig(name="extractor", model_name="m"), provider_id=provider.id)
+    loader = AsyncMock(return_value=("provider", "model", 0.0))
+    await registry.get_config("scorer", loader)
+    await registry.get_config("scorer", loader)
+    loader.assert_awaited_once()
+
+    assert registry.invalidate_agent("scorer") == 1
+    await registry.get_config("scorer", loader)
+    assert loader.await_count == 2
+
+    assert registry.invalidate_provider(provider.id) == 1
+    assert registry.get_stats()["agents"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(framework, provider) -> None:
+    """Test least recently used agents are evicted beyond max_entries."""
+    registry = LLMAgentRegistry(max_entries=2)
+    service, session = _service(provider, registry)
+
+    for name in ("a", "b", "c"):
+        await service.create_agent(session, AgentConfig(name=name, model_name="m"), provider_id=provider.id)
+
+    assert registry.get_stats()["agents"] == 2
+    await service.create_agent(session, AgentConfig(name="a", model_name="m"), provider_id=provider.id)
+    assert framework.created == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_factory_leaves_no_lock_behind() -> None:
+    """Test a factory error propagates without leaking its per-key lock."""
+    registry = LLMAgentRegistry()
+    factory = AsyncMock(side_effect=RuntimeError("provider down"))
+
+    with pytest.raises(RuntimeError):
+        await registry.get_or_create(("framework", "provider", "config"), factory)
+
+    assert registry._locks == {}
+    assert registry.get_stats()["agents"] == 0